@@ -0,0 +1,59 @@
+"""add_stock_ledger_indexes
+
+Revision ID: 9e1f2a3b4c5d
+Revises: 7cb259170036
+Create Date: 2025-10-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1f2a3b4c5d"
+down_revision: str | None = "7cb259170036"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add composite indexes backing the inventory-wide stock ledger API.
+
+    - (created_at, component_id): date-range scans and keyset pagination
+    - (user_id, created_at): per-user audit trails in chronological order
+    - (lot_id): lot/batch traceability lookups
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = {idx["name"] for idx in inspector.get_indexes("stock_transactions")}
+
+    if "idx_stock_transactions_created_component" not in indexes:
+        op.create_index(
+            "idx_stock_transactions_created_component",
+            "stock_transactions",
+            ["created_at", "component_id"],
+        )
+    if "idx_stock_transactions_user_created" not in indexes:
+        op.create_index(
+            "idx_stock_transactions_user_created",
+            "stock_transactions",
+            ["user_id", "created_at"],
+        )
+    # lot_id is declared index=True on the model but was never indexed by a migration
+    if "ix_stock_transactions_lot_id" not in indexes:
+        op.create_index(
+            "ix_stock_transactions_lot_id", "stock_transactions", ["lot_id"]
+        )
+
+
+def downgrade() -> None:
+    """Remove stock ledger indexes."""
+    op.drop_index("ix_stock_transactions_lot_id", table_name="stock_transactions")
+    op.drop_index(
+        "idx_stock_transactions_user_created", table_name="stock_transactions"
+    )
+    op.drop_index(
+        "idx_stock_transactions_created_component", table_name="stock_transactions"
+    )
@@ -0,0 +1,82 @@
+"""add_stock_anomalies
+
+Revision ID: b2c4d6e8f0a1
+Revises: 9e1f2a3b4c5d
+Create Date: 2025-10-18 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c4d6e8f0a1"
+down_revision: str | None = "9e1f2a3b4c5d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add tables for flagged stock anomalies and anomaly scan runs."""
+    op.create_table(
+        "stock_anomalies",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("component_id", sa.String(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("median_daily_removal", sa.Float(), nullable=False),
+        sa.Column("mad_daily_removal", sa.Float(), nullable=False),
+        sa.Column("robust_score", sa.Float(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column(
+            "detected_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.Column("acknowledged_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("acknowledged_by", sa.String(), nullable=True),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["transaction_id"], ["stock_transactions.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["component_id"], ["components.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("transaction_id"),
+    )
+    op.create_index(
+        op.f("ix_stock_anomalies_component_id"),
+        "stock_anomalies",
+        ["component_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_stock_anomalies_status"), "stock_anomalies", ["status"], unique=False
+    )
+
+    op.create_table(
+        "stock_anomaly_scans",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=True,
+        ),
+        sa.Column("high_water_mark", sa.String(), nullable=True),
+        sa.Column("transactions_scanned", sa.Integer(), nullable=False),
+        sa.Column("anomalies_found", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Drop anomaly detection tables."""
+    op.drop_table("stock_anomaly_scans")
+    op.drop_index(op.f("ix_stock_anomalies_status"), table_name="stock_anomalies")
+    op.drop_index(op.f("ix_stock_anomalies_component_id"), table_name="stock_anomalies")
+    op.drop_table("stock_anomalies")
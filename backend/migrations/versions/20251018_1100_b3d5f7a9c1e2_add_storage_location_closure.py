@@ -0,0 +1,144 @@
+"""add_storage_location_closure
+
+Revision ID: b3d5f7a9c1e2
+Revises: b2c4d6e8f0a1
+Create Date: 2025-10-18 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d5f7a9c1e2"
+down_revision: str | None = "b2c4d6e8f0a1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_NAMES = [
+    "trigger_storage_location_closure_insert",
+    "trigger_storage_location_closure_cycle",
+    "trigger_storage_location_closure_move",
+    "trigger_storage_location_closure_delete",
+]
+
+
+def upgrade() -> None:
+    """Add the storage location closure table, its triggers and backfill it.
+
+    One row per (ancestor, descendant, depth) pair lets subtree listings,
+    subtree component counts and cycle checks run as single indexed queries.
+    """
+    op.create_table(
+        "storage_location_closure",
+        sa.Column("ancestor_id", sa.String(), nullable=False),
+        sa.Column("descendant_id", sa.String(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ancestor_id"], ["storage_locations.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["descendant_id"], ["storage_locations.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "idx_storage_location_closure_descendant",
+        "storage_location_closure",
+        ["descendant_id", "depth"],
+        unique=False,
+    )
+
+    # Backfill from the existing parent_id tree
+    op.execute("""
+        INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+          SELECT id, id, 0 FROM storage_locations
+          UNION ALL
+          SELECT closure.ancestor_id, child.id, closure.depth + 1
+          FROM closure
+          JOIN storage_locations AS child ON child.parent_id = closure.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM closure
+        """)
+
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_insert
+        AFTER INSERT ON storage_locations
+        FOR EACH ROW
+        BEGIN
+          INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+          SELECT NEW.id, NEW.id, 0
+          UNION ALL
+          SELECT ancestor_id, NEW.id, depth + 1
+          FROM storage_location_closure
+          WHERE descendant_id = NEW.parent_id;
+
+          INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+          SELECT supertree.ancestor_id, subtree.descendant_id,
+                 supertree.depth + subtree.depth + 1
+          FROM storage_location_closure AS supertree
+          JOIN storage_locations AS child ON child.parent_id = NEW.id
+          JOIN storage_location_closure AS subtree ON subtree.ancestor_id = child.id
+          WHERE supertree.descendant_id = NEW.id;
+        END
+        """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_cycle
+        BEFORE UPDATE OF parent_id ON storage_locations
+        FOR EACH ROW
+        WHEN NEW.parent_id IS NOT NULL
+          AND EXISTS (
+            SELECT 1 FROM storage_location_closure
+            WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+          )
+        BEGIN
+          SELECT RAISE(ABORT, 'Circular reference detected');
+        END
+        """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_move
+        AFTER UPDATE OF parent_id ON storage_locations
+        FOR EACH ROW
+        WHEN OLD.parent_id IS NOT NEW.parent_id
+        BEGIN
+          DELETE FROM storage_location_closure
+          WHERE descendant_id IN (
+              SELECT descendant_id FROM storage_location_closure
+              WHERE ancestor_id = NEW.id
+            )
+            AND ancestor_id NOT IN (
+              SELECT descendant_id FROM storage_location_closure
+              WHERE ancestor_id = NEW.id
+            );
+
+          INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+          SELECT supertree.ancestor_id, subtree.descendant_id,
+                 supertree.depth + subtree.depth + 1
+          FROM storage_location_closure AS supertree
+          JOIN storage_location_closure AS subtree ON subtree.ancestor_id = NEW.id
+          WHERE supertree.descendant_id = NEW.parent_id;
+        END
+        """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_delete
+        AFTER DELETE ON storage_locations
+        FOR EACH ROW
+        BEGIN
+          DELETE FROM storage_location_closure
+          WHERE ancestor_id = OLD.id OR descendant_id = OLD.id;
+        END
+        """)
+
+
+def downgrade() -> None:
+    """Drop closure triggers and table."""
+    for trigger_name in TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+    op.drop_index(
+        "idx_storage_location_closure_descendant",
+        table_name="storage_location_closure",
+    )
+    op.drop_table("storage_location_closure")
@@ -0,0 +1,40 @@
+"""add_storage_location_parent_index
+
+Revision ID: c4e6a8b0d2f3
+Revises: b3d5f7a9c1e2
+Create Date: 2025-10-18 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e6a8b0d2f3"
+down_revision: str | None = "b3d5f7a9c1e2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index storage_locations.parent_id.
+
+    The closure insert trigger looks up children of every new location, so
+    without this index high-volume layout generation is quadratic. The index
+    was previously only created at startup by database.indexes.
+    """
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = {idx["name"] for idx in inspector.get_indexes("storage_locations")}
+
+    if "idx_storage_locations_parent_id" not in indexes:
+        op.create_index(
+            "idx_storage_locations_parent_id", "storage_locations", ["parent_id"]
+        )
+
+
+def downgrade() -> None:
+    """Remove the storage_locations.parent_id index."""
+    op.drop_index("idx_storage_locations_parent_id", table_name="storage_locations")
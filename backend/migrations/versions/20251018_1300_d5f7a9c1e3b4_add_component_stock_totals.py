@@ -0,0 +1,121 @@
+"""add_component_stock_totals
+
+Revision ID: d5f7a9c1e3b4
+Revises: c4e6a8b0d2f3
+Create Date: 2025-10-18 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f7a9c1e3b4"
+down_revision: str | None = "c4e6a8b0d2f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGGER_NAMES = [
+    "trigger_component_stock_totals_insert",
+    "trigger_component_stock_totals_update",
+    "trigger_component_stock_totals_delete",
+]
+
+
+def upgrade() -> None:
+    """Add per-component stock totals, their triggers and backfill them.
+
+    Location component listings filter and sort by total quantity; keeping
+    the totals in an indexed table avoids summing component_locations for
+    every candidate row.
+    """
+    op.create_table(
+        "component_stock_totals",
+        sa.Column("component_id", sa.String(), nullable=False),
+        sa.Column("quantity_on_hand", sa.Integer(), nullable=False),
+        sa.Column("minimum_stock", sa.Integer(), nullable=False),
+        sa.Column("location_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["component_id"], ["components.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("component_id"),
+    )
+    op.create_index(
+        "idx_component_stock_totals_quantity",
+        "component_stock_totals",
+        ["quantity_on_hand"],
+        unique=False,
+    )
+
+    # Backfill from existing stock
+    op.execute("""
+        INSERT INTO component_stock_totals (
+          component_id, quantity_on_hand, minimum_stock, location_count
+        )
+        SELECT component_id, SUM(quantity_on_hand), SUM(minimum_stock), COUNT(*)
+        FROM component_locations
+        GROUP BY component_id
+        """)
+
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_insert
+        AFTER INSERT ON component_locations
+        FOR EACH ROW
+        BEGIN
+          INSERT INTO component_stock_totals (
+            component_id, quantity_on_hand, minimum_stock, location_count
+          )
+          VALUES (NEW.component_id, NEW.quantity_on_hand, NEW.minimum_stock, 1)
+          ON CONFLICT (component_id) DO UPDATE SET
+            quantity_on_hand = quantity_on_hand + excluded.quantity_on_hand,
+            minimum_stock = minimum_stock + excluded.minimum_stock,
+            location_count = location_count + 1;
+        END
+        """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_update
+        AFTER UPDATE OF component_id, quantity_on_hand, minimum_stock
+        ON component_locations
+        FOR EACH ROW
+        BEGIN
+          UPDATE component_stock_totals SET
+            quantity_on_hand = quantity_on_hand - OLD.quantity_on_hand,
+            minimum_stock = minimum_stock - OLD.minimum_stock,
+            location_count = location_count - 1
+          WHERE component_id = OLD.component_id;
+
+          INSERT INTO component_stock_totals (
+            component_id, quantity_on_hand, minimum_stock, location_count
+          )
+          VALUES (NEW.component_id, NEW.quantity_on_hand, NEW.minimum_stock, 1)
+          ON CONFLICT (component_id) DO UPDATE SET
+            quantity_on_hand = quantity_on_hand + excluded.quantity_on_hand,
+            minimum_stock = minimum_stock + excluded.minimum_stock,
+            location_count = location_count + 1;
+        END
+        """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_delete
+        AFTER DELETE ON component_locations
+        FOR EACH ROW
+        BEGIN
+          UPDATE component_stock_totals SET
+            quantity_on_hand = quantity_on_hand - OLD.quantity_on_hand,
+            minimum_stock = minimum_stock - OLD.minimum_stock,
+            location_count = location_count - 1
+          WHERE component_id = OLD.component_id;
+        END
+        """)
+
+
+def downgrade() -> None:
+    """Drop stock total triggers and table."""
+    for trigger_name in TRIGGER_NAMES:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+    op.drop_index(
+        "idx_component_stock_totals_quantity",
+        table_name="component_stock_totals",
+    )
+    op.drop_table("component_stock_totals")
@@ -0,0 +1,78 @@
+"""add_provider_response_cache
+
+Revision ID: e6b8c0d2f4a5
+Revises: d5f7a9c1e3b4
+Create Date: 2025-10-18 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b8c0d2f4a5"
+down_revision: str | None = "d5f7a9c1e3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the provider response cache table.
+
+    Provider searches, SKU lookups and part details are cached per
+    (provider, kind, query, params) so repeated lookups skip the network.
+    """
+    op.create_table(
+        "provider_response_cache",
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("query", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("is_empty", sa.Boolean(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("stale_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index(
+        "idx_provider_response_cache_provider_kind",
+        "provider_response_cache",
+        ["provider", "kind"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_provider_response_cache_last_accessed",
+        "provider_response_cache",
+        ["last_accessed_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_provider_response_cache_stale_until",
+        "provider_response_cache",
+        ["stale_until"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the provider response cache table."""
+    op.drop_index(
+        "idx_provider_response_cache_stale_until",
+        table_name="provider_response_cache",
+    )
+    op.drop_index(
+        "idx_provider_response_cache_last_accessed",
+        table_name="provider_response_cache",
+    )
+    op.drop_index(
+        "idx_provider_response_cache_provider_kind",
+        table_name="provider_response_cache",
+    )
+    op.drop_table("provider_response_cache")
@@ -0,0 +1,46 @@
+"""add_bom_fields_to_component_provider_data
+
+Revision ID: f7c9d1e3a5b6
+Revises: e6b8c0d2f4a5
+Create Date: 2025-10-18 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c9d1e3a5b6"
+down_revision: str | None = "e6b8c0d2f4a5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add provider URL, availability and pricing to cached provider data.
+
+    BOM generation refreshes these from provider searches and reports them
+    per line (provider link, stock and unit cost).
+    """
+    op.add_column(
+        "component_provider_data",
+        sa.Column("provider_url", sa.String(length=1000), nullable=True),
+    )
+    op.add_column(
+        "component_provider_data",
+        sa.Column("availability", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "component_provider_data",
+        sa.Column("pricing", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop the BOM fields from cached provider data."""
+    with op.batch_alter_table("component_provider_data") as batch_op:
+        batch_op.drop_column("pricing")
+        batch_op.drop_column("availability")
+        batch_op.drop_column("provider_url")
@@ -0,0 +1,74 @@
+"""add_background_jobs
+
+Revision ID: a8d0e2f4b6c7
+Revises: f7c9d1e3a5b6
+Create Date: 2025-10-18 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d0e2f4b6c7"
+down_revision: str | None = "f7c9d1e3a5b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the background job queue table.
+
+    Resource downloads and EasyEDA conversions are persisted as jobs so they
+    run outside request handlers and survive restarts.
+    """
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=255), nullable=True),
+        sa.Column("host", sa.String(length=255), nullable=True),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("worker_id", sa.String(length=64), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "idempotency_key", name="uq_background_jobs_idempotency_key"
+        ),
+    )
+    op.create_index(
+        "idx_background_jobs_claim",
+        "background_jobs",
+        ["status", "priority", "run_after"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_background_jobs_kind",
+        "background_jobs",
+        ["kind"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the background job queue table."""
+    op.drop_index("idx_background_jobs_kind", table_name="background_jobs")
+    op.drop_index("idx_background_jobs_claim", table_name="background_jobs")
+    op.drop_table("background_jobs")
@@ -0,0 +1,125 @@
+"""add_blobs
+
+Revision ID: b9e1f3a5c7d8
+Revises: a8d0e2f4b6c7
+Create Date: 2025-10-18 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e1f3a5c7d8"
+down_revision: str | None = "a8d0e2f4b6c7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+REFERENCE_COLUMNS = {
+    "attachments": ["file_path"],
+    "resources": ["file_path"],
+    "kicad_library_data": [
+        "custom_symbol_file_path",
+        "custom_footprint_file_path",
+        "custom_3d_model_file_path",
+    ],
+}
+
+
+_HEX = "[0-9a-f]"
+
+
+def _sha(column: str) -> str:
+    directory = f"rtrim({column}, replace({column}, '/', ''))"
+    sha = f"substr({column}, length({directory}) + 1, 64)"
+    return (
+        f"CASE WHEN {directory} GLOB '*blobs/{_HEX}{_HEX}/{_HEX}{_HEX}/' "
+        f"AND length({sha}) = 64 AND {sha} NOT GLOB '*[^0-9a-f]*' "
+        f"THEN {sha} END"
+    )
+
+
+def _add_reference(column: str) -> str:
+    return f"""
+          INSERT INTO blobs (sha256, ref_count, updated_at)
+          SELECT {_sha(column)}, 1, CURRENT_TIMESTAMP
+          WHERE {_sha(column)} IS NOT NULL
+          ON CONFLICT (sha256) DO UPDATE SET
+            ref_count = ref_count + 1,
+            updated_at = CURRENT_TIMESTAMP;
+    """
+
+
+def _remove_reference(column: str) -> str:
+    return f"""
+          UPDATE blobs SET
+            ref_count = ref_count - 1,
+            updated_at = CURRENT_TIMESTAMP
+          WHERE sha256 = {_sha(column)};
+    """
+
+
+def upgrade() -> None:
+    """Add blob reference counts and the triggers maintaining them.
+
+    Attachments, resources and custom KiCad files now share one
+    content-addressed store; the counts tell garbage collection which blobs
+    are still referenced.
+    """
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+
+    for table, columns in REFERENCE_COLUMNS.items():
+        add_new = "".join(_add_reference(f"NEW.{column}") for column in columns)
+        remove_old = "".join(_remove_reference(f"OLD.{column}") for column in columns)
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_insert
+            AFTER INSERT ON {table}
+            FOR EACH ROW
+            BEGIN
+              {add_new}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_update
+            AFTER UPDATE OF {", ".join(columns)} ON {table}
+            FOR EACH ROW
+            BEGIN
+              {remove_old}
+              {add_new}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_delete
+            AFTER DELETE ON {table}
+            FOR EACH ROW
+            BEGIN
+              {remove_old}
+            END
+            """
+        )
+
+
+def downgrade() -> None:
+    """Drop blob reference triggers and table."""
+    for table in REFERENCE_COLUMNS:
+        for action in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS trigger_{table}_blobs_{action}")
+    op.drop_table("blobs")
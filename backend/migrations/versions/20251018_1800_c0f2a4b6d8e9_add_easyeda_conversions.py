@@ -0,0 +1,140 @@
+"""add_easyeda_conversions
+
+Revision ID: c0f2a4b6d8e9
+Revises: b9e1f3a5c7d8
+Create Date: 2025-10-18 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c0f2a4b6d8e9"
+down_revision: str | None = "b9e1f3a5c7d8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+KICAD_COLUMNS = [
+    "custom_symbol_file_path",
+    "custom_footprint_file_path",
+    "custom_3d_model_file_path",
+]
+
+CONVERSION_COLUMNS = [
+    "symbol_file_path",
+    "footprint_file_path",
+    "model_3d_file_path",
+]
+
+
+_HEX = "[0-9a-f]"
+
+
+def _sha(column: str) -> str:
+    directory = f"rtrim({column}, replace({column}, '/', ''))"
+    sha = f"substr({column}, length({directory}) + 1, 64)"
+    return (
+        f"CASE WHEN {directory} GLOB '*blobs/{_HEX}{_HEX}/{_HEX}{_HEX}/' "
+        f"AND length({sha}) = 64 AND {sha} NOT GLOB '*[^0-9a-f]*' "
+        f"THEN {sha} END"
+    )
+
+
+def _add_reference(column: str) -> str:
+    return f"""
+          INSERT INTO blobs (sha256, ref_count, updated_at)
+          SELECT {_sha(column)}, 1, CURRENT_TIMESTAMP
+          WHERE {_sha(column)} IS NOT NULL
+          ON CONFLICT (sha256) DO UPDATE SET
+            ref_count = ref_count + 1,
+            updated_at = CURRENT_TIMESTAMP;
+    """
+
+
+def _remove_reference(column: str) -> str:
+    return f"""
+          UPDATE blobs SET
+            ref_count = ref_count - 1,
+            updated_at = CURRENT_TIMESTAMP
+          WHERE sha256 = {_sha(column)};
+    """
+
+
+def _create_triggers(table: str, columns: list[str]) -> None:
+    add_new = "".join(_add_reference(f"NEW.{column}") for column in columns)
+    remove_old = "".join(_remove_reference(f"OLD.{column}") for column in columns)
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_insert
+        AFTER INSERT ON {table}
+        FOR EACH ROW
+        BEGIN
+          {add_new}
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_update
+        AFTER UPDATE OF {", ".join(columns)} ON {table}
+        FOR EACH ROW
+        BEGIN
+          {remove_old}
+          {add_new}
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_delete
+        AFTER DELETE ON {table}
+        FOR EACH ROW
+        BEGIN
+          {remove_old}
+        END
+        """
+    )
+
+
+def _drop_triggers(table: str) -> None:
+    for action in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_{table}_blobs_{action}")
+
+
+def upgrade() -> None:
+    """Add the EasyEDA conversion cache and count its blob references.
+
+    Converted symbols, footprints and 3D models are stored as blobs; the
+    cached paths and KiCad 3D model paths pointing at them are counted so
+    garbage collection keeps them.
+    """
+    op.create_table(
+        "easyeda_conversions",
+        sa.Column("lcsc_id", sa.String(length=20), nullable=False),
+        sa.Column("converter_version", sa.String(length=50), nullable=False),
+        sa.Column("component_info", sa.JSON(), nullable=True),
+        sa.Column("conversions", sa.JSON(), nullable=False),
+        sa.Column("symbol_file_path", sa.Text(), nullable=True),
+        sa.Column("footprint_file_path", sa.Text(), nullable=True),
+        sa.Column("model_3d_file_path", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("lcsc_id", "converter_version"),
+    )
+    _create_triggers("easyeda_conversions", CONVERSION_COLUMNS)
+
+    _drop_triggers("kicad_library_data")
+    _create_triggers("kicad_library_data", [*KICAD_COLUMNS, "model_3d_path"])
+
+
+def downgrade() -> None:
+    """Drop the EasyEDA conversion cache and stop counting 3D model paths."""
+    _drop_triggers("kicad_library_data")
+    _create_triggers("kicad_library_data", KICAD_COLUMNS)
+
+    _drop_triggers("easyeda_conversions")
+    op.drop_table("easyeda_conversions")
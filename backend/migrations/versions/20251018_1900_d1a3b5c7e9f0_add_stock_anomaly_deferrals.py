@@ -0,0 +1,49 @@
+"""add_stock_anomaly_deferrals
+
+Revision ID: d1a3b5c7e9f0
+Revises: c0f2a4b6d8e9
+Create Date: 2025-10-18 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d1a3b5c7e9f0"
+down_revision: str | None = "c0f2a4b6d8e9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add table for removals deferred until their component has a baseline."""
+    op.create_table(
+        "stock_anomaly_deferrals",
+        sa.Column("transaction_id", sa.String(), nullable=False),
+        sa.Column("component_id", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["transaction_id"], ["stock_transactions.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["component_id"], ["components.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("transaction_id"),
+    )
+    op.create_index(
+        op.f("ix_stock_anomaly_deferrals_component_id"),
+        "stock_anomaly_deferrals",
+        ["component_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the anomaly deferrals table."""
+    op.drop_index(
+        op.f("ix_stock_anomaly_deferrals_component_id"),
+        table_name="stock_anomaly_deferrals",
+    )
+    op.drop_table("stock_anomaly_deferrals")
@@ -7,6 +7,10 @@ Provides REST API for stock analytics and inventory insights:
 - GET /api/v1/analytics/forecast - Stock predictions with reorder suggestions
 - GET /api/v1/analytics/dashboard - Inventory KPIs and top lists
 - GET /api/v1/analytics/slow-moving-stock - Identify slow-moving/obsolete stock
+- POST /api/v1/analytics/exports/columnar - Incremental Parquet/Arrow ledger export
+- POST /api/v1/analytics/anomalies/scan - Flag outlier removals since last scan
+- GET /api/v1/analytics/anomalies - List flagged anomalies
+- POST /api/v1/analytics/anomalies/{anomaly_id}/acknowledge - Acknowledge anomaly
 
 All endpoints require admin authentication. Designed for Chart.js visualization
 in Vue.js frontend with comprehensive time-series and forecasting capabilities.
@@ -15,24 +19,33 @@ in Vue.js frontend with comprehensive time-series and forecasting capabilities.
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from ..auth.dependencies import require_admin
 from ..database import get_db
 from ..schemas.analytics import (
     AggregationPeriod,
+    AnomalyAcknowledgeRequest,
+    AnomalyListResponse,
+    AnomalyScanResponse,
+    AnomalyStatus,
+    ColumnarExportFormat,
+    ColumnarExportResponse,
     DashboardSummaryResponse,
     ForecastHorizon,
     ForecastResponse,
     InventorySummaryResponse,
     SlowMovingStockResponse,
+    StockAnomalyResponse,
     StockDistributionResponse,
     StockLevelsResponse,
     TopVelocityResponse,
     UsageTrendsResponse,
 )
 from ..services.analytics_service import AnalyticsService
+from ..services.anomaly_detection_service import AnomalyDetectionService
+from ..services.columnar_export_service import ColumnarExportService
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["Analytics"])
 
@@ -523,3 +536,193 @@ async def get_top_velocity(
         lookback_days=lookback_days,
         min_transactions=min_transactions,
     )
+
+
+# ==================== Columnar Export ====================
+
+
+@router.post(
+    "/exports/columnar",
+    response_model=ColumnarExportResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export ledger tables to Parquet/Arrow",
+    description=(
+        "Writes stock transactions, component locations and components added or "
+        "changed since the previous run into a month-partitioned Parquet or Arrow "
+        "dataset for BI tools. Intended to be triggered nightly."
+    ),
+)
+def export_columnar(
+    format: ColumnarExportFormat = Query(
+        ColumnarExportFormat.PARQUET, description="Output file format"
+    ),
+    full_refresh: bool = Query(
+        False, description="Ignore stored high-water marks and re-export everything"
+    ),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+) -> ColumnarExportResponse:
+    """
+    Run an incremental columnar export of the inventory ledger.
+
+    Only rows past each table's stored high-water mark are read, so repeated
+    runs append new partition files instead of rewriting the dataset.
+
+    **Admin-only operation.**
+
+    Args:
+        format: parquet (default) or arrow (Arrow IPC file)
+        full_refresh: Re-export all rows regardless of stored state
+        db: Database session (injected)
+        admin: Current admin user (injected)
+
+    Returns:
+        ColumnarExportResponse with per-table row counts and written files
+
+    Raises:
+        HTTPException 403: User is not admin
+        HTTPException 500: pyarrow is not installed
+
+    Example:
+        POST /api/v1/analytics/exports/columnar?format=parquet
+    """
+    service = ColumnarExportService(db)
+    try:
+        return service.export(export_format=format.value, full_refresh=full_refresh)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        ) from e
+
+
+# ==================== Anomaly Detection ====================
+
+
+@router.post(
+    "/anomalies/scan",
+    response_model=AnomalyScanResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Scan new removals for anomalies",
+    description=(
+        "Evaluates stock removals recorded since the previous scan against each "
+        "component's median/MAD of daily removals and flags outliers. "
+        "Intended to be run periodically (e.g. nightly)."
+    ),
+)
+def scan_anomalies(
+    lookback_days: int = Query(
+        90, ge=7, le=365, description="Days of history used for baselines"
+    ),
+    threshold: float = Query(
+        3.5, gt=0, description="Modified z-score above which removals are flagged"
+    ),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+) -> AnomalyScanResponse:
+    """
+    Run an incremental anomaly detection scan.
+
+    **Admin-only operation.**
+
+    Args:
+        lookback_days: Days of history used for each component's baseline
+        threshold: Modified z-score threshold (default 3.5)
+        db: Database session (injected)
+        admin: Current admin user (injected)
+
+    Returns:
+        AnomalyScanResponse with scanned and flagged counts
+
+    Raises:
+        HTTPException 403: User is not admin
+
+    Example:
+        POST /api/v1/analytics/anomalies/scan?lookback_days=90&threshold=3.5
+    """
+    service = AnomalyDetectionService(db)
+    return AnomalyScanResponse(
+        **service.run_scan(lookback_days=lookback_days, threshold=threshold)
+    )
+
+
+@router.get(
+    "/anomalies",
+    response_model=AnomalyListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="List flagged stock anomalies",
+)
+async def list_anomalies(
+    anomaly_status: AnomalyStatus | None = Query(
+        AnomalyStatus.OPEN, alias="status", description="Filter by review state"
+    ),
+    component_id: UUID | None = Query(None, description="Filter by component UUID"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+) -> AnomalyListResponse:
+    """
+    List flagged anomalies ordered by score (most extreme first).
+
+    **Admin-only operation.**
+
+    Args:
+        anomaly_status: Review state filter (default open)
+        component_id: Optional component UUID filter
+        limit: Maximum number of records (default 100, max 500)
+        db: Database session (injected)
+        admin: Current admin user (injected)
+
+    Returns:
+        AnomalyListResponse with anomalies and count
+
+    Raises:
+        HTTPException 403: User is not admin
+
+    Example:
+        GET /api/v1/analytics/anomalies?status=open
+    """
+    service = AnomalyDetectionService(db)
+    anomalies = service.list_anomalies(
+        status=anomaly_status.value if anomaly_status else None,
+        component_id=str(component_id) if component_id else None,
+        limit=limit,
+    )
+    return AnomalyListResponse(anomalies=anomalies, total_count=len(anomalies))
+
+
+@router.post(
+    "/anomalies/{anomaly_id}/acknowledge",
+    response_model=StockAnomalyResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Acknowledge a stock anomaly",
+)
+async def acknowledge_anomaly(
+    anomaly_id: int,
+    request: AnomalyAcknowledgeRequest,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+) -> StockAnomalyResponse:
+    """
+    Mark an open anomaly as reviewed.
+
+    **Admin-only operation.**
+
+    Args:
+        anomaly_id: Anomaly ID to acknowledge
+        request: Optional reviewer notes
+        db: Database session (injected)
+        admin: Current admin user (injected)
+
+    Returns:
+        StockAnomalyResponse with updated review state
+
+    Raises:
+        HTTPException 400: Anomaly already acknowledged
+        HTTPException 403: User is not admin
+        HTTPException 404: Anomaly not found
+    """
+    service = AnomalyDetectionService(db)
+    anomaly = service.acknowledge_anomaly(
+        anomaly_id, username=admin.get("username"), notes=request.notes
+    )
+    return StockAnomalyResponse(**anomaly)
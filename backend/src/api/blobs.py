@@ -0,0 +1,69 @@
+"""
+Blob store API endpoints.
+
+Provides endpoints for checking deduplicated storage usage, collecting
+unreferenced blobs and moving files from the old per-component layout into
+the blob store.
+"""
+
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, Query
+
+from ..auth.dependencies import require_admin, require_auth
+from ..services.blob_store import BLOB_GC_GRACE
+from ..services.file_storage import file_storage
+
+router = APIRouter(prefix="/api/v1/blobs", tags=["blobs"])
+
+
+@router.get("/stats")
+def get_blob_stats(_: dict = Depends(require_auth)):
+    """
+    Get blob store usage.
+
+    Returns:
+        Dictionary with blob and reference counts, bytes on disk and bytes
+        saved by deduplication
+    """
+    return file_storage.blobs.get_statistics()
+
+
+@router.post("/gc")
+def collect_blob_garbage(
+    grace_minutes: int = Query(
+        int(BLOB_GC_GRACE.total_seconds() // 60),
+        ge=0,
+        description="Keep unreferenced blobs younger than this",
+    ),
+    _: dict = Depends(require_admin),
+):
+    """
+    Delete blobs that no attachment, resource or KiCad file references.
+
+    Returns:
+        Dictionary with blobs_removed, bytes_freed and incoming_removed
+
+    Requires: Admin authentication
+    """
+    return file_storage.blobs.collect_garbage(timedelta(minutes=grace_minutes))
+
+
+@router.post("/adopt")
+def adopt_existing_files(_: dict = Depends(require_admin)):
+    """
+    Move files stored before the blob store into it, deduplicating them.
+
+    Reference counts are rebuilt afterwards. Run garbage collection to
+    reclaim any blobs left unreferenced.
+
+    Returns:
+        Dictionary with files_adopted, files_missing, bytes_saved and
+        referenced_blobs
+
+    Requires: Admin authentication
+    """
+    blobs = file_storage.blobs
+    result = blobs.adopt_existing_files(file_storage.base_path)
+    result["referenced_blobs"] = blobs.recount()
+    return result
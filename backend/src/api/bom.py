@@ -5,7 +5,8 @@ Provides endpoints for generating and exporting BOMs with provider integration.
 
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from ..services.bom_service import BOMExportFormat, BOMService
@@ -15,6 +16,14 @@ router = APIRouter(prefix="/api/v1/bom", tags=["bom"])
 # Initialize services
 bom_service = BOMService()
 
+# Download filename extension per export format
+EXPORT_EXTENSIONS = {
+    BOMExportFormat.CSV: ".csv",
+    BOMExportFormat.JSON: ".json",
+    BOMExportFormat.NDJSON: ".ndjson",
+    BOMExportFormat.KICAD: ".txt",
+}
+
 
 # Request/Response models
 class ProjectBOMRequest(BaseModel):
@@ -128,16 +137,10 @@ async def export_bom(
         filename = "bom"
         if request.project_id:
             filename = f"project_{request.project_id}_bom"
+        filename += EXPORT_EXTENSIONS.get(request.export_format, "")
 
-        if request.export_format == BOMExportFormat.CSV:
-            filename += ".csv"
-        elif request.export_format == BOMExportFormat.JSON:
-            filename += ".json"
-        elif request.export_format == BOMExportFormat.KICAD:
-            filename += ".txt"
-
-        return Response(
-            content=content,
+        return StreamingResponse(
+            content,
             media_type=mime_type,
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -184,11 +187,7 @@ async def export_project_bom(
     """Export project BOM in specified format (GET endpoint)"""
     try:
         # Validate export format
-        if export_format not in [
-            BOMExportFormat.CSV,
-            BOMExportFormat.JSON,
-            BOMExportFormat.KICAD,
-        ]:
+        if export_format not in EXPORT_EXTENSIONS:
             raise HTTPException(
                 status_code=400, detail=f"Unsupported export format: {export_format}"
             )
@@ -203,16 +202,10 @@ async def export_project_bom(
         content, mime_type = await bom_service.export_bom(bom_items, export_format)
 
         # Determine filename
-        filename = f"project_{project_id}_bom"
-        if export_format == BOMExportFormat.CSV:
-            filename += ".csv"
-        elif export_format == BOMExportFormat.JSON:
-            filename += ".json"
-        elif export_format == BOMExportFormat.KICAD:
-            filename += ".txt"
-
-        return Response(
-            content=content,
+        filename = f"project_{project_id}_bom{EXPORT_EXTENSIONS[export_format]}"
+
+        return StreamingResponse(
+            content,
             media_type=mime_type,
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -238,6 +231,11 @@ async def get_export_formats():
                 "label": "JSON",
                 "description": "Structured data format with metadata",
             },
+            {
+                "value": BOMExportFormat.NDJSON,
+                "label": "NDJSON",
+                "description": "Newline-delimited JSON, one item per line",
+            },
             {
                 "value": BOMExportFormat.KICAD,
                 "label": "KiCad BOM",
@@ -3,10 +3,13 @@ External integrations API endpoints.
 Provides endpoints for component providers, barcode scanning, KiCad export, and import functionality.
 """
 
+import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Response
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from ..services.import_service import ImportService
 from ..services.kicad_library import KiCadLibraryManager
@@ -38,6 +41,11 @@ class ProviderSkuSearchRequest(BaseModel):
     providers: list[str] | None = None
 
 
+class ProviderSkuBatchRequest(BaseModel):
+    provider_skus: list[str] = Field(..., min_length=1, max_length=1000)
+    providers: list[str] | None = None
+
+
 class UnifiedSearchRequest(BaseModel):
     query: str
     search_type: str | None = "auto"  # "auto", "part_number", "provider_sku"
@@ -110,6 +118,27 @@ async def search_components_by_provider_sku(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/providers/search-skus")
+async def search_components_by_provider_skus(
+    request: ProviderSkuBatchRequest,
+):
+    """
+    Resolve many provider SKUs (e.g. from a supplier order or KiCad BOM).
+
+    Streams newline-delimited JSON with one line per distinct SKU, in the
+    shape of /providers/search-sku plus a "cached" flag. Cached SKUs come
+    first; the rest follow as their lookups complete.
+    """
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for entry in provider_service.search_by_provider_skus(
+            request.provider_skus, providers=request.providers
+        ):
+            yield (json.dumps(entry, default=str) + "\n").encode("utf-8")
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/providers/unified-search")
 async def unified_component_search(
     request: UnifiedSearchRequest,
@@ -0,0 +1,155 @@
+"""
+Background job API endpoints.
+
+Provides endpoints for checking the status of queued resource downloads and
+EasyEDA conversions, and for retrying or cancelling them.
+"""
+
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..auth.dependencies import require_admin, require_auth
+from ..database import get_db
+from ..models.background_job import BackgroundJob
+from ..services.job_queue import cancel_job, get_job_queue, retry_job
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobResponse(BaseModel):
+    """Background job status response"""
+
+    id: int
+    kind: str
+    payload: dict[str, Any] | None = None
+    priority: int
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    idempotency_key: str | None = None
+    host: str | None = None
+    run_after: str | None = None
+    result: Any = None
+    error: str | None = None
+    created_at: str | None = None
+    started_at: str | None = None
+    finished_at: str | None = None
+
+
+@router.get("", response_model=list[JobResponse])
+async def list_jobs(
+    job_status: JobStatus | None = Query(None, alias="status"),
+    kind: str | None = Query(None, description="Filter by job kind"),
+    limit: int = Query(50, ge=1, le=500),
+    _: dict = Depends(require_auth),
+    db: Session = Depends(get_db),
+):
+    """
+    List background jobs, newest first.
+
+    Args:
+        status: Only jobs in this status
+        kind: Only jobs of this kind (e.g. "resource_download")
+        limit: Maximum number of jobs returned
+
+    Returns:
+        List of JobResponse
+    """
+    query = db.query(BackgroundJob)
+    if job_status:
+        query = query.filter(BackgroundJob.status == job_status)
+    if kind:
+        query = query.filter(BackgroundJob.kind == kind)
+    jobs = query.order_by(BackgroundJob.id.desc()).limit(limit).all()
+    return [job.to_dict() for job in jobs]
+
+
+@router.get("/stats")
+async def get_job_stats(_: dict = Depends(require_auth)):
+    """
+    Get job counts per status and worker state.
+
+    Returns:
+        Dictionary with per-status counts, worker count, active jobs and hosts
+    """
+    return get_job_queue().get_statistics()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    _: dict = Depends(require_auth),
+    db: Session = Depends(get_db),
+):
+    """
+    Get status, attempts and result of a background job.
+
+    Raises:
+        404: Job not found
+    """
+    job = db.get(BackgroundJob, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job.to_dict()
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+async def retry_background_job(
+    job_id: int,
+    _: dict = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a failed or cancelled job again.
+
+    Raises:
+        404: Job not found
+        409: Job is not failed or cancelled
+
+    Requires: Admin authentication
+    """
+    try:
+        job = retry_job(db, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job.to_dict()
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_background_job(
+    job_id: int,
+    _: dict = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Cancel a queued job.
+
+    Raises:
+        404: Job not found
+        409: Job is not queued
+
+    Requires: Admin authentication
+    """
+    try:
+        job = cancel_job(db, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job.to_dict()
@@ -3,7 +3,6 @@ KiCad integration API endpoints.
 Provides KiCad-specific endpoints for component search, symbol/footprint data, and library synchronization.
 """
 
-import shutil
 import uuid
 from pathlib import Path
 from typing import Any
@@ -23,6 +22,8 @@ from sqlalchemy.orm import Session
 from ..auth.dependencies import require_auth
 from ..database import get_db
 from ..services.component_service import ComponentService
+from ..services.file_storage import file_storage
+from ..services.job_queue import enqueue_job
 from ..services.kicad_library import KiCadLibraryManager
 from ..services.kicad_service import KiCadExportService
 
@@ -158,6 +159,8 @@ class LibrarySyncResponse(BaseModel):
     symbols_created: int = 0
     footprints_created: int = 0
     models_created: int = 0
+    components_unchanged: int = 0
+    components_removed: int = 0
     library_path: str = ""
     message: str = ""
 
@@ -403,6 +406,7 @@ def sync_kicad_libraries(
             include_symbols=request.include_symbols,
             include_footprints=request.include_footprints,
             include_3d_models=request.include_3d_models,
+            sync_mode="full" if request.force_update else request.sync_mode,
         )
 
         import uuid
@@ -433,6 +437,8 @@ def sync_kicad_libraries(
             symbols_created=sync_result.get("symbols_created", 0),
             footprints_created=sync_result.get("footprints_created", 0),
             models_created=sync_result.get("models_created", 0),
+            components_unchanged=sync_result.get("components_unchanged", 0),
+            components_removed=sync_result.get("components_removed", 0),
             library_path=library_path,
             message=f"Successfully synchronized {sync_result.get('components_exported', 0)} components to KiCad libraries",
             # Optional fields for advanced sync features
@@ -475,9 +481,6 @@ def get_kicad_field_mappings():
 
 
 # T144: Custom KiCad File Upload Endpoints
-# Configuration for custom file storage
-KICAD_CUSTOM_FILES_DIR = Path("custom_kicad_files")
-KICAD_CUSTOM_FILES_DIR.mkdir(exist_ok=True)
 
 
 def validate_kicad_file(file: UploadFile, expected_extension: str) -> bool:
@@ -505,22 +508,13 @@ def validate_kicad_file(file: UploadFile, expected_extension: str) -> bool:
 
 
 def save_custom_kicad_file(component_id: str, file: UploadFile, file_type: str) -> str:
-    """Save custom KiCad file and return the storage path."""
-    # Create component-specific directory
-    component_dir = KICAD_CUSTOM_FILES_DIR / component_id
-    component_dir.mkdir(exist_ok=True)
+    """Save custom KiCad file in the blob store and return the storage path.
 
-    # Generate unique filename with timestamp
-    timestamp = str(int(uuid.uuid4().time_low))
-    file_extension = Path(file.filename).suffix
-    filename = f"{file_type}_{timestamp}{file_extension}"
-    file_path = component_dir / filename
-
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    return str(file_path)
+    The extension is kept on the stored file, since KiCad picks the 3D model
+    loader by it. The same file uploaded for several components is stored once.
+    """
+    stored = file_storage.blobs.put_stream(file.file, Path(file.filename).suffix)
+    return str(stored.path)
 
 
 class CustomFileUploadResponse(BaseModel):
@@ -737,7 +731,7 @@ def reset_symbol_to_auto(
     Reset component symbol to auto-generated, removing custom override.
 
     This will revert to provider data if available, or auto-generated symbol.
-    The custom symbol file will be kept but no longer used.
+    The custom symbol file is garbage collected once nothing references it.
     """
     # Validate UUID format
     validate_uuid(component_id)
@@ -774,7 +768,7 @@ def reset_footprint_to_auto(
     Reset component footprint to auto-generated, removing custom override.
 
     This will revert to provider data if available, or auto-generated footprint.
-    The custom footprint file will be kept but no longer used.
+    The custom footprint file is garbage collected once nothing references it.
     """
     # Validate UUID format
     validate_uuid(component_id)
@@ -813,7 +807,7 @@ def reset_3d_model_to_auto(
     Reset component 3D model to auto-generated, removing custom override.
 
     This will revert to provider data if available, or auto-generated 3D model.
-    The custom 3D model file will be kept but no longer used.
+    The custom 3D model file is garbage collected once nothing references it.
     """
     # Validate UUID format
     validate_uuid(component_id)
@@ -888,6 +882,12 @@ class LCSCConversionResponse(BaseModel):
     message: str
     easyeda_data: dict[str, Any] | None = None
     conversion_result: dict[str, Any] | None = None
+    job_id: int | None = None
+
+
+# EasyEDA conversions run on the background job queue
+EASYEDA_JOB_HOST = "easyeda.com"
+EASYEDA_JOB_MAX_ATTEMPTS = 3
 
 
 @router.post("/lcsc/{lcsc_id}/convert", response_model=LCSCConversionResponse)
@@ -902,8 +902,9 @@ async def convert_lcsc_component(
     """
     Convert an LCSC component to KiCad format using EasyEDA data.
 
-    This endpoint fetches component data from EasyEDA and converts symbols,
-    footprints, and 3D models to KiCad format.
+    This endpoint fetches component data from EasyEDA. With include_files the
+    conversion of symbols, footprints, and 3D models to KiCad format is
+    queued as a background job; poll /api/v1/jobs/{job_id} for its result.
     """
     if not EASYEDA_API_AVAILABLE:
         raise HTTPException(
@@ -932,11 +933,25 @@ async def convert_lcsc_component(
                 conversion_result=None,
             )
 
-        # Convert to KiCad format if requested
-        conversion_result = None
+        # Queue conversion to KiCad format if requested
         if include_files:
-            conversion_result = await easyeda_service.convert_lcsc_component(
-                clean_lcsc_id
+            job = enqueue_job(
+                db,
+                "easyeda_conversion",
+                {"lcsc_id": clean_lcsc_id},
+                idempotency_key=f"easyeda_conversion:{clean_lcsc_id}",
+                host=EASYEDA_JOB_HOST,
+                max_attempts=EASYEDA_JOB_MAX_ATTEMPTS,
+            )
+            db.commit()
+
+            return LCSCConversionResponse(
+                success=True,
+                lcsc_id=clean_lcsc_id,
+                message=f"Conversion of component {clean_lcsc_id} queued",
+                easyeda_data=easyeda_data,
+                conversion_result=job.result,
+                job_id=job.id,
             )
 
         return LCSCConversionResponse(
@@ -944,7 +959,6 @@ async def convert_lcsc_component(
             lcsc_id=clean_lcsc_id,
             message=f"Successfully processed component {clean_lcsc_id}",
             easyeda_data=easyeda_data,
-            conversion_result=conversion_result,
         )
 
     except Exception as e:
@@ -1008,8 +1022,9 @@ async def convert_component_from_lcsc(
     """
     Convert an existing component using LCSC/EasyEDA data.
 
-    This endpoint attempts to find LCSC data for an existing component
-    and convert it to KiCad format using EasyEDA.
+    This endpoint attempts to find LCSC data for an existing component and
+    queues its conversion to KiCad format using EasyEDA as a background job;
+    poll /api/v1/jobs/{job_id} for the outcome.
     """
     if not EASYEDA_API_AVAILABLE:
         raise HTTPException(
@@ -1037,30 +1052,26 @@ async def convert_component_from_lcsc(
                 "component_name": component.name,
             }
 
-        # Convert using EasyEDA
-        easyeda_kicad_data = await component_service._try_easyeda_conversion(component)
-
-        if easyeda_kicad_data:
-            # Save the converted data
-            db.add(easyeda_kicad_data)
-            db.commit()
+        # Queue conversion using EasyEDA
+        job = enqueue_job(
+            db,
+            "easyeda_conversion",
+            {"lcsc_id": lcsc_id, "component_id": component_id},
+            idempotency_key=f"easyeda_conversion:component:{component_id}",
+            host=EASYEDA_JOB_HOST,
+            max_attempts=EASYEDA_JOB_MAX_ATTEMPTS,
+        )
+        db.commit()
 
-            return {
-                "success": True,
-                "message": f"Successfully converted component using LCSC data {lcsc_id}",
-                "component_id": component_id,
-                "component_name": component.name,
-                "lcsc_id": lcsc_id,
-                "kicad_data_created": True,
-            }
-        else:
-            return {
-                "success": False,
-                "message": f"Conversion failed for LCSC component {lcsc_id}",
-                "component_id": component_id,
-                "component_name": component.name,
-                "lcsc_id": lcsc_id,
-            }
+        return {
+            "success": True,
+            "message": f"Conversion using LCSC data {lcsc_id} queued",
+            "component_id": component_id,
+            "component_name": component.name,
+            "lcsc_id": lcsc_id,
+            "job_id": job.id,
+            "job_status": job.status,
+        }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
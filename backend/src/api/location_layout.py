@@ -5,7 +5,7 @@ Implements the OpenAPI specification for bulk location generation with
 preview and creation endpoints.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from ..auth.dependencies import require_auth
@@ -13,6 +13,7 @@ from ..database import get_db
 from ..schemas.location_layout import (
     BulkCreateResponse,
     LayoutConfiguration,
+    PreviewPageResponse,
     PreviewResponse,
 )
 from ..services.bulk_create_service import BulkCreateService
@@ -55,6 +56,41 @@ def generate_preview(
     return preview_service.generate_preview(config)
 
 
+@router.post(
+    "/generate-preview/names",
+    response_model=PreviewPageResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Page through generated storage location names",
+    description="""
+Return a page of the names a layout configuration would generate, in generation order.
+Names are computed by position, so any page of any size of layout is equally fast.
+No validation is performed and no locations are created.
+    """,
+)
+def generate_preview_page(
+    config: LayoutConfiguration,
+    offset: int = Query(0, ge=0, description="Position of the first name"),
+    limit: int = Query(100, ge=1, le=1000, description="Names per page"),
+    db: Session = Depends(get_db),
+) -> PreviewPageResponse:
+    """
+    Page through the names of a layout before creation.
+
+    Args:
+        config: Layout configuration with layout type, ranges, and separators
+        offset: Position of the first name to return
+        limit: Maximum number of names to return
+        db: Database session
+
+    Returns:
+        PreviewPageResponse with names, total count and has_more
+
+    No authentication required - preview is read-only and has no side effects.
+    """
+    preview_service = PreviewService(db)
+    return preview_service.generate_preview_page(config, offset=offset, limit=limit)
+
+
 @router.post(
     "/bulk-create-layout",
     response_model=BulkCreateResponse,
@@ -63,7 +99,8 @@ def generate_preview(
     description="""
 Create multiple storage locations based on layout configuration.
 All locations are created in a single transaction (all-or-nothing).
-Requires authentication. Maximum 500 locations per request.
+Requires authentication. Maximum 500 locations per request, or 50,000
+when the layout sets `high_volume`.
     """,
     responses={
         201: {"description": "Locations created successfully"},
@@ -85,7 +122,8 @@ def bulk_create_locations(
 
     FR-001: System MUST allow authenticated users to create storage locations.
     FR-007: System MUST prevent creation of locations with names that already exist.
-    FR-008: System MUST enforce maximum limit of 500 locations per bulk creation operation.
+    FR-008: System MUST enforce maximum limit of 500 locations per bulk creation operation
+            (50,000 for layouts with high_volume set).
     FR-014: System MUST allow users to assign all generated locations to an optional parent location.
     FR-015: System MUST allow users to mark generated locations as "single-part only" storage.
     FR-016: System MUST persist layout configuration with each created location for audit purposes.
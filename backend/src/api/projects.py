@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from ..auth.dependencies import require_admin
 from ..database import get_db
 from ..models import ProjectStatus
+from ..services.pick_list_service import PickListService
 from ..services.project_service import ProjectService
 
 router = APIRouter(prefix="/api/v1/projects", tags=["projects"])
@@ -125,6 +126,47 @@ class ProjectsListResponse(BaseModel):
     limit: int
 
 
+class PickLine(BaseModel):
+    """Quantity of one component taken at a stop."""
+
+    component_id: str
+    component_name: str
+    part_number: str | None
+    quantity: int
+
+
+class PickStopResponse(BaseModel):
+    """A location on the pick route."""
+
+    sequence: int
+    location_id: str
+    location_name: str
+    location_hierarchy: str
+    picks: list[PickLine]
+
+
+class PickShortage(BaseModel):
+    """Component that cannot be picked in full from current stock."""
+
+    component_id: str
+    component_name: str | None
+    part_number: str | None
+    required: int
+    available: int
+
+
+class PickListResponse(BaseModel):
+    """Ordered pick list for kitting a project."""
+
+    project_id: str
+    stops: list[PickStopResponse]
+    shortages: list[PickShortage]
+    total_lines: int
+    total_visits: int
+    route_cost: float
+    hierarchy_order_cost: float
+
+
 def validate_uuid(project_id: str) -> None:
     """Validate UUID format and raise 422 error if invalid."""
     try:
@@ -352,6 +394,23 @@ async def get_project_components(project_id: str, db: Session = Depends(get_db))
     return responses
 
 
+@router.get("/{project_id}/pick-list", response_model=PickListResponse)
+async def get_project_pick_list(project_id: str, db: Session = Depends(get_db)):
+    """
+    Get an ordered pick list for kitting a project.
+
+    Chooses a source location for each outstanding allocation (allocated minus
+    used) and orders the visits into a short round trip through the storage
+    hierarchy.
+    """
+    validate_uuid(project_id)
+
+    try:
+        return PickListService(db).build_project_pick_list(project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
 @router.get("/{project_id}/statistics", response_model=ProjectStatisticsResponse)
 async def get_project_statistics(project_id: str, db: Session = Depends(get_db)):
     """Get project statistics including component counts and costs."""
@@ -5,16 +5,18 @@ Provides dashboard statistics and comprehensive reporting functionality.
 Optimized with proper Pydantic response models and comprehensive error handling.
 """
 
-import json
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from ..auth.dependencies import require_auth
 from ..database import get_db
+from ..services.export_streaming import iter_csv, iter_json, iter_ndjson
 from ..services.report_service import ReportService
 
 router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
@@ -123,7 +125,7 @@ class ErrorResponse(BaseModel):
     description="Retrieve key metrics for the main dashboard including component statistics, project status, and activity metrics.",
 )
 async def get_dashboard_summary(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
 ) -> DashboardSummaryResponse:
     """Get key metrics for the main dashboard with comprehensive error handling."""
     report_service = ReportService(db)
@@ -155,7 +157,7 @@ async def get_dashboard_stats(db: Session = Depends(get_db)) -> DashboardStatsRe
     description="Get detailed inventory breakdown by categories, storage locations, and component types.",
 )
 async def get_inventory_breakdown(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
 ) -> InventoryBreakdownResponse:
     """Get detailed inventory breakdown by categories and locations with optimized queries."""
     report_service = ReportService(db)
@@ -228,8 +230,8 @@ async def get_comprehensive_report(
             f"comprehensive-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
         )
         headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
+        return StreamingResponse(
+            iter_json(report_data),
             media_type="application/json",
             headers=headers,
         )
@@ -240,7 +242,7 @@ async def get_comprehensive_report(
 
 @router.get("/export/inventory")
 async def export_inventory_report(
-    format: str = Query("json", description="Export format (json, csv)"),
+    format: str = Query("json", description="Export format (json, csv, ndjson)"),
     db: Session = Depends(get_db),
 ):
     """Export detailed inventory report."""
@@ -249,48 +251,26 @@ async def export_inventory_report(
 
     filename = f"inventory-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-
-        output = io.StringIO()
-
-        # Write category breakdown to CSV
-        if report_data.get("by_category"):
-            writer = csv.writer(output)
-            writer.writerow(
-                ["Category", "Component Count", "Total Quantity", "Total Value"]
-            )
-
-            for item in report_data["by_category"]:
-                writer.writerow(
-                    [
-                        item["category"],
-                        item["component_count"],
-                        item["total_quantity"],
-                        item["total_value"],
-                    ]
-                )
-
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
-        return Response(
-            content=output.getvalue(), media_type="text/csv", headers=headers
-        )
-    else:
-        # JSON format
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.json"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
-            media_type="application/json",
-            headers=headers,
-        )
+    # Tabular formats export the category breakdown
+    return _stream_report(
+        report_data,
+        format,
+        filename,
+        items=report_data.get("by_category") or [],
+        csv_header=["Category", "Component Count", "Total Quantity", "Total Value"],
+        csv_row=lambda item: [
+            item["category"],
+            item["component_count"],
+            item["total_quantity"],
+            item["total_value"],
+        ],
+    )
 
 
 @router.get("/export/usage")
 async def export_usage_report(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    format: str = Query("json", description="Export format (json, csv)"),
+    format: str = Query("json", description="Export format (json, csv, ndjson)"),
     db: Session = Depends(get_db),
 ):
     """Export component usage analytics report."""
@@ -299,54 +279,32 @@ async def export_usage_report(
 
     filename = f"usage-report-{days}days-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-
-        output = io.StringIO()
-
-        # Write most used components to CSV
-        if report_data.get("most_used_components"):
-            writer = csv.writer(output)
-            writer.writerow(
-                [
-                    "Component ID",
-                    "Part Number",
-                    "Name",
-                    "Transaction Count",
-                    "Total Quantity Moved",
-                ]
-            )
-
-            for item in report_data["most_used_components"]:
-                writer.writerow(
-                    [
-                        item["component_id"],
-                        item["part_number"],
-                        item["name"],
-                        item["transaction_count"],
-                        item["total_quantity_moved"],
-                    ]
-                )
-
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
-        return Response(
-            content=output.getvalue(), media_type="text/csv", headers=headers
-        )
-    else:
-        # JSON format
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.json"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
-            media_type="application/json",
-            headers=headers,
-        )
+    # Tabular formats export the most used components
+    return _stream_report(
+        report_data,
+        format,
+        filename,
+        items=report_data.get("most_used_components") or [],
+        csv_header=[
+            "Component ID",
+            "Part Number",
+            "Name",
+            "Transaction Count",
+            "Total Quantity Moved",
+        ],
+        csv_row=lambda item: [
+            item["component_id"],
+            item["part_number"],
+            item["name"],
+            item["transaction_count"],
+            item["total_quantity_moved"],
+        ],
+    )
 
 
 @router.get("/export/projects")
 async def export_project_report(
-    format: str = Query("json", description="Export format (json, csv)"),
+    format: str = Query("json", description="Export format (json, csv, ndjson)"),
     db: Session = Depends(get_db),
 ):
     """Export project analytics report."""
@@ -355,39 +313,21 @@ async def export_project_report(
 
     filename = f"project-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-
-        output = io.StringIO()
-
-        # Write project status distribution to CSV
-        if report_data.get("project_status_distribution"):
-            writer = csv.writer(output)
-            writer.writerow(["Status", "Count"])
-
-            for item in report_data["project_status_distribution"]:
-                writer.writerow([item["status"], item["count"]])
-
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
-        return Response(
-            content=output.getvalue(), media_type="text/csv", headers=headers
-        )
-    else:
-        # JSON format
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.json"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
-            media_type="application/json",
-            headers=headers,
-        )
+    # Tabular formats export the project status distribution
+    return _stream_report(
+        report_data,
+        format,
+        filename,
+        items=report_data.get("project_status_distribution") or [],
+        csv_header=["Status", "Count"],
+        csv_row=lambda item: [item["status"], item["count"]],
+    )
 
 
 @router.get("/export/financial")
 async def export_financial_report(
     months: int = Query(12, ge=1, le=60, description="Number of months to analyze"),
-    format: str = Query("json", description="Export format (json, csv)"),
+    format: str = Query("json", description="Export format (json, csv, ndjson)"),
     db: Session = Depends(get_db),
 ):
     """Export financial summary report."""
@@ -398,45 +338,25 @@ async def export_financial_report(
         f"financial-report-{months}months-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
     )
 
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-
-        output = io.StringIO()
-
-        # Write top value components to CSV
-        if report_data.get("top_value_components"):
-            writer = csv.writer(output)
-            writer.writerow(["Component ID", "Part Number", "Name", "Inventory Value"])
-
-            for item in report_data["top_value_components"]:
-                writer.writerow(
-                    [
-                        item["component_id"],
-                        item["part_number"],
-                        item["name"],
-                        item["inventory_value"],
-                    ]
-                )
-
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
-        return Response(
-            content=output.getvalue(), media_type="text/csv", headers=headers
-        )
-    else:
-        # JSON format
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.json"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
-            media_type="application/json",
-            headers=headers,
-        )
+    # Tabular formats export the top value components
+    return _stream_report(
+        report_data,
+        format,
+        filename,
+        items=report_data.get("top_value_components") or [],
+        csv_header=["Component ID", "Part Number", "Name", "Inventory Value"],
+        csv_row=lambda item: [
+            item["component_id"],
+            item["part_number"],
+            item["name"],
+            item["inventory_value"],
+        ],
+    )
 
 
 @router.get("/export/system-health")
 async def export_system_health_report(
-    format: str = Query("json", description="Export format (json, csv)"),
+    format: str = Query("json", description="Export format (json, csv, ndjson)"),
     db: Session = Depends(get_db),
 ):
     """Export system health metrics report."""
@@ -445,34 +365,50 @@ async def export_system_health_report(
 
     filename = f"system-health-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
-    if format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-
-        output = io.StringIO()
-
-        # Write database statistics to CSV
-        if report_data.get("database_statistics"):
-            writer = csv.writer(output)
-            writer.writerow(["Metric", "Value"])
+    # Tabular formats export the database statistics as metric/value pairs
+    stats = report_data.get("database_statistics") or {}
+    return _stream_report(
+        report_data,
+        format,
+        filename,
+        items=[
+            {"metric": key.replace("_", " ").title(), "value": value}
+            for key, value in stats.items()
+        ],
+        csv_header=["Metric", "Value"],
+        csv_row=lambda item: [item["metric"], item["value"]],
+    )
 
-            stats = report_data["database_statistics"]
-            for key, value in stats.items():
-                writer.writerow([key.replace("_", " ").title(), value])
 
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"'}
-        return Response(
-            content=output.getvalue(), media_type="text/csv", headers=headers
-        )
+def _stream_report(
+    report_data: dict[str, Any],
+    format: str,
+    filename: str,
+    items: list[dict[str, Any]],
+    csv_header: list[str],
+    csv_row: Callable[[dict[str, Any]], list[Any]],
+) -> StreamingResponse:
+    """
+    Stream a report export as a download.
+
+    CSV and NDJSON export the report's primary table (items); JSON exports
+    the whole report document. All formats are encoded incrementally.
+    """
+    if format == "csv":
+        content = iter_csv(csv_header, map(csv_row, items))
+        media_type = "text/csv"
+        extension = "csv"
+    elif format == "ndjson":
+        content = iter_ndjson(items)
+        media_type = "application/x-ndjson"
+        extension = "ndjson"
     else:
-        # JSON format
-        headers = {"Content-Disposition": f'attachment; filename="{filename}.json"'}
-        return Response(
-            content=json.dumps(report_data, indent=2, default=str),
-            media_type="application/json",
-            headers=headers,
-        )
+        content = iter_json(report_data)
+        media_type = "application/json"
+        extension = "json"
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    return StreamingResponse(content, media_type=media_type, headers=headers)
 
 
 # Admin-only detailed reports
@@ -7,7 +7,7 @@ to provider links.
 
 from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -102,7 +102,6 @@ async def get_resource_status(
 async def add_resource(
     link_id: int,
     resource_data: AddResourceRequest,
-    background_tasks: BackgroundTasks,
     _: dict = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
@@ -115,7 +114,6 @@ async def add_resource(
     Args:
         link_id: Provider link ID
         resource_data: Resource data (type, url, file_name)
-        background_tasks: FastAPI background tasks
 
     Returns:
         Created Resource
@@ -131,9 +129,7 @@ async def add_resource(
         data = resource_data.model_dump()
 
         # Add resource via service
-        resource = await ResourceService.add_resource(
-            db, link_id, data, background_tasks=background_tasks
-        )
+        resource = await ResourceService.add_resource(db, link_id, data)
 
         # Return resource response
         return {
@@ -1,14 +1,18 @@
 """
 Stock history API endpoints for paginated history and multi-format exports.
 
-Provides two endpoints:
+Provides per-component endpoints:
 - GET /api/v1/components/{id}/stock/history - Paginated history with sorting
-- GET /api/v1/components/{id}/stock/history/export - Export to CSV/Excel/JSON
+- GET /api/v1/components/{id}/stock/history/export - Streaming export to CSV/Excel/JSON/NDJSON
 
-All endpoints require authentication. Export endpoint requires admin privileges.
+And inventory-wide ledger endpoints:
+- GET /api/v1/stock/ledger - Filtered ledger with keyset (cursor) pagination
+- GET /api/v1/stock/ledger/export - Streaming export of the filtered ledger
+
+All endpoints require authentication. Export endpoints require admin privileges.
 """
 
-import io
+from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -17,9 +21,11 @@ from sqlalchemy.orm import Session
 
 from ..auth.dependencies import require_admin, require_auth
 from ..database import get_db
+from ..models import TransactionType
 from ..services.stock_history_service import StockHistoryService
 
 router = APIRouter(prefix="/api/v1/components", tags=["Stock History"])
+ledger_router = APIRouter(prefix="/api/v1/stock", tags=["Stock History"])
 
 
 @router.get(
@@ -90,25 +96,25 @@ async def get_stock_history(
             serialized_entries.append(
                 {
                     "id": txn.id,
-                    "created_at": txn.created_at.isoformat()
-                    if txn.created_at
-                    else None,
+                    "created_at": (
+                        txn.created_at.isoformat() if txn.created_at else None
+                    ),
                     "transaction_type": txn.transaction_type.value.upper(),
                     "quantity_change": txn.quantity_change,
                     "previous_quantity": txn.previous_quantity,
                     "new_quantity": txn.new_quantity,
                     "from_location_id": txn.from_location_id,
-                    "from_location_name": txn.from_location.name
-                    if txn.from_location
-                    else None,
+                    "from_location_name": (
+                        txn.from_location.name if txn.from_location else None
+                    ),
                     "to_location_id": txn.to_location_id,
-                    "to_location_name": txn.to_location.name
-                    if txn.to_location
-                    else None,
+                    "to_location_name": (
+                        txn.to_location.name if txn.to_location else None
+                    ),
                     "lot_id": txn.lot_id,
-                    "price_per_unit": float(txn.price_per_unit)
-                    if txn.price_per_unit
-                    else None,
+                    "price_per_unit": (
+                        float(txn.price_per_unit) if txn.price_per_unit else None
+                    ),
                     "total_price": float(txn.total_price) if txn.total_price else None,
                     "user_id": txn.user_id,
                     "user_name": txn.user_name,
@@ -138,8 +144,8 @@ async def export_stock_history(
     component_id: UUID,
     format: str = Query(
         ...,
-        pattern="^(csv|xlsx|json)$",
-        description="Export format (csv, xlsx, or json)",
+        pattern="^(csv|xlsx|json|ndjson)$",
+        description="Export format (csv, xlsx, json, or ndjson)",
     ),
     sort_by: str = Query(
         "created_at",
@@ -157,13 +163,14 @@ async def export_stock_history(
 
     Admin-only operation (per FR-059) that:
     - Exports ALL transaction history (no pagination)
-    - Supports CSV, Excel/XLSX, and JSON formats
+    - Supports CSV, Excel/XLSX, JSON and NDJSON formats
     - Includes proper headers and formatting per FR-043
-    - Returns streaming response with appropriate content-type headers
+    - Streams rows from the database as they are encoded, so large
+      histories start downloading immediately in constant memory
 
     Args:
         component_id: UUID of component
-        format: Export format (csv, xlsx, or json)
+        format: Export format (csv, xlsx, json, or ndjson)
         sort_by: Field to sort by (default created_at)
         sort_order: Sort order (default desc)
         db: Database session (injected)
@@ -174,6 +181,7 @@ async def export_stock_history(
             - CSV: text/csv content-type
             - Excel: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet
             - JSON: application/json
+            - NDJSON: application/x-ndjson (one entry per line)
             - Content-Disposition header with filename
 
     Raises:
@@ -185,37 +193,168 @@ async def export_stock_history(
     service = StockHistoryService(db)
 
     try:
-        result = service.export_history(
+        chunks, content_type, filename = service.export_history(
             component_id=str(component_id),
             export_format=format,
             sort_by=sort_by,
             sort_order=sort_order,
         )
 
-        if result is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Component not found",
-            )
+        return StreamingResponse(
+            chunks,
+            media_type=content_type,
+            headers={
+                "Content-Type": content_type,  # Explicit header to prevent charset=utf-8 addition
+                "Content-Disposition": f"attachment; filename={filename}",
+            },
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export stock history: {str(e)}",
+        )
+
+
+@ledger_router.get(
+    "/ledger",
+    status_code=status.HTTP_200_OK,
+)
+async def get_stock_ledger(
+    start_date: datetime | None = Query(
+        None, description="Only include transactions at or after this time"
+    ),
+    end_date: datetime | None = Query(
+        None, description="Only include transactions before this time"
+    ),
+    component_id: UUID | None = Query(None, description="Filter by component"),
+    user_id: str | None = Query(None, description="Filter by user who performed it"),
+    location_id: UUID | None = Query(
+        None, description="Filter by source or destination storage location"
+    ),
+    lot_id: str | None = Query(None, description="Filter by lot/batch identifier"),
+    transaction_type: TransactionType | None = Query(
+        None, description="Filter by transaction type"
+    ),
+    sort_order: str = Query(
+        "desc", pattern="^(asc|desc)$", description="Chronological sort order"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Entries per page"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(
+        False, description="Include COUNT(*) of all matching entries"
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_auth),
+):
+    """
+    Get the inventory-wide stock transaction ledger.
+
+    Authenticated operation for auditing that:
+    - Filters by date range, component, user, location, lot and transaction type
+    - Pages with an opaque cursor (keyset pagination), so deep pages stay fast
+    - Optionally returns the total match count via COUNT(*)
+
+    Returns:
+        JSON response with:
+            - entries: Ledger entries (history entry fields plus component name/part number)
+            - next_cursor: Cursor for the next page, or null on the last page
+            - has_more: Whether another page exists
+            - total_entries: Only when include_total=true
+
+    Raises:
+        HTTPException 401: User is not authenticated
+        HTTPException 400: Invalid date range or cursor
+    """
+    service = StockHistoryService(db)
+
+    try:
+        return service.get_ledger(
+            start_date=start_date,
+            end_date=end_date,
+            component_id=str(component_id) if component_id else None,
+            user_id=user_id,
+            location_id=str(location_id) if location_id else None,
+            lot_id=lot_id,
+            transaction_type=transaction_type,
+            sort_order=sort_order,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve stock ledger: {str(e)}",
+        )
+
+
+@ledger_router.get(
+    "/ledger/export",
+    status_code=status.HTTP_200_OK,
+)
+async def export_stock_ledger(
+    format: str = Query(
+        ...,
+        pattern="^(csv|xlsx|json|ndjson)$",
+        description="Export format (csv, xlsx, json, or ndjson)",
+    ),
+    start_date: datetime | None = Query(
+        None, description="Only include transactions at or after this time"
+    ),
+    end_date: datetime | None = Query(
+        None, description="Only include transactions before this time"
+    ),
+    component_id: UUID | None = Query(None, description="Filter by component"),
+    user_id: str | None = Query(None, description="Filter by user who performed it"),
+    location_id: UUID | None = Query(
+        None, description="Filter by source or destination storage location"
+    ),
+    lot_id: str | None = Query(None, description="Filter by lot/batch identifier"),
+    transaction_type: TransactionType | None = Query(
+        None, description="Filter by transaction type"
+    ),
+    sort_order: str = Query(
+        "desc", pattern="^(asc|desc)$", description="Chronological sort order"
+    ),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+):
+    """
+    Stream an export of the filtered inventory-wide ledger.
 
-        content, content_type, filename = result
+    Admin-only operation (as per-component exports, FR-059) accepting the
+    same filters as GET /ledger. Rows are streamed from the database as they
+    are encoded, so whole-ledger exports run in constant memory.
 
-        # Create appropriate stream based on content type
-        if isinstance(content, bytes):
-            # XLSX format (binary)
-            stream = io.BytesIO(content)
-        else:
-            # CSV or JSON format (text)
-            stream = io.BytesIO(content.encode("utf-8"))
+    Raises:
+        HTTPException 401: User is not authenticated
+        HTTPException 403: User is not admin
+        HTTPException 400: Invalid format or date range
+    """
+    service = StockHistoryService(db)
 
-        # Ensure stream is at beginning before reading
-        stream.seek(0)
+    try:
+        chunks, content_type, filename = service.export_ledger(
+            export_format=format,
+            start_date=start_date,
+            end_date=end_date,
+            component_id=str(component_id) if component_id else None,
+            user_id=user_id,
+            location_id=str(location_id) if location_id else None,
+            lot_id=lot_id,
+            transaction_type=transaction_type,
+            sort_order=sort_order,
+        )
 
         return StreamingResponse(
-            stream,
+            chunks,
             media_type=content_type,
             headers={
-                "Content-Type": content_type,  # Explicit header to prevent charset=utf-8 addition
+                "Content-Type": content_type,
                 "Content-Disposition": f"attachment; filename={filename}",
             },
         )
@@ -224,5 +363,5 @@ async def export_stock_history(
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export stock history: {str(e)}",
+            detail=f"Failed to export stock ledger: {str(e)}",
         )
@@ -0,0 +1,66 @@
+"""
+Stock-take (cycle count) API endpoint.
+
+Provides:
+- POST /api/v1/stock/stock-take - Reconcile counted quantities in one batch
+
+Admin-only. All adjustments of a stock-take are written in one transaction
+as ADJUST StockTransactions sharing a batch_id, which can be used to find
+them in the stock ledger.
+"""
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from ..auth.dependencies import require_admin
+from ..database import get_db
+from ..schemas.stock_operations import StockTakeRequest, StockTakeResponse
+from ..services.stock_take_service import StockTakeService
+
+router = APIRouter(prefix="/api/v1/stock", tags=["Stock Operations"])
+
+
+@router.post(
+    "/stock-take",
+    response_model=StockTakeResponse,
+    status_code=status.HTTP_200_OK,
+)
+def reconcile_stock_take(
+    request: StockTakeRequest,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(require_admin),
+) -> StockTakeResponse:
+    """
+    Reconcile a stock-take against recorded inventory.
+
+    Admin-only operation that:
+    - Diffs every counted (location, component) against ComponentLocation
+    - Updates, creates or deletes (counted zero) ComponentLocation entries
+    - Records one ADJUST StockTransaction per variance, sharing a batch_id
+    - Applies everything in a single transaction (or nothing with dry_run)
+
+    Args:
+        request: Counted lines and reconciliation options
+        db: Database session (injected)
+        admin: Current admin user (injected)
+
+    Returns:
+        StockTakeResponse with the variance report
+
+    Raises:
+        HTTPException 403: User is not admin
+        HTTPException 404: Unknown location or component IDs
+        HTTPException 422: Invalid lines (validation errors)
+    """
+    service = StockTakeService(db)
+    result = service.reconcile(
+        lines=[
+            (str(line.location_id), str(line.component_id), line.counted_quantity)
+            for line in request.lines
+        ],
+        user=admin,
+        complete_locations=request.complete_locations,
+        dry_run=request.dry_run,
+        comments=request.comments,
+    )
+    return StockTakeResponse(**result)
@@ -2,10 +2,12 @@
 Storage locations API endpoints implementing the OpenAPI specification.
 """
 
+import hashlib
+import string
 import uuid
 from enum import Enum
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -13,6 +15,7 @@ from sqlalchemy.orm import Session
 from ..auth.dependencies import require_auth
 from ..constants import StorageLocationType
 from ..database import get_db
+from ..services.label_sheet_service import LabelSheetService
 from ..services.storage_service import StorageLocationService
 
 
@@ -102,6 +105,34 @@ class StorageLocationResponse(StorageLocationBase):
         from_attributes = True
 
 
+class LocationOccupancy(BaseModel):
+    id: str
+    name: str
+    type: str
+    parent_id: str | None = None
+    location_hierarchy: str
+    part_count: int = Field(..., description="Components stored directly here")
+    total_quantity: int = Field(..., description="Units stored directly here")
+    total_value: float = Field(..., description="Value of stock stored directly here")
+    subtree_part_count: int = Field(..., description="Components in the subtree")
+    subtree_quantity: int = Field(..., description="Units in the subtree")
+    subtree_value: float = Field(..., description="Value of stock in the subtree")
+    subtree_locations: int = Field(
+        ..., description="Locations in the subtree, including this one"
+    )
+    occupied_locations: int = Field(
+        ..., description="Locations in the subtree holding stock"
+    )
+    fill_ratio: float = Field(
+        ..., description="occupied_locations / subtree_locations (0-1)"
+    )
+
+
+class OccupancyResponse(BaseModel):
+    locations: list[LocationOccupancy]
+    total_locations: int
+
+
 class BulkCreateLocation(BaseModel):
     name: str = Field(
         ..., min_length=1, max_length=100, description="Storage location name"
@@ -130,6 +161,13 @@ class BulkCreateRequest(BaseModel):
     locations: list[BulkCreateLocation]
 
 
+class LabelFormat(str, Enum):
+    """Label sheet output formats."""
+
+    PDF = "pdf"
+    PNG = "png"
+
+
 # Layout generation schemas for location layout generator feature
 class LayoutType(str, Enum):
     """Type of layout for location generation."""
@@ -171,8 +209,8 @@ class RangeSpecification(BaseModel):
         range_type = data.get("range_type")
 
         if range_type == RangeType.LETTERS:
-            if not isinstance(v, str) or len(v) != 1 or not v.isalpha():
-                raise ValueError("Letters range must be single alphabetic character")
+            if not isinstance(v, str) or len(v) != 1 or v not in string.ascii_letters:
+                raise ValueError("Letters range must be a single letter a-z")
         elif range_type == RangeType.NUMBERS:
             if not isinstance(v, int) or v < 0 or v > 999:
                 raise ValueError("Numbers range must be integer between 0 and 999")
@@ -226,6 +264,10 @@ class LayoutConfiguration(BaseModel):
     single_part_only: bool = Field(
         False, description="Whether locations can hold only one part"
     )
+    high_volume: bool = Field(
+        False,
+        description="Opt in to high-volume generation (up to 50,000 locations)",
+    )
 
     @field_validator("ranges")
     @classmethod
@@ -494,6 +536,42 @@ def bulk_create_storage_locations(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/occupancy", response_model=OccupancyResponse)
+def get_location_occupancy(
+    request: Request,
+    response: Response,
+    root_id: str | None = Query(None, description="Only include this subtree"),
+    type: StorageLocationType | None = Query(
+        None, description="Filter by location type"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Occupancy heatmap data: per-location part count, quantity, value and fill
+    ratio, with rollups over each location's subtree.
+
+    Responses carry an ETag of their content; clients that send it back in
+    If-None-Match get 304 Not Modified while nothing has changed.
+    """
+    service = StorageLocationService(db)
+
+    if root_id and not service.get_storage_location(root_id):
+        raise HTTPException(status_code=404, detail="Storage location not found")
+
+    locations = service.get_occupancy(
+        root_id=root_id, location_type=type.value if type else None
+    )
+    result = OccupancyResponse(locations=locations, total_locations=len(locations))
+
+    etag = f'"{hashlib.sha256(result.model_dump_json().encode()).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return result
+
+
 @router.get("/{location_id}", response_model=StorageLocationResponse)
 def get_storage_location(
     location_id: str,
@@ -634,6 +712,7 @@ def get_location_components(
     ),
     search: str | None = Query(None, description="Search in component names"),
     category: str | None = Query(None, description="Filter by category"),
+    category_id: str | None = Query(None, description="Filter by category ID"),
     component_type: str | None = Query(None, description="Filter by component type"),
     stock_status: str | None = Query(
         None, pattern="^(low|out|available)$", description="Filter by stock status"
@@ -662,6 +741,7 @@ def get_location_components(
         include_children=include_children,
         search=search,
         category=category,
+        category_id=category_id,
         component_type=component_type,
         stock_status=stock_status,
         sort_by=sort_by,
@@ -673,16 +753,14 @@ def get_location_components(
     # Convert to response format (similar to components API)
     result = []
     for component in components:
-        # Get the ComponentLocation record for this specific location
-        from ..models import ComponentLocation
-
-        component_location = (
-            db.query(ComponentLocation)
-            .filter(
-                ComponentLocation.component_id == component.id,
-                ComponentLocation.storage_location_id == location_id,
-            )
-            .first()
+        # The ComponentLocation record for this specific location (preloaded)
+        component_location = next(
+            (
+                entry
+                for entry in component.locations
+                if entry.storage_location_id == location_id
+            ),
+            None,
         )
 
         # Use location-specific quantities if available, otherwise use component totals
@@ -715,6 +793,79 @@ def get_location_components(
     return result
 
 
+def _label_sheet_response(
+    service: LabelSheetService, specs: list, format: LabelFormat, page: int
+) -> Response:
+    """Render label specs and wrap the sheet in a download response."""
+    try:
+        sheet = service.render_sheet(specs, output_format=format.value, page=page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return Response(
+        content=sheet.content,
+        media_type=sheet.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="labels.{format.value}"',
+            "X-Total-Pages": str(sheet.page_count),
+            "X-Label-Count": str(sheet.label_count),
+        },
+    )
+
+
+@router.get("/{location_id}/labels")
+def get_location_labels(
+    location_id: str,
+    format: LabelFormat = Query(LabelFormat.PDF, description="pdf or png"),
+    page: int = Query(1, ge=1, description="Page to render (PNG only)"),
+    current_user=Depends(require_auth),
+    db: Session = Depends(get_db),
+):
+    """
+    Print QR labels for a location and everything below it.
+
+    PDF output contains every page; PNG output is one page, selected with
+    `page`. The X-Total-Pages header reports the sheet's page count.
+    """
+    try:
+        uuid.UUID(location_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid location ID format")
+
+    service = LabelSheetService(db)
+    try:
+        specs = service.subtree_labels(location_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Storage location not found")
+
+    return _label_sheet_response(service, specs, format, page)
+
+
+@router.post("/labels")
+def get_layout_labels(
+    config: LayoutConfiguration,
+    format: LabelFormat = Query(LabelFormat.PDF, description="pdf or png"),
+    page: int = Query(1, ge=1, description="Page to render (PNG only)"),
+    current_user=Depends(require_auth),
+    db: Session = Depends(get_db),
+):
+    """
+    Print QR labels for the locations created from a layout configuration,
+    in the order the layout generates them.
+
+    Returns 400 if any location of the layout has not been created yet.
+    """
+    service = LabelSheetService(db)
+    try:
+        specs = service.layout_labels(config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _label_sheet_response(service, specs, format, page)
+
+
 # Layout generation endpoints
 @router.post("/generate-preview", response_model=PreviewResponse)
 def generate_preview(
@@ -7,7 +7,7 @@ and wizard-based component creation with provider links and resources.
 
 from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -180,7 +180,6 @@ async def search_tags(
 @router.post("/components", status_code=status.HTTP_201_CREATED)
 async def create_component(
     component_data: CreateComponentRequest,
-    background_tasks: BackgroundTasks,
     _: dict = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
@@ -195,7 +194,6 @@ async def create_component(
 
     Args:
         component_data: Component creation data including provider link and resources
-        background_tasks: FastAPI background tasks for async downloads
 
     Returns:
         Created Component with relationships loaded
@@ -218,9 +216,7 @@ async def create_component(
         logger.info(f"[WIZARD] Specifications received: {data.get('specifications')}")
 
         # Create component via service
-        component = await WizardService.create_component(
-            db, data, background_tasks=background_tasks
-        )
+        component = await WizardService.create_component(db, data)
 
         # Return component response
         # Note: We need to format the response according to ComponentResponse schema
@@ -3,10 +3,14 @@ Database configuration and session management for PartsHub backend.
 """
 
 import os
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
 
-from sqlalchemy import MetaData, create_engine, event
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import Engine, MetaData, create_engine, event
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Support environment variable override for database URL
 # Use ../data to go up from backend/ to project root
@@ -91,6 +95,92 @@ def get_session():
     return SessionLocal()
 
 
+# Connection arguments of the dedicated writer connections
+WRITER_CONNECT_ARGS = {
+    "check_same_thread": False,
+    "timeout": 30,
+    "isolation_level": None,
+}
+
+# Writer engines, per engine whose StaticPool connection is shared
+_writer_engines: "weakref.WeakKeyDictionary[Engine, Engine]" = (
+    weakref.WeakKeyDictionary()
+)
+_writer_engines_lock = threading.Lock()
+
+
+def _writer_engine(bind: Engine) -> Engine | None:
+    """
+    Engine handing out a connection of its own, or None if there is none.
+
+    StaticPool shares one DBAPI connection between every session, so a
+    commit() from any of them would end another's transaction. File
+    databases get a NullPool engine opening a fresh connection per
+    transaction; an in-memory database exists on its single connection only.
+    """
+    if not isinstance(bind.pool, StaticPool):
+        # Every checkout is a connection of its own
+        return bind
+    if bind.url.database in (None, "", ":memory:"):
+        return None
+    with _writer_engines_lock:
+        writer = _writer_engines.get(bind)
+        if writer is None:
+            writer = create_engine(
+                bind.url, connect_args=WRITER_CONNECT_ARGS, poolclass=NullPool
+            )
+            event.listen(writer, "connect", set_sqlite_pragma)
+            _writer_engines[bind] = writer
+        return writer
+
+
+@contextmanager
+def write_transaction(session: Session) -> Iterator[Session]:
+    """
+    Run a block of writes as one transaction on a connection of its own.
+
+    The engine runs SQLite in autocommit mode over a single shared
+    connection (StaticPool), so statements on the request's session commit
+    on their own, and a commit() from any other session would end an
+    explicit transaction early. The yielded session is bound to a separate
+    connection in BEGIN IMMEDIATE: it is committed when the block exits and
+    rolled back if it raises, whatever other sessions do meanwhile. Other
+    writers wait for the commit (busy timeout) instead of interleaving.
+
+    An in-memory database (tests) has no second connection, so the given
+    session's own connection is used instead.
+
+    Args:
+        session: Session whose engine the writes go to
+
+    Yields:
+        Session to read and write through inside the transaction
+    """
+    engine = _writer_engine(session.get_bind())
+    if engine is None:
+        with _immediate(session):
+            yield session
+        return
+
+    with Session(bind=engine, autoflush=False) as writer:
+        with _immediate(writer):
+            yield writer
+
+
+@contextmanager
+def _immediate(session: Session) -> Iterator[None]:
+    """BEGIN IMMEDIATE on the session's connection; commit or roll back on exit."""
+    connection = session.connection()
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        session.rollback()
+        raise
+    session.commit()
+
+
 # Database health check utility
 def check_database_health():
     """Check if database is accessible and properly configured."""
@@ -50,6 +50,10 @@ def create_search_indexes(session: Session) -> None:
         "CREATE INDEX IF NOT EXISTS idx_stock_transactions_component_id ON stock_transactions(component_id)",
         "CREATE INDEX IF NOT EXISTS idx_stock_transactions_created_at ON stock_transactions(created_at)",
         "CREATE INDEX IF NOT EXISTS idx_stock_transactions_transaction_type ON stock_transactions(transaction_type)",
+        # Ledger indexes for inventory-wide history filtering and keyset pagination
+        # (lot_id is indexed by the model/migration as ix_stock_transactions_lot_id)
+        "CREATE INDEX IF NOT EXISTS idx_stock_transactions_created_component ON stock_transactions(created_at, component_id)",
+        "CREATE INDEX IF NOT EXISTS idx_stock_transactions_user_created ON stock_transactions(user_id, created_at)",
         # Project component allocation indexes
         "CREATE INDEX IF NOT EXISTS idx_project_components_project_id ON project_components(project_id)",
         "CREATE INDEX IF NOT EXISTS idx_project_components_component_id ON project_components(component_id)",
@@ -223,6 +227,8 @@ def drop_search_indexes(session: Session) -> None:
         "DROP INDEX IF EXISTS idx_stock_transactions_component_id",
         "DROP INDEX IF EXISTS idx_stock_transactions_created_at",
         "DROP INDEX IF EXISTS idx_stock_transactions_transaction_type",
+        "DROP INDEX IF EXISTS idx_stock_transactions_created_component",
+        "DROP INDEX IF EXISTS idx_stock_transactions_user_created",
         "DROP INDEX IF EXISTS idx_project_components_project_id",
         "DROP INDEX IF EXISTS idx_project_components_component_id",
         "DROP INDEX IF EXISTS idx_attachments_component_id",
@@ -5,8 +5,9 @@ Enables fast search across component names, part numbers, manufacturers, and not
 
 import logging
 
-from sqlalchemy import text
+from sqlalchemy import String, text
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import TextualSelect
 
 from ..database import get_session
 
@@ -237,6 +238,31 @@ class ComponentSearchService:
             if close_session:
                 session.close()
 
+    def matching_ids_query(
+        self, query: str, session: Session | None = None
+    ) -> TextualSelect:
+        """
+        Build a subquery selecting the IDs of components matching query.
+
+        Unlike search_components, nothing is executed and no limit applies:
+        the result is meant to be embedded in a larger statement, e.g.
+        Component.id.in_(...), so filtering, sorting and pagination happen
+        in one query.
+
+        Args:
+            query: Search query (escaped like search_components)
+            session: Database session used to make sure the FTS table exists
+
+        Returns:
+            Selectable with a single id column
+        """
+        self._ensure_fts_table(session)
+        return (
+            text(f"SELECT id FROM {self.fts_table} WHERE {self.fts_table} MATCH :q")
+            .bindparams(q=self._escape_fts_query(query.strip()))
+            .columns(id=String)
+        )
+
     def _escape_fts_query(self, query: str) -> str:
         """
         Escape special FTS5 characters and prepare query for search.
@@ -489,6 +515,20 @@ def search_components_fts(
     )
 
 
+def fts_matching_ids_query(query: str, session: Session | None = None) -> TextualSelect:
+    """
+    Convenience function for an FTS subquery of matching component IDs.
+
+    Args:
+        query: Search query
+        session: Database session to use (creates new one if None)
+
+    Returns:
+        Selectable with a single id column, for use in IN (...) filters
+    """
+    return get_component_search_service().matching_ids_query(query, session)
+
+
 def hybrid_search_components(
     query: str,
     session: Session | None = None,
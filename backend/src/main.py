@@ -16,6 +16,7 @@ from fastapi.responses import JSONResponse
 from .api.analytics import router as analytics_router
 from .api.attachments import router as attachments_router
 from .api.auth import router as auth_router
+from .api.blobs import router as blobs_router
 from .api.bom import router as bom_router
 from .api.bulk_operations import router as bulk_operations_router
 from .api.categories import router as categories_router
@@ -23,6 +24,7 @@ from .api.categories import router as categories_router
 # Import API routers
 from .api.components import router as components_router
 from .api.integrations import router as integrations_router
+from .api.jobs import router as jobs_router
 from .api.kicad import router as kicad_router
 from .api.location_layout import router as location_layout_router
 from .api.projects import router as projects_router
@@ -31,8 +33,10 @@ from .api.reorder_alerts import router as reorder_alerts_router
 from .api.reports import router as reports_router
 from .api.resources import router as resources_router
 from .api.saved_searches import router as saved_searches_router
+from .api.stock_history import ledger_router as stock_ledger_router
 from .api.stock_history import router as stock_history_router
 from .api.stock_operations import router as stock_operations_router
+from .api.stock_take import router as stock_take_router
 from .api.storage import router as storage_router
 from .api.tags import router as tags_router
 from .api.wizard import router as wizard_router
@@ -40,6 +44,11 @@ from .auth.admin import ensure_admin_exists
 
 # Import for startup events
 from .database import get_db
+from .services.browser_pool import close_browser_pool
+from .services.easyeda_cache import shutdown_conversion_cache
+from .services.http_client import close_http_client, open_http_client
+from .services.job_queue import start_job_queue, stop_job_queue
+from .services.label_sheet_service import shutdown_label_pool
 
 
 @asynccontextmanager
@@ -102,10 +111,20 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
+    # Shared HTTP connection pool for provider lookups and downloads
+    await open_http_client()
+
+    # Workers for queued resource downloads and EasyEDA conversions
+    await start_job_queue()
+
     yield
 
-    # Shutdown (if needed)
-    # Add any cleanup code here
+    # Shutdown
+    await stop_job_queue()
+    shutdown_conversion_cache()
+    shutdown_label_pool()
+    await close_browser_pool()
+    await close_http_client()
 
 
 # Get version from pyproject.toml
@@ -197,12 +216,16 @@ app.include_router(bom_router)
 app.include_router(categories_router)
 app.include_router(bulk_operations_router)
 app.include_router(stock_operations_router)
+app.include_router(stock_take_router)
 app.include_router(stock_history_router)
+app.include_router(stock_ledger_router)
 app.include_router(reorder_alerts_router)
 app.include_router(analytics_router)
 app.include_router(providers_router)
 app.include_router(wizard_router)
 app.include_router(resources_router)
+app.include_router(jobs_router)
+app.include_router(blobs_router)
 app.include_router(saved_searches_router)
 
 
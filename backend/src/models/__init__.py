@@ -8,24 +8,29 @@ Imports all models to ensure proper SQLAlchemy relationship initialization.
 from ..database import Base
 from .api_token import APIToken
 from .attachment import Attachment
+from .background_job import BackgroundJob
+from .blob import Blob
 from .category import Category
 
 # Import all models to ensure they are registered with SQLAlchemy
 from .component import Component
-from .component_location import ComponentLocation
+from .component_location import ComponentLocation, ComponentStockTotal
 from .custom_field import CustomField, CustomFieldValue, FieldType
+from .easyeda_conversion import EasyEDAConversion
 from .kicad_data import KiCadLibraryData
 from .meta_part import MetaPart, MetaPartComponent
 from .project import Project, ProjectComponent, ProjectStatus
 from .provider import ComponentDataProvider
+from .provider_cache import ProviderResponseCache
 from .provider_data import ComponentProviderData
 from .provider_link import ProviderLink
 from .purchase import Purchase, PurchaseItem
 from .reorder_alert import ReorderAlert
 from .resource import Resource
 from .saved_search import SavedSearch
+from .stock_anomaly import StockAnomaly, StockAnomalyDeferral, StockAnomalyScan
 from .stock_transaction import StockTransaction, TransactionType
-from .storage_location import StorageLocation
+from .storage_location import StorageLocation, StorageLocationClosure
 from .substitute import Substitute
 from .supplier import Supplier
 from .tag import Tag, component_tags
@@ -37,7 +42,9 @@ __all__ = [
     "Base",
     "Component",
     "ComponentLocation",
+    "ComponentStockTotal",
     "StorageLocation",
+    "StorageLocationClosure",
     "Category",
     "Project",
     "ProjectComponent",
@@ -47,9 +54,12 @@ __all__ = [
     "Tag",
     "component_tags",
     "Attachment",
+    "BackgroundJob",
+    "Blob",
     "CustomField",
     "CustomFieldValue",
     "FieldType",
+    "EasyEDAConversion",
     "Substitute",
     "User",
     "APIToken",
@@ -58,6 +68,7 @@ __all__ = [
     "PurchaseItem",
     "ComponentDataProvider",
     "ComponentProviderData",
+    "ProviderResponseCache",
     "KiCadLibraryData",
     "MetaPart",
     "MetaPartComponent",
@@ -66,4 +77,7 @@ __all__ = [
     "ReorderAlert",
     "Resource",
     "SavedSearch",
+    "StockAnomaly",
+    "StockAnomalyDeferral",
+    "StockAnomalyScan",
 ]
@@ -0,0 +1,89 @@
+"""
+BackgroundJob model for the durable job queue.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class BackgroundJob(Base):
+    """
+    Unit of background work (resource download, EasyEDA conversion, ...).
+
+    Jobs are persisted so queued and interrupted work survives restarts, and
+    are run by JobQueue workers: claimed highest priority first once run_after
+    has passed, leased while running, and rescheduled with exponential backoff
+    on failure until max_attempts is reached.
+
+    Attributes:
+        kind: Handler name (e.g. "resource_download")
+        payload: JSON arguments for the handler
+        priority: Higher runs first
+        status: queued, running, succeeded, failed or cancelled
+        attempts: Number of times the job has been started
+        max_attempts: Attempts before the job is marked failed
+        idempotency_key: Optional unique key; enqueueing it again returns
+            the existing job
+        host: Remote host the job talks to (drives per-host concurrency)
+        run_after: Earliest time the job may (re)start
+        lease_expires_at: When a running job is considered abandoned
+        worker_id: Worker that holds the lease
+        result: JSON result of a successful run
+        error: Last error message
+    """
+
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=True)
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    idempotency_key = Column(String(255), nullable=True, unique=True)
+    host = Column(String(255), nullable=True)
+
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    worker_id = Column(String(64), nullable=True)
+
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_background_jobs_claim", "status", "priority", "run_after"),
+        Index("idx_background_jobs_kind", "kind"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<BackgroundJob(id={self.id}, kind='{self.kind}', "
+            f"status='{self.status}')>"
+        )
+
+    def to_dict(self) -> dict:
+        """Convert the job to a dictionary for API responses."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "priority": self.priority,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "idempotency_key": self.idempotency_key,
+            "host": self.host,
+            "run_after": self.run_after.isoformat() if self.run_after else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,167 @@
+"""
+Blob model for reference counts of content-addressed files.
+"""
+
+from sqlalchemy import DDL, Column, DateTime, Integer, String, event
+from sqlalchemy.sql import func
+
+from ..database import Base
+from .attachment import Attachment
+from .easyeda_conversion import EasyEDAConversion
+from .kicad_data import KiCadLibraryData
+from .resource import Resource
+
+
+class Blob(Base):
+    """
+    Reference count of one file in the content-addressed blob store.
+
+    Blob files live under <storage>/blobs/aa/bb/<sha256><ext> and are shared
+    by every attachment, resource, KiCad file and cached EasyEDA conversion
+    with the same content. Rows are maintained by SQLite triggers on the
+    columns holding blob paths (BLOB_REFERENCE_COLUMNS), so ORM, Core and
+    cascade deletes all keep ref_count in step. Blobs whose count drops to
+    zero are removed by BlobStore.collect_garbage.
+
+    Attributes:
+        sha256: Hex SHA-256 of the file content
+        ref_count: Number of rows referencing the blob
+        updated_at: Last time the count changed
+    """
+
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<Blob(sha256='{self.sha256}', ref_count={self.ref_count})>"
+
+
+# Columns that may hold a blob path, per table
+BLOB_REFERENCE_COLUMNS = {
+    "attachments": ["file_path"],
+    "resources": ["file_path"],
+    "kicad_library_data": [
+        "custom_symbol_file_path",
+        "custom_footprint_file_path",
+        "custom_3d_model_file_path",
+        "model_3d_path",
+    ],
+    "easyeda_conversions": [
+        "symbol_file_path",
+        "footprint_file_path",
+        "model_3d_file_path",
+    ],
+}
+
+
+# GLOB class matching one lower-case hex digit
+_HEX = "[0-9a-f]"
+
+
+def blob_sha256_sql(column: str) -> str:
+    """
+    SQL expression extracting the blob digest from a path column.
+
+    Mirrors services.blob_store.blob_sha256: the 64 hex characters starting
+    the file name, if the file's directory ends in "blobs/aa/bb/", else NULL.
+    Only the last path segments are matched, so a "blobs/" elsewhere in the
+    install path is ignored. rtrim() with every non-"/" character of the
+    path strips the file name, leaving the directory.
+    """
+    directory = f"rtrim({column}, replace({column}, '/', ''))"
+    sha = f"substr({column}, length({directory}) + 1, 64)"
+    return (
+        f"CASE WHEN {directory} GLOB '*blobs/{_HEX}{_HEX}/{_HEX}{_HEX}/' "
+        f"AND length({sha}) = 64 AND {sha} NOT GLOB '*[^0-9a-f]*' "
+        f"THEN {sha} END"
+    )
+
+
+def _add_reference(column: str) -> str:
+    sha = blob_sha256_sql(column)
+    return f"""
+      INSERT INTO blobs (sha256, ref_count, updated_at)
+      SELECT {sha}, 1, CURRENT_TIMESTAMP WHERE {sha} IS NOT NULL
+      ON CONFLICT (sha256) DO UPDATE SET
+        ref_count = ref_count + 1,
+        updated_at = CURRENT_TIMESTAMP;
+"""
+
+
+def _remove_reference(column: str) -> str:
+    return f"""
+      UPDATE blobs SET
+        ref_count = ref_count - 1,
+        updated_at = CURRENT_TIMESTAMP
+      WHERE sha256 = {blob_sha256_sql(column)};
+"""
+
+
+def blob_reference_triggers(table: str, columns: list[str]) -> list[str]:
+    """Insert, update and delete triggers counting a table's blob references."""
+    add_new = "".join(_add_reference(f"NEW.{column}") for column in columns)
+    remove_old = "".join(_remove_reference(f"OLD.{column}") for column in columns)
+    return [
+        f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_insert
+    AFTER INSERT ON {table}
+    FOR EACH ROW
+    BEGIN
+      {add_new}
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_update
+    AFTER UPDATE OF {", ".join(columns)} ON {table}
+    FOR EACH ROW
+    BEGIN
+      {remove_old}
+      {add_new}
+    END
+    """,
+        f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_{table}_blobs_delete
+    AFTER DELETE ON {table}
+    FOR EACH ROW
+    BEGIN
+      {remove_old}
+    END
+    """,
+    ]
+
+
+def blob_reference_counts_sql() -> str:
+    """SELECT of (sha256, ref_count) recomputed from all reference columns."""
+    references = " UNION ALL ".join(
+        f"SELECT {blob_sha256_sql(column)} AS sha256 FROM {table}"
+        for table, columns in BLOB_REFERENCE_COLUMNS.items()
+        for column in columns
+    )
+    return (
+        f"SELECT sha256, COUNT(*) FROM ({references}) "
+        "WHERE sha256 IS NOT NULL GROUP BY sha256"
+    )
+
+
+# Reference count triggers. Also created by migrations b9e1f3a5c7d8 and
+# c0f2a4b6d8e9 for databases managed by Alembic; attached to the referencing
+# tables so create_all() installs them once the table they fire on exists
+# (trigger bodies are resolved when they run, so the blobs table may come
+# later).
+for _table in (
+    Attachment.__table__,
+    Resource.__table__,
+    KiCadLibraryData.__table__,
+    EasyEDAConversion.__table__,
+):
+    for _trigger_sql in blob_reference_triggers(
+        _table.name, BLOB_REFERENCE_COLUMNS[_table.name]
+    ):
+        event.listen(
+            _table, "after_create", DDL(_trigger_sql).execute_if(dialect="sqlite")
+        )
@@ -5,15 +5,18 @@ ComponentLocation model for tracking component inventory across multiple storage
 import uuid
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    event,
     select,
 )
 from sqlalchemy.orm import Session, relationship
@@ -162,3 +165,95 @@ class ComponentLocation(Base):
         result = session.execute(stmt).scalars().all()
 
         return list(result)
+
+
+class ComponentStockTotal(Base):
+    """
+    Per-component stock totals across all locations.
+
+    Lets listings filter and sort by total quantity with an indexed join
+    instead of summing component_locations for every candidate row.
+
+    Rows are maintained by SQLite triggers on component_locations (insert,
+    update and delete), so ORM, Core and bulk writes all keep the totals
+    consistent. Components that never had stock have no row; treat a
+    missing row as zero.
+    """
+
+    __tablename__ = "component_stock_totals"
+
+    component_id = Column(
+        String,
+        ForeignKey("components.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    quantity_on_hand = Column(Integer, nullable=False, default=0)
+    minimum_stock = Column(Integer, nullable=False, default=0)
+    location_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("idx_component_stock_totals_quantity", "quantity_on_hand"),)
+
+    def __repr__(self):
+        return (
+            f"<ComponentStockTotal(component_id='{self.component_id}', "
+            f"quantity={self.quantity_on_hand}, locations={self.location_count})>"
+        )
+
+
+# Stock total maintenance triggers. Also created by migration d5f7a9c1e3b4 for
+# databases managed by Alembic; attached to component_locations so
+# create_all() installs them once the table they fire on exists.
+_ADD_NEW_ROW_TO_TOTALS = """
+      INSERT INTO component_stock_totals (
+        component_id, quantity_on_hand, minimum_stock, location_count
+      )
+      VALUES (NEW.component_id, NEW.quantity_on_hand, NEW.minimum_stock, 1)
+      ON CONFLICT (component_id) DO UPDATE SET
+        quantity_on_hand = quantity_on_hand + excluded.quantity_on_hand,
+        minimum_stock = minimum_stock + excluded.minimum_stock,
+        location_count = location_count + 1;
+"""
+
+_REMOVE_OLD_ROW_FROM_TOTALS = """
+      UPDATE component_stock_totals SET
+        quantity_on_hand = quantity_on_hand - OLD.quantity_on_hand,
+        minimum_stock = minimum_stock - OLD.minimum_stock,
+        location_count = location_count - 1
+      WHERE component_id = OLD.component_id;
+"""
+
+COMPONENT_STOCK_TOTAL_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_insert
+    AFTER INSERT ON component_locations
+    FOR EACH ROW
+    BEGIN
+      {_ADD_NEW_ROW_TO_TOTALS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_update
+    AFTER UPDATE OF component_id, quantity_on_hand, minimum_stock
+    ON component_locations
+    FOR EACH ROW
+    BEGIN
+      {_REMOVE_OLD_ROW_FROM_TOTALS}
+      {_ADD_NEW_ROW_TO_TOTALS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trigger_component_stock_totals_delete
+    AFTER DELETE ON component_locations
+    FOR EACH ROW
+    BEGIN
+      {_REMOVE_OLD_ROW_FROM_TOTALS}
+    END
+    """,
+]
+
+for _trigger_sql in COMPONENT_STOCK_TOTAL_TRIGGERS:
+    event.listen(
+        ComponentLocation.__table__,
+        "after_create",
+        DDL(_trigger_sql).execute_if(dialect="sqlite"),
+    )
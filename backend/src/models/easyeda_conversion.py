@@ -0,0 +1,72 @@
+"""
+EasyEDAConversion model for cached EasyEDA to KiCad conversions.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+
+from ..database import Base
+
+
+class EasyEDAConversion(Base):
+    """
+    Cached result of converting one LCSC part with one converter version.
+
+    Generated symbol, footprint and 3D model files are kept in the blob
+    store; their paths count as blob references, so cached artefacts are
+    never garbage collected while the entry exists. Entries are managed by
+    EasyEDAConversionCache and never expire: a converter upgrade changes
+    converter_version, which makes every part convert again.
+
+    Attributes:
+        lcsc_id: Normalised LCSC part number (e.g. "C8734")
+        converter_version: easyeda2kicad version and cache format
+        component_info: Component data returned by the EasyEDA API
+        conversions: Library and symbol/footprint/model names per artefact
+        symbol_file_path: Blob path of the generated .kicad_sym
+        footprint_file_path: Blob path of the generated .kicad_mod
+        model_3d_file_path: Blob path of the generated 3D model
+        created_at: When the part was converted
+        last_used_at: Last cache hit
+        hit_count: Number of cache hits
+    """
+
+    __tablename__ = "easyeda_conversions"
+
+    lcsc_id = Column(String(20), primary_key=True)
+    converter_version = Column(String(50), primary_key=True)
+
+    component_info = Column(JSON, nullable=True)
+    conversions = Column(JSON, nullable=False, default=dict)
+    symbol_file_path = Column(Text, nullable=True)
+    footprint_file_path = Column(Text, nullable=True)
+    model_3d_file_path = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    # Artefact kind in conversion results -> column holding its blob path
+    ARTEFACT_COLUMNS = {
+        "symbol": "symbol_file_path",
+        "footprint": "footprint_file_path",
+        "model_3d": "model_3d_file_path",
+    }
+
+    def __repr__(self):
+        return (
+            f"<EasyEDAConversion(lcsc_id='{self.lcsc_id}', "
+            f"converter_version='{self.converter_version}')>"
+        )
+
+    def to_result(self) -> dict:
+        """Conversion result in the shape EasyEDAService returns."""
+        conversions = {}
+        for kind, metadata in (self.conversions or {}).items():
+            file_path = getattr(self, self.ARTEFACT_COLUMNS[kind], None)
+            conversions[kind] = {**metadata, "file_path": file_path}
+        return {
+            "lcsc_id": self.lcsc_id,
+            "component_info": self.component_info,
+            "conversions": conversions,
+            "converter_version": self.converter_version,
+        }
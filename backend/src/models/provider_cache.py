@@ -0,0 +1,63 @@
+"""
+ProviderResponseCache model for caching external provider lookups.
+"""
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String
+
+from ..database import Base
+
+
+class ProviderResponseCache(Base):
+    """
+    Cached response of one provider lookup (search, SKU or detail request).
+
+    Entries are keyed by a digest of provider, lookup kind, normalised query
+    and parameters, and managed by ProviderCache: fresh until expires_at,
+    served stale (while a background refresh runs) until stale_until, and
+    evicted least-recently-used first once the cache is full.
+
+    Attributes:
+        cache_key: SHA-256 of provider, kind, query and params
+        provider: Provider name (e.g. "lcsc")
+        kind: Lookup kind (search, sku, details)
+        query: Normalised query or SKU
+        params: Extra lookup parameters (e.g. limit)
+        payload: JSON-encoded response
+        is_empty: Response was empty (cached with a short TTL)
+        size_bytes: Size of the encoded payload
+        fetched_at: When the response was fetched
+        expires_at: End of the fresh period
+        stale_until: Last moment the entry may be served stale
+        last_accessed_at: Last cache hit (drives LRU eviction)
+        hit_count: Number of cache hits
+    """
+
+    __tablename__ = "provider_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    provider = Column(String, nullable=False)
+    kind = Column(String, nullable=False)
+    query = Column(String, nullable=False)
+    params = Column(JSON, nullable=True)
+
+    payload = Column(JSON, nullable=True)
+    is_empty = Column(Boolean, nullable=False, default=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    stale_until = Column(DateTime(timezone=True), nullable=False)
+    last_accessed_at = Column(DateTime(timezone=True), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("idx_provider_response_cache_provider_kind", "provider", "kind"),
+        Index("idx_provider_response_cache_last_accessed", "last_accessed_at"),
+        Index("idx_provider_response_cache_stale_until", "stale_until"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<ProviderResponseCache(provider='{self.provider}', "
+            f"kind='{self.kind}', query='{self.query}')>"
+        )
@@ -11,6 +11,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    Integer,
     String,
     UniqueConstraint,
 )
@@ -44,6 +45,9 @@ class ComponentProviderData(Base):
     datasheet_url = Column(String(1000), nullable=True)
     image_url = Column(String(1000), nullable=True)
     specifications_json = Column(JSON, nullable=True)
+    provider_url = Column(String(1000), nullable=True)
+    availability = Column(Integer, nullable=True)
+    pricing = Column(JSON, nullable=True)  # {"price_breaks": [...], "currency": ...}
 
     # Cache metadata
     cached_at = Column(
@@ -113,6 +117,9 @@ class ComponentProviderData(Base):
             "datasheet_url": self.datasheet_url,
             "image_url": self.image_url,
             "specifications": self.specifications,
+            "provider_url": self.provider_url,
+            "availability": self.availability,
+            "pricing": self.pricing,
             "cached_at": self.cached_at.isoformat() if self.cached_at else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
@@ -0,0 +1,132 @@
+"""
+StockAnomaly model for flagging suspicious stock removals.
+
+Anomalies are created by the batch anomaly detection job
+(AnomalyDetectionService) and reviewed by users through the analytics API.
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class StockAnomaly(Base):
+    """
+    Stock transaction flagged as an outlier against its component's usage.
+
+    A removal is flagged when its quantity is far outside the component's
+    typical daily removals, measured with the median and median absolute
+    deviation (MAD) so a single mis-scan cannot skew the baseline.
+
+    Attributes:
+        id: Auto-incrementing primary key
+        transaction_id: Flagged stock transaction (unique)
+        component_id: Denormalized foreign key to components
+        quantity: Units removed by the flagged transaction
+        median_daily_removal: Median daily removal at detection time
+        mad_daily_removal: Median absolute deviation of daily removals
+        robust_score: Modified z-score of the removal
+        status: Review state (open, acknowledged)
+        detected_at: When the anomaly was flagged
+        acknowledged_at: When a user acknowledged the anomaly
+        acknowledged_by: Username that acknowledged the anomaly
+        notes: Optional reviewer notes (e.g., "mis-scan, corrected")
+    """
+
+    __tablename__ = "stock_anomalies"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Foreign keys
+    transaction_id = Column(
+        String,
+        ForeignKey("stock_transactions.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    component_id = Column(
+        String,
+        ForeignKey("components.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Detection statistics
+    quantity = Column(Integer, nullable=False)
+    median_daily_removal = Column(Float, nullable=False)
+    mad_daily_removal = Column(Float, nullable=False)
+    robust_score = Column(Float, nullable=False)
+
+    # Review state
+    status = Column(String, nullable=False, default="open", index=True)
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+    acknowledged_at = Column(DateTime(timezone=True), nullable=True)
+    acknowledged_by = Column(String, nullable=True)
+    notes = Column(String, nullable=True)
+
+    # Relationships
+    transaction = relationship("StockTransaction")
+    component = relationship("Component")
+
+    def __repr__(self):
+        return (
+            f"<StockAnomaly(id={self.id}, "
+            f"transaction_id='{self.transaction_id}', "
+            f"status='{self.status}', "
+            f"score={self.robust_score:.1f})>"
+        )
+
+
+class StockAnomalyScan(Base):
+    """
+    Record of an anomaly detection run.
+
+    The newest scan's high_water_mark is where the next run resumes, so each
+    run only evaluates transactions created since the previous one.
+
+    Attributes:
+        id: Auto-incrementing primary key
+        started_at: When the scan ran
+        high_water_mark: Largest transaction created_at (stored text) scanned
+        transactions_scanned: Removals evaluated in this run
+        anomalies_found: Anomalies flagged in this run
+    """
+
+    __tablename__ = "stock_anomaly_scans"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    high_water_mark = Column(String, nullable=True)
+    transactions_scanned = Column(Integer, nullable=False, default=0)
+    anomalies_found = Column(Integer, nullable=False, default=0)
+
+
+class StockAnomalyDeferral(Base):
+    """
+    Removal that could not be evaluated because its component had no baseline.
+
+    Scans re-evaluate a component's deferred removals once it has enough
+    active days for a baseline, and drop them once they leave the lookback
+    window, so the high-water mark never has to wait for them.
+
+    Attributes:
+        transaction_id: Deferred stock transaction (primary key)
+        component_id: Denormalized foreign key to components
+    """
+
+    __tablename__ = "stock_anomaly_deferrals"
+
+    transaction_id = Column(
+        String,
+        ForeignKey("stock_transactions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    component_id = Column(
+        String,
+        ForeignKey("components.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
@@ -5,7 +5,16 @@ StockTransaction audit model for tracking all inventory changes.
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -79,6 +88,12 @@ class StockTransaction(Base):
     from_location = relationship("StorageLocation", foreign_keys=[from_location_id])
     to_location = relationship("StorageLocation", foreign_keys=[to_location_id])
 
+    # Ledger query indexes (added in migration 9e1f2a3b4c5d)
+    __table_args__ = (
+        Index("idx_stock_transactions_created_component", "created_at", "component_id"),
+        Index("idx_stock_transactions_user_created", "user_id", "created_at"),
+    )
+
     def __repr__(self):
         return f"<StockTransaction(id='{self.id}', component_id='{self.component_id}', type='{self.transaction_type.value}', qty_change={self.quantity_change}, lot_id='{self.lot_id}', total_price={self.total_price})>"
 
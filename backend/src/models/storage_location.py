@@ -3,23 +3,32 @@ StorageLocation model with hierarchy support for organizing components.
 """
 
 import uuid
+from contextlib import contextmanager
 from datetime import UTC
 
 from sqlalchemy import (
+    DDL,
     JSON,
     CheckConstraint,
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Text,
     event,
+    func,
+    inspect,
+    select,
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import object_session, relationship
 
 from ..database import Base
 
+# Session.info flag that suspends the location_hierarchy "set" listeners
+SKIP_HIERARCHY_LISTENERS = "skip_storage_hierarchy_listeners"
+
 
 class StorageLocation(Base):
     """
@@ -82,6 +91,8 @@ class StorageLocation(Base):
             "type IN ('container', 'room', 'building', 'cabinet', 'drawer', 'shelf', 'bin', 'box', 'bag')",
             name="ck_storage_location_type_valid",
         ),
+        # Child lookups; the closure insert trigger probes it for every new row
+        Index("idx_storage_locations_parent_id", "parent_id"),
     )
 
     def __repr__(self):
@@ -97,6 +108,20 @@ class StorageLocation(Base):
     @property
     def full_path(self):
         """Get the full hierarchical path as a list of StorageLocation objects."""
+        session = self._closure_session()
+        if session is not None:
+            return list(
+                session.execute(
+                    select(StorageLocation)
+                    .join(
+                        StorageLocationClosure,
+                        StorageLocationClosure.ancestor_id == StorageLocation.id,
+                    )
+                    .where(StorageLocationClosure.descendant_id == self.id)
+                    .order_by(StorageLocationClosure.depth.desc())
+                ).scalars()
+            )
+
         path = []
         current = self
         while current:
@@ -113,21 +138,71 @@ class StorageLocation(Base):
             else 0
         )
 
+    def _closure_session(self):
+        """
+        Session for closure-table queries, or None for unsaved locations.
+
+        Transient and pending locations have no closure rows yet, so callers
+        fall back to walking the loaded relationships.
+        """
+        state = inspect(self)
+        return state.session if state.persistent else None
+
+    def _subtree_ids(self, include_self=True):
+        """Select statement yielding the IDs of this location's subtree."""
+        query = select(StorageLocationClosure.descendant_id).where(
+            StorageLocationClosure.ancestor_id == self.id
+        )
+        if not include_self:
+            query = query.where(StorageLocationClosure.depth > 0)
+        return query
+
     def get_all_descendants(self):
-        """Get all descendant storage locations recursively."""
-        descendants = []
-        for child in self.children:
-            descendants.append(child)
-            descendants.extend(child.get_all_descendants())
-        return descendants
+        """Get all descendant storage locations (nearest levels first)."""
+        session = self._closure_session()
+        if session is None:
+            descendants = []
+            for child in self.children:
+                descendants.append(child)
+                descendants.extend(child.get_all_descendants())
+            return descendants
+
+        return list(
+            session.execute(
+                select(StorageLocation)
+                .join(
+                    StorageLocationClosure,
+                    StorageLocationClosure.descendant_id == StorageLocation.id,
+                )
+                .where(
+                    StorageLocationClosure.ancestor_id == self.id,
+                    StorageLocationClosure.depth > 0,
+                )
+                .order_by(
+                    StorageLocationClosure.depth, StorageLocation.location_hierarchy
+                )
+            ).scalars()
+        )
 
     def get_component_count(self, include_children=False):
         """Get count of components in this location (optionally including children)."""
-        count = len(self.component_locations)
-        if include_children:
-            for child in self.children:
-                count += child.get_component_count(include_children=True)
-        return count
+        if not include_children:
+            return len(self.component_locations)
+
+        session = self._closure_session()
+        if session is None:
+            return len(self.component_locations) + sum(
+                child.get_component_count(include_children=True)
+                for child in self.children
+            )
+
+        from .component_location import ComponentLocation
+
+        return session.execute(
+            select(func.count(ComponentLocation.id)).where(
+                ComponentLocation.storage_location_id.in_(self._subtree_ids())
+            )
+        ).scalar_one()
 
     @property
     def components(self):
@@ -138,40 +213,94 @@ class StorageLocation(Base):
         """Get total quantity of all components in this location."""
         return sum(location.quantity_on_hand for location in self.component_locations)
 
+    def _subtree_component_rows(self, limit=None):
+        """
+        (depth, location name, component name) for every component stored in
+        this location's subtree, nearest levels first, in a single query.
+        """
+        from .component import Component
+        from .component_location import ComponentLocation
+
+        query = (
+            select(
+                StorageLocationClosure.depth,
+                StorageLocation.name,
+                Component.name.label("component_name"),
+            )
+            .join(
+                StorageLocation,
+                StorageLocation.id == StorageLocationClosure.descendant_id,
+            )
+            .join(
+                ComponentLocation,
+                ComponentLocation.storage_location_id
+                == StorageLocationClosure.descendant_id,
+            )
+            .join(Component, Component.id == ComponentLocation.component_id)
+            .where(StorageLocationClosure.ancestor_id == self.id)
+            .order_by(
+                StorageLocationClosure.depth,
+                StorageLocation.location_hierarchy,
+                StorageLocation.id,
+            )
+        )
+        if limit:
+            query = query.limit(limit)
+        return self._closure_session().execute(query).all()
+
     def can_be_deleted(self):
         """Check if this storage location can be safely deleted."""
-        # Cannot delete if it has components assigned
-        if self.component_locations:
-            return False, "Cannot delete storage location with assigned components"
-
-        # Cannot delete if it has child locations with components
-        for child in self.children:
-            can_delete, reason = child.can_be_deleted()
-            if not can_delete:
-                return (
-                    False,
-                    f"Cannot delete storage location: child '{child.name}' {reason}",
-                )
+        if self._closure_session() is None:
+            # Cannot delete if it has components assigned
+            if self.component_locations:
+                return False, "Cannot delete storage location with assigned components"
+
+            # Cannot delete if it has child locations with components
+            for child in self.children:
+                can_delete, reason = child.can_be_deleted()
+                if not can_delete:
+                    return (
+                        False,
+                        f"Cannot delete storage location: child '{child.name}' {reason}",
+                    )
+
+            return True, "Can be safely deleted"
+
+        rows = self._subtree_component_rows(limit=1)
+        if not rows:
+            return True, "Can be safely deleted"
 
-        return True, "Can be safely deleted"
+        reason = "Cannot delete storage location with assigned components"
+        if rows[0].depth == 0:
+            return False, reason
+        return False, f"Cannot delete storage location: child '{rows[0].name}' {reason}"
 
     def get_deletion_blockers(self):
         """Get detailed list of what prevents deletion of this location."""
-        blockers = []
-
-        # Check for assigned components
-        if self.component_locations:
+        if self._closure_session() is None:
+            blockers = []
             component_names = [cl.component.name for cl in self.component_locations]
+            if component_names:
+                blockers.append(_describe_components(component_names))
+            for child in self.children:
+                child_blockers = child.get_deletion_blockers()
+                if child_blockers:
+                    blockers.append(
+                        f"Child '{child.name}': {'; '.join(child_blockers)}"
+                    )
+            return blockers
+
+        # Group component names per location in subtree order
+        by_location = {}
+        for row in self._subtree_component_rows():
+            by_location.setdefault((row.depth, row.name), []).append(row.component_name)
+
+        blockers = []
+        for (depth, name), component_names in by_location.items():
+            description = _describe_components(component_names)
             blockers.append(
-                f"Contains {len(component_names)} component(s): {', '.join(component_names[:3])}{'...' if len(component_names) > 3 else ''}"
+                description if depth == 0 else f"Child '{name}': {description}"
             )
-
-        # Check child locations recursively
-        for child in self.children:
-            child_blockers = child.get_deletion_blockers()
-            if child_blockers:
-                blockers.append(f"Child '{child.name}': {'; '.join(child_blockers)}")
-
         return blockers
 
     def is_ancestor_of(self, other):
@@ -179,45 +308,206 @@ class StorageLocation(Base):
         if not other:
             return False
 
-        current = other.parent
-        while current:
-            if current.id == self.id:
-                return True
-            current = current.parent
-        return False
+        session = self._closure_session()
+        if session is None or not inspect(other).persistent:
+            current = other.parent
+            while current:
+                if current.id == self.id:
+                    return True
+                current = current.parent
+            return False
+
+        return (
+            session.execute(
+                select(StorageLocationClosure.depth).where(
+                    StorageLocationClosure.ancestor_id == self.id,
+                    StorageLocationClosure.descendant_id == other.id,
+                    StorageLocationClosure.depth > 0,
+                )
+            ).first()
+            is not None
+        )
+
+
+def _describe_components(component_names):
+    """Summarise components blocking deletion (first three names)."""
+    return (
+        f"Contains {len(component_names)} component(s): "
+        f"{', '.join(component_names[:3])}{'...' if len(component_names) > 3 else ''}"
+    )
+
+
+class StorageLocationClosure(Base):
+    """
+    Closure table for the storage location hierarchy.
+
+    Holds one row per (ancestor, descendant) pair, including each location
+    paired with itself at depth 0, so subtree listings, subtree component
+    counts and cycle checks are single indexed queries at any depth.
+
+    Rows are maintained by SQLite triggers on storage_locations (insert,
+    parent_id update and delete), so ORM, Core and bulk writes all keep the
+    table consistent.
+    """
+
+    __tablename__ = "storage_location_closure"
+
+    ancestor_id = Column(
+        String,
+        ForeignKey("storage_locations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id = Column(
+        String,
+        ForeignKey("storage_locations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("idx_storage_location_closure_descendant", "descendant_id", "depth"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<StorageLocationClosure(ancestor_id='{self.ancestor_id}', "
+            f"descendant_id='{self.descendant_id}', depth={self.depth})>"
+        )
+
+
+# Closure maintenance triggers. Also created by migration b3d5f7a9c1e2 for
+# databases managed by Alembic; attached here so create_all() installs them.
+STORAGE_LOCATION_CLOSURE_TRIGGERS = [
+    # New location: self row plus one row per ancestor of its parent. Rows
+    # whose parent was inserted after them (possible with FKs disabled) are
+    # attached by the second statement.
+    """
+    CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_insert
+    AFTER INSERT ON storage_locations
+    FOR EACH ROW
+    BEGIN
+      INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+      SELECT NEW.id, NEW.id, 0
+      UNION ALL
+      SELECT ancestor_id, NEW.id, depth + 1
+      FROM storage_location_closure
+      WHERE descendant_id = NEW.parent_id;
+
+      INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+      SELECT supertree.ancestor_id, subtree.descendant_id,
+             supertree.depth + subtree.depth + 1
+      FROM storage_location_closure AS supertree
+      JOIN storage_locations AS child ON child.parent_id = NEW.id
+      JOIN storage_location_closure AS subtree ON subtree.ancestor_id = child.id
+      WHERE supertree.descendant_id = NEW.id;
+    END
+    """,
+    # Refuse moves into the location's own subtree
+    """
+    CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_cycle
+    BEFORE UPDATE OF parent_id ON storage_locations
+    FOR EACH ROW
+    WHEN NEW.parent_id IS NOT NULL
+      AND EXISTS (
+        SELECT 1 FROM storage_location_closure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+      )
+    BEGIN
+      SELECT RAISE(ABORT, 'Circular reference detected');
+    END
+    """,
+    # Move: detach the subtree from its old ancestors, attach to the new ones
+    """
+    CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_move
+    AFTER UPDATE OF parent_id ON storage_locations
+    FOR EACH ROW
+    WHEN OLD.parent_id IS NOT NEW.parent_id
+    BEGIN
+      DELETE FROM storage_location_closure
+      WHERE descendant_id IN (
+          SELECT descendant_id FROM storage_location_closure
+          WHERE ancestor_id = NEW.id
+        )
+        AND ancestor_id NOT IN (
+          SELECT descendant_id FROM storage_location_closure
+          WHERE ancestor_id = NEW.id
+        );
+
+      INSERT INTO storage_location_closure (ancestor_id, descendant_id, depth)
+      SELECT supertree.ancestor_id, subtree.descendant_id,
+             supertree.depth + subtree.depth + 1
+      FROM storage_location_closure AS supertree
+      JOIN storage_location_closure AS subtree ON subtree.ancestor_id = NEW.id
+      WHERE supertree.descendant_id = NEW.parent_id;
+    END
+    """,
+    # Delete: drop every pair involving the location (FK cascades may be off)
+    """
+    CREATE TRIGGER IF NOT EXISTS trigger_storage_location_closure_delete
+    AFTER DELETE ON storage_locations
+    FOR EACH ROW
+    BEGIN
+      DELETE FROM storage_location_closure
+      WHERE ancestor_id = OLD.id OR descendant_id = OLD.id;
+    END
+    """,
+]
+
+for _trigger_sql in STORAGE_LOCATION_CLOSURE_TRIGGERS:
+    event.listen(
+        StorageLocationClosure.__table__,
+        "after_create",
+        DDL(_trigger_sql).execute_if(dialect="sqlite"),
+    )
+
+
+@contextmanager
+def hierarchy_listeners_suspended(session):
+    """
+    Suspend the per-assignment location_hierarchy listeners for a session.
+
+    Bulk operations that compute paths themselves (and rewrite subtrees with
+    a single UPDATE) use this to avoid a parent lookup on every assignment.
+    """
+    previous = session.info.get(SKIP_HIERARCHY_LISTENERS, False)
+    session.info[SKIP_HIERARCHY_LISTENERS] = True
+    try:
+        yield session
+    finally:
+        session.info[SKIP_HIERARCHY_LISTENERS] = previous
 
 
 # Event listener to automatically update location_hierarchy
 @event.listens_for(StorageLocation.parent_id, "set")
 def update_location_hierarchy(target, value, oldvalue, initiator):
     """Automatically update location_hierarchy when parent changes."""
+    session = object_session(target)
+    if session is not None and session.info.get(SKIP_HIERARCHY_LISTENERS):
+        return
+
     if value is None:
         # Root level location
         target.location_hierarchy = target.name
-    else:
+    elif session:
         # Find parent and build hierarchy
-        from sqlalchemy.orm import object_session
-
-        session = object_session(target)
-        if session:
-            parent = session.get(StorageLocation, value)
-            if parent:
-                target.location_hierarchy = f"{parent.location_hierarchy}/{target.name}"
+        parent = session.get(StorageLocation, value)
+        if parent:
+            target.location_hierarchy = f"{parent.location_hierarchy}/{target.name}"
 
 
 @event.listens_for(StorageLocation.name, "set")
 def update_hierarchy_on_name_change(target, value, oldvalue, initiator):
     """Update location_hierarchy when name changes."""
+    session = object_session(target)
+    if session is not None and session.info.get(SKIP_HIERARCHY_LISTENERS):
+        return
+
     if target.parent_id is None:
         target.location_hierarchy = value
-    else:
-        from sqlalchemy.orm import object_session
-
-        session = object_session(target)
-        if session:
-            parent = session.get(StorageLocation, target.parent_id)
-            if parent:
-                target.location_hierarchy = f"{parent.location_hierarchy}/{value}"
+    elif session:
+        parent = session.get(StorageLocation, target.parent_id)
+        if parent:
+            target.location_hierarchy = f"{parent.location_hierarchy}/{value}"
 
 
 @event.listens_for(StorageLocation, "before_insert")
@@ -4,5 +4,6 @@ Provides integrations with electronic component suppliers and data sources.
 """
 
 from .base_provider import ComponentDataProvider
+from .local_provider import LocalProvider
 
-__all__ = ["ComponentDataProvider"]
+__all__ = ["ComponentDataProvider", "LocalProvider"]
@@ -36,6 +36,7 @@ class ComponentDataProvider(ABC):
         self.api_key = api_key
         self.base_url = ""
         self.rate_limit_delay = 1.0  # seconds between requests
+        self.hosts: list[str] = []  # hosts requests go to, paced at that rate
 
     @abstractmethod
     async def search_components(
@@ -7,12 +7,14 @@ import logging
 import re
 from typing import Any
 
+from ..services.rate_limiter import CircuitOpenError
 from .base_provider import ComponentDataProvider, ComponentSearchResult
 
 logger = logging.getLogger(__name__)
 
 # Import EasyEDA service for KiCad conversion
 try:
+    from ..services.easyeda_cache import get_conversion_cache
     from ..services.easyeda_service import EasyEDAService
 
     EASYEDA_SERVICE_AVAILABLE = True
@@ -28,6 +30,7 @@ class LCSCProvider(ComponentDataProvider):
         super().__init__("LCSC", api_key)
         self.base_url = "https://wmsc.lcsc.com/wmsc"
         self.rate_limit_delay = 0.5  # LCSC allows higher rates
+        self.hosts = ["www.lcsc.com"]  # Scraped by LCSCAdapter
 
         # Initialize EasyEDA service for KiCad data
         self.easyeda_service = EasyEDAService() if EASYEDA_SERVICE_AVAILABLE else None
@@ -72,6 +75,9 @@ class LCSCProvider(ComponentDataProvider):
             )
             return component_results
 
+        except CircuitOpenError:
+            # Propagated so cached results are kept rather than replaced
+            raise
         except Exception as e:
             logger.error(f"LCSC search failed for '{query}': {e}")
             return []
@@ -105,6 +111,8 @@ class LCSCProvider(ComponentDataProvider):
                 provider_part_id=result.get("part_number", ""),
             )
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"LCSC details failed for '{part_number}': {e}")
             return None
@@ -132,6 +140,8 @@ class LCSCProvider(ComponentDataProvider):
 
             return result
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"LCSC SKU search failed for '{provider_sku}': {e}")
             return None
@@ -211,10 +221,14 @@ class LCSCProvider(ComponentDataProvider):
 
             logger.info(f"Converting LCSC component to KiCad: {clean_lcsc_id}")
 
-            # Convert using EasyEDA service
-            conversion_result = await self.easyeda_service.convert_lcsc_component(
-                clean_lcsc_id, output_dir
-            )
+            # Convert using EasyEDA service (cached unless files are wanted
+            # in a specific directory)
+            if output_dir is None:
+                conversion_result = await get_conversion_cache().convert(clean_lcsc_id)
+            else:
+                conversion_result = await self.easyeda_service.convert_lcsc_component(
+                    clean_lcsc_id, output_dir
+                )
 
             if conversion_result:
                 logger.info(f"Successfully converted {clean_lcsc_id} to KiCad format")
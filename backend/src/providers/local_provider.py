@@ -0,0 +1,81 @@
+"""
+In-process component data provider serving a fixed catalogue.
+
+Stands in for network providers in tests and offline development: register
+it with ProviderService (optionally alongside a ProviderCache) to exercise
+searches, SKU lookups and detail requests without network access.
+"""
+
+from collections import Counter
+
+from .base_provider import ComponentDataProvider, ComponentSearchResult
+
+
+class LocalProvider(ComponentDataProvider):
+    """
+    Provider answering from an in-memory list of parts.
+
+    Every lookup that reaches the provider is counted in calls (keyed by
+    search, details and sku), which makes cache hits observable.
+    """
+
+    def __init__(
+        self, parts: list[ComponentSearchResult] | None = None, name: str = "Local"
+    ):
+        super().__init__(name)
+        self.base_url = "local://"
+        self.rate_limit_delay = 0.0
+        self.parts = list(parts or [])
+        self.calls: Counter[str] = Counter()
+
+    async def search_components(
+        self, query: str, limit: int = 10
+    ) -> list[ComponentSearchResult]:
+        """Parts whose part number, manufacturer, description or SKU contain every term."""
+        self.calls["search"] += 1
+        terms = query.casefold().split()
+        matches = [
+            part
+            for part in self.parts
+            if all(term in self._search_text(part) for term in terms)
+        ]
+        return [part.model_copy(deep=True) for part in matches[:limit]]
+
+    async def get_component_details(
+        self, part_number: str, manufacturer: str | None = None
+    ) -> ComponentSearchResult | None:
+        """Part with the given part number (and manufacturer, if given)."""
+        self.calls["details"] += 1
+        for part in self.parts:
+            if part.part_number.upper() != part_number.strip().upper():
+                continue
+            if manufacturer and part.manufacturer.casefold() != manufacturer.casefold():
+                continue
+            return part.model_copy(deep=True)
+        return None
+
+    async def search_by_provider_sku(
+        self, provider_sku: str
+    ) -> ComponentSearchResult | None:
+        """Part with the given provider SKU."""
+        self.calls["sku"] += 1
+        sku = provider_sku.strip().upper()
+        for part in self.parts:
+            if (part.provider_part_id or "").upper() == sku:
+                return part.model_copy(deep=True)
+        return None
+
+    async def verify_connection(self) -> bool:
+        """The catalogue is always reachable."""
+        return True
+
+    @staticmethod
+    def _search_text(part: ComponentSearchResult) -> str:
+        return " ".join(
+            [
+                part.part_number,
+                part.manufacturer,
+                part.description,
+                part.provider_part_id or "",
+            ]
+        ).casefold()
@@ -39,6 +39,10 @@ from .stock_operations import (
     RemoveStockRequest,
     RemoveStockResponse,
     StockHistoryEntry,
+    StockTakeAdjustment,
+    StockTakeLine,
+    StockTakeRequest,
+    StockTakeResponse,
 )
 
 __all__ = [
@@ -50,6 +54,10 @@ __all__ = [
     "MoveStockRequest",
     "MoveStockResponse",
     "StockHistoryEntry",
+    "StockTakeLine",
+    "StockTakeRequest",
+    "StockTakeAdjustment",
+    "StockTakeResponse",
     # Analytics schemas - Enums
     "AggregationPeriod",
     "ForecastHorizon",
@@ -1130,3 +1130,136 @@ class TopVelocityResponse(BaseModel):
                 },
             }
         }
+
+
+class ColumnarExportFormat(str, Enum):
+    """File format for columnar analytics exports."""
+
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+class ColumnarTableExport(BaseModel):
+    """Result of exporting one table in a columnar export run."""
+
+    rows_exported: int = Field(..., description="Rows written in this run", ge=0)
+    rows_skipped: int = Field(
+        0, description="Rows left out because they have no timestamp", ge=0
+    )
+    files: list[str] = Field(
+        ..., description="Partition files written in this run (one per month)"
+    )
+    high_water_mark: str | None = Field(
+        None, description="Watermark timestamp the next run continues from"
+    )
+
+
+class ColumnarExportResponse(BaseModel):
+    """
+    Summary of an incremental Parquet/Arrow ledger export.
+
+    Files are written to a month-partitioned dataset directory that BI
+    tools (DuckDB, pandas, Spark) can query without touching the database.
+    """
+
+    run_id: str = Field(..., description="Identifier embedded in written file names")
+    format: ColumnarExportFormat = Field(..., description="File format written")
+    output_dir: str = Field(..., description="Dataset root directory")
+    tables: dict[str, ColumnarTableExport] = Field(
+        ..., description="Per-table export results keyed by table name"
+    )
+
+    class Config:
+        """Pydantic configuration."""
+
+        json_schema_extra = {
+            "example": {
+                "run_id": "20251018T020000-1a2b3c4d",
+                "format": "parquet",
+                "output_dir": "/app/data/analytics",
+                "tables": {
+                    "stock_transactions": {
+                        "rows_exported": 1250,
+                        "rows_skipped": 0,
+                        "files": [
+                            "/app/data/analytics/stock_transactions/month=2025-10/"
+                            "part-20251018T020000-1a2b3c4d.parquet"
+                        ],
+                        "high_water_mark": "2025-10-18 01:59:12",
+                    }
+                },
+            }
+        }
+
+
+# ==================== Anomaly Detection ====================
+
+
+class AnomalyStatus(str, Enum):
+    """Review state of a flagged stock anomaly."""
+
+    OPEN = "open"
+    ACKNOWLEDGED = "acknowledged"
+
+
+class AnomalyScanResponse(BaseModel):
+    """Summary of an incremental anomaly detection scan."""
+
+    scan_id: int = Field(..., description="Scan record ID")
+    transactions_scanned: int = Field(
+        ..., description="Removals evaluated in this scan", ge=0
+    )
+    anomalies_found: int = Field(..., description="Anomalies flagged", ge=0)
+    high_water_mark: str | None = Field(
+        None, description="Newest transaction timestamp evaluated so far"
+    )
+
+
+class StockAnomalyResponse(BaseModel):
+    """
+    Stock removal flagged as an outlier against the component's daily usage.
+
+    robust_score is the modified z-score 0.6745 * (quantity - median) / MAD.
+    """
+
+    id: int = Field(..., description="Anomaly ID")
+    transaction_id: str = Field(..., description="Flagged stock transaction UUID")
+    component_id: str = Field(..., description="Component UUID")
+    component_name: str = Field(..., description="Component name")
+    component_part_number: str | None = Field(None, description="Part number")
+    transaction_type: str = Field(..., description="Transaction type (remove/adjust)")
+    transaction_created_at: datetime | None = Field(
+        None, description="When the flagged transaction was recorded"
+    )
+    from_location_id: str | None = Field(None, description="Source location UUID")
+    user_name: str | None = Field(None, description="User who recorded the removal")
+    quantity: int = Field(..., description="Units removed", ge=0)
+    median_daily_removal: float = Field(
+        ..., description="Median daily removal at detection time"
+    )
+    mad_daily_removal: float = Field(
+        ..., description="Median absolute deviation of daily removals"
+    )
+    robust_score: float = Field(..., description="Modified z-score of the removal")
+    status: AnomalyStatus = Field(..., description="Review state")
+    detected_at: datetime | None = Field(None, description="When it was flagged")
+    acknowledged_at: datetime | None = Field(None, description="When it was reviewed")
+    acknowledged_by: str | None = Field(None, description="Reviewer username")
+    notes: str | None = Field(None, description="Reviewer notes")
+
+
+class AnomalyListResponse(BaseModel):
+    """List of flagged stock anomalies, highest score first."""
+
+    anomalies: list[StockAnomalyResponse] = Field(..., description="Anomalies")
+    total_count: int = Field(..., description="Number of anomalies returned", ge=0)
+
+
+class AnomalyAcknowledgeRequest(BaseModel):
+    """Request schema for acknowledging an anomaly."""
+
+    notes: str | None = Field(
+        None,
+        max_length=1000,
+        description="Optional reviewer notes (e.g., 'mis-scan, corrected')",
+    )
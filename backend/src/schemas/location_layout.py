@@ -5,6 +5,7 @@ This module defines all request/response schemas for the layout generation featu
 including comprehensive validation logic for multi-dimensional location layouts.
 """
 
+import string
 from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -77,7 +78,7 @@ class RangeSpecification(BaseModel):
         Validate range specification based on range_type.
 
         Rules:
-        - If letters: start/end must be single alphabetic characters, start <= end
+        - If letters: start/end must be single letters a-z, start <= end
         - If numbers: start/end must be 0-999, start <= end
         - capitalize only valid for letters
         - zero_pad only valid for numbers
@@ -92,10 +93,12 @@ class RangeSpecification(BaseModel):
                     "start and end must be single characters for letters range"
                 )
 
-            if not self.start.isalpha() or not self.end.isalpha():
-                raise ValueError(
-                    "start and end must be alphabetic characters for letters range"
-                )
+            # Only a-z: generation walks string.ascii_lowercase
+            if (
+                self.start not in string.ascii_letters
+                or self.end not in string.ascii_letters
+            ):
+                raise ValueError("start and end must be letters a-z for letters range")
 
             # Normalize to lowercase for comparison
             start_lower = self.start.lower()
@@ -160,6 +163,10 @@ class LayoutConfiguration(BaseModel):
     single_part_only: bool = Field(
         False, description="Whether locations can hold only one part"
     )
+    high_volume: bool = Field(
+        False,
+        description="Opt in to high-volume generation (up to 50,000 locations)",
+    )
 
     @field_validator("prefix")
     @classmethod
@@ -178,7 +185,7 @@ class LayoutConfiguration(BaseModel):
         - layout_type determines ranges length: single=0, row=1, grid=2, grid_3d=3
         - separators length must be len(ranges) - 1 (except single which needs 0)
         - prefix must not contain separator characters
-        - Total generated locations <= 500
+        - Total generated locations <= 500 (50,000 with high_volume)
         """
         # Validate ranges length based on layout_type
         expected_ranges = {
@@ -267,6 +274,22 @@ class PreviewResponse(BaseModel):
         return self
 
 
+class PreviewPageResponse(BaseModel):
+    """
+    One page of the location names a layout would generate.
+
+    Names are returned in generation order, starting at offset.
+    """
+
+    names: list[str] = Field(..., description="Names on this page")
+    offset: int = Field(..., description="Position of the first name")
+    limit: int = Field(..., description="Requested page size")
+    total_count: int = Field(
+        ..., description="Total number of locations the layout generates"
+    )
+    has_more: bool = Field(..., description="Whether names exist past this page")
+
+
 class BulkCreateResponse(BaseModel):
     """
     Result of bulk location creation operation.
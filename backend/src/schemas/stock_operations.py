@@ -364,3 +364,102 @@ class MoveStockResponse(BaseModel):
     pricing_inherited: bool = Field(
         ..., description="True if pricing data was copied from source to destination"
     )
+
+
+class StockTakeLine(BaseModel):
+    """One counted (location, component) quantity from a stock-take."""
+
+    location_id: UUID = Field(..., description="UUID of the counted storage location")
+    component_id: UUID = Field(..., description="UUID of the counted component")
+    counted_quantity: int = Field(
+        ..., ge=0, description="Quantity physically counted at the location"
+    )
+
+
+class StockTakeRequest(BaseModel):
+    """
+    Request schema for reconciling a stock-take (cycle count).
+
+    Lines for the same (location, component) are summed, so a bin counted
+    across several count sheets may appear more than once.
+
+    Examples:
+        Count two bins, treating them as fully counted:
+            {
+                "lines": [
+                    {
+                        "location_id": "660e8400-e29b-41d4-a716-446655440001",
+                        "component_id": "550e8400-e29b-41d4-a716-446655440000",
+                        "counted_quantity": 97
+                    },
+                    {
+                        "location_id": "660e8400-e29b-41d4-a716-446655440002",
+                        "component_id": "550e8400-e29b-41d4-a716-446655440000",
+                        "counted_quantity": 0
+                    }
+                ],
+                "complete_locations": true,
+                "comments": "Q1 cycle count, aisle 3"
+            }
+    """
+
+    lines: list[StockTakeLine] = Field(
+        ..., min_length=1, max_length=50_000, description="Counted quantities"
+    )
+    complete_locations: bool = Field(
+        False,
+        description=(
+            "Treat every counted location as fully counted: stock recorded "
+            "there but missing from the lines is adjusted to zero"
+        ),
+    )
+    dry_run: bool = Field(
+        False, description="Return the reconciliation report without applying it"
+    )
+    comments: str | None = Field(
+        None, description="Comments recorded on every adjustment transaction"
+    )
+
+
+class StockTakeAdjustment(BaseModel):
+    """Variance found for one (location, component) during a stock-take."""
+
+    component_id: UUID = Field(..., description="Component ID")
+    location_id: UUID = Field(..., description="Storage location ID")
+    previous_quantity: int = Field(..., description="Recorded quantity before count")
+    counted_quantity: int = Field(..., description="Counted quantity")
+    quantity_change: int = Field(..., description="counted - previous")
+    action: str = Field(
+        ...,
+        description=(
+            'How the variance is applied: "adjusted", "created" (new '
+            'ComponentLocation) or "removed" (counted zero, entry deleted)'
+        ),
+    )
+
+
+class StockTakeResponse(BaseModel):
+    """
+    Reconciliation report for a stock-take.
+
+    Every adjustment transaction written for the count shares batch_id.
+    """
+
+    batch_id: UUID = Field(..., description="Batch ID shared by all adjustments")
+    dry_run: bool = Field(..., description="True if nothing was written")
+    total_lines: int = Field(..., description="Lines received")
+    counted_locations: int = Field(..., description="Distinct locations counted")
+    counted_entries: int = Field(
+        ..., description="Distinct (location, component) pairs reconciled"
+    )
+    matched: int = Field(..., description="Entries whose count matched the record")
+    adjusted: int = Field(..., description="Entries with a variance")
+    units_added: int = Field(..., description="Total positive variance")
+    units_removed: int = Field(..., description="Total negative variance (positive)")
+    net_change: int = Field(..., description="units_added - units_removed")
+    variance_value: Decimal = Field(
+        ..., description="Net variance valued at location or average unit cost"
+    )
+    adjustments: list[StockTakeAdjustment] = Field(
+        default_factory=list, description="Entries with a variance"
+    )
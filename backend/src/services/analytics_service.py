@@ -9,7 +9,7 @@ and component_locations tables.
 import logging
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, case, desc, func, or_, select
 from sqlalchemy.orm import Session, joinedload
 
 from ..models import Component, ComponentLocation, StockTransaction, StorageLocation
@@ -118,33 +118,9 @@ class AnalyticsService:
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=UTC)
 
-        # Get transactions in date range
-        query = select(StockTransaction).where(
-            and_(
-                StockTransaction.component_id == component_id,
-                StockTransaction.created_at >= start_date,
-                StockTransaction.created_at <= end_date,
-            )
-        )
-
-        # Filter by location if specified (using to_location_id for add transactions)
-        if location_id:
-            query = query.where(
-                or_(
-                    StockTransaction.to_location_id == location_id,
-                    StockTransaction.from_location_id == location_id,
-                )
-            )
-
-        transactions = (
-            self.session.execute(query.order_by(StockTransaction.created_at))
-            .scalars()
-            .all()
-        )
-
         # Aggregate data by period
         data_points = self._aggregate_stock_by_period(
-            transactions, start_date, end_date, period, component_id, location_id
+            component_id, location_id, start_date, end_date, period
         )
 
         # Get current quantity and reorder threshold
@@ -197,23 +173,25 @@ class AnalyticsService:
 
     def _aggregate_stock_by_period(
         self,
-        transactions: list[StockTransaction],
+        component_id: str,
+        location_id: str | None,
         start_date: datetime,
         end_date: datetime,
         period: AggregationPeriod,
-        component_id: str,
-        location_id: str | None,
     ) -> list[StockDataPoint]:
         """
         Aggregate stock transactions into time-series data points.
 
+        Net change and transaction count per bucket come from a single
+        grouped query; Python only carries the running total and fills
+        buckets without transactions.
+
         Args:
-            transactions: List of transactions to aggregate
+            component_id: Component UUID
+            location_id: Optional location filter
             start_date: Start of date range
             end_date: End of date range
             period: Aggregation period
-            component_id: Component UUID
-            location_id: Optional location filter
 
         Returns:
             List of StockDataPoint objects
@@ -223,36 +201,35 @@ class AnalyticsService:
             component_id, location_id, start_date - timedelta(seconds=1)
         )
 
-        # Generate time buckets
-        time_buckets = self._generate_time_buckets(start_date, end_date, period)
+        bucket_key = self._period_bucket_key(period)
+        rows = self.session.execute(
+            select(
+                bucket_key.label("bucket"),
+                func.sum(StockTransaction.quantity_change).label("net_change"),
+                func.count(StockTransaction.id).label("transaction_count"),
+            )
+            .where(
+                *self._transaction_criteria(
+                    component_id, location_id, start_date, end_date
+                )
+            )
+            .group_by(bucket_key)
+        ).all()
+        totals = {row.bucket: row for row in rows}
 
-        # Aggregate transactions into buckets
         data_points = []
         running_quantity = initial_quantity
 
-        for bucket_start, bucket_end in time_buckets:
-            # Get transactions in this bucket
-            bucket_transactions = [
-                t
-                for t in transactions
-                if bucket_start
-                <= (
-                    t.created_at.replace(tzinfo=UTC)
-                    if t.created_at.tzinfo is None
-                    else t.created_at
-                )
-                < bucket_end
-            ]
-
-            # Calculate net change
-            net_change = sum(t.quantity_change for t in bucket_transactions)
-            running_quantity += net_change
+        for bucket_start in self._generate_time_buckets(start_date, end_date, period):
+            row = totals.get(bucket_start.strftime("%Y-%m-%d"))
+            if row is not None:
+                running_quantity += row.net_change
 
             data_points.append(
                 StockDataPoint(
-                    timestamp=bucket_start,
+                    timestamp=max(bucket_start, start_date),
                     quantity=max(0, running_quantity),  # Ensure non-negative
-                    transaction_count=len(bucket_transactions),
+                    transaction_count=row.transaction_count if row else 0,
                 )
             )
 
@@ -276,12 +253,12 @@ class AnalyticsService:
         if at_date.tzinfo is None:
             at_date = at_date.replace(tzinfo=UTC)
 
-        # Get all transactions before at_date
-        query = select(StockTransaction).where(
-            and_(
-                StockTransaction.component_id == component_id,
-                StockTransaction.created_at <= at_date,
-            )
+        # Sum quantity changes of all transactions up to at_date
+        query = select(
+            func.coalesce(func.sum(StockTransaction.quantity_change), 0)
+        ).where(
+            StockTransaction.component_id == component_id,
+            StockTransaction.created_at <= at_date,
         )
 
         if location_id:
@@ -292,41 +269,97 @@ class AnalyticsService:
                 )
             )
 
-        transactions = self.session.execute(query).scalars().all()
+        return self.session.execute(query).scalar_one()
+
+    def _transaction_criteria(
+        self,
+        component_id: str,
+        location_id: str | None,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list:
+        """
+        Build WHERE criteria for a component's transactions in a date range.
+
+        Args:
+            component_id: Component UUID
+            location_id: Optional location filter (matches source or destination)
+            start_date: Start of date range (inclusive)
+            end_date: End of date range (inclusive)
+
+        Returns:
+            List of SQLAlchemy criteria
+        """
+        criteria = [
+            StockTransaction.component_id == component_id,
+            StockTransaction.created_at >= start_date,
+            StockTransaction.created_at <= end_date,
+        ]
+        if location_id:
+            criteria.append(
+                or_(
+                    StockTransaction.to_location_id == location_id,
+                    StockTransaction.from_location_id == location_id,
+                )
+            )
+        return criteria
+
+    def _period_bucket_key(self, period: AggregationPeriod):
+        """
+        SQL expression mapping a transaction to its bucket start date.
+
+        Produces 'YYYY-MM-DD' of the day, the ISO week's Monday, or the first
+        of the calendar month, matching _generate_time_buckets.
 
-        # Sum quantity changes
-        return sum(t.quantity_change for t in transactions)
+        Args:
+            period: Aggregation period
+
+        Returns:
+            SQLAlchemy strftime expression
+        """
+        created_at = StockTransaction.created_at
+        if period == AggregationPeriod.WEEKLY:
+            # Step back six days, then forward to the next Monday (or same day)
+            return func.strftime("%Y-%m-%d", created_at, "-6 days", "weekday 1")
+        if period == AggregationPeriod.MONTHLY:
+            return func.strftime("%Y-%m-01", created_at)
+        return func.strftime("%Y-%m-%d", created_at)
 
     def _generate_time_buckets(
         self, start_date: datetime, end_date: datetime, period: AggregationPeriod
-    ) -> list[tuple[datetime, datetime]]:
+    ) -> list[datetime]:
         """
-        Generate time bucket boundaries for aggregation.
+        Generate calendar-aligned bucket start times covering a date range.
+
+        Daily buckets start at midnight UTC, weekly buckets on Monday (ISO
+        week) and monthly buckets on the first of the calendar month. The
+        first bucket is the one containing start_date.
 
         Args:
             start_date: Start of date range
-            end_date: End of date range
+            end_date: End of date range (inclusive)
             period: Aggregation period
 
         Returns:
-            List of (bucket_start, bucket_end) tuples
+            List of bucket start datetimes (UTC)
         """
-        buckets = []
-        current = start_date
-
-        if period == AggregationPeriod.DAILY:
-            delta = timedelta(days=1)
-        elif period == AggregationPeriod.WEEKLY:
-            delta = timedelta(weeks=1)
+        current = start_date.astimezone(UTC).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if period == AggregationPeriod.WEEKLY:
+            current -= timedelta(days=current.weekday())
         elif period == AggregationPeriod.MONTHLY:
-            delta = timedelta(days=30)  # Approximate month
-        else:
-            delta = timedelta(days=1)
+            current = current.replace(day=1)
 
-        while current < end_date:
-            bucket_end = min(current + delta, end_date)
-            buckets.append((current, bucket_end))
-            current = bucket_end
+        buckets = []
+        while current <= end_date:
+            buckets.append(current)
+            if period == AggregationPeriod.WEEKLY:
+                current += timedelta(weeks=1)
+            elif period == AggregationPeriod.MONTHLY:
+                current = (current + timedelta(days=32)).replace(day=1)
+            else:
+                current += timedelta(days=1)
 
         return buckets
 
@@ -376,32 +409,9 @@ class AnalyticsService:
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=UTC)
 
-        # Get transactions in date range
-        query = select(StockTransaction).where(
-            and_(
-                StockTransaction.component_id == component_id,
-                StockTransaction.created_at >= start_date,
-                StockTransaction.created_at <= end_date,
-            )
-        )
-
-        if location_id:
-            query = query.where(
-                or_(
-                    StockTransaction.to_location_id == location_id,
-                    StockTransaction.from_location_id == location_id,
-                )
-            )
-
-        transactions = (
-            self.session.execute(query.order_by(StockTransaction.created_at))
-            .scalars()
-            .all()
-        )
-
         # Aggregate usage by period
         trend_data = self._aggregate_usage_by_period(
-            transactions, start_date, end_date, period
+            component_id, location_id, start_date, end_date, period
         )
 
         # Calculate velocity metrics
@@ -411,12 +421,12 @@ class AnalyticsService:
 
         velocity = VelocityMetrics(
             daily_average=total_consumed / days_analyzed if days_analyzed > 0 else 0.0,
-            weekly_average=total_consumed / (days_analyzed / 7)
-            if days_analyzed >= 7
-            else 0.0,
-            monthly_average=total_consumed / (days_analyzed / 30)
-            if days_analyzed >= 30
-            else 0.0,
+            weekly_average=(
+                total_consumed / (days_analyzed / 7) if days_analyzed >= 7 else 0.0
+            ),
+            monthly_average=(
+                total_consumed / (days_analyzed / 30) if days_analyzed >= 30 else 0.0
+            ),
             total_consumed=total_consumed,
             days_analyzed=days_analyzed,
         )
@@ -437,7 +447,8 @@ class AnalyticsService:
 
     def _aggregate_usage_by_period(
         self,
-        transactions: list[StockTransaction],
+        component_id: str,
+        location_id: str | None,
         start_date: datetime,
         end_date: datetime,
         period: AggregationPeriod,
@@ -445,8 +456,12 @@ class AnalyticsService:
         """
         Aggregate transactions into usage trend data points.
 
+        Added and removed totals per bucket come from a single grouped
+        query; Python only fills buckets without transactions.
+
         Args:
-            transactions: List of transactions
+            component_id: Component UUID
+            location_id: Optional location filter
             start_date: Start of date range
             end_date: End of date range
             period: Aggregation period
@@ -454,42 +469,38 @@ class AnalyticsService:
         Returns:
             List of UsageTrendDataPoint objects
         """
-        time_buckets = self._generate_time_buckets(start_date, end_date, period)
-        data_points = []
-
-        for bucket_start, bucket_end in time_buckets:
-            # Get transactions in this bucket
-            bucket_transactions = [
-                t
-                for t in transactions
-                if bucket_start
-                <= (
-                    t.created_at.replace(tzinfo=UTC)
-                    if t.created_at.tzinfo is None
-                    else t.created_at
-                )
-                < bucket_end
-            ]
-
-            # Calculate added vs removed
-            added = sum(
-                t.quantity_change for t in bucket_transactions if t.quantity_change > 0
+        quantity_change = StockTransaction.quantity_change
+        bucket_key = self._period_bucket_key(period)
+        rows = self.session.execute(
+            select(
+                bucket_key.label("bucket"),
+                func.sum(case((quantity_change > 0, quantity_change), else_=0)).label(
+                    "added"
+                ),
+                func.sum(case((quantity_change < 0, -quantity_change), else_=0)).label(
+                    "removed"
+                ),
             )
-            removed = abs(
-                sum(
-                    t.quantity_change
-                    for t in bucket_transactions
-                    if t.quantity_change < 0
+            .where(
+                *self._transaction_criteria(
+                    component_id, location_id, start_date, end_date
                 )
             )
-            consumed = (
-                removed - added
-            )  # Net consumption (positive = removed more than added)
+            .group_by(bucket_key)
+        ).all()
+        totals = {row.bucket: row for row in rows}
+
+        data_points = []
+        for bucket_start in self._generate_time_buckets(start_date, end_date, period):
+            row = totals.get(bucket_start.strftime("%Y-%m-%d"))
+            added = row.added if row else 0
+            removed = row.removed if row else 0
 
             data_points.append(
                 UsageTrendDataPoint(
-                    timestamp=bucket_start,
-                    consumed=consumed,
+                    timestamp=max(bucket_start, start_date),
+                    consumed=removed
+                    - added,  # Net consumption (positive = removed more)
                     added=added,
                     removed=removed,
                 )
@@ -497,6 +508,30 @@ class AnalyticsService:
 
         return data_points
 
+    def daily_removals(self, *criteria):
+        """
+        Grouped query of units removed per component and day.
+
+        Days use the same buckets as daily usage trends; days without
+        removals have no row.
+
+        Args:
+            *criteria: Extra WHERE criteria on stock_transactions
+
+        Returns:
+            SQLAlchemy select of (component_id, day, removed)
+        """
+        bucket_key = self._period_bucket_key(AggregationPeriod.DAILY)
+        return (
+            select(
+                StockTransaction.component_id,
+                bucket_key.label("day"),
+                func.sum(-StockTransaction.quantity_change).label("removed"),
+            )
+            .where(StockTransaction.quantity_change < 0, *criteria)
+            .group_by(StockTransaction.component_id, bucket_key)
+        )
+
     # ==================== Stock Forecasting ====================
 
     def get_forecast(
@@ -687,9 +722,9 @@ class AnalyticsService:
                 suggested_quantity=None,
                 estimated_stockout_date=None,
                 days_until_stockout=None,
-                confidence_level=forecast_data[0].confidence_level
-                if forecast_data
-                else 0.8,
+                confidence_level=(
+                    forecast_data[0].confidence_level if forecast_data else 0.8
+                ),
             )
 
         # Calculate days until stockout
@@ -1047,9 +1082,9 @@ class AnalyticsService:
                     component_name=cl.component.name,
                     total_quantity=cl.quantity_on_hand,
                     daily_velocity=velocity,
-                    days_of_stock=days_of_stock
-                    if days_of_stock != float("inf")
-                    else 9999.0,
+                    days_of_stock=(
+                        days_of_stock if days_of_stock != float("inf") else 9999.0
+                    ),
                     last_used_date=last_used_date,
                     days_since_last_use=days_since_last_use,
                     inventory_value=inventory_value,
@@ -1381,9 +1416,11 @@ class AnalyticsService:
                     "monthly_velocity": velocity * 30,
                     "current_quantity": total_qty,
                     "days_until_stockout": days_until_stockout,
-                    "location_name": primary_loc.storage_location.name
-                    if primary_loc.storage_location
-                    else None,
+                    "location_name": (
+                        primary_loc.storage_location.name
+                        if primary_loc.storage_location
+                        else None
+                    ),
                 }
             )
 
@@ -0,0 +1,474 @@
+"""
+Anomaly detection over stock consumption data.
+
+Flags removals that are far outside a component's normal daily usage
+(mis-scans such as removing 10,000 instead of 10, or sudden shrinkage) so
+they can be reviewed before they distort velocity and forecasts.
+
+Statistics are robust to the very outliers being hunted: each component's
+baseline is the median of its daily removal totals, and spread is the
+median absolute deviation (MAD). A removal is flagged when its modified
+z-score 0.6745 * (quantity - median) / MAD exceeds the threshold
+(Iglewicz & Hoaglin recommend 3.5).
+
+Runs are incremental: each scan records the newest transaction timestamp
+it evaluated, and the next scan only looks at removals from that point on.
+Removals of a component without a baseline yet (fewer than MIN_ACTIVE_DAYS
+active days, e.g. a newly stocked part) are recorded as deferrals instead
+of holding the mark back. They are evaluated again when a later scan sees
+new removals of that component and it has a baseline, and are given up on
+once they fall out of the lookback window.
+Daily totals for the affected components come from AnalyticsService's
+daily removal buckets, and medians are computed in the same query with
+window functions (SQLite has no MEDIAN aggregate). Flagged rows are
+bulk-inserted, so a scan's cost tracks the number of new transactions
+rather than the size of the ledger.
+"""
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    String,
+    and_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.orm import Session, joinedload
+
+from ..models import (
+    Component,
+    StockAnomaly,
+    StockAnomalyDeferral,
+    StockAnomalyScan,
+    StockTransaction,
+    TransactionType,
+)
+from .analytics_service import AnalyticsService
+from .export_streaming import EXPORT_YIELD_PER
+
+logger = logging.getLogger(__name__)
+
+# Days of history used for each component's baseline
+ANOMALY_LOOKBACK_DAYS = 90
+
+# Modified z-score above which a removal is flagged
+ANOMALY_SCORE_THRESHOLD = 3.5
+
+# Components with fewer active days have no reliable baseline; their
+# removals are deferred to later scans until they leave the lookback window
+MIN_ACTIVE_DAYS = 5
+
+# MAD is floored at this fraction of the median (and at one unit), so perfectly
+# regular usage (MAD == 0) does not flag every small deviation
+MAD_FLOOR_RATIO = 0.25
+
+# Scales MAD to the standard deviation of a normal distribution
+MAD_CONSISTENCY = 0.6745
+
+# Flagged and deferred rows written per executemany round trip
+INSERT_BATCH_SIZE = 1000
+
+CREATED_KEY = type_coerce(StockTransaction.created_at, String)
+
+RESOLVE_DEFERRAL = delete(StockAnomalyDeferral).where(
+    StockAnomalyDeferral.transaction_id == bindparam("deferred_id")
+)
+
+REMOVAL_CRITERIA = (
+    StockTransaction.quantity_change < 0,
+    StockTransaction.transaction_type.in_(
+        [TransactionType.REMOVE, TransactionType.ADJUST]
+    ),
+)
+
+
+def _median_by_component(component_id, value):
+    """
+    Select the median of value per component, with its number of rows.
+
+    Rows are ranked within each component; the median is the middle row,
+    or the mean of the two middle rows for an even count.
+
+    Returns:
+        SQLAlchemy select of (component_id, median, days)
+    """
+    ranked = select(
+        component_id.label("component_id"),
+        value.label("value"),
+        func.row_number()
+        .over(partition_by=component_id, order_by=value)
+        .label("position"),
+        func.count().over(partition_by=component_id).label("days"),
+    ).subquery()
+    return (
+        select(
+            ranked.c.component_id,
+            func.avg(ranked.c.value).label("median"),
+            func.max(ranked.c.days).label("days"),
+        )
+        .where(
+            ranked.c.position.between(
+                (ranked.c.days + 1) // 2, (ranked.c.days + 2) // 2
+            )
+        )
+        .group_by(ranked.c.component_id)
+    )
+
+
+class AnomalyDetectionService:
+    """
+    Service for detecting and reviewing anomalous stock removals.
+
+    Provides methods for:
+    - Incremental detection scans over new removals
+    - Listing flagged anomalies with filters
+    - Acknowledging reviewed anomalies
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize service with database session.
+
+        Args:
+            session: SQLAlchemy session for database operations
+        """
+        self.session = session
+
+    # ==================== Detection ====================
+
+    def run_scan(
+        self,
+        lookback_days: int = ANOMALY_LOOKBACK_DAYS,
+        threshold: float = ANOMALY_SCORE_THRESHOLD,
+    ) -> dict:
+        """
+        Evaluate removals created since the previous scan and flag outliers.
+
+        The high-water mark always advances to the newest removal read.
+        Removals whose component has no baseline yet are recorded as
+        deferrals; those of components with new removals in this scan are
+        re-evaluated alongside them and resolved once a baseline exists.
+
+        Args:
+            lookback_days: Days of history used for each component's baseline
+            threshold: Modified z-score above which a removal is flagged
+
+        Returns:
+            Scan summary (scan_id, transactions_scanned, anomalies_found,
+            high_water_mark)
+        """
+        previous_mark = self.session.execute(
+            select(StockAnomalyScan.high_water_mark)
+            .where(StockAnomalyScan.high_water_mark.is_not(None))
+            .order_by(StockAnomalyScan.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+        new_criteria = [
+            *REMOVAL_CRITERIA,
+            ~exists().where(StockAnomaly.transaction_id == StockTransaction.id),
+            ~exists().where(StockAnomalyDeferral.transaction_id == StockTransaction.id),
+        ]
+        if previous_mark:
+            # >= so rows sharing the boundary timestamp are not missed;
+            # already-flagged and deferred rows are excluded above
+            new_criteria.append(CREATED_KEY >= previous_mark)
+
+        window_start = datetime.now(UTC) - timedelta(days=lookback_days)
+
+        # Deferred removals outside the window can no longer be evaluated
+        self.session.execute(
+            delete(StockAnomalyDeferral).where(
+                StockAnomalyDeferral.transaction_id.in_(
+                    select(StockTransaction.id).where(
+                        StockTransaction.created_at < window_start
+                    )
+                )
+            )
+        )
+
+        # Only components with new removals can have gained a baseline
+        new_components = (
+            select(StockTransaction.component_id).where(*new_criteria).distinct()
+        )
+        baselines = self._component_baselines(new_components, window_start)
+
+        is_deferred = StockTransaction.id.in_(
+            select(StockAnomalyDeferral.transaction_id).where(
+                StockAnomalyDeferral.component_id.in_(new_components)
+            )
+        )
+        candidates = self.session.execute(
+            select(
+                StockTransaction.id,
+                StockTransaction.component_id,
+                StockTransaction.quantity_change,
+                CREATED_KEY.label("created_key"),
+                (StockTransaction.created_at >= window_start).label("in_window"),
+                is_deferred.label("deferred"),
+            )
+            .where(or_(and_(*new_criteria), is_deferred))
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+
+        scanned = 0
+        found = 0
+        high_water_mark = previous_mark
+        pending: list[dict] = []
+        deferrals: list[dict] = []
+        resolved: list[dict] = []
+
+        for row in candidates:
+            scanned += 1
+            if (
+                not row.deferred
+                and row.created_key
+                and (high_water_mark is None or row.created_key > high_water_mark)
+            ):
+                high_water_mark = row.created_key
+
+            baseline = baselines.get(row.component_id)
+            if baseline is None:
+                if row.in_window and not row.deferred:
+                    deferrals.append(
+                        {"transaction_id": row.id, "component_id": row.component_id}
+                    )
+                    if len(deferrals) >= INSERT_BATCH_SIZE:
+                        self._execute_batch(insert(StockAnomalyDeferral), deferrals)
+                continue
+
+            if row.deferred:
+                resolved.append({"deferred_id": row.id})
+                if len(resolved) >= INSERT_BATCH_SIZE:
+                    self._execute_batch(RESOLVE_DEFERRAL, resolved)
+
+            median, mad = baseline
+            quantity = -row.quantity_change
+            score = MAD_CONSISTENCY * (quantity - median) / mad
+            if score <= threshold:
+                continue
+
+            pending.append(
+                {
+                    "transaction_id": row.id,
+                    "component_id": row.component_id,
+                    "quantity": quantity,
+                    "median_daily_removal": median,
+                    "mad_daily_removal": mad,
+                    "robust_score": round(score, 2),
+                    "status": "open",
+                }
+            )
+            if len(pending) >= INSERT_BATCH_SIZE:
+                found += self._execute_batch(insert(StockAnomaly), pending)
+
+        found += self._execute_batch(insert(StockAnomaly), pending)
+        self._execute_batch(insert(StockAnomalyDeferral), deferrals)
+        self._execute_batch(RESOLVE_DEFERRAL, resolved)
+
+        scan = StockAnomalyScan(
+            high_water_mark=high_water_mark,
+            transactions_scanned=scanned,
+            anomalies_found=found,
+        )
+        self.session.add(scan)
+        self.session.commit()
+
+        logger.info(
+            f"Anomaly scan {scan.id}: {scanned} removals evaluated, "
+            f"{found} anomalies flagged"
+        )
+
+        return {
+            "scan_id": scan.id,
+            "transactions_scanned": scanned,
+            "anomalies_found": found,
+            "high_water_mark": high_water_mark,
+        }
+
+    def _component_baselines(
+        self, component_ids, window_start: datetime
+    ) -> dict[str, tuple[float, float]]:
+        """
+        Compute median and (floored) MAD of daily removals per component.
+
+        Daily totals, their medians and the medians of the absolute
+        deviations are computed in one query for every affected component;
+        days without removals are not part of the baseline.
+
+        Args:
+            component_ids: Subquery selecting the components to evaluate
+            window_start: Start of the history to include
+
+        Returns:
+            Mapping of component_id to (median, mad)
+        """
+        daily = (
+            AnalyticsService(self.session)
+            .daily_removals(
+                *REMOVAL_CRITERIA,
+                StockTransaction.created_at >= window_start,
+                StockTransaction.component_id.in_(component_ids),
+            )
+            .cte("daily")
+        )
+
+        medians = _median_by_component(daily.c.component_id, daily.c.removed).cte(
+            "medians"
+        )
+        deviations = (
+            select(
+                daily.c.component_id,
+                func.abs(daily.c.removed - medians.c.median).label("deviation"),
+            )
+            .join_from(daily, medians, daily.c.component_id == medians.c.component_id)
+            .where(medians.c.days >= MIN_ACTIVE_DAYS)
+            .subquery()
+        )
+        mads = _median_by_component(
+            deviations.c.component_id, deviations.c.deviation
+        ).subquery()
+
+        rows = self.session.execute(
+            select(
+                medians.c.component_id,
+                medians.c.median,
+                mads.c.median.label("mad"),
+            ).join_from(medians, mads, medians.c.component_id == mads.c.component_id)
+        )
+
+        return {
+            row.component_id: (
+                float(row.median),
+                max(float(row.mad), row.median * MAD_FLOOR_RATIO, 1.0),
+            )
+            for row in rows
+        }
+
+    def _execute_batch(self, statement, rows: list[dict]) -> int:
+        """Run a bulk statement over buffered rows (executemany) and clear them."""
+        if not rows:
+            return 0
+        # Core execution: the ORM has no bulk DELETE by bound parameters
+        self.session.connection().execute(statement, rows)
+        count = len(rows)
+        rows.clear()
+        return count
+
+    # ==================== Review ====================
+
+    def list_anomalies(
+        self,
+        status: str | None = "open",
+        component_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """
+        List flagged anomalies, highest score first.
+
+        Args:
+            status: Filter by review state (None = all)
+            component_id: Filter by component UUID
+            limit: Maximum number of records
+
+        Returns:
+            List of anomaly dictionaries with transaction details
+        """
+        query = select(StockAnomaly).options(
+            joinedload(StockAnomaly.transaction),
+            joinedload(StockAnomaly.component),
+        )
+        if status:
+            query = query.where(StockAnomaly.status == status)
+        if component_id:
+            query = query.where(StockAnomaly.component_id == component_id)
+
+        query = query.order_by(StockAnomaly.robust_score.desc()).limit(limit)
+        anomalies = self.session.execute(query).scalars().all()
+        return [self._to_dict(anomaly) for anomaly in anomalies]
+
+    def acknowledge_anomaly(
+        self, anomaly_id: int, username: str | None = None, notes: str | None = None
+    ) -> dict:
+        """
+        Mark an anomaly as reviewed.
+
+        Args:
+            anomaly_id: Anomaly primary key
+            username: Reviewer recorded on the anomaly
+            notes: Optional reviewer notes
+
+        Returns:
+            Updated anomaly dictionary
+
+        Raises:
+            HTTPException(404): Anomaly not found
+            HTTPException(400): Anomaly already acknowledged
+        """
+        anomaly = self.session.get(StockAnomaly, anomaly_id)
+        if not anomaly:
+            raise HTTPException(
+                status_code=404, detail=f"Anomaly {anomaly_id} not found"
+            )
+
+        if anomaly.status != "open":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Anomaly {anomaly_id} is not open (status: {anomaly.status})",
+            )
+
+        anomaly.status = "acknowledged"
+        anomaly.acknowledged_at = datetime.now(UTC)
+        anomaly.acknowledged_by = username
+        if notes:
+            anomaly.notes = notes
+
+        self.session.commit()
+        self.session.refresh(anomaly)
+
+        logger.info(f"Anomaly {anomaly_id} acknowledged by {username}")
+        return self._to_dict(anomaly)
+
+    # ==================== Helpers ====================
+
+    def _to_dict(self, anomaly: StockAnomaly) -> dict:
+        """
+        Convert ORM model to dictionary for response.
+
+        Args:
+            anomaly: StockAnomaly instance with loaded relationships
+
+        Returns:
+            Dict with anomaly and transaction details
+        """
+        transaction = anomaly.transaction
+        component: Component = anomaly.component
+
+        return {
+            "id": anomaly.id,
+            "transaction_id": anomaly.transaction_id,
+            "component_id": anomaly.component_id,
+            "component_name": component.name,
+            "component_part_number": component.part_number,
+            "transaction_type": transaction.transaction_type.value,
+            "transaction_created_at": transaction.created_at,
+            "from_location_id": transaction.from_location_id,
+            "user_name": transaction.user_name,
+            "quantity": anomaly.quantity,
+            "median_daily_removal": anomaly.median_daily_removal,
+            "mad_daily_removal": anomaly.mad_daily_removal,
+            "robust_score": anomaly.robust_score,
+            "status": anomaly.status,
+            "detected_at": anomaly.detected_at,
+            "acknowledged_at": anomaly.acknowledged_at,
+            "acknowledged_by": anomaly.acknowledged_by,
+            "notes": anomaly.notes,
+        }
@@ -0,0 +1,425 @@
+"""
+Content-addressed, reference-counted blob store.
+
+Attachments, provider resource downloads and custom KiCad files used to be
+written to per-component (or per-provider-link) directories, so the same
+manufacturer datasheet was stored once for every resistor value linking to
+it. BlobStore keeps a single copy of each distinct file:
+
+- files are keyed by SHA-256 under <root>/aa/bb/<sha256><ext>; storing
+  content that is already present discards the new copy
+- the database column referencing the file holds the blob path, and SQLite
+  triggers on those columns keep blobs.ref_count up to date (see
+  models.blob), whichever code path inserts, updates or deletes the row
+- collect_garbage removes blobs no longer referenced, after a grace period
+  that covers files stored but not yet committed by their owner
+
+Derived files of a blob (image thumbnails) share its digest prefix and are
+collected with it.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from ..database import get_session
+from ..models.attachment import Attachment
+from ..models.blob import BLOB_REFERENCE_COLUMNS, Blob, blob_reference_counts_sql
+from ..models.easyeda_conversion import EasyEDAConversion
+from ..models.kicad_data import KiCadLibraryData
+from ..models.resource import Resource
+
+logger = logging.getLogger(__name__)
+
+# Unreferenced blobs (and abandoned incoming files) younger than this are
+# kept, so a file stored just before its owner row commits is never collected
+BLOB_GC_GRACE = timedelta(hours=1)
+
+# Bytes read per chunk when hashing or copying
+BLOB_CHUNK_SIZE = 64 * 1024
+
+# Suffix of thumbnails stored next to an image blob
+THUMBNAIL_SUFFIX = "_thumb.jpg"
+
+# Attributes of the models holding blob paths, per table
+_REFERENCE_MODELS = {
+    "attachments": Attachment,
+    "resources": Resource,
+    "kicad_library_data": KiCadLibraryData,
+    "easyeda_conversions": EasyEDAConversion,
+}
+
+
+@dataclass
+class StoredBlob:
+    """A file placed in the blob store."""
+
+    sha256: str
+    path: Path
+    size: int
+    deduplicated: bool
+
+
+def blob_sha256(path: str | Path | None) -> str | None:
+    """
+    Digest of the blob a path points to, or None if it is not a blob path.
+
+    Only the last "blobs/aa/bb/<sha256><ext>" segments are matched, so the
+    install path may itself contain "blobs/". Mirrors
+    models.blob.blob_sha256_sql, which the reference triggers use.
+    """
+    if not path:
+        return None
+    directory, _, name = Path(path).as_posix().rpartition("/")
+    if not fnmatchcase(f"{directory}/", "*blobs/[0-9a-f][0-9a-f]/[0-9a-f][0-9a-f]/"):
+        return None
+    sha256 = name[:64]
+    if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+        return None
+    return sha256
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(BLOB_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _clean_extension(extension: str) -> str:
+    """Lower-case extension with its dot, or "" if it is not a plain suffix."""
+    extension = extension.lower()
+    if not extension:
+        return ""
+    if not extension.startswith("."):
+        extension = f".{extension}"
+    if len(extension) > 16 or not all(c.isalnum() or c in "._" for c in extension[1:]):
+        return ""
+    return extension
+
+
+class BlobStore:
+    """Content-addressed file store with garbage collection."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        session_factory: Callable[[], Session] = get_session,
+    ):
+        """
+        Initialize the blob store.
+
+        Args:
+            root: Directory holding the blobs (must be named "blobs", which
+                the reference triggers look for in stored paths)
+            session_factory: Creates sessions for reference counts
+        """
+        self.root = Path(root)
+        self.session_factory = session_factory
+        # Serialises placing a blob against collecting it
+        self._lock = threading.Lock()
+
+    @property
+    def incoming_dir(self) -> Path:
+        """Directory for files being written before they are stored."""
+        incoming = self.root / ".incoming"
+        incoming.mkdir(parents=True, exist_ok=True)
+        return incoming
+
+    def path_for(self, sha256: str, extension: str = "") -> Path:
+        """Path of the blob with this digest and extension."""
+        return self.root / sha256[:2] / sha256[2:4] / f"{sha256}{extension}"
+
+    def put_file(
+        self, source: str | Path, extension: str = "", sha256: str | None = None
+    ) -> StoredBlob:
+        """
+        Move a file into the store.
+
+        The source should be on the same filesystem (see incoming_dir) so the
+        move is an atomic rename. If the content is already stored the source
+        is deleted instead. Either way the source no longer exists afterwards.
+
+        Args:
+            source: File to store
+            extension: File extension kept on the blob (e.g. ".pdf")
+            sha256: Digest of the file, if already known
+
+        Returns:
+            StoredBlob with digest, path and size
+        """
+        source = Path(source)
+        sha256 = sha256 or file_sha256(source)
+        path = self.path_for(sha256, _clean_extension(extension))
+        size = source.stat().st_size
+
+        with self._lock:
+            deduplicated = path.exists()
+            if deduplicated:
+                # Restart the grace period of a blob that may be unreferenced
+                os.utime(path)
+                source.unlink()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(source, path)
+
+        if deduplicated:
+            logger.debug(f"Deduplicated {size} bytes as blob {sha256}")
+        return StoredBlob(sha256, path, size, deduplicated)
+
+    def put_bytes(self, content: bytes, extension: str = "") -> StoredBlob:
+        """Store file content held in memory."""
+        incoming = self.incoming_dir / uuid.uuid4().hex
+        try:
+            incoming.write_bytes(content)
+            return self.put_file(
+                incoming, extension, hashlib.sha256(content).hexdigest()
+            )
+        finally:
+            incoming.unlink(missing_ok=True)
+
+    def put_stream(self, stream: BinaryIO, extension: str = "") -> StoredBlob:
+        """Store the content of a binary file object, copied in chunks."""
+        incoming = self.incoming_dir / uuid.uuid4().hex
+        digest = hashlib.sha256()
+        try:
+            with open(incoming, "wb") as f:
+                while chunk := stream.read(BLOB_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+            return self.put_file(incoming, extension, digest.hexdigest())
+        finally:
+            incoming.unlink(missing_ok=True)
+
+    def _blob_files(self) -> dict[str, list[Path]]:
+        """Files in the store grouped by digest."""
+        files: dict[str, list[Path]] = {}
+        if not self.root.exists():
+            return files
+        for path in self.root.glob("??/??/*"):
+            if path.is_file():
+                files.setdefault(path.name[:64], []).append(path)
+        return files
+
+    def collect_garbage(self, grace: timedelta = BLOB_GC_GRACE) -> dict:
+        """
+        Delete blobs that are no longer referenced.
+
+        Blob rows whose count dropped to zero are removed, then every blob
+        file without a referenced row is deleted once all files sharing its
+        digest are older than the grace period. Abandoned incoming files are
+        removed after the same period.
+
+        Args:
+            grace: Minimum age of unreferenced files before they are deleted
+
+        Returns:
+            Dictionary with blobs_removed, bytes_freed and incoming_removed
+        """
+        cutoff = time.time() - grace.total_seconds()
+
+        with self.session_factory() as session:
+            session.execute(delete(Blob).where(Blob.ref_count <= 0))
+            session.commit()
+            referenced = set(session.scalars(select(Blob.sha256)))
+
+        blobs_removed = 0
+        bytes_freed = 0
+        for sha256, paths in self._blob_files().items():
+            if sha256 in referenced:
+                continue
+            with self._lock:
+                try:
+                    stats = [path.stat() for path in paths]
+                except FileNotFoundError:
+                    continue
+                if any(stat.st_mtime >= cutoff for stat in stats):
+                    continue
+                for path in paths:
+                    path.unlink(missing_ok=True)
+            blobs_removed += 1
+            bytes_freed += sum(stat.st_size for stat in stats)
+
+        incoming_removed = 0
+        for path in self.incoming_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    incoming_removed += 1
+            except FileNotFoundError:
+                continue
+
+        if blobs_removed:
+            logger.info(
+                f"Blob garbage collection removed {blobs_removed} blobs "
+                f"({bytes_freed} bytes)"
+            )
+        return {
+            "blobs_removed": blobs_removed,
+            "bytes_freed": bytes_freed,
+            "incoming_removed": incoming_removed,
+        }
+
+    def recount(self) -> int:
+        """
+        Rebuild reference counts from the referencing columns.
+
+        The triggers keep counts current; this repairs them after direct
+        edits with triggers disabled, such as restoring a table from backup.
+
+        Returns:
+            Number of referenced blobs
+        """
+        with self.session_factory() as session:
+            session.execute(delete(Blob))
+            session.execute(
+                text(
+                    "INSERT INTO blobs (sha256, ref_count, updated_at) "
+                    f"SELECT *, CURRENT_TIMESTAMP FROM ({blob_reference_counts_sql()})"
+                )
+            )
+            session.commit()
+            return session.query(Blob).count()
+
+    def adopt_existing_files(self, attachment_root: Path) -> dict:
+        """
+        Move files stored outside the blob store into it.
+
+        Rewrites each referencing column to the blob path, then deletes the
+        old file once the new path is committed. Identical files collapse
+        into one blob. Missing files are left as they are.
+
+        Args:
+            attachment_root: Directory attachment paths are relative to
+
+        Returns:
+            Dictionary with files_adopted, files_missing and bytes_saved
+        """
+        adopted = 0
+        missing = 0
+        bytes_saved = 0
+
+        for table, columns in BLOB_REFERENCE_COLUMNS.items():
+            model = _REFERENCE_MODELS[table]
+            for column in columns:
+                attribute = getattr(model, column)
+                with self.session_factory() as session:
+                    rows = session.scalars(
+                        select(model).where(
+                            attribute.is_not(None),
+                            attribute.not_like("%blobs/%"),
+                        )
+                    ).all()
+                    for row in rows:
+                        old_value = getattr(row, column)
+                        relative = table == "attachments"
+                        old_path = (
+                            attachment_root / old_value if relative else Path(old_value)
+                        )
+                        if not old_path.is_file():
+                            missing += 1
+                            continue
+
+                        copy = self.incoming_dir / uuid.uuid4().hex
+                        shutil.copyfile(old_path, copy)
+                        stored = self.put_file(copy, old_path.suffix)
+                        new_path = stored.path
+                        setattr(
+                            row,
+                            column,
+                            (
+                                str(new_path.relative_to(attachment_root))
+                                if relative
+                                else str(new_path)
+                            ),
+                        )
+                        if table == "attachments" and row.thumbnail_path:
+                            row.thumbnail_path = self._adopt_thumbnail(
+                                attachment_root, row.thumbnail_path, stored
+                            )
+                        session.commit()
+
+                        old_path.unlink(missing_ok=True)
+                        adopted += 1
+                        if stored.deduplicated:
+                            bytes_saved += stored.size
+
+        logger.info(
+            f"Adopted {adopted} files into the blob store, "
+            f"{bytes_saved} bytes deduplicated"
+        )
+        return {
+            "files_adopted": adopted,
+            "files_missing": missing,
+            "bytes_saved": bytes_saved,
+        }
+
+    def _adopt_thumbnail(
+        self, attachment_root: Path, thumbnail_path: str, stored: StoredBlob
+    ) -> str:
+        """Move an attachment thumbnail next to its adopted blob."""
+        new_thumbnail = self.path_for(stored.sha256, THUMBNAIL_SUFFIX)
+        old_thumbnail = attachment_root / thumbnail_path
+        if old_thumbnail.is_file():
+            if new_thumbnail.exists():
+                old_thumbnail.unlink()
+            else:
+                shutil.move(old_thumbnail, new_thumbnail)
+        elif not new_thumbnail.exists():
+            return thumbnail_path
+        return str(new_thumbnail.relative_to(attachment_root))
+
+    def get_statistics(self) -> dict:
+        """
+        Get blob store usage.
+
+        Returns:
+            Dictionary with blob and reference counts, bytes stored on disk,
+            bytes the references would take without deduplication, and the
+            difference saved
+        """
+        sizes: dict[str, int] = {}
+        stored_bytes = 0
+        for sha256, paths in self._blob_files().items():
+            for path in paths:
+                try:
+                    size = path.stat().st_size
+                except FileNotFoundError:
+                    continue
+                stored_bytes += size
+                if not path.name.endswith(THUMBNAIL_SUFFIX):
+                    sizes[sha256] = max(sizes.get(sha256, 0), size)
+
+        with self.session_factory() as session:
+            counts = dict(
+                session.execute(
+                    select(Blob.sha256, Blob.ref_count).where(Blob.ref_count > 0)
+                ).all()
+            )
+
+        referenced_bytes = sum(
+            sizes.get(sha256, 0) * ref_count for sha256, ref_count in counts.items()
+        )
+        return {
+            "blobs": len(sizes),
+            "referenced_blobs": len(counts),
+            "references": sum(counts.values()),
+            "stored_bytes": stored_bytes,
+            "referenced_bytes": referenced_bytes,
+            "saved_bytes": max(0, referenced_bytes - stored_bytes),
+        }
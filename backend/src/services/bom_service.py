@@ -3,25 +3,42 @@ BOM (Bill of Materials) generation service with provider SKU integration.
 Generates BOMs from project components and integrates with provider data.
 """
 
-import csv
-import io
-import json
+import asyncio
 import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterator
 from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+
 from ..database import get_session
-from ..models import Component, ComponentProviderData, Project, ProjectComponent
+from ..models import (
+    Component,
+    ComponentDataProvider,
+    ComponentProviderData,
+    Project,
+    ProjectComponent,
+)
+from ..providers.base_provider import ComponentSearchResult
+from .export_streaming import iter_csv, iter_json, iter_ndjson, iter_text
 from .provider_service import ProviderService
 
 logger = logging.getLogger(__name__)
 
+# Provider searches in flight at once while refreshing a BOM
+BOM_REFRESH_CONCURRENCY = 8
+
 
 class BOMExportFormat:
     """BOM export format enumeration"""
 
     CSV = "csv"
     JSON = "json"
+    NDJSON = "ndjson"
     KICAD = "kicad"
     EXCEL = "excel"
 
@@ -46,9 +63,9 @@ class BOMItem:
             "part_number": self.component.part_number,
             "manufacturer": self.component.manufacturer,
             "description": self.component.notes,
-            "category": self.component.category.name
-            if self.component.category
-            else None,
+            "category": (
+                self.component.category.name if self.component.category else None
+            ),
             "quantity": self.quantity,
             "unit_cost": None,
             "total_cost": None,
@@ -64,9 +81,11 @@ class BOMItem:
             item.update(
                 {
                     "provider_sku": self.provider_data.provider_part_id,
-                    "provider_name": self.provider_data.provider_id.split("_")[0]
-                    if "_" in self.provider_data.provider_id
-                    else self.provider_data.provider_id,
+                    "provider_name": (
+                        self.provider_data.provider.name
+                        if self.provider_data.provider
+                        else None
+                    ),
                     "provider_url": self.provider_data.provider_url,
                     "availability": self.provider_data.availability,
                 }
@@ -97,8 +116,13 @@ class BOMItem:
 class BOMService:
     """Service for generating Bills of Materials with provider integration"""
 
-    def __init__(self):
-        self.provider_service = ProviderService()
+    def __init__(
+        self,
+        provider_service: ProviderService | None = None,
+        session_factory: Callable[[], Session] = get_session,
+    ):
+        self.provider_service = provider_service or ProviderService()
+        self.session_factory = session_factory
 
     async def generate_project_bom(
         self,
@@ -113,11 +137,12 @@ class BOMService:
             project_id: Project ID
             include_provider_data: Whether to include provider data
             refresh_provider_data: Whether to refresh provider data from APIs
+                (components without provider data are always refreshed)
 
         Returns:
             List of BOM items
         """
-        session = get_session()
+        session = self.session_factory()
         try:
             # Get project and its components
             project = session.query(Project).filter(Project.id == project_id).first()
@@ -126,36 +151,36 @@ class BOMService:
 
             project_components = (
                 session.query(ProjectComponent)
+                .options(
+                    selectinload(ProjectComponent.component).selectinload(
+                        Component.category
+                    )
+                )
                 .filter(ProjectComponent.project_id == project_id)
                 .all()
             )
-
-            bom_items = []
-
-            for pc in project_components:
-                component = pc.component
-                provider_data = None
-
-                if include_provider_data:
-                    # Get existing provider data
-                    provider_data = (
-                        session.query(ComponentProviderData)
-                        .filter(ComponentProviderData.component_id == component.id)
-                        .first()
-                    )
-
-                    # Refresh provider data if requested
-                    if refresh_provider_data or not provider_data:
-                        await self._refresh_component_provider_data(component.id)
-                        # Re-query after refresh
-                        provider_data = (
-                            session.query(ComponentProviderData)
-                            .filter(ComponentProviderData.component_id == component.id)
-                            .first()
-                        )
-
-                bom_item = BOMItem(component, pc.quantity, provider_data)
-                bom_items.append(bom_item)
+            component_ids = [pc.component_id for pc in project_components]
+
+            provider_data = {}
+            if include_provider_data:
+                provider_data = self._load_provider_data(session, component_ids)
+
+                stale = [
+                    pc.component
+                    for pc in project_components
+                    if refresh_provider_data or pc.component_id not in provider_data
+                ]
+                if stale and await self._refresh_provider_data(stale):
+                    provider_data = self._load_provider_data(session, component_ids)
+
+            bom_items = [
+                BOMItem(
+                    pc.component,
+                    pc.quantity_allocated,
+                    provider_data.get(pc.component_id),
+                )
+                for pc in project_components
+            ]
 
             logger.info(
                 f"Generated BOM for project {project_id} with {len(bom_items)} items"
@@ -180,29 +205,30 @@ class BOMService:
         Returns:
             List of BOM items
         """
-        session = get_session()
+        session = self.session_factory()
         try:
-            bom_items = []
+            component_ids = list(
+                dict.fromkeys(component_id for component_id, _ in component_quantities)
+            )
+            components = {
+                component.id: component
+                for component in session.query(Component)
+                .options(selectinload(Component.category))
+                .filter(Component.id.in_(component_ids))
+            }
+
+            provider_data = {}
+            if include_provider_data:
+                provider_data = self._load_provider_data(session, component_ids)
 
+            bom_items = []
             for component_id, quantity in component_quantities:
-                component = (
-                    session.query(Component)
-                    .filter(Component.id == component_id)
-                    .first()
-                )
+                component = components.get(component_id)
                 if not component:
                     logger.warning(f"Component not found: {component_id}")
                     continue
 
-                provider_data = None
-                if include_provider_data:
-                    provider_data = (
-                        session.query(ComponentProviderData)
-                        .filter(ComponentProviderData.component_id == component_id)
-                        .first()
-                    )
-
-                bom_item = BOMItem(component, quantity, provider_data)
+                bom_item = BOMItem(component, quantity, provider_data.get(component_id))
                 bom_items.append(bom_item)
 
             logger.info(
@@ -213,65 +239,171 @@ class BOMService:
         finally:
             session.close()
 
-    async def _refresh_component_provider_data(self, component_id: str):
-        """Refresh provider data for a component"""
-        session = get_session()
-        try:
-            component = (
-                session.query(Component).filter(Component.id == component_id).first()
-            )
-            if not component:
-                return
+    def _load_provider_data(
+        self, session: Session, component_ids: list[str]
+    ) -> dict[str, ComponentProviderData]:
+        """Most recently cached provider data per component, in one query"""
+        if not component_ids:
+            return {}
+
+        rows = session.scalars(
+            select(ComponentProviderData)
+            .options(joinedload(ComponentProviderData.provider))
+            .where(ComponentProviderData.component_id.in_(component_ids))
+            .order_by(ComponentProviderData.cached_at.desc())
+            .execution_options(populate_existing=True)
+        )
+        provider_data = {}
+        for row in rows:
+            provider_data.setdefault(row.component_id, row)
+        return provider_data
 
-            # Search for component in providers
-            search_results = await self.provider_service.search_components(
-                query=component.part_number, limit=1
-            )
+    async def _refresh_provider_data(self, components: list[Component]) -> int:
+        """
+        Refresh provider data for components from provider searches.
 
-            if search_results:
-                result = search_results[0]
+        Each distinct part number is searched once, however many components
+        share it, with at most BOM_REFRESH_CONCURRENCY searches in flight
+        (ProviderService paces the requests per provider). Results are
+        written with a single upsert.
 
-                # Update or create provider data
-                provider_data = (
-                    session.query(ComponentProviderData)
-                    .filter(ComponentProviderData.component_id == component_id)
-                    .first()
-                )
+        Returns:
+            Number of components whose provider data was updated
+        """
+        component_ids_by_part: dict[str, list[str]] = defaultdict(list)
+        queries: dict[str, str] = {}
+        for component in components:
+            part_number = (component.part_number or "").strip()
+            if not part_number:
+                continue
+            key = part_number.upper()
+            queries.setdefault(key, part_number)
+            component_ids_by_part[key].append(component.id)
+
+        if not queries:
+            return 0
+
+        semaphore = asyncio.Semaphore(BOM_REFRESH_CONCURRENCY)
+
+        async def search(
+            part_number: str,
+        ) -> tuple[str, ComponentSearchResult] | None:
+            """Best match for part_number and the name of its provider."""
+            async with semaphore:
+                try:
+                    provider_results = await self.provider_service.search_all_providers(
+                        part_number, limit_per_provider=1
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error refreshing provider data for {part_number}: {e}"
+                    )
+                    return None
+            # Same pick as search_components(limit=1), keeping the provider
+            # name rather than parsing it back out of the prefixed provider_id
+            results = self.provider_service.aggregate_search_results(provider_results)
+            if not results:
+                return None
+            best = results[0]
+            provider_name = next(
+                name
+                for name, matches in provider_results.items()
+                if any(match is best for match in matches)
+            )
+            return provider_name, best
 
-                if not provider_data:
-                    provider_data = ComponentProviderData(component_id=component_id)
-                    session.add(provider_data)
-
-                provider_data.provider_id = result.provider_id
-                provider_data.provider_part_id = result.provider_part_id
-                provider_data.provider_url = result.provider_url
-                provider_data.datasheet_url = result.datasheet_url
-                provider_data.image_url = result.image_url
-                provider_data.specifications = result.specifications
-                provider_data.availability = result.availability
-                provider_data.pricing = {
-                    "price_breaks": result.price_breaks,
-                    "currency": "USD",
-                }
-                provider_data.last_updated = datetime.now(UTC)
+        keys = list(queries)
+        results = await asyncio.gather(*(search(queries[key]) for key in keys))
+        found = {key: result for key, result in zip(keys, results) if result}
+        if not found:
+            return 0
 
-                session.commit()
-                logger.debug(f"Refreshed provider data for component {component_id}")
+        session = self.session_factory()
+        try:
+            provider_ids = self._get_provider_record_ids(
+                session, {provider_name for provider_name, _ in found.values()}
+            )
+            now = datetime.now(UTC)
+            rows = {}
+            for key, (provider_name, result) in found.items():
+                for component_id in component_ids_by_part[key]:
+                    rows[component_id] = {
+                        "id": str(uuid.uuid4()),
+                        "component_id": component_id,
+                        "provider_id": provider_ids[provider_name],
+                        "provider_part_id": result.provider_part_id
+                        or result.part_number,
+                        "provider_url": result.provider_url,
+                        "datasheet_url": result.datasheet_url,
+                        "image_url": result.image_url,
+                        "specifications_json": result.specifications,
+                        "availability": result.availability,
+                        "pricing": {
+                            "price_breaks": result.price_breaks,
+                            "currency": "USD",
+                        },
+                        "cached_at": now,
+                    }
+
+            statement = sqlite_insert(ComponentProviderData).values(list(rows.values()))
+            refreshed_columns = (
+                "provider_part_id",
+                "provider_url",
+                "datasheet_url",
+                "image_url",
+                "specifications_json",
+                "availability",
+                "pricing",
+                "cached_at",
+            )
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["component_id", "provider_id"],
+                    set_={
+                        **{
+                            column: statement.excluded[column]
+                            for column in refreshed_columns
+                        },
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+            session.commit()
+            logger.info(
+                f"Refreshed provider data for {len(rows)} components "
+                f"({len(found)} of {len(queries)} part numbers found)"
+            )
+            return len(rows)
 
         except Exception as e:
-            logger.error(
-                f"Error refreshing provider data for component {component_id}: {e}"
-            )
+            logger.error(f"Error storing refreshed provider data: {e}")
             session.rollback()
+            return 0
         finally:
             session.close()
 
-    def export_bom_csv(self, bom_items: list[BOMItem]) -> str:
-        """Export BOM to CSV format"""
-        output = io.StringIO()
-        writer = csv.writer(output)
+    def _get_provider_record_ids(
+        self, session: Session, provider_names: set[str]
+    ) -> dict[str, str]:
+        """Provider record IDs by registered provider name, creating missing records"""
+        records = {
+            record.name.lower(): record
+            for record in session.query(ComponentDataProvider).filter(
+                func.lower(ComponentDataProvider.name).in_(provider_names)
+            )
+        }
+        for name in provider_names - records.keys():
+            provider = self.provider_service.providers.get(name)
+            records[name] = ComponentDataProvider(
+                name=provider.name if provider else name,
+                api_url=provider.base_url if provider else "",
+            )
+            session.add(records[name])
+        session.flush()
+        return {name: records[name].id for name in provider_names}
 
-        # Write header
+    def export_bom_csv(self, bom_items: list[BOMItem]) -> Iterator[bytes]:
+        """Export BOM to CSV format as a stream of encoded chunks"""
         headers = [
             "Part Number",
             "Manufacturer",
@@ -285,53 +417,44 @@ class BOMService:
             "Availability",
             "Provider URL",
         ]
-        writer.writerow(headers)
-
-        # Write data rows
-        for item in bom_items:
-            data = item.to_dict()
-            row = [
-                data["part_number"],
-                data["manufacturer"],
-                data["description"],
-                data["category"],
-                data["quantity"],
-                data["unit_cost"] or "",
-                data["total_cost"] or "",
-                data["provider_sku"] or "",
-                data["provider_name"] or "",
-                data["availability"] or "",
-                data["provider_url"] or "",
-            ]
-            writer.writerow(row)
 
-        return output.getvalue()
-
-    def export_bom_json(self, bom_items: list[BOMItem]) -> str:
-        """Export BOM to JSON format"""
+        def rows() -> Iterator[list[Any]]:
+            for item in bom_items:
+                data = item.to_dict()
+                yield [
+                    data["part_number"],
+                    data["manufacturer"],
+                    data["description"],
+                    data["category"],
+                    data["quantity"],
+                    data["unit_cost"] or "",
+                    data["total_cost"] or "",
+                    data["provider_sku"] or "",
+                    data["provider_name"] or "",
+                    data["availability"] or "",
+                    data["provider_url"] or "",
+                ]
+
+        return iter_csv(headers, rows())
+
+    def export_bom_json(self, bom_items: list[BOMItem]) -> Iterator[bytes]:
+        """Export BOM to JSON format as a stream of encoded chunks"""
+        items = [item.to_dict() for item in bom_items]
         bom_data = {
             "generated_at": datetime.now(UTC).isoformat(),
-            "total_items": len(bom_items),
-            "items": [item.to_dict() for item in bom_items],
+            "total_items": len(items),
+            "items": items,
+            "total_cost": sum(item.get("total_cost", 0) or 0 for item in items),
         }
 
-        # Calculate totals
-        total_cost = sum(item.to_dict().get("total_cost", 0) or 0 for item in bom_items)
-        bom_data["total_cost"] = total_cost
-
-        return json.dumps(bom_data, indent=2)
+        return iter_json(bom_data)
 
-    def export_bom_kicad(self, bom_items: list[BOMItem]) -> str:
-        """Export BOM to KiCad format"""
-        output = io.StringIO()
-
-        # KiCad BOM header
-        output.write("# Bill of Materials\n")
-        output.write(
-            f"# Generated on {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')}\n"
-        )
-        output.write("#\n")
+    def export_bom_ndjson(self, bom_items: list[BOMItem]) -> Iterator[bytes]:
+        """Export BOM to newline-delimited JSON (one item per line)"""
+        return iter_ndjson(item.to_dict() for item in bom_items)
 
+    def export_bom_kicad(self, bom_items: list[BOMItem]) -> Iterator[bytes]:
+        """Export BOM to KiCad format as a stream of encoded chunks"""
         # Tab-separated format for KiCad
         headers = [
             "Reference",
@@ -344,24 +467,30 @@ class BOMService:
             "SPN",
             "Quantity",
         ]
-        output.write("\t".join(headers) + "\n")
-
-        for i, item in enumerate(bom_items):
-            data = item.to_dict()
-            row = [
-                f"U{i+1}",  # Reference designator
-                data["part_number"],  # Value
-                "",  # Footprint (would need to be determined from specs)
-                data.get("provider_url", ""),  # Datasheet
-                data["manufacturer"],
-                data["part_number"],  # MPN
-                data.get("provider_name", ""),  # Supplier
-                data.get("provider_sku", ""),  # SPN
-                str(data["quantity"]),
-            ]
-            output.write("\t".join(row) + "\n")
 
-        return output.getvalue()
+        def lines() -> Iterator[str]:
+            # KiCad BOM header
+            yield "# Bill of Materials\n"
+            yield f"# Generated on {datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')}\n"
+            yield "#\n"
+            yield "\t".join(headers) + "\n"
+
+            for i, item in enumerate(bom_items):
+                data = item.to_dict()
+                row = [
+                    f"U{i+1}",  # Reference designator
+                    data["part_number"],  # Value
+                    "",  # Footprint (would need to be determined from specs)
+                    data.get("provider_url") or "",  # Datasheet
+                    data["manufacturer"] or "",
+                    data["part_number"],  # MPN
+                    data.get("provider_name") or "",  # Supplier
+                    data.get("provider_sku") or "",  # SPN
+                    str(data["quantity"]),
+                ]
+                yield "\t".join(row) + "\n"
+
+        return iter_text(lines())
 
     def calculate_bom_cost(self, bom_items: list[BOMItem]) -> dict[str, Any]:
         """Calculate total BOM cost and statistics"""
@@ -385,26 +514,26 @@ class BOMService:
             "total_items": total_items,
             "items_with_pricing": items_with_pricing,
             "items_with_availability": items_with_availability,
-            "pricing_coverage": items_with_pricing / total_items
-            if total_items > 0
-            else 0,
-            "availability_coverage": items_with_availability / total_items
-            if total_items > 0
-            else 0,
+            "pricing_coverage": (
+                items_with_pricing / total_items if total_items > 0 else 0
+            ),
+            "availability_coverage": (
+                items_with_availability / total_items if total_items > 0 else 0
+            ),
         }
 
     async def export_bom(
         self, bom_items: list[BOMItem], export_format: str = BOMExportFormat.CSV
-    ) -> tuple[str, str]:
+    ) -> tuple[Iterator[bytes], str]:
         """
         Export BOM in specified format.
 
         Args:
             bom_items: List of BOM items
-            export_format: Export format (csv, json, kicad)
+            export_format: Export format (csv, json, ndjson, kicad)
 
         Returns:
-            Tuple of (content, mime_type)
+            Tuple of (content chunks, mime_type) suitable for StreamingResponse
         """
         if export_format == BOMExportFormat.CSV:
             content = self.export_bom_csv(bom_items)
@@ -412,6 +541,9 @@ class BOMService:
         elif export_format == BOMExportFormat.JSON:
             content = self.export_bom_json(bom_items)
             mime_type = "application/json"
+        elif export_format == BOMExportFormat.NDJSON:
+            content = self.export_bom_ndjson(bom_items)
+            mime_type = "application/x-ndjson"
         elif export_format == BOMExportFormat.KICAD:
             content = self.export_bom_kicad(bom_items)
             mime_type = "text/plain"
@@ -0,0 +1,287 @@
+"""
+Warm headless-browser pool for JavaScript-rendered provider pages.
+
+Launching Chromium costs hundreds of milliseconds to seconds and a few
+hundred MB of RAM, far more than rendering one LCSC page. BrowserPool keeps
+one browser and context alive across requests instead:
+
+- at most max_pages pages are open at once; further callers wait
+- pages are returned to the pool after use and reused by the next caller
+- the context intercepts requests: images are answered with an inline
+  1x1 GIF (so image components still record their URLs), while fonts,
+  media and analytics/tracking requests are aborted
+- the browser is recycled after pages_per_browser pages, or as soon as it
+  disconnects, to bound Chromium's memory growth; the old browser is closed
+  once its last page is returned
+
+Playwright objects are bound to the event loop they were created on, so
+get_browser_pool() keeps one pool per running loop. The FastAPI lifespan
+closes it on shutdown; Chromium is only launched on first use.
+"""
+
+import asyncio
+import base64
+import logging
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Try to import Playwright for JavaScript rendering
+try:
+    from playwright.async_api import async_playwright
+
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    logger.info(
+        "Playwright not available. LCSC search will use basic HTML scraping (may return limited results). "
+        "Install with: uv pip install -e '.[scraping]' && playwright install chromium"
+    )
+
+# Pages open at once across all callers
+BROWSER_POOL_MAX_PAGES = 4
+
+# Pages served by one browser before it is replaced
+BROWSER_POOL_PAGES_PER_BROWSER = 200
+
+# Resource types never fetched from the network
+BLOCKED_RESOURCE_TYPES = frozenset({"font", "media"})
+
+# Hosts (and their subdomains) whose requests are aborted
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "hm.baidu.com",
+)
+
+# Transparent 1x1 GIF served in place of every image
+_BLANK_GIF = base64.b64decode(
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+)
+
+Launcher = Callable[[], Awaitable[Any]]
+
+
+def _is_blocked_host(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(
+        host == blocked or host.endswith(f".{blocked}") for blocked in BLOCKED_HOSTS
+    )
+
+
+async def _intercept(route) -> None:
+    """Route handler answering images inline and dropping heavy requests."""
+    request = route.request
+    if request.resource_type == "image":
+        await route.fulfill(status=200, content_type="image/gif", body=_BLANK_GIF)
+    elif request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(
+        request.url
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _Browser:
+    """One launched browser, its context and idle pages."""
+
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.idle: list = []
+        self.served = 0
+        self.active = 0
+        self.retired = False
+        self.closed = False
+
+
+class BrowserPool:
+    """
+    Pool of reusable pages on a shared headless browser.
+
+    Args:
+        max_pages: Pages open at once; further callers wait for a page
+        pages_per_browser: Pages served before the browser is recycled
+        launcher: Coroutine function returning a launched browser
+            (default: headless Chromium via Playwright)
+    """
+
+    def __init__(
+        self,
+        max_pages: int = BROWSER_POOL_MAX_PAGES,
+        pages_per_browser: int = BROWSER_POOL_PAGES_PER_BROWSER,
+        launcher: Launcher | None = None,
+    ):
+        self.max_pages = max_pages
+        self.pages_per_browser = pages_per_browser
+        self.counters: Counter[str] = Counter()
+        self._launcher = launcher or self._launch_chromium
+        self._playwright = None
+        self._current: _Browser | None = None
+        self._slots = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """
+        Borrow a page for the duration of the block.
+
+        Pages come back to the pool when the block exits; a page whose block
+        raised is closed instead, since it may be left mid-navigation.
+        """
+        async with self._slots:
+            holder, page = await self._checkout()
+            try:
+                yield page
+            except BaseException:
+                await self._release(holder, page, reuse=False)
+                raise
+            await self._release(holder, page, reuse=True)
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright."""
+        async with self._lock:
+            current, self._current = self._current, None
+            if current is not None:
+                current.retired = True
+                await self._close_browser(current)
+            if self._playwright is not None:
+                playwright, self._playwright = self._playwright, None
+                await playwright.stop()
+
+    def get_statistics(self) -> dict:
+        """Browser launches and page use since startup."""
+        current = self._current
+        return {
+            "max_pages": self.max_pages,
+            "pages_per_browser": self.pages_per_browser,
+            "browser_open": current is not None,
+            "idle_pages": len(current.idle) if current else 0,
+            **{
+                name: self.counters[name]
+                for name in ("launches", "pages_created", "pages_reused", "recycles")
+            },
+        }
+
+    # ==================== Pages ====================
+
+    async def _checkout(self) -> tuple[_Browser, Any]:
+        async with self._lock:
+            current = self._current
+            if current is None or not self._usable(current):
+                if current is not None:
+                    self.counters["recycles"] += 1
+                    await self._retire(current)
+                current = self._current = await self._open_browser()
+            current.served += 1
+            current.active += 1
+            page = current.idle.pop() if current.idle else None
+
+        if page is not None:
+            self.counters["pages_reused"] += 1
+            return current, page
+
+        try:
+            page = await current.context.new_page()
+        except BaseException:
+            current.active -= 1
+            raise
+        self.counters["pages_created"] += 1
+        return current, page
+
+    async def _release(self, holder: _Browser, page, reuse: bool) -> None:
+        try:
+            if reuse and not holder.retired:
+                try:
+                    # Drop the previous document so idle pages hold little memory
+                    await page.goto("about:blank")
+                except Exception as e:
+                    logger.debug(f"Discarding browser page: {e}")
+                else:
+                    if not holder.retired:
+                        holder.idle.append(page)
+                        return
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Failed to close browser page: {e}")
+        finally:
+            holder.active -= 1
+            if holder.retired and holder.active == 0:
+                await self._close_browser(holder)
+
+    def _usable(self, holder: _Browser) -> bool:
+        return holder.served < self.pages_per_browser and holder.browser.is_connected()
+
+    # ==================== Browsers ====================
+
+    async def _open_browser(self) -> _Browser:
+        browser = await self._launcher()
+        try:
+            context = await browser.new_context()
+            await context.route("**/*", _intercept)
+        except BaseException:
+            await browser.close()
+            raise
+        self.counters["launches"] += 1
+        logger.info("Launched headless browser for provider scraping")
+        return _Browser(browser, context)
+
+    async def _retire(self, holder: _Browser) -> None:
+        """Stop handing out holder's pages; close it once none are in use."""
+        holder.retired = True
+        if holder.active == 0:
+            await self._close_browser(holder)
+
+    async def _close_browser(self, holder: _Browser) -> None:
+        if holder.closed:
+            return
+        holder.closed = True
+        holder.idle.clear()
+        try:
+            await holder.browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close headless browser: {e}")
+
+    async def _launch_chromium(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+
+# Global instance - lazy initialized, one per event loop
+_browser_pool: BrowserPool | None = None
+_browser_pool_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get the shared browser pool for the running event loop.
+
+    Must be called from a coroutine; callers check PLAYWRIGHT_AVAILABLE first.
+    """
+    global _browser_pool, _browser_pool_loop
+    loop = asyncio.get_running_loop()
+    if _browser_pool is None or _browser_pool_loop is not loop:
+        _browser_pool = BrowserPool()
+        _browser_pool_loop = loop
+    return _browser_pool
+
+
+async def close_browser_pool() -> None:
+    """Close the shared browser pool (application shutdown)."""
+    global _browser_pool, _browser_pool_loop
+    pool, loop = _browser_pool, _browser_pool_loop
+    _browser_pool = _browser_pool_loop = None
+    # A pool left behind by another (finished) loop cannot be closed from this one
+    if pool is not None and loop is asyncio.get_running_loop():
+        await pool.close()
@@ -3,15 +3,30 @@ Bulk create service for creating storage locations in transactions.
 
 This service handles transactional bulk creation of storage locations with
 proper error handling and rollback support.
+
+Locations are written with batched Core INSERTs (executemany) rather than one
+ORM object per name: ids, QR code ids and hierarchy paths are computed in
+Python while names stream out of the generator, which keeps 50,000-location
+layouts fast and memory-flat. The storage_location_closure triggers still fire
+per inserted row.
 """
 
+import uuid
+from collections.abc import Iterator
+from itertools import islice
+
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from ..database import write_transaction
 from ..models.storage_location import StorageLocation
 from ..schemas.location_layout import BulkCreateResponse, LayoutConfiguration
 from .location_generator import LocationGeneratorService
 from .location_validator import LocationValidatorService
 
+# Rows sent to the database per executemany round trip
+INSERT_BATCH_SIZE = 1000
+
 
 class BulkCreateService:
     """
@@ -67,9 +82,6 @@ class BulkCreateService:
                 errors=errors,
             )
 
-        # Generate all location names
-        all_names = self.generator.generate_names(config)
-
         # Prepare layout_config for storage (FR-016 - audit trail)
         layout_config = {
             "layout_type": config.layout_type.value,
@@ -87,39 +99,13 @@ class BulkCreateService:
             "separators": config.separators,
         }
 
-        # Create location objects
-        created_locations = []
-
         try:
-            for name in all_names:
-                location = StorageLocation(
-                    type=config.location_type,  # FR-021
-                    parent_id=config.parent_id,  # FR-014
-                    description=f"Auto-generated {config.layout_type.value} layout location",
+            # Batches must commit together; the engine autocommits otherwise
+            with write_transaction(self.db) as db:
+                created_ids = BulkCreateService(db)._insert_locations(
+                    config, layout_config
                 )
 
-                # Add to session first so event listeners have session context
-                self.db.add(location)
-
-                # Set name AFTER adding to session to trigger hierarchy update with proper context
-                location.name = name
-
-                # Store the layout configuration as JSON (FR-016)
-                # Note: SQLite stores this as JSON text, but SQLAlchemy handles conversion
-                location.layout_config = layout_config
-
-                created_locations.append(location)
-
-            # Commit all at once (transactional)
-            self.db.commit()
-
-            # Refresh to get generated IDs and timestamps
-            for location in created_locations:
-                self.db.refresh(location)
-
-            # Extract IDs
-            created_ids = [str(location.id) for location in created_locations]
-
             return BulkCreateResponse(
                 created_ids=created_ids,
                 created_count=len(created_ids),
@@ -128,13 +114,109 @@ class BulkCreateService:
             )
 
         except Exception as e:
-            # Rollback on any error (all-or-nothing)
-            self.db.rollback()
-
-            # Return error response
+            # Rolled back on any error (all-or-nothing); return error response
             return BulkCreateResponse(
                 created_ids=[],
                 created_count=0,
                 success=False,
                 errors=[f"Failed to create locations: {str(e)}"],
             )
+
+    def _insert_locations(
+        self, config: LayoutConfiguration, layout_config: dict
+    ) -> list[str]:
+        """
+        Insert every generated location in INSERT_BATCH_SIZE batches.
+
+        Args:
+            config: Layout configuration
+            layout_config: Serialised configuration stored on each row (FR-016)
+
+        Returns:
+            IDs of the inserted locations
+        """
+        parent_hierarchy = None
+        if config.parent_id:
+            parent_hierarchy = self.db.execute(
+                select(StorageLocation.location_hierarchy).where(
+                    StorageLocation.id == config.parent_id
+                )
+            ).scalar_one()
+
+        rows = self._iter_location_rows(config, layout_config, parent_hierarchy)
+        seen_qr_codes: set[str] = set()
+        created_ids: list[str] = []
+
+        while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+            self._assign_unique_qr_codes(batch, seen_qr_codes)
+            self.db.execute(insert(StorageLocation), batch)
+            created_ids.extend(row["id"] for row in batch)
+
+        return created_ids
+
+    def _iter_location_rows(
+        self,
+        config: LayoutConfiguration,
+        layout_config: dict,
+        parent_hierarchy: str | None,
+    ) -> Iterator[dict]:
+        """
+        Stream insert parameters for every generated location.
+
+        Mirrors what the StorageLocation listeners would compute per object:
+        location_hierarchy is "<parent path>/<name>" (FR-014) and qr_code_id
+        is "LOC-" plus the first 8 characters of the id.
+
+        Args:
+            config: Layout configuration
+            layout_config: Serialised configuration stored on each row (FR-016)
+            parent_hierarchy: Parent's location_hierarchy, if any
+
+        Yields:
+            Column values for one storage location
+        """
+        description = f"Auto-generated {config.layout_type.value} layout location"
+
+        for name in self.generator.iter_names(config):
+            location_id = str(uuid.uuid4())
+            yield {
+                "id": location_id,
+                "name": name,
+                "description": description,
+                "type": config.location_type,  # FR-021
+                "parent_id": config.parent_id,  # FR-014
+                "location_hierarchy": (
+                    f"{parent_hierarchy}/{name}" if parent_hierarchy else name
+                ),
+                "qr_code_id": f"LOC-{location_id[:8].upper()}",
+                "layout_config": layout_config,
+            }
+
+    def _assign_unique_qr_codes(self, batch: list[dict], seen: set[str]) -> None:
+        """
+        Re-roll ids whose 8-character QR code id is already taken.
+
+        QR codes only carry 32 bits of the UUID, so collisions become likely
+        at tens of thousands of locations. Each batch is checked against the
+        codes issued earlier in this run and (in one query) against existing
+        rows, and colliding rows get a fresh id.
+
+        Args:
+            batch: Row parameters, updated in place
+            seen: QR code ids already issued in this run (updated)
+        """
+        taken = set(
+            self.db.execute(
+                select(StorageLocation.qr_code_id).where(
+                    StorageLocation.qr_code_id.in_([row["qr_code_id"] for row in batch])
+                )
+            ).scalars()
+        )
+        taken |= seen
+
+        for row in batch:
+            while row["qr_code_id"] in taken:
+                row["id"] = str(uuid.uuid4())
+                row["qr_code_id"] = f"LOC-{row['id'][:8].upper()}"
+            taken.add(row["qr_code_id"])
+            seen.add(row["qr_code_id"])
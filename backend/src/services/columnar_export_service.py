@@ -0,0 +1,487 @@
+"""
+Columnar (Parquet / Arrow IPC) export of the inventory ledger for BI tools.
+
+Writes stock_transactions, component_locations and components into a
+Hive-style month-partitioned dataset that DuckDB, Spark, pandas or
+pyarrow.dataset can query directly:
+
+    <output_dir>/<table>/month=YYYY-MM/part-<run_id>.parquet
+
+Each run only reads rows past the per-table high-water mark recorded in
+<output_dir>/_export_state.json and streams them from the database in
+batches, so nightly exports touch only new data and analytical queries run
+against the files instead of the production SQLite database.
+
+stock_transactions is append-only and partitioned by created_at. The
+mutable tables (component_locations, components) are exported by
+updated_at (created_at for rows never updated): every run appends the rows
+changed since the last run, so readers should keep the latest row per id.
+Deletions are not captured. Rows without any timestamp cannot be placed in
+a partition; they are counted as rows_skipped and logged on every run.
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import String, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..models import Component, ComponentLocation, StockTransaction
+from .export_streaming import EXPORT_YIELD_PER
+
+logger = logging.getLogger(__name__)
+
+# Try to import pyarrow for Parquet/Arrow IPC writing
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.info(
+        "pyarrow not available. Columnar analytics export is disabled. "
+        "Install with: uv pip install -e '.[analytics]'"
+    )
+
+# Rows per Arrow record batch (and Parquet row group flush)
+RECORD_BATCH_ROWS = 10_000
+
+STATE_FILE_NAME = "_export_state.json"
+
+FILE_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+# Exported tables: model, high-water-mark column and (column, arrow type) pairs
+EXPORT_TABLES: dict[str, dict[str, Any]] = {
+    "stock_transactions": {
+        "model": StockTransaction,
+        "watermark": "created_at",
+        "columns": [
+            ("id", "string"),
+            ("component_id", "string"),
+            ("transaction_type", "string"),
+            ("quantity_change", "int64"),
+            ("previous_quantity", "int64"),
+            ("new_quantity", "int64"),
+            ("from_location_id", "string"),
+            ("to_location_id", "string"),
+            ("lot_id", "string"),
+            ("price_per_unit", "decimal_10_4"),
+            ("total_price", "decimal_10_4"),
+            ("reason", "string"),
+            ("reference_id", "string"),
+            ("reference_type", "string"),
+            ("user_id", "string"),
+            ("user_name", "string"),
+            ("batch_id", "string"),
+            ("created_at", "timestamp"),
+        ],
+    },
+    "component_locations": {
+        "model": ComponentLocation,
+        "watermark": "updated_at",
+        "columns": [
+            ("id", "string"),
+            ("component_id", "string"),
+            ("storage_location_id", "string"),
+            ("quantity_on_hand", "int64"),
+            ("quantity_ordered", "int64"),
+            ("minimum_stock", "int64"),
+            ("reorder_threshold", "int64"),
+            ("reorder_enabled", "bool"),
+            ("unit_cost_at_location", "decimal_10_4"),
+            ("created_at", "timestamp"),
+            ("updated_at", "timestamp"),
+        ],
+    },
+    "components": {
+        "model": Component,
+        "watermark": "updated_at",
+        "columns": [
+            ("id", "string"),
+            ("name", "string"),
+            ("part_number", "string"),
+            ("manufacturer", "string"),
+            ("manufacturer_part_number", "string"),
+            ("provider_sku", "string"),
+            ("local_part_id", "string"),
+            ("category_id", "string"),
+            ("component_type", "string"),
+            ("value", "string"),
+            ("package", "string"),
+            ("average_purchase_price", "decimal_10_4"),
+            ("total_purchase_value", "decimal_12_2"),
+            ("specifications", "json"),
+            ("created_at", "timestamp"),
+            ("updated_at", "timestamp"),
+        ],
+    },
+}
+
+
+def default_export_dir() -> Path:
+    """Default dataset directory, following FileStorageService conventions."""
+    if os.getenv("ANALYTICS_EXPORT_DIR"):
+        return Path(os.environ["ANALYTICS_EXPORT_DIR"])
+    if os.getenv("ENVIRONMENT") == "production":
+        return Path("/app/data/analytics")
+    return Path("./data/analytics")
+
+
+class ColumnarExportService:
+    """
+    Incremental Parquet/Arrow IPC export of ledger tables.
+
+    Usage:
+        service = ColumnarExportService(session, output_dir)
+        summary = service.export(export_format="parquet")
+    """
+
+    def __init__(self, session: Session, output_dir: str | Path | None = None):
+        """
+        Initialize service.
+
+        Args:
+            session: SQLAlchemy session used to read the source tables
+            output_dir: Dataset root directory (defaults to default_export_dir())
+        """
+        self.session = session
+        self.output_dir = Path(output_dir) if output_dir else default_export_dir()
+
+    def export(
+        self,
+        export_format: Literal["parquet", "arrow"] = "parquet",
+        tables: list[str] | None = None,
+        full_refresh: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Export rows added or changed since the last run.
+
+        Files are written under temporary names and renamed when complete;
+        the high-water marks are only advanced after every table succeeds,
+        so a failed run is simply repeated next time. A full refresh writes
+        each table into a staging directory that replaces the table's
+        existing partitions once every table has succeeded, so the dataset
+        never holds a row twice.
+
+        Args:
+            export_format: "parquet" or "arrow" (Arrow IPC file format)
+            tables: Subset of EXPORT_TABLES to export (default: all)
+            full_refresh: Ignore stored high-water marks and re-export the
+                selected tables from scratch, replacing their files
+
+        Returns:
+            Summary with per-table row counts, written files and high-water marks
+
+        Raises:
+            RuntimeError: pyarrow is not installed
+            ValueError: Unknown format or table name
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError(
+                "Columnar export not available. pyarrow library not installed."
+            )
+        if export_format not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        table_names = tables or list(EXPORT_TABLES)
+        unknown = [name for name in table_names if name not in EXPORT_TABLES]
+        if unknown:
+            raise ValueError(f"Unknown export tables: {', '.join(unknown)}")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+        run_id = f"{datetime.now(UTC).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        written: list[Path] = []
+        summary: dict[str, Any] = {}
+        new_state = dict(state)
+        staged: dict[str, Path] = {}
+
+        try:
+            for name in table_names:
+                table_dir = self.output_dir / name
+                table_state = state.get(name)
+                if full_refresh:
+                    table_dir = staged[name] = self.output_dir / f".{name}.{run_id}"
+                    table_state = None
+                    new_state.pop(name, None)
+                result = self._export_table(
+                    name, export_format, run_id, table_dir, table_state, written
+                )
+                summary[name] = {
+                    "rows_exported": result["rows_exported"],
+                    "rows_skipped": result["rows_skipped"],
+                    "files": result["files"],
+                    "high_water_mark": (
+                        result["state"]["high_water_mark"] if result["state"] else None
+                    ),
+                }
+                if result["state"]:
+                    new_state[name] = result["state"]
+        except Exception:
+            # Roll back partially written files so the next run starts clean
+            for path in written:
+                path.unlink(missing_ok=True)
+            for staging_dir in staged.values():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        for name, staging_dir in staged.items():
+            self._replace_table_dir(name, staging_dir)
+            summary[name]["files"] = [
+                str(self.output_dir / name / Path(path).relative_to(staging_dir))
+                for path in summary[name]["files"]
+            ]
+
+        self._save_state(new_state)
+
+        logger.info(
+            f"Columnar export {run_id} wrote "
+            f"{sum(t['rows_exported'] for t in summary.values())} rows to {self.output_dir}"
+        )
+
+        return {
+            "run_id": run_id,
+            "format": export_format,
+            "output_dir": str(self.output_dir),
+            "tables": summary,
+        }
+
+    def _export_table(
+        self,
+        name: str,
+        export_format: str,
+        run_id: str,
+        table_dir: Path,
+        table_state: dict[str, Any] | None,
+        written: list[Path],
+    ) -> dict[str, Any]:
+        """
+        Stream one table past its high-water mark into month partitions.
+
+        Rows are ordered by the watermark column, so each month's rows arrive
+        contiguously and only one partition file is open at a time.
+        """
+        spec = EXPORT_TABLES[name]
+        model = spec["model"]
+        column_names = [column for column, _ in spec["columns"]]
+        schema = self._arrow_schema(spec["columns"])
+
+        watermark_column = getattr(model, spec["watermark"])
+        if spec["watermark"] != "created_at":
+            # Rows that were never updated may have no updated_at
+            watermark_column = func.coalesce(watermark_column, model.created_at)
+        # Compare the watermark as stored text so marks round-trip exactly
+        watermark = type_coerce(watermark_column, String)
+        query = select(
+            watermark.label("_watermark"),
+            *(getattr(model, column) for column in column_names),
+        ).order_by(watermark, model.id)
+
+        boundary_ids: set[str] = set()
+        if table_state:
+            # >= rather than > because several rows can share the boundary
+            # timestamp; rows already exported at it are skipped by id below
+            # Rows without a watermark are kept so they are reported below
+            query = query.where(
+                or_(
+                    watermark >= table_state["high_water_mark"],
+                    watermark.is_(None),
+                )
+            )
+            boundary_ids = set(table_state.get("boundary_ids", []))
+
+        rows_exported = rows_skipped = 0
+        files: list[str] = []
+        high_water_mark = table_state["high_water_mark"] if table_state else None
+        mark_ids = set(boundary_ids)
+
+        writer = None
+        current_month = None
+        batch: dict[str, list[Any]] = {column: [] for column in column_names}
+
+        def flush():
+            if batch[column_names[0]]:
+                writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+                for values in batch.values():
+                    values.clear()
+
+        try:
+            for row in self._iter_rows(query):
+                mark = row._watermark
+                if mark is None:
+                    rows_skipped += 1
+                    continue
+                if mark == high_water_mark and row.id in mark_ids:
+                    continue
+
+                month = mark[:7]
+                if month != current_month:
+                    if writer is not None:
+                        flush()
+                        files.append(writer.close_partition())
+                    writer = _PartitionWriter(
+                        table_dir / f"month={month}",
+                        f"part-{run_id}.{FILE_EXTENSIONS[export_format]}",
+                        schema,
+                        export_format,
+                    )
+                    written.append(writer.final_path)
+                    written.append(writer.temp_path)
+                    current_month = month
+
+                for column, kind in spec["columns"]:
+                    batch[column].append(_to_arrow_value(getattr(row, column), kind))
+                if len(batch[column_names[0]]) >= RECORD_BATCH_ROWS:
+                    flush()
+
+                if mark != high_water_mark:
+                    high_water_mark = mark
+                    mark_ids = set()
+                mark_ids.add(row.id)
+                rows_exported += 1
+
+            if writer is not None:
+                flush()
+                files.append(writer.close_partition())
+                writer = None
+        finally:
+            if writer is not None:
+                writer.abort()
+
+        if rows_skipped:
+            logger.warning(
+                f"Skipped {rows_skipped} {name} rows without a "
+                f"{spec['watermark']} or created_at timestamp"
+            )
+
+        state = (
+            {"high_water_mark": high_water_mark, "boundary_ids": sorted(mark_ids)}
+            if high_water_mark is not None
+            else None
+        )
+        return {
+            "rows_exported": rows_exported,
+            "rows_skipped": rows_skipped,
+            "files": files,
+            "state": state,
+        }
+
+    def _iter_rows(self, query) -> Iterator:
+        """Stream query rows from the database in EXPORT_YIELD_PER batches."""
+        result = self.session.execute(
+            query.execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    @staticmethod
+    def _arrow_schema(columns: list[tuple[str, str]]) -> "pa.Schema":
+        """Build the Arrow schema for a table spec."""
+        arrow_types = {
+            "string": pa.string(),
+            "json": pa.string(),
+            "int64": pa.int64(),
+            "bool": pa.bool_(),
+            "decimal_10_4": pa.decimal128(10, 4),
+            "decimal_12_2": pa.decimal128(12, 2),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+        }
+        return pa.schema([(column, arrow_types[kind]) for column, kind in columns])
+
+    def _replace_table_dir(self, name: str, staging_dir: Path) -> None:
+        """Swap a fully re-exported table's staging directory into place."""
+        table_dir = self.output_dir / name
+        if not staging_dir.exists():
+            # Nothing to export: the refreshed table is empty
+            staging_dir.mkdir()
+        if table_dir.exists():
+            retired = staging_dir.with_name(f"{staging_dir.name}.old")
+            os.replace(table_dir, retired)
+            os.replace(staging_dir, table_dir)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging_dir, table_dir)
+
+    def _state_path(self) -> Path:
+        return self.output_dir / STATE_FILE_NAME
+
+    def _load_state(self) -> dict[str, Any]:
+        """Load per-table high-water marks from the dataset directory."""
+        path = self._state_path()
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export state {path}: {e}")
+            return {}
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        """Atomically persist per-table high-water marks."""
+        path = self._state_path()
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(state, indent=2))
+        os.replace(temp_path, path)
+
+
+class _PartitionWriter:
+    """Writes one partition file under a temporary name, renamed on close."""
+
+    def __init__(self, directory: Path, file_name: str, schema, export_format: str):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.final_path = directory / file_name
+        self.temp_path = directory / f".{file_name}.tmp"
+
+        if export_format == "parquet":
+            self._writer = pq.ParquetWriter(self.temp_path, schema, compression="zstd")
+            self._sink = None
+        else:
+            self._sink = pa.OSFile(str(self.temp_path), "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write_batch(self, batch) -> None:
+        self._writer.write_batch(batch)
+
+    def _close_writer(self) -> None:
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+    def close_partition(self) -> str:
+        """Finish the file and move it into place; returns the final path."""
+        self._close_writer()
+        os.replace(self.temp_path, self.final_path)
+        return str(self.final_path)
+
+    def abort(self) -> None:
+        """Close and discard a partially written file."""
+        try:
+            self._close_writer()
+        finally:
+            self.temp_path.unlink(missing_ok=True)
+
+
+def _to_arrow_value(value: Any, kind: str) -> Any:
+    """Convert a SQLAlchemy column value to the representation Arrow expects."""
+    if value is None:
+        return None
+    if kind == "json":
+        return json.dumps(value, default=str)
+    if isinstance(value, Enum):
+        return value.value
+    if kind == "timestamp" and value.tzinfo is None:
+        # SQLite returns naive datetimes; stored values are UTC
+        return value.replace(tzinfo=UTC)
+    return value
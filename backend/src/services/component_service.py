@@ -22,11 +22,10 @@ from ..models import (
 
 logger = logging.getLogger(__name__)
 
-# Import EasyEDA service for LCSC KiCad conversion
+# Import EasyEDA conversion cache for LCSC KiCad conversion
 try:
-    from .easyeda_service import EasyEDAService
-
-    EASYEDA_INTEGRATION_AVAILABLE = True
+    from .easyeda_cache import get_conversion_cache
+    from .easyeda_service import EASYEDA_AVAILABLE as EASYEDA_INTEGRATION_AVAILABLE
 except ImportError:
     EASYEDA_INTEGRATION_AVAILABLE = False
 
@@ -148,6 +147,9 @@ class ComponentService:
         """
         Try to convert component using EasyEDA for LCSC components.
 
+        Conversions are cached per LCSC part, so components sharing a part
+        reuse the same converted symbol, footprint and 3D model.
+
         Args:
             component: Component to convert
 
@@ -163,66 +165,28 @@ class ComponentService:
             return None
 
         try:
-            # Initialize EasyEDA service
-            EasyEDAService()
-
-            # Convert component using EasyEDA
-            # Note: This would require an async context, so it's commented out for now
-            # conversion_result = await easyeda_service.convert_lcsc_component(lcsc_id)
-            return (
-                None  # Temporarily disabled until proper async handling is implemented
-            )
-
-            # if not conversion_result or 'conversions' not in conversion_result:
-            #     return None
-
-            # # Create KiCad data from conversion results
-            # kicad_data = KiCadLibraryData(component_id=component.id)
-
-            # conversions = conversion_result['conversions']
-
-            # # Set symbol data if available
-            # if 'symbol' in conversions:
-            #     symbol_info = conversions['symbol']
-            #     kicad_data.custom_symbol_file_path = symbol_info.get('file_path')
-            #     kicad_data.symbol_library = symbol_info.get('library_name', 'EasyEDA_Symbols')
-            #     kicad_data.symbol_name = symbol_info.get('symbol_name', component.name or 'EasyEDA_Component')
-            #     kicad_data.symbol_source = kicad_data.symbol_source.PROVIDER
-            #     kicad_data.symbol_updated_at = kicad_data.symbol_updated_at
-
-            # # Set footprint data if available
-            # if 'footprint' in conversions:
-            #     footprint_info = conversions['footprint']
-            #     kicad_data.custom_footprint_file_path = footprint_info.get('file_path')
-            #     kicad_data.footprint_library = footprint_info.get('library_name', 'EasyEDA_Footprints')
-            #     kicad_data.footprint_name = footprint_info.get('footprint_name', component.name or 'EasyEDA_Component')
-            #     kicad_data.footprint_source = kicad_data.footprint_source.PROVIDER
-            #     kicad_data.footprint_updated_at = kicad_data.footprint_updated_at
-
-            # # Set 3D model data if available
-            # if 'model_3d' in conversions:
-            #     model_info = conversions['model_3d']
-            #     kicad_data.custom_3d_model_file_path = model_info.get('file_path')
-            #     kicad_data.model_3d_path = model_info.get('file_path')
-            #     kicad_data.model_3d_source = kicad_data.model_3d_source.PROVIDER
-            #     kicad_data.model_3d_updated_at = kicad_data.model_3d_updated_at
-
-            # # Set provider data using the set_provider_data method
-            # kicad_data.set_provider_data(
-            #     symbol_lib=kicad_data.symbol_library,
-            #     symbol_name=kicad_data.symbol_name,
-            #     footprint_lib=kicad_data.footprint_library,
-            #     footprint_name=kicad_data.footprint_name,
-            #     model_3d_path=kicad_data.model_3d_path
-            # )
-
-            # print(f"Successfully converted LCSC component {lcsc_id} using EasyEDA")
-            # return kicad_data
-
+            conversion_result = await get_conversion_cache().convert(lcsc_id)
         except Exception as e:
-            print(f"EasyEDA conversion failed for {lcsc_id}: {e}")
+            logger.warning(f"EasyEDA conversion failed for {lcsc_id}: {e}")
             return None
 
+        conversions = conversion_result.get("conversions") or {}
+        if not conversions:
+            return None
+
+        kicad_data = component.kicad_data or KiCadLibraryData(component_id=component.id)
+        symbol_info = conversions.get("symbol") or {}
+        footprint_info = conversions.get("footprint") or {}
+        model_info = conversions.get("model_3d") or {}
+        kicad_data.set_provider_data(
+            symbol_lib=symbol_info.get("library_name"),
+            symbol_name=symbol_info.get("symbol_name"),
+            footprint_lib=footprint_info.get("library_name"),
+            footprint_name=footprint_info.get("footprint_name"),
+            model_3d_path=model_info.get("file_path"),
+        )
+        return kicad_data
+
     def _extract_lcsc_id(self, component: Component) -> str | None:
         """
         Extract LCSC component ID from component data.
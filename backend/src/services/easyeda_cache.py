@@ -0,0 +1,318 @@
+"""
+Persistent cache of EasyEDA to KiCad conversions.
+
+EasyEDAService.convert_lcsc_component fetches the part from the EasyEDA API
+and regenerates its symbol, footprint and 3D model on every call, although
+the result only changes when EasyEDA or the converter does. Components
+sharing an LCSC part converted it once each. EasyEDAConversionCache keeps
+one conversion per LCSC part and converter version:
+
+- the generated files go to the blob store and the result to the
+  easyeda_conversions table, so a hit is one row read
+- a converter upgrade changes the version key and parts convert again;
+  entries are otherwise kept until invalidated
+- concurrent misses for the same part share a single conversion
+- conversions run in a process pool: easyeda2kicad is blocking and
+  CPU-bound (3D model export in particular), so a cold conversion never
+  stalls the event loop serving requests
+
+Conversion errors propagate and are never cached. Cache storage errors are
+logged and the fresh result returned, as with the provider cache.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..database import get_session
+from ..models import EasyEDAConversion
+from .blob_store import BlobStore
+
+logger = logging.getLogger(__name__)
+
+# Worker processes converting parts (EASYEDA_CONVERSION_PROCESSES)
+EASYEDA_CONVERSION_PROCESSES = 2
+
+# Bump when the stored result or artefacts change shape, so old entries are
+# no longer served
+CONVERSION_CACHE_FORMAT = 1
+
+# Converts (lcsc_id, output_dir) to a conversion result; runs in the pool
+Converter = Callable[[str, str], dict[str, Any]]
+
+
+def conversion_processes() -> int:
+    """Number of conversion worker processes."""
+    return max(
+        1,
+        int(os.getenv("EASYEDA_CONVERSION_PROCESSES", EASYEDA_CONVERSION_PROCESSES)),
+    )
+
+
+def converter_version() -> str:
+    """Cache version key: easyeda2kicad version and cache format."""
+    try:
+        converter = package_version("easyeda2kicad")
+    except PackageNotFoundError:
+        converter = "unavailable"
+    return f"{converter}+{CONVERSION_CACHE_FORMAT}"
+
+
+def normalize_lcsc_id(lcsc_id: str) -> str:
+    """Upper-case LCSC part number with its "C" prefix."""
+    clean_lcsc_id = lcsc_id.strip().upper()
+    if not clean_lcsc_id.startswith("C"):
+        clean_lcsc_id = f"C{clean_lcsc_id}"
+    return clean_lcsc_id
+
+
+def convert_in_process(lcsc_id: str, output_dir: str) -> dict[str, Any]:
+    """Convert a part in a pool worker, writing its files to output_dir."""
+    from .easyeda_service import EasyEDAService
+
+    return asyncio.run(EasyEDAService().convert_lcsc_component(lcsc_id, output_dir))
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+class EasyEDAConversionCache:
+    """
+    Conversion cache keyed by LCSC part and converter version.
+
+    Args:
+        session_factory: Callable returning a new Session (one per operation)
+        blob_store: Store for generated files (default: attachment storage)
+        converter: Function converting a part into an output directory
+        executor: Executor running the converter (default: a process pool
+            of EASYEDA_CONVERSION_PROCESSES workers, created on first use)
+        version: Version key (default from converter_version())
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = get_session,
+        blob_store: BlobStore | None = None,
+        converter: Converter = convert_in_process,
+        executor: Executor | None = None,
+        version: str | None = None,
+    ):
+        if blob_store is None:
+            from .file_storage import file_storage
+
+            blob_store = file_storage.blobs
+
+        self.session_factory = session_factory
+        self.blob_store = blob_store
+        self.converter = converter
+        self.version = version or converter_version()
+        self.counters: Counter[str] = Counter()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def convert(self, lcsc_id: str) -> dict[str, Any]:
+        """
+        Return the conversion of an LCSC part, converting it on a miss.
+
+        Args:
+            lcsc_id: LCSC part number (e.g. "C8734" or "8734")
+
+        Returns:
+            Conversion result with component_info and per-artefact metadata;
+            artefact file paths point into the blob store
+
+        Raises:
+            EasyEDAConversionError: If the conversion fails on a miss
+        """
+        lcsc_id = normalize_lcsc_id(lcsc_id)
+
+        cached = self._read(lcsc_id)
+        if cached is not None:
+            self.counters["hits"] += 1
+            return cached
+
+        self.counters["misses"] += 1
+        task = self._inflight.get(lcsc_id)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.counters["coalesced"] += 1
+        else:
+            task = self._start_conversion(lcsc_id)
+        # Shielded so a cancelled caller does not cancel a conversion others share
+        return await asyncio.shield(task)
+
+    def invalidate(self, lcsc_id: str | None = None) -> int:
+        """
+        Delete cached conversions of one part (all versions) or of all parts.
+
+        Their files are garbage collected once nothing else references them.
+
+        Returns:
+            Number of entries deleted
+        """
+        statement = delete(EasyEDAConversion)
+        if lcsc_id is not None:
+            statement = statement.where(
+                EasyEDAConversion.lcsc_id == normalize_lcsc_id(lcsc_id)
+            )
+        with self.session_factory() as session:
+            deleted = session.execute(statement).rowcount
+            session.commit()
+        return deleted
+
+    def get_statistics(self) -> dict:
+        """Entry count, converter version and hit/miss counters since startup."""
+        try:
+            with self.session_factory() as session:
+                entries = session.scalar(
+                    select(func.count(EasyEDAConversion.lcsc_id)).where(
+                        EasyEDAConversion.converter_version == self.version
+                    )
+                )
+        except SQLAlchemyError as e:
+            logger.warning(f"EasyEDA conversion cache statistics failed: {e}")
+            entries = None
+        return {
+            "entries": entries,
+            "converter_version": self.version,
+            "processes": conversion_processes() if self._owns_executor else None,
+            **{
+                name: self.counters[name]
+                for name in ("hits", "misses", "coalesced", "conversions", "errors")
+            },
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes this cache started."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # ==================== Converting ====================
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads and locks
+            self._executor = ProcessPoolExecutor(
+                max_workers=conversion_processes(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _start_conversion(self, lcsc_id: str) -> asyncio.Task:
+        """Convert a part once and store the result."""
+        task = asyncio.ensure_future(self._convert_and_store(lcsc_id))
+        self._inflight[lcsc_id] = task
+
+        def finished(done: asyncio.Task) -> None:
+            if self._inflight.get(lcsc_id) is done:
+                del self._inflight[lcsc_id]
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(
+                    f"EasyEDA conversion of {lcsc_id} failed: {done.exception()}"
+                )
+
+        task.add_done_callback(finished)
+        return task
+
+    async def _convert_and_store(self, lcsc_id: str) -> dict[str, Any]:
+        self.counters["conversions"] += 1
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryDirectory(prefix="partshub_easyeda_") as output_dir:
+            result = await loop.run_in_executor(
+                self._get_executor(), self.converter, lcsc_id, output_dir
+            )
+            return self._write(lcsc_id, result)
+
+    # ==================== Storage ====================
+
+    def _read(self, lcsc_id: str) -> dict[str, Any] | None:
+        """Return a cached result whose files are all present and record the hit."""
+        try:
+            with self.session_factory() as session:
+                entry = session.get(EasyEDAConversion, (lcsc_id, self.version))
+                if entry is None:
+                    return None
+                for column in EasyEDAConversion.ARTEFACT_COLUMNS.values():
+                    file_path = getattr(entry, column)
+                    if file_path and not Path(file_path).is_file():
+                        logger.warning(
+                            f"Cached EasyEDA file {file_path} of {lcsc_id} is "
+                            "missing, converting again"
+                        )
+                        return None
+                entry.last_used_at = _now()
+                entry.hit_count += 1
+                result = entry.to_result()
+                session.commit()
+                return result
+        except SQLAlchemyError as e:
+            self.counters["errors"] += 1
+            logger.warning(f"EasyEDA conversion cache read failed: {e}")
+            return None
+
+    def _write(self, lcsc_id: str, result: dict[str, Any]) -> dict[str, Any]:
+        """Move generated files into the blob store and cache the result."""
+        now = _now()
+        entry = EasyEDAConversion(
+            lcsc_id=lcsc_id,
+            converter_version=self.version,
+            component_info=result.get("component_info"),
+            conversions={},
+            created_at=now,
+            last_used_at=now,
+            hit_count=0,
+        )
+        for kind, artefact in (result.get("conversions") or {}).items():
+            column = EasyEDAConversion.ARTEFACT_COLUMNS.get(kind)
+            if column is None or not artefact:
+                continue
+            metadata = dict(artefact)
+            file_path = metadata.pop("file_path", None)
+            if file_path and Path(file_path).is_file():
+                stored = self.blob_store.put_file(file_path, Path(file_path).suffix)
+                setattr(entry, column, str(stored.path))
+            entry.conversions[kind] = metadata
+
+        try:
+            with self.session_factory() as session:
+                session.merge(entry)
+                session.commit()
+        except SQLAlchemyError as e:
+            self.counters["errors"] += 1
+            logger.warning(f"EasyEDA conversion cache write failed: {e}")
+
+        return entry.to_result()
+
+
+# Global instance - lazy initialized
+_conversion_cache: EasyEDAConversionCache | None = None
+
+
+def get_conversion_cache() -> EasyEDAConversionCache:
+    """Get the shared EasyEDA conversion cache."""
+    global _conversion_cache
+    if _conversion_cache is None:
+        _conversion_cache = EasyEDAConversionCache()
+    return _conversion_cache
+
+
+def shutdown_conversion_cache() -> None:
+    """Stop the conversion worker processes, if any were started."""
+    if _conversion_cache is not None:
+        _conversion_cache.shutdown()
@@ -281,10 +281,64 @@ class EasyEDAService:
             logger.error(f"Failed to cleanup temp files: {e}")
 
     def get_conversion_status(self) -> dict[str, Any]:
-        """Get status of EasyEDA conversion capability."""
+        """Get status of EasyEDA conversion capability and its cache."""
+        from .easyeda_cache import get_conversion_cache
+
         return {
             "easyeda_available": EASYEDA_AVAILABLE,
             "api_initialized": self.api is not None,
             "temp_dir": str(self.temp_dir),
             "temp_dir_exists": self.temp_dir.exists(),
+            "conversion_cache": get_conversion_cache().get_statistics(),
+        }
+
+
+async def run_conversion_job(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    Job handler for "easyeda_conversion" jobs.
+
+    With a component_id the component's KiCad data is converted and stored;
+    otherwise the LCSC part is converted and the conversion result returned.
+    Both go through the conversion cache, which runs cold conversions in a
+    worker process.
+
+    Args:
+        payload: Job payload with lcsc_id and optional component_id
+
+    Returns:
+        Conversion result (standalone) or a summary of the stored KiCad data
+    """
+    from ..database import SessionLocal
+    from .component_service import ComponentService
+    from .easyeda_cache import get_conversion_cache
+    from .job_queue import PermanentJobError
+
+    if not EASYEDA_AVAILABLE:
+        raise PermanentJobError("easyeda2kicad library not available")
+
+    lcsc_id = payload["lcsc_id"]
+    component_id = payload.get("component_id")
+
+    if component_id is None:
+        return await get_conversion_cache().convert(lcsc_id)
+
+    db = SessionLocal()
+    try:
+        component_service = ComponentService(db)
+        component = component_service.get_component(component_id)
+        if component is None:
+            raise PermanentJobError(f"Component {component_id} not found")
+
+        kicad_data = await component_service._try_easyeda_conversion(component)
+        if kicad_data is None:
+            raise PermanentJobError(f"Conversion failed for LCSC component {lcsc_id}")
+
+        db.add(kicad_data)
+        db.commit()
+        return {
+            "component_id": component_id,
+            "lcsc_id": lcsc_id,
+            "kicad_data_created": True,
         }
+    finally:
+        db.close()
@@ -0,0 +1,226 @@
+"""
+Streaming export helpers shared by stock history, report and BOM exports.
+
+These generators turn row iterables into encoded byte chunks that can be
+handed straight to a StreamingResponse, so exports start sending data
+immediately and never hold the complete file in memory.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+# Rows fetched from the database per round trip when paging exports
+EXPORT_YIELD_PER = 500
+
+# Approximate size of each chunk handed to the response stream
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_csv(
+    header: list[str],
+    rows: Iterable[Iterable[Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encode rows as CSV, yielding UTF-8 chunks of roughly chunk_size bytes.
+
+    Args:
+        header: Column headers written as the first row
+        rows: Iterable of row value sequences
+        chunk_size: Buffer size before a chunk is flushed
+
+    Yields:
+        Encoded CSV chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(
+    records: Iterable[dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode records as newline-delimited JSON (one object per line).
+
+    Args:
+        records: Iterable of JSON-serialisable dicts
+        chunk_size: Buffer size before a chunk is flushed
+
+    Yields:
+        Encoded NDJSON chunks
+    """
+    buffer: list[str] = []
+    buffered = 0
+
+    for record in records:
+        line = json.dumps(record, default=str) + "\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_json(
+    document: Any, chunk_size: int = EXPORT_CHUNK_SIZE, indent: int | None = 2
+) -> Iterator[bytes]:
+    """
+    Encode an in-memory document incrementally with JSONEncoder.iterencode.
+
+    Args:
+        document: JSON-serialisable object
+        chunk_size: Buffer size before a chunk is flushed
+        indent: Indentation passed to the encoder
+
+    Yields:
+        Encoded JSON chunks
+    """
+    encoder = json.JSONEncoder(indent=indent, default=str)
+    buffer: list[str] = []
+    buffered = 0
+
+    for fragment in encoder.iterencode(document):
+        buffer.append(fragment)
+        buffered += len(fragment)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_json_with_items(
+    header: dict[str, Any],
+    items_key: str,
+    items: Iterable[dict[str, Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encode a JSON object whose (potentially huge) list member is streamed.
+
+    The header fields are written first, followed by items_key holding the
+    items array, so the result parses as a single JSON object.
+
+    Args:
+        header: Scalar fields written before the items array
+        items_key: Key of the streamed array
+        items: Iterable of JSON-serialisable dicts
+        chunk_size: Buffer size before a chunk is flushed
+
+    Yields:
+        Encoded JSON chunks
+    """
+    opening = json.dumps(header, default=str)[:-1]
+    separator = ", " if header else ""
+    buffer = [f"{opening}{separator}{json.dumps(items_key)}: ["]
+    buffered = len(buffer[0])
+    first = True
+
+    for item in items:
+        fragment = ("\n" if first else ",\n") + json.dumps(item, default=str)
+        first = False
+        buffer.append(fragment)
+        buffered += len(fragment)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            buffered = 0
+
+    buffer.append("\n]}" if not first else "]}")
+    yield "".join(buffer).encode("utf-8")
+
+
+def iter_text(
+    lines: Iterable[str], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode text lines (already newline-terminated) as UTF-8 chunks.
+
+    Args:
+        lines: Iterable of strings
+        chunk_size: Buffer size before a chunk is flushed
+
+    Yields:
+        Encoded text chunks
+    """
+    buffer: list[str] = []
+    buffered = 0
+
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            buffered = 0
+
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_xlsx(
+    sheet_title: str,
+    header: list[str],
+    rows: Iterable[Iterable[Any]],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Build an XLSX workbook in openpyxl write-only mode and stream the result.
+
+    Write-only worksheets spill rows to disk as they are appended, and the
+    finished workbook is saved to a temporary file that is then streamed in
+    chunks, so memory use stays flat regardless of the number of rows.
+
+    Args:
+        sheet_title: Worksheet title
+        header: Column headers written as the first row
+        rows: Iterable of row value sequences
+        chunk_size: Size of each chunk read back from the temporary file
+
+    Yields:
+        XLSX file chunks
+
+    Raises:
+        ImportError: openpyxl is not installed
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+    ws.append(header)
+    for row in rows:
+        ws.append(list(row))
+
+    with tempfile.TemporaryFile() as output:
+        wb.save(output)
+        output.seek(0)
+        yield from iter_file(output, chunk_size)
+
+
+def iter_file(
+    fileobj: IO[bytes], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield a binary file object in fixed-size chunks."""
+    while chunk := fileobj.read(chunk_size):
+        yield chunk
@@ -0,0 +1,127 @@
+"""
+Streaming, size-capped downloads written straight to disk.
+
+Resource and attachment downloads used to buffer the whole response in
+memory and trusted Content-Length for the size check. download_to_file
+streams the body in chunks to a temporary file next to the destination:
+
+- the size cap is checked against Content-Length up front and against the
+  bytes actually received, so a missing or lying header cannot exceed it
+- the SHA-256 digest is computed while the chunks are written
+- the temporary file is renamed over the destination only once the body is
+  complete, so readers never see a partial file and a failed download
+  leaves nothing behind
+
+Memory per download stays at one chunk, however large the datasheet or STEP
+model, and however many download in parallel.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the response per write
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class DownloadTooLargeError(ValueError):
+    """Raised when a download exceeds its size cap."""
+
+    pass
+
+
+@dataclass
+class DownloadedFile:
+    """A completed download."""
+
+    path: Path
+    size: int
+    sha256: str
+    content_type: str | None
+
+
+async def download_to_file(
+    url: str,
+    destination: Path,
+    max_size: int,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> DownloadedFile:
+    """
+    Stream a URL to a file, capping its size.
+
+    Args:
+        url: URL to download
+        destination: Final file path (parent directories are created)
+        max_size: Maximum body size in bytes
+        headers: Extra request headers
+        timeout: Request timeout in seconds (client default if None)
+
+    Returns:
+        DownloadedFile with path, size, SHA-256 and Content-Type
+
+    Raises:
+        DownloadTooLargeError: If the body exceeds max_size
+        httpx.HTTPStatusError: If the response status is not successful
+        httpx.HTTPError: On transport errors
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    client = get_http_client()
+    request_options = {"headers": headers, "follow_redirects": True}
+    if timeout is not None:
+        request_options["timeout"] = timeout
+
+    async with client.stream("GET", url, **request_options) as response:
+        response.raise_for_status()
+
+        content_length = response.headers.get("content-length")
+        if content_length and int(content_length) > max_size:
+            raise DownloadTooLargeError(
+                f"File too large: {content_length} bytes (max {max_size})"
+            )
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = tempfile.mkstemp(
+            dir=destination.parent, prefix=f".{destination.name}.", suffix=".part"
+        )
+        temp_path = Path(temp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        raise DownloadTooLargeError(
+                            f"File too large: more than {max_size} bytes received"
+                        )
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.replace(temp_path, destination)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    logger.debug(f"Downloaded {size} bytes from {url} to {destination}")
+    return DownloadedFile(
+        path=destination,
+        size=size,
+        sha256=digest.hexdigest(),
+        content_type=response.headers.get("content-type"),
+    )
+
+
+def is_client_error(error: httpx.HTTPStatusError) -> bool:
+    """Whether a status error is a client error that retrying cannot fix."""
+    status_code = error.response.status_code
+    return 400 <= status_code < 500 and status_code not in (408, 429)
@@ -1,6 +1,9 @@
 """
 File storage service for component attachments.
 Implemented following TDD approach based on comprehensive test requirements.
+
+Files are kept in a content-addressed blob store under <base_path>/blobs, so
+an attachment uploaded for many components is stored once.
 """
 
 import hashlib
@@ -10,6 +13,8 @@ from pathlib import Path
 
 import magic
 
+from .blob_store import THUMBNAIL_SUFFIX, BlobStore, blob_sha256
+
 try:
     from PIL import Image, ImageOps
 
@@ -33,7 +38,7 @@ THUMBNAIL_SIZE = (300, 300)
 
 
 class FileStorageService:
-    """Service for handling file storage with hashed directory structure."""
+    """Service for handling attachment validation and content-addressed storage."""
 
     def __init__(self, base_path: str = None):
         """Initialize file storage service.
@@ -57,35 +62,41 @@ class FileStorageService:
 
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.blobs = BlobStore(self.base_path / "blobs")
 
-    def _get_component_hash(self, component_id: str) -> str:
-        """Generate hash prefix for component directory structure.
+    def _validate_file(self, file_content: bytes, filename: str) -> tuple[str, str]:
+        """Validate file content and return MIME type and cleaned filename.
 
         Args:
-            component_id: Component ID to hash
+            file_content: File content bytes
+            filename: Original filename
 
         Returns:
-            First 2 characters of MD5 hash
+            Tuple of (mime_type, safe_filename)
+
+        Raises:
+            ValueError: If file is invalid
         """
-        return hashlib.md5(component_id.encode(), usedforsecurity=False).hexdigest()[:2]
+        self._check_size(len(file_content))
 
-    def _get_component_dir(self, component_id: str) -> Path:
-        """Get component directory path with hashed structure.
+        # Detect MIME type
+        mime_type = magic.from_buffer(file_content, mime=True)
+        self._check_type(mime_type, len(file_content))
 
-        Args:
-            component_id: Component ID
+        safe_filename = self._clean_filename(filename)
+        if not safe_filename:
+            # Generate filename from hash if original is invalid
+            file_hash = hashlib.md5(file_content, usedforsecurity=False).hexdigest()[:8]
+            extension = self._get_extension_from_mime(mime_type)
+            safe_filename = f"{file_hash}{extension}"
 
-        Returns:
-            Path to component directory
-        """
-        hash_prefix = self._get_component_hash(component_id)
-        return self.base_path / hash_prefix / component_id
+        return mime_type, safe_filename
 
-    def _validate_file(self, file_content: bytes, filename: str) -> tuple[str, str]:
-        """Validate file content and return MIME type and cleaned filename.
+    def _validate_path(self, source_path: Path, filename: str) -> tuple[str, str]:
+        """Validate a file on disk and return MIME type and cleaned filename.
 
         Args:
-            file_content: File content bytes
+            source_path: Path to the file
             filename: Original filename
 
         Returns:
@@ -94,35 +105,41 @@ class FileStorageService:
         Raises:
             ValueError: If file is invalid
         """
-        # Check file size
-        if len(file_content) > MAX_FILE_SIZE:
+        size = source_path.stat().st_size
+        self._check_size(size)
+
+        # Detect MIME type from the file header, without reading it all
+        mime_type = magic.from_file(str(source_path), mime=True)
+        self._check_type(mime_type, size)
+
+        safe_filename = self._clean_filename(filename)
+        if not safe_filename:
+            extension = self._get_extension_from_mime(mime_type)
+            safe_filename = f"{uuid.uuid4().hex[:8]}{extension}"
+
+        return mime_type, safe_filename
+
+    def _check_size(self, size: int) -> None:
+        """Reject files over MAX_FILE_SIZE."""
+        if size > MAX_FILE_SIZE:
             raise ValueError(
                 f"File size exceeds maximum of {MAX_FILE_SIZE // (1024*1024)}MB"
             )
 
-        # Detect MIME type
-        mime_type = magic.from_buffer(file_content, mime=True)
-
+    def _check_type(self, mime_type: str, size: int) -> None:
+        """Reject disallowed MIME types and oversized images."""
         if mime_type not in ALLOWED_MIME_TYPES:
             raise ValueError(f"File type '{mime_type}' is not allowed")
 
         # Additional check for images
-        if mime_type in ALLOWED_IMAGE_TYPES and len(file_content) > MAX_IMAGE_SIZE:
+        if mime_type in ALLOWED_IMAGE_TYPES and size > MAX_IMAGE_SIZE:
             raise ValueError(
                 f"Image size exceeds maximum of {MAX_IMAGE_SIZE // (1024*1024)}MB"
             )
 
-        # Clean filename
-        safe_filename = "".join(
-            c for c in filename if c.isalnum() or c in "._-"
-        ).strip()
-        if not safe_filename:
-            # Generate filename from hash if original is invalid
-            file_hash = hashlib.md5(file_content, usedforsecurity=False).hexdigest()[:8]
-            extension = self._get_extension_from_mime(mime_type)
-            safe_filename = f"{file_hash}{extension}"
-
-        return mime_type, safe_filename
+    def _clean_filename(self, filename: str) -> str:
+        """Keep only alphanumerics and ._- (may return an empty string)."""
+        return "".join(c for c in filename if c.isalnum() or c in "._-").strip()
 
     def _get_extension_from_mime(self, mime_type: str) -> str:
         """Get file extension from MIME type."""
@@ -188,7 +205,9 @@ class FileStorageService:
         filename: str,
         attachment_type: str | None = None,
     ) -> tuple[str, str | None, int, str, str]:
-        """Store file with hashed directory structure.
+        """Store file content in the blob store.
+
+        Identical content is stored once, whichever component it belongs to.
 
         Args:
             component_id: Component ID
@@ -206,42 +225,76 @@ class FileStorageService:
         # Validate file
         mime_type, safe_filename = self._validate_file(file_content, filename)
 
-        # Generate unique filename to prevent conflicts
-        file_id = str(uuid.uuid4())[:8]
-        name_without_ext = Path(safe_filename).stem
-        extension = Path(safe_filename).suffix
-        unique_filename = f"{name_without_ext}_{file_id}{extension}"
+        # Store file
+        try:
+            blob = self.blobs.put_bytes(
+                file_content, self._get_extension_from_mime(mime_type)
+            )
+        except OSError as e:
+            logger.error(f"Failed to store file {safe_filename}: {e}")
+            raise OSError(f"Failed to store file: {e}")
 
-        # Create component directory
-        component_dir = self._get_component_dir(component_id)
-        component_dir.mkdir(parents=True, exist_ok=True)
+        return self._finish_store(blob.path, blob.size, mime_type, safe_filename)
 
-        # Determine subdirectory based on type
-        if attachment_type == "datasheet" or mime_type == "application/pdf":
-            subdir = component_dir / "datasheets"
-        elif mime_type in ALLOWED_IMAGE_TYPES:
-            subdir = component_dir / "images"
-        else:
-            subdir = component_dir / "documents"
+    def store_file_from_path(
+        self,
+        component_id: str,
+        source_path: Path,
+        filename: str,
+        attachment_type: str | None = None,
+    ) -> tuple[str, str | None, int, str, str]:
+        """Move a file already on disk into storage.
 
-        subdir.mkdir(parents=True, exist_ok=True)
+        Used for streamed downloads, so large files are never held in memory.
+        The source should live on the same filesystem (see incoming_dir) so
+        the move is an atomic rename. It is left in place if validation fails,
+        and deleted instead of moved if the content is already stored.
+
+        Args:
+            component_id: Component ID
+            source_path: Path to the file to store
+            filename: Original filename
+            attachment_type: Type of attachment (datasheet, image, etc.)
+
+        Returns:
+            Tuple of (file_path, thumbnail_path, file_size, mime_type, safe_filename)
+
+        Raises:
+            ValueError: If file is invalid
+            IOError: If file cannot be stored
+        """
+        source_path = Path(source_path)
+        mime_type, safe_filename = self._validate_path(source_path, filename)
 
-        # Store file
-        file_path = subdir / unique_filename
         try:
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+            blob = self.blobs.put_file(
+                source_path, self._get_extension_from_mime(mime_type)
+            )
         except OSError as e:
-            logger.error(f"Failed to write file {file_path}: {e}")
+            logger.error(f"Failed to move file {source_path} to storage: {e}")
             raise OSError(f"Failed to store file: {e}")
 
-        # Generate thumbnail for images
+        return self._finish_store(blob.path, blob.size, mime_type, safe_filename)
+
+    @property
+    def incoming_dir(self) -> Path:
+        """Directory for files being downloaded before they are stored."""
+        return self.blobs.incoming_dir
+
+    def _finish_store(
+        self, file_path: Path, file_size: int, mime_type: str, safe_filename: str
+    ) -> tuple[str, str | None, int, str, str]:
+        """Generate the thumbnail of a stored file and build the result tuple."""
+        # Generate thumbnail for images, once per blob
         thumbnail_path = None
         if mime_type in ALLOWED_IMAGE_TYPES:
-            thumb_filename = f"{Path(unique_filename).stem}_thumb.jpg"
-            thumbnail_full_path = subdir / thumb_filename
+            thumbnail_full_path = file_path.with_name(
+                f"{file_path.name[:64]}{THUMBNAIL_SUFFIX}"
+            )
 
-            if self._generate_thumbnail(file_path, thumbnail_full_path):
+            if thumbnail_full_path.exists() or self._generate_thumbnail(
+                file_path, thumbnail_full_path
+            ):
                 # Return relative path from base_path
                 thumbnail_path = str(thumbnail_full_path.relative_to(self.base_path))
 
@@ -251,7 +304,7 @@ class FileStorageService:
         return (
             relative_file_path,
             thumbnail_path,
-            len(file_content),
+            file_size,
             mime_type,
             safe_filename,
         )
@@ -259,6 +312,11 @@ class FileStorageService:
     def delete_file(self, file_path: str, thumbnail_path: str | None = None) -> bool:
         """Delete file and its thumbnail.
 
+        Blob files may be shared with other attachments, resources or KiCad
+        files and are left for BlobStore.collect_garbage, which removes them
+        once the attachment row is gone. Files from the old per-component
+        layout are deleted here.
+
         Args:
             file_path: Relative file path from base_path
             thumbnail_path: Relative thumbnail path from base_path
@@ -266,6 +324,9 @@ class FileStorageService:
         Returns:
             True if file was deleted successfully
         """
+        if blob_sha256(file_path):
+            return True
+
         try:
             # Delete main file
             full_path = self.base_path / file_path
@@ -306,26 +367,6 @@ class FileStorageService:
         """
         return self.get_file_path(relative_path).exists()
 
-    def get_component_files(self, component_id: str) -> list[Path]:
-        """Get all files for a component.
-
-        Args:
-            component_id: Component ID
-
-        Returns:
-            List of file paths
-        """
-        component_dir = self._get_component_dir(component_id)
-        if not component_dir.exists():
-            return []
-
-        files = []
-        for subdir in component_dir.iterdir():
-            if subdir.is_dir():
-                files.extend([f for f in subdir.iterdir() if f.is_file()])
-
-        return files
-
 
 # Global file storage service instance - initialized on first use
 file_storage = FileStorageService()
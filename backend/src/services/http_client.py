@@ -0,0 +1,212 @@
+"""
+Shared HTTP client pool for provider and resource I/O.
+
+Provider lookups, resource downloads and attachment downloads all go through
+one application-lifetime httpx.AsyncClient, so bulk imports reuse warm
+keep-alive (and, with the optional h2 package, HTTP/2) connections instead
+of paying TCP and TLS setup on every request.
+
+The FastAPI lifespan opens the client on startup and closes it on shutdown;
+code running outside the app (scripts, tests) gets one lazily. Clients are
+bound to the event loop they were created on, so a different running loop
+gets its own client.
+
+Besides the pool-wide limits, HostLimitedTransport caps concurrent requests
+per host. A request holds its host slot until the response body has been
+read or closed, so streamed downloads count against the limit too. Every
+request is also paced by its host's shared HostLimiter, which slows down on
+429s and fails fast while the host's circuit is open (see rate_limiter).
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+
+import httpx
+
+from .rate_limiter import CircuitOpenError, HostLimiters, get_host_limiters
+
+logger = logging.getLogger(__name__)
+
+# Try to import h2 for HTTP/2 support
+try:
+    import h2  # noqa: F401
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+    logger.info(
+        "h2 not available. Provider requests will use HTTP/1.1 keep-alive. "
+        "Install with: uv pip install -e '.[http2]'"
+    )
+
+# Connections across all hosts, and idle connections kept open
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Seconds an idle connection is kept for reuse
+HTTP_KEEPALIVE_EXPIRY = 60.0
+
+# Concurrent requests per host
+HTTP_MAX_CONNECTIONS_PER_HOST = 6
+
+# Default request timeout in seconds (callers may pass their own)
+HTTP_DEFAULT_TIMEOUT = 30.0
+
+
+class _HostSlotStream(httpx.AsyncByteStream):
+    """Response body that frees its host slot once read or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper pacing requests and limiting concurrency per host.
+
+    Args:
+        transport: Transport performing the requests
+        max_per_host: Concurrent requests allowed per host
+        limiters: Per-host rate limiters and circuit breakers (default: the
+            shared ones)
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        max_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        limiters: HostLimiters | None = None,
+    ):
+        self._transport = transport
+        self.max_per_host = max_per_host
+        self.limiters = limiters if limiters is not None else get_host_limiters()
+        self._slots: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = self.limiters.get(request.url.host)
+        try:
+            await limiter.acquire()
+        except CircuitOpenError as e:
+            e.request = request
+            raise
+
+        semaphore = self._slots[request.url.host]
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            limiter.release()
+            raise
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError:
+            semaphore.release()
+            limiter.record_failure()
+            raise
+        except BaseException:
+            semaphore.release()
+            limiter.release()
+            raise
+
+        limiter.record_response(
+            response.status_code, response.headers.get("Retry-After")
+        )
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_HostSlotStream(response.stream, semaphore),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def create_http_client(
+    transport: httpx.AsyncBaseTransport | None = None,
+    max_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+    limiters: HostLimiters | None = None,
+) -> httpx.AsyncClient:
+    """
+    Build a pooled client.
+
+    Args:
+        transport: Transport to wrap (default: pooled HTTP transport using
+            HTTP/2 when h2 is installed)
+        max_per_host: Concurrent requests allowed per host
+        limiters: Per-host rate limiters (default: the shared ones)
+
+    Returns:
+        AsyncClient with keep-alive pooling and per-host limits
+    """
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=H2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return httpx.AsyncClient(
+        transport=HostLimitedTransport(transport, max_per_host, limiters),
+        timeout=HTTP_DEFAULT_TIMEOUT,
+    )
+
+
+# Global instance - opened by the app lifespan or lazily
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared client for the running event loop.
+
+    Must be called from a coroutine. The client is shared; do not close it
+    or use it as a context manager.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        # A client left behind by another (finished) loop cannot be closed
+        # from this one; its connections are dropped with it
+        _http_client = create_http_client()
+        _http_client_loop = loop
+    return _http_client
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the shared client (application startup)."""
+    client = get_http_client()
+    logger.info(
+        f"HTTP client pool opened ({'HTTP/2' if H2_AVAILABLE else 'HTTP/1.1'}, "
+        f"{HTTP_MAX_CONNECTIONS_PER_HOST} connections per host)"
+    )
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its connections (application shutdown)."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("HTTP client pool closed")
@@ -0,0 +1,598 @@
+"""
+Durable background job queue.
+
+Resource downloads and EasyEDA conversions used to run inside request
+handlers or as FastAPI background tasks, which block the request or vanish
+on restart. They are now stored as rows in the background_jobs table and run
+by a JobQueue started with the app:
+
+- jobs are enqueued in the caller's transaction, so they only become
+  runnable once the rows they refer to are committed
+- workers claim the highest-priority ready job with a conditional UPDATE, so
+  two workers (or processes) never run the same job
+- running jobs hold a lease, renewed while the handler runs; a job whose
+  lease expired (crashed worker) is claimed again while it has attempts
+  left and marked failed otherwise, and jobs interrupted by shutdown are put
+  back immediately
+- failures are retried with exponential backoff until max_attempts, unless
+  the handler raises PermanentJobError
+- an idempotency key makes enqueueing the same work twice return the
+  existing job
+- at most max_per_host jobs talk to the same remote host at once
+- polls that find nothing to do only read, so they never wait for a write
+  transaction holding the database (see database.write_transaction)
+
+Handlers are async callables taking the job payload and returning a
+JSON-serialisable result (or None).
+"""
+
+import asyncio
+import logging
+import os
+import random
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import urlparse
+
+from sqlalchemy import and_, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..database import get_session
+from ..models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Jobs run concurrently by one queue
+JOB_WORKERS = 4
+
+# Jobs run concurrently against one remote host
+JOB_MAX_PER_HOST = 2
+
+# Attempts before a job is marked failed
+JOB_MAX_ATTEMPTS = 5
+
+# Retry delay after the first failure, doubled per attempt up to the maximum
+JOB_BACKOFF_BASE = 5.0  # seconds
+JOB_BACKOFF_MAX = 3600.0  # seconds
+
+# How long a running job may go without renewing its lease before it is
+# reclaimed; the lease is renewed every JOB_LEASE / 3 while the job runs, so
+# only jobs whose worker died (or whose event loop stalled) expire
+JOB_LEASE = timedelta(minutes=15)
+
+# How often idle workers look for due jobs (enqueues wake them immediately)
+JOB_POLL_INTERVAL = 2.0  # seconds
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler when retrying cannot succeed."""
+
+    pass
+
+
+def job_workers() -> int:
+    """Worker count for the app's queue (JOB_QUEUE_WORKERS, 0 disables)."""
+    return int(os.getenv("JOB_QUEUE_WORKERS", JOB_WORKERS))
+
+
+def job_host(url: str | None) -> str | None:
+    """Host a job talks to, for per-host concurrency limits."""
+    if not url:
+        return None
+    return urlparse(url).hostname
+
+
+def backoff_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a job that failed `attempts` times."""
+    delay = min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * 2 ** max(attempts - 1, 0))
+    # Jitter so jobs that failed together do not retry in lockstep
+    return delay + random.uniform(0, delay * 0.1)
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    priority: int = 0,
+    idempotency_key: str | None = None,
+    host: str | None = None,
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+    delay: float = 0.0,
+) -> BackgroundJob:
+    """
+    Add a job to the queue within the caller's transaction.
+
+    The job is flushed (so it has an ID) but not committed; workers pick it up
+    once the caller commits. Enqueueing an idempotency key that already
+    exists returns that job unchanged while it is queued, running or
+    succeeded, and queues a failed or cancelled one again with a fresh
+    attempt budget.
+
+    Args:
+        db: Session of the caller's transaction
+        kind: Handler name
+        payload: JSON arguments for the handler
+        priority: Higher runs first
+        idempotency_key: Optional key identifying the unit of work
+        host: Remote host the job talks to
+        max_attempts: Attempts before the job is marked failed
+        delay: Seconds before the job may first run
+
+    Returns:
+        The new or existing BackgroundJob
+    """
+    run_after = _now() + timedelta(seconds=delay)
+
+    job = None
+    if idempotency_key is not None:
+        job = (
+            db.query(BackgroundJob)
+            .filter(BackgroundJob.idempotency_key == idempotency_key)
+            .first()
+        )
+        if job is not None and job.status not in ("failed", "cancelled"):
+            return job
+
+    if job is None:
+        job = BackgroundJob(kind=kind, idempotency_key=idempotency_key)
+        db.add(job)
+    job.payload = payload or {}
+    job.priority = priority
+    job.host = host
+    job.max_attempts = max_attempts
+    job.status = "queued"
+    job.attempts = 0
+    job.run_after = run_after
+    job.result = None
+    job.error = None
+    job.finished_at = None
+    db.flush()
+
+    db.info["job_enqueued"] = True
+    return job
+
+
+def retry_job(db: Session, job_id: int) -> BackgroundJob | None:
+    """
+    Queue a failed or cancelled job again with a fresh attempt budget.
+
+    Returns:
+        The job, or None if it does not exist
+
+    Raises:
+        ValueError: If the job is not failed or cancelled
+    """
+    job = db.get(BackgroundJob, job_id)
+    if job is None:
+        return None
+    if job.status not in ("failed", "cancelled"):
+        raise ValueError(
+            f"Job {job_id} is {job.status}; only failed or cancelled jobs can be retried"
+        )
+    job.status = "queued"
+    job.attempts = 0
+    job.run_after = _now()
+    job.error = None
+    job.finished_at = None
+    db.info["job_enqueued"] = True
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def cancel_job(db: Session, job_id: int) -> BackgroundJob | None:
+    """
+    Cancel a queued job.
+
+    Returns:
+        The job, or None if it does not exist
+
+    Raises:
+        ValueError: If the job is not queued
+    """
+    job = db.get(BackgroundJob, job_id)
+    if job is None:
+        return None
+    if job.status != "queued":
+        raise ValueError(
+            f"Job {job_id} is {job.status}; only queued jobs can be cancelled"
+        )
+    job.status = "cancelled"
+    job.finished_at = _now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_queue_after_commit(session: Session) -> None:
+    """Wake idle workers once an enqueueing transaction commits."""
+    if session.info.pop("job_enqueued", False) and _job_queue is not None:
+        _job_queue.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueue_after_rollback(session: Session) -> None:
+    session.info.pop("job_enqueued", None)
+
+
+class JobQueue:
+    """
+    Pool of asyncio workers running jobs from the background_jobs table.
+
+    Args:
+        handlers: Job kind to handler mapping
+        session_factory: Callable returning a new Session (one per operation)
+        workers: Jobs run concurrently
+        max_per_host: Jobs run concurrently against one host
+        poll_interval: Seconds between polls while idle
+        lease: How long a claimed job may run before it is reclaimed
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, JobHandler] | None = None,
+        session_factory: Callable[[], Session] = get_session,
+        workers: int = JOB_WORKERS,
+        max_per_host: int = JOB_MAX_PER_HOST,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease: timedelta = JOB_LEASE,
+    ):
+        self.handlers: dict[str, JobHandler] = dict(handlers or {})
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_per_host = max_per_host
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.counters: Counter[str] = Counter()
+
+        self._host_active: Counter[str] = Counter()
+        self._running: dict[int, asyncio.Task] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the handler for a job kind."""
+        self.handlers[kind] = handler
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; interrupted jobs are put back in the queue."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    def wake(self) -> None:
+        """Make idle workers look for jobs now (safe from any thread)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            pass
+
+    async def _dispatch(self) -> None:
+        while True:
+            await self._slots.acquire()
+            self._wakeup.clear()
+            try:
+                job = self.claim()
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+
+            if job.host:
+                self._host_active[job.host] += 1
+            self._running[job.id] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: BackgroundJob) -> None:
+        try:
+            await self.run_job(job)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._running.pop(job.id, None)
+            if job.host:
+                self._host_active[job.host] -= 1
+                if self._host_active[job.host] <= 0:
+                    del self._host_active[job.host]
+            self._slots.release()
+            self._wakeup.set()
+
+    def claim(self) -> BackgroundJob | None:
+        """
+        Claim the next ready job for this worker.
+
+        Ready jobs are queued ones whose run_after has passed and running ones
+        whose lease expired with attempts left, excluding hosts already at
+        max_per_host. Expired jobs without attempts left (their worker kept
+        dying, e.g. out of memory) are marked failed first. The claim is a
+        conditional UPDATE, so a job taken by another worker in the meantime
+        is skipped.
+
+        Returns:
+            The claimed (detached) job, or None when nothing is ready
+        """
+        now = _now()
+        expired = and_(
+            BackgroundJob.status == "running",
+            BackgroundJob.lease_expires_at < now,
+        )
+        ready = or_(
+            and_(BackgroundJob.status == "queued", BackgroundJob.run_after <= now),
+            and_(expired, BackgroundJob.attempts < BackgroundJob.max_attempts),
+        )
+        saturated = [
+            host
+            for host, active in self._host_active.items()
+            if active >= self.max_per_host
+        ]
+
+        out_of_attempts = and_(
+            expired, BackgroundJob.attempts >= BackgroundJob.max_attempts
+        )
+
+        with self.session_factory() as session:
+            # Checked with a read first, so idle polls never take the write lock
+            exhausted = 0
+            if session.scalar(select(BackgroundJob.id).where(out_of_attempts).limit(1)):
+                exhausted = session.execute(
+                    update(BackgroundJob)
+                    .where(out_of_attempts)
+                    .values(
+                        status="failed",
+                        error="Lease expired on the last attempt (worker lost)",
+                        lease_expires_at=None,
+                        worker_id=None,
+                        finished_at=now,
+                    )
+                ).rowcount
+                session.commit()
+            if exhausted:
+                logger.error(
+                    f"Failed {exhausted} job(s) whose lease expired on the last attempt"
+                )
+                self.counters["failed"] += exhausted
+
+            skipped: list[int] = []
+            while True:
+                candidates = select(BackgroundJob.id).where(ready)
+                if saturated:
+                    candidates = candidates.where(
+                        or_(
+                            BackgroundJob.host.is_(None),
+                            BackgroundJob.host.notin_(saturated),
+                        )
+                    )
+                if skipped:
+                    candidates = candidates.where(BackgroundJob.id.notin_(skipped))
+                job_id = session.scalar(
+                    candidates.order_by(
+                        BackgroundJob.priority.desc(),
+                        BackgroundJob.run_after,
+                        BackgroundJob.id,
+                    ).limit(1)
+                )
+                if job_id is None:
+                    return None
+
+                claimed = session.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == job_id, ready)
+                    .values(
+                        status="running",
+                        attempts=BackgroundJob.attempts + 1,
+                        worker_id=self.worker_id,
+                        lease_expires_at=now + self.lease,
+                        started_at=now,
+                    )
+                ).rowcount
+                session.commit()
+                if claimed:
+                    job = session.get(BackgroundJob, job_id)
+                    session.expunge(job)
+                    self.counters["claimed"] += 1
+                    return job
+                skipped.append(job_id)
+
+    async def run_job(self, job: BackgroundJob) -> None:
+        """Run a claimed job and record its outcome."""
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise PermanentJobError(f"No handler for job kind '{job.kind}'")
+            result = await self._call_handler(handler, job)
+        except asyncio.CancelledError:
+            # Interrupted by shutdown: back to the queue, attempt not counted
+            self._finish(
+                job,
+                status="queued",
+                attempts=job.attempts - 1,
+                run_after=_now(),
+            )
+            self.counters["interrupted"] += 1
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts:
+                logger.error(f"Job {job.id} ({job.kind}) failed: {error}")
+                self._finish(job, status="failed", error=error, finished_at=_now())
+                self.counters["failed"] += 1
+            else:
+                delay = backoff_delay(job.attempts)
+                logger.warning(
+                    f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, "
+                    f"retrying in {delay:.0f}s: {error}"
+                )
+                self._finish(
+                    job,
+                    status="queued",
+                    error=error,
+                    run_after=_now() + timedelta(seconds=delay),
+                )
+                self.counters["retried"] += 1
+        else:
+            self._finish(
+                job, status="succeeded", result=result, error=None, finished_at=_now()
+            )
+            self.counters["succeeded"] += 1
+
+    async def _call_handler(self, handler: JobHandler, job: BackgroundJob) -> Any:
+        """Run a job's handler, renewing its lease until it returns."""
+        renewal = asyncio.create_task(self._keep_lease(job))
+        try:
+            return await handler(dict(job.payload or {}))
+        finally:
+            renewal.cancel()
+
+    async def _keep_lease(self, job: BackgroundJob) -> None:
+        """Push a running job's lease back every third of the lease."""
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            try:
+                self._renew_lease(job)
+            except Exception as e:
+                logger.warning(f"Failed to renew lease of job {job.id}: {e}")
+
+    def _renew_lease(self, job: BackgroundJob) -> None:
+        """Extend a job's lease, unless another worker reclaimed it."""
+        with self.session_factory() as session:
+            session.execute(
+                update(BackgroundJob)
+                .where(
+                    BackgroundJob.id == job.id,
+                    BackgroundJob.status == "running",
+                    BackgroundJob.worker_id == self.worker_id,
+                )
+                .values(lease_expires_at=_now() + self.lease)
+            )
+            session.commit()
+
+    def _finish(self, job: BackgroundJob, **values: Any) -> None:
+        """Release a job's lease, unless another worker reclaimed it."""
+        with self.session_factory() as session:
+            session.execute(
+                update(BackgroundJob)
+                .where(
+                    BackgroundJob.id == job.id,
+                    BackgroundJob.status == "running",
+                    BackgroundJob.worker_id == self.worker_id,
+                )
+                .values(lease_expires_at=None, worker_id=None, **values)
+            )
+            session.commit()
+
+    async def run_pending(self) -> int:
+        """
+        Run ready jobs one at a time until none is left.
+
+        Used when no worker pool is running (scripts, tests).
+
+        Returns:
+            Number of jobs run
+        """
+        count = 0
+        while (job := self.claim()) is not None:
+            await self.run_job(job)
+            count += 1
+        return count
+
+    def get_statistics(self) -> dict:
+        """Job counts per status plus this queue's worker state."""
+        with self.session_factory() as session:
+            counts = dict(
+                session.execute(
+                    select(BackgroundJob.status, func.count(BackgroundJob.id)).group_by(
+                        BackgroundJob.status
+                    )
+                ).all()
+            )
+        return {
+            "jobs": {status: counts.get(status, 0) for status in JOB_STATUSES},
+            "workers": self.workers,
+            "running": self.running,
+            "active_jobs": len(self._running),
+            "active_hosts": dict(self._host_active),
+            **self.counters,
+        }
+
+
+def default_handlers() -> dict[str, JobHandler]:
+    """Handlers for the job kinds enqueued by the app."""
+    from .easyeda_service import run_conversion_job
+    from .resource_service import ResourceService
+
+    return {
+        "resource_download": ResourceService.run_download_job,
+        "easyeda_conversion": run_conversion_job,
+    }
+
+
+# Global instance - lazy initialized
+_job_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get the shared job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(default_handlers(), workers=max(job_workers(), 1))
+    return _job_queue
+
+
+async def start_job_queue() -> None:
+    """Start the shared queue's workers, unless JOB_QUEUE_WORKERS is 0."""
+    if job_workers() <= 0:
+        logger.info("Job queue workers disabled (JOB_QUEUE_WORKERS=0)")
+        return
+    await get_job_queue().start()
+
+
+async def stop_job_queue() -> None:
+    """Stop the shared queue's workers."""
+    if _job_queue is not None:
+        await _job_queue.stop()
@@ -1,17 +1,90 @@
 """
 KiCad library management service.
 Manages component symbols, footprints, and library metadata.
+
+Library syncs keep a manifest next to the library files recording, per
+component, what its symbol and footprint were generated from (updated_at,
+version and category) and a hash of the generated text. Incremental syncs read
+only ids, timestamps and categories, regenerate the parts whose source
+changed, reuse every other symbol from the existing library file, and
+prune the symbols and footprints of parts that are gone, so a sync of a
+large library where little changed rewrites next to nothing.
 """
 
+import hashlib
+import json
 import logging
 import os
+import re
+import tempfile
+from collections.abc import Callable
 from typing import Any
 
+from sqlalchemy.orm import Session, selectinload
+
 from ..database import get_session
-from ..models import Component
+from ..models import Category, Component
 
 logger = logging.getLogger(__name__)
 
+SYMBOL_LIBRARY_FILE = "PartsHub.kicad_sym"
+FOOTPRINT_LIBRARY_DIR = "PartsHub.pretty"
+
+# Per-library record of what was generated, next to the library files
+LIBRARY_MANIFEST_FILE = "PartsHub.manifest.json"
+
+# Bump when generated symbols or footprints change shape, so the next
+# incremental sync regenerates every part once
+LIBRARY_MANIFEST_FORMAT = 1
+
+# Components loaded per query when regenerating changed parts
+SYNC_BATCH_SIZE = 500
+
+_SYMBOL_START = re.compile(r'^  \(symbol ".*" \(in_bom')
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of generated library text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """Write a file through a temporary file, so KiCad never reads half of it."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".partshub_", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _read_symbol_blocks(path: str) -> dict[str, str]:
+    """Symbol definitions of a generated symbol library, by content hash."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except FileNotFoundError:
+        return {}
+
+    blocks = {}
+    block = None
+    for line in lines:
+        if block is None:
+            if _SYMBOL_START.match(line):
+                block = [line]
+            continue
+        block.append(line)
+        if line == "  )":
+            text = "\n".join(block)
+            blocks[content_hash(text)] = text
+            block = None
+    return blocks
+
 
 class KiCadSymbol:
     """Represents a KiCad component symbol"""
@@ -142,7 +215,8 @@ class KiCadFootprint:
 class KiCadLibraryManager:
     """Manages KiCad symbols and footprints for components"""
 
-    def __init__(self):
+    def __init__(self, session_factory: Callable[[], Session] = get_session):
+        self.session_factory = session_factory
         self.symbol_templates = self._load_symbol_templates()
         self.footprint_templates = self._load_footprint_templates()
 
@@ -437,58 +511,134 @@ class KiCadLibraryManager:
         include_footprints: bool = True,
         include_3d_models: bool = False,
         limit: int | None = None,
+        sync_mode: str = "full",
     ) -> dict[str, Any]:
-        """Synchronize components to KiCad library files"""
-        import os
-
-        from sqlalchemy.orm import selectinload
-
-        session = get_session()
+        """
+        Synchronize components to KiCad library files.
+
+        Args:
+            library_path: Directory holding the symbol library, footprint
+                library and manifest
+            category_filters: Category names to export (default: all)
+            include_symbols: Sync PartsHub.kicad_sym
+            include_footprints: Sync PartsHub.pretty
+            include_3d_models: Reserved; 3D models are not exported
+            limit: Maximum components to export
+            sync_mode: "incremental" regenerates only parts that changed
+                since the manifest was written; "full" regenerates all
+
+        Returns:
+            Sync summary; symbols_created and footprints_created count the
+            entries whose generated content changed
+        """
+        session = self.session_factory()
         try:
-            # Query components with filters
-            query = session.query(Component).options(
-                selectinload(Component.category), selectinload(Component.kicad_data)
-            )
+            # Ids plus what their symbols and footprints are generated from;
+            # full components are loaded only for the parts that changed
+            query = session.query(
+                Component.id, Component.updated_at, Component.version, Category.name
+            ).outerjoin(Category, Component.category_id == Category.id)
 
             if category_filters:
-                from ..models import Category
-
-                query = query.join(Category).filter(Category.name.in_(category_filters))
+                query = query.filter(Category.name.in_(category_filters))
 
             if limit:
                 query = query.limit(limit)
 
-            components = query.all()
+            # updated_at has one-second resolution; the optimistic-locking
+            # version catches edits within the same second
+            sources = {
+                component_id: f"{updated_at.isoformat() if updated_at else ''}"
+                f"|{version}|{category_name or ''}"
+                for component_id, updated_at, version, category_name in query.all()
+            }
 
             # Create library directory
             os.makedirs(library_path, exist_ok=True)
+            manifest_path = os.path.join(library_path, LIBRARY_MANIFEST_FILE)
+            manifest = self._load_manifest(manifest_path)
+            force = sync_mode != "incremental"
+
+            symbol_lib_path = os.path.join(library_path, SYMBOL_LIBRARY_FILE)
+            footprint_lib_path = os.path.join(library_path, FOOTPRINT_LIBRARY_DIR)
+            removed = set()
+            symbol_blocks = {}
+            footprint_files = set()
+            stale_symbols = set()
+            stale_footprints = set()
+
+            # A full sync trusts nothing on disk and rewrites every file
+            if include_symbols:
+                if not force:
+                    symbol_blocks = _read_symbol_blocks(symbol_lib_path)
+                stale_symbols = self._stale_components(
+                    sources,
+                    manifest["symbols"],
+                    lambda entry: entry["hash"] in symbol_blocks,
+                )
+                removed |= set(manifest["symbols"]) - set(sources)
+
+            if include_footprints:
+                os.makedirs(footprint_lib_path, exist_ok=True)
+                if not force:
+                    footprint_files = set(os.listdir(footprint_lib_path))
+                stale_footprints = self._stale_components(
+                    sources,
+                    manifest["footprints"],
+                    lambda entry: f"{entry['name']}.kicad_mod" in footprint_files,
+                )
+                removed |= set(manifest["footprints"]) - set(sources)
 
-            # Generate library files
-            symbols_generated = 0
-            footprints_generated = 0
+            components = self._load_components(
+                session, stale_symbols | stale_footprints
+            )
+
+            symbols_generated = footprints_generated = footprints_removed = 0
 
             if include_symbols:
-                symbol_lib_path = os.path.join(library_path, "PartsHub.kicad_sym")
-                symbols_generated = self._generate_symbol_library_file(
-                    components, symbol_lib_path
+                manifest["symbols"], symbols_generated = self._sync_symbols(
+                    sources,
+                    components,
+                    stale_symbols,
+                    manifest["symbols"],
+                    symbol_blocks,
+                    symbol_lib_path,
                 )
 
             if include_footprints:
-                footprint_lib_path = os.path.join(library_path, "PartsHub.pretty")
-                os.makedirs(footprint_lib_path, exist_ok=True)
-                footprints_generated = self._generate_footprint_library_files(
-                    components, footprint_lib_path
+                (
+                    manifest["footprints"],
+                    footprints_generated,
+                    footprints_removed,
+                ) = self._sync_footprints(
+                    sources,
+                    components,
+                    stale_footprints,
+                    manifest["footprints"],
+                    footprint_files,
+                    footprint_lib_path,
                 )
 
-            logger.info(f"Synchronized {len(components)} components to {library_path}")
+            _write_atomic(manifest_path, json.dumps(manifest, sort_keys=True))
+
+            logger.info(
+                f"Synchronized {len(sources)} components to {library_path} "
+                f"({sync_mode}: {len(components)} regenerated, "
+                f"{len(removed)} removed)"
+            )
 
             return {
                 "success": True,
-                "components_exported": len(components),
+                "sync_mode": "full" if force else "incremental",
+                "components_exported": len(sources),
+                "components_regenerated": len(components),
+                "components_unchanged": len(sources) - len(components),
+                "components_removed": len(removed),
                 "symbols_created": symbols_generated,
                 "footprints_created": footprints_generated,
+                "footprints_removed": footprints_removed,
                 "library_path": library_path,
-                "message": f"Successfully synchronized {len(components)} components to KiCad libraries",
+                "message": f"Successfully synchronized {len(sources)} components to KiCad libraries",
             }
 
         except Exception as e:
@@ -501,55 +651,181 @@ class KiCadLibraryManager:
         finally:
             session.close()
 
-    def _generate_symbol_library_file(
-        self, components: list[Component], output_path: str
-    ) -> int:
-        """Generate KiCad symbol library file"""
-        symbol_content = [
-            '(kicad_symbol_lib (version 20231120) (generator "PartsHub")',
-            "",
-        ]
+    @staticmethod
+    def _load_manifest(path: str) -> dict[str, Any]:
+        """The library's manifest, or an empty one if missing or outdated."""
+        empty = {"format": LIBRARY_MANIFEST_FORMAT, "symbols": {}, "footprints": {}}
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable library manifest {path}: {e}")
+            return empty
+        if manifest.get("format") != LIBRARY_MANIFEST_FORMAT:
+            return empty
+        return {**empty, **manifest}
+
+    @staticmethod
+    def _stale_components(
+        sources: dict[str, str],
+        entries: dict[str, dict],
+        on_disk: Callable[[dict], bool],
+    ) -> set[str]:
+        """
+        Components whose manifest entry no longer describes the library.
+
+        An entry is stale when the component changed since it was generated
+        or its output is missing from disk (e.g. a symbol edited by hand).
+        """
+        return {
+            component_id
+            for component_id, source in sources.items()
+            if (entry := entries.get(component_id)) is None
+            or entry["source"] != source
+            or not on_disk(entry)
+        }
+
+    @staticmethod
+    def _load_components(
+        session: Session, component_ids: set[str]
+    ) -> dict[str, Component]:
+        """Components to regenerate, loaded in batches."""
+        components = {}
+        ids = sorted(component_ids)
+        for start in range(0, len(ids), SYNC_BATCH_SIZE):
+            batch = (
+                session.query(Component)
+                .options(selectinload(Component.category))
+                .filter(Component.id.in_(ids[start : start + SYNC_BATCH_SIZE]))
+                .all()
+            )
+            components.update((component.id, component) for component in batch)
+        return components
+
+    def _sync_symbols(
+        self,
+        sources: dict[str, str],
+        components: dict[str, Component],
+        stale: set[str],
+        entries: dict[str, dict],
+        blocks: dict[str, str],
+        output_path: str,
+    ) -> tuple[dict[str, dict], int]:
+        """
+        Regenerate stale symbols and rewrite the library if anything changed.
+
+        blocks holds the existing library's symbols by content hash; those
+        of current parts are copied into the new file as they are.
+
+        Returns:
+            (manifest entries, symbols whose content changed)
+        """
+        new_entries = {}
+        symbol_texts = []
+        changed = 0
+
+        for component_id, source in sources.items():
+            if component_id not in stale:
+                entry = new_entries[component_id] = entries[component_id]
+                symbol_texts.append(blocks[entry["hash"]])
+                continue
 
-        symbols_created = 0
-        for component in components:
+            component = components.get(component_id)
+            if component is None:
+                continue
             try:
                 symbol = self.create_symbol_for_component(component)
-                symbol_content.append(symbol.to_kicad_format())
-                symbol_content.append("")
-                symbols_created += 1
             except Exception as e:
                 logger.warning(
                     f"Failed to generate symbol for {component.part_number}: {e}"
                 )
                 continue
+            text = symbol.to_kicad_format()
+            entry = {"source": source, "name": symbol.name, "hash": content_hash(text)}
+            if entry["hash"] not in blocks:
+                changed += 1
+            new_entries[component_id] = entry
+            symbol_texts.append(text)
 
-        symbol_content.append(")")
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(symbol_content))
+        if changed or set(new_entries) != set(entries) or not blocks:
+            self._write_symbol_library(symbol_texts, output_path)
 
-        return symbols_created
+        return new_entries, changed
 
-    def _generate_footprint_library_files(
-        self, components: list[Component], output_dir: str
-    ) -> int:
-        """Generate KiCad footprint library files"""
-        footprints_created = 0
+    def _sync_footprints(
+        self,
+        sources: dict[str, str],
+        components: dict[str, Component],
+        stale: set[str],
+        entries: dict[str, dict],
+        existing_files: set[str],
+        output_dir: str,
+    ) -> tuple[dict[str, dict], int, int]:
+        """
+        Rewrite stale footprints whose content changed and prune unused ones.
+
+        Returns:
+            (manifest entries, footprints written, footprint files removed)
+        """
+        new_entries = {}
+        written = 0
+
+        for component_id, source in sources.items():
+            if component_id not in stale:
+                new_entries[component_id] = entries[component_id]
+                continue
 
-        for component in components:
+            component = components.get(component_id)
+            if component is None:
+                continue
             try:
                 footprint = self.create_footprint_for_component(component)
-                footprint_filename = f"{footprint.name}.kicad_mod"
-                footprint_path = os.path.join(output_dir, footprint_filename)
-
-                with open(footprint_path, "w", encoding="utf-8") as f:
-                    f.write(footprint.to_kicad_format())
-
-                footprints_created += 1
             except Exception as e:
                 logger.warning(
                     f"Failed to generate footprint for {component.part_number}: {e}"
                 )
                 continue
+            text = footprint.to_kicad_format()
+            entry = {
+                "source": source,
+                "name": footprint.name,
+                "hash": content_hash(text),
+            }
+            previous = entries.get(component_id)
+            filename = f"{footprint.name}.kicad_mod"
+            if (
+                previous is None
+                or previous["hash"] != entry["hash"]
+                or previous["name"] != entry["name"]
+                or filename not in existing_files
+            ):
+                _write_atomic(os.path.join(output_dir, filename), text)
+                existing_files.add(filename)
+                written += 1
+            new_entries[component_id] = entry
+
+        # Footprint files no remaining part was generated into
+        used = {entry["name"] for entry in new_entries.values()}
+        pruned = 0
+        for name in {entry["name"] for entry in entries.values()} - used:
+            path = os.path.join(output_dir, f"{name}.kicad_mod")
+            if os.path.exists(path):
+                os.unlink(path)
+                pruned += 1
+
+        return new_entries, written, pruned
+
+    def _write_symbol_library(self, symbol_texts: list[str], output_path: str):
+        """Write the symbol library file from generated symbol definitions."""
+        symbol_content = [
+            '(kicad_symbol_lib (version 20231120) (generator "PartsHub")',
+            "",
+        ]
+        for text in symbol_texts:
+            symbol_content.append(text)
+            symbol_content.append("")
+        symbol_content.append(")")
 
-        return footprints_created
+        _write_atomic(output_path, "\n".join(symbol_content))
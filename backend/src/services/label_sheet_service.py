@@ -0,0 +1,453 @@
+"""
+Batch label sheet rendering for storage locations.
+
+Renders QR labels for a location subtree or for the locations created from
+a layout configuration, laid out on Avery 5160-compatible sheets (US Letter,
+3 x 10 labels of 2.625" x 1") at 300 DPI. Sheets are returned as a
+multi-page PDF or as single PNG pages.
+
+Each label encodes the location's qr_code_id (falling back to its id, like
+the frontend does) and shows its name, qr_code_id and hierarchy path.
+Rendered labels are cached on disk as 1-bit PNGs keyed by qr_code_id plus a
+digest of the printed text, so reprints only compose pages and a renamed
+location is re-rendered. Cache misses are rendered in a process pool once
+there are enough of them to outweigh dispatch overhead.
+"""
+
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import StorageLocation, StorageLocationClosure
+from .location_generator import LocationGeneratorService
+
+logger = logging.getLogger(__name__)
+
+# Try to import qrcode for QR symbol generation
+try:
+    import qrcode
+
+    QRCODE_AVAILABLE = True
+except ImportError:
+    QRCODE_AVAILABLE = False
+    logger.info(
+        "qrcode not available. Label sheet rendering is disabled. "
+        "Install with: uv pip install -e '.[labels]'"
+    )
+
+# Sheet geometry in pixels at LABEL_DPI (Avery 5160 on US Letter)
+LABEL_DPI = 300
+PAGE_SIZE = (2550, 3300)
+LABEL_SIZE = (788, 300)
+SHEET_COLUMNS = 3
+SHEET_ROWS = 10
+SHEET_MARGINS = (56, 150)  # left, top
+COLUMN_PITCH = 825
+LABELS_PER_PAGE = SHEET_COLUMNS * SHEET_ROWS
+
+# Label content
+QR_SIZE = 270
+LABEL_PADDING = 15
+NAME_FONT_SIZE = 56
+DETAIL_FONT_SIZE = 28
+
+# Bump when the label artwork changes so cached labels are re-rendered
+LABEL_STYLE_VERSION = 1
+
+# Labels rendered per process pool task
+RENDER_CHUNK_SIZE = 100
+
+# Fewer cache misses than this are rendered inline
+POOL_MIN_LABELS = 200
+
+# PDF sheets are composed in memory; bound the page count per request
+MAX_LABELS_PER_SHEET = 5000
+
+MEDIA_TYPES = {"pdf": "application/pdf", "png": "image/png"}
+
+_pool: ProcessPoolExecutor | None = None
+
+
+@dataclass(frozen=True)
+class LabelSpec:
+    """Printed content of one location label."""
+
+    qr_code_id: str
+    name: str
+    hierarchy: str
+
+    @property
+    def cache_key(self) -> str:
+        """qr_code_id made safe for use in a file name."""
+        return re.sub(r"[^A-Za-z0-9_-]", "_", self.qr_code_id)
+
+    @property
+    def cache_path(self) -> Path:
+        """
+        Cache path relative to the cache directory.
+
+        Files live in a directory hashed from the qr_code_id and are named
+        by the qr_code_id plus a digest of everything printed on the label.
+        """
+        shard = hashlib.md5(self.qr_code_id.encode(), usedforsecurity=False)
+        digest = hashlib.sha256(
+            f"{LABEL_STYLE_VERSION}\0{self.qr_code_id}\0{self.name}\0"
+            f"{self.hierarchy}".encode()
+        ).hexdigest()[:12]
+        return Path(shard.hexdigest()[:2], f"{self.cache_key}-{digest}.png")
+
+
+@dataclass
+class LabelSheet:
+    """Rendered sheet and cache statistics."""
+
+    content: bytes
+    media_type: str
+    page_count: int
+    label_count: int
+    rendered: int
+    cached: int
+
+
+def default_cache_dir() -> Path:
+    """Default label cache directory, following FileStorageService conventions."""
+    if os.getenv("LABEL_CACHE_DIR"):
+        return Path(os.environ["LABEL_CACHE_DIR"])
+    if os.getenv("ENVIRONMENT") == "production":
+        return Path("/app/data/labels")
+    return Path("./data/labels")
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    """Default TrueType font at the given size (bitmap font without FreeType)."""
+    try:
+        return ImageFont.load_default(size=size)
+    except (OSError, TypeError):
+        return ImageFont.load_default()
+
+
+def _fit_text(draw: ImageDraw.ImageDraw, text: str, font, width: int) -> str:
+    """Trim text from the left with an ellipsis until it fits width."""
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(f"…{text}", font=font) > width:
+        text = text[1:]
+    return f"…{text}"
+
+
+def render_label(spec: LabelSpec) -> Image.Image:
+    """
+    Render a single 1-bit label image.
+
+    The QR code sits on the left; the name, qr_code_id and hierarchy path
+    are printed to its right.
+    """
+    label = Image.new("1", LABEL_SIZE, 1)
+
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=1, border=2
+    )
+    qr.add_data(spec.qr_code_id)
+    qr.make(fit=True)
+    qr.box_size = max(1, QR_SIZE // (qr.modules_count + 2 * qr.border))
+    symbol = qr.make_image().get_image().convert("1")
+    offset = (QR_SIZE - symbol.size[0]) // 2
+    label.paste(symbol, (offset, (LABEL_SIZE[1] - symbol.size[1]) // 2))
+
+    draw = ImageDraw.Draw(label)
+    left = QR_SIZE + LABEL_PADDING
+    width = LABEL_SIZE[0] - left - LABEL_PADDING
+    name_font = _font(NAME_FONT_SIZE)
+    detail_font = _font(DETAIL_FONT_SIZE)
+
+    draw.text(
+        (left, 40), _fit_text(draw, spec.name, name_font, width), font=name_font, fill=0
+    )
+    draw.text((left, 130), spec.qr_code_id, font=detail_font, fill=0)
+    draw.text(
+        (left, 180),
+        _fit_text(draw, spec.hierarchy, detail_font, width),
+        font=detail_font,
+        fill=0,
+    )
+    return label
+
+
+def render_to_cache(cache_dir: str, specs: list[LabelSpec]) -> int:
+    """
+    Render labels into the cache directory (process pool entry point).
+
+    Files are written under a temporary name and renamed, so concurrent
+    renders of the same label never expose a partial file.
+
+    Returns:
+        Number of labels written
+    """
+    root = Path(cache_dir)
+    for spec in specs:
+        path = root / spec.cache_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        render_label(spec).save(temp, "PNG", optimize=True)
+        os.replace(temp, path)
+        # Drop renders of the same qr_code_id with outdated text
+        for stale in path.parent.glob(f"{spec.cache_key}-*.png"):
+            if stale != path and stale.stem.rsplit("-", 1)[0] == spec.cache_key:
+                stale.unlink(missing_ok=True)
+    return len(specs)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared render pool, created on first use."""
+    global _pool
+    if _pool is None:
+        # spawn: forking a threaded server process can deadlock the children
+        _pool = ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_label_pool() -> None:
+    """Stop the render worker processes, if any were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+class LabelSheetService:
+    """
+    Service for printing storage location labels in bulk.
+
+    Provides methods for:
+    - Collecting labels for a location subtree
+    - Collecting labels for the locations created from a layout
+    - Rendering cached labels onto PDF/PNG sheets
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        cache_dir: str | Path | None = None,
+        pool_min_labels: int = POOL_MIN_LABELS,
+    ):
+        """
+        Initialize service with database session.
+
+        Args:
+            db: SQLAlchemy session for database operations
+            cache_dir: Label cache directory (default: per environment)
+            pool_min_labels: Cache misses needed before rendering in the
+                process pool
+        """
+        self.db = db
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.pool_min_labels = pool_min_labels
+
+    # ==================== Label selection ====================
+
+    def subtree_labels(self, root_id: str) -> list[LabelSpec]:
+        """
+        Labels for a location and all of its descendants, in hierarchy order.
+
+        Raises:
+            ValueError: Location not found
+        """
+        if not self.db.get(StorageLocation, root_id):
+            raise ValueError(f"Storage location {root_id} not found")
+
+        rows = self.db.execute(
+            select(
+                StorageLocation.id,
+                StorageLocation.qr_code_id,
+                StorageLocation.name,
+                StorageLocation.location_hierarchy,
+            )
+            .join(
+                StorageLocationClosure,
+                StorageLocationClosure.descendant_id == StorageLocation.id,
+            )
+            .where(StorageLocationClosure.ancestor_id == root_id)
+            .order_by(StorageLocation.location_hierarchy)
+        )
+        return [self._spec(row) for row in rows]
+
+    def layout_labels(self, config) -> list[LabelSpec]:
+        """
+        Labels for the locations created from a layout, in layout order.
+
+        Locations are matched by generated name under the layout's parent,
+        RENDER_CHUNK_SIZE names per query.
+
+        Raises:
+            ValueError: Some locations of the layout have not been created
+        """
+        names = LocationGeneratorService().iter_names(config)
+        parent = (
+            StorageLocation.parent_id == config.parent_id
+            if config.parent_id
+            else StorageLocation.parent_id.is_(None)
+        )
+
+        specs = []
+        missing = 0
+        chunk: list[str] = []
+        for name in names:
+            chunk.append(name)
+            if len(chunk) >= RENDER_CHUNK_SIZE:
+                missing += self._collect_layout_chunk(chunk, parent, specs)
+        missing += self._collect_layout_chunk(chunk, parent, specs)
+
+        if missing:
+            raise ValueError(
+                f"{missing} location(s) from this layout have not been created"
+            )
+        return specs
+
+    def _collect_layout_chunk(self, chunk: list[str], parent, specs: list) -> int:
+        """Append specs for one chunk of names; return how many are missing."""
+        if not chunk:
+            return 0
+        rows = {
+            row.name: row
+            for row in self.db.execute(
+                select(
+                    StorageLocation.id,
+                    StorageLocation.qr_code_id,
+                    StorageLocation.name,
+                    StorageLocation.location_hierarchy,
+                ).where(parent, StorageLocation.name.in_(chunk))
+            )
+        }
+        specs.extend(self._spec(rows[name]) for name in chunk if name in rows)
+        missing = len(chunk) - len(rows)
+        chunk.clear()
+        return missing
+
+    @staticmethod
+    def _spec(row) -> LabelSpec:
+        return LabelSpec(
+            qr_code_id=row.qr_code_id or row.id,
+            name=row.name,
+            hierarchy=row.location_hierarchy,
+        )
+
+    # ==================== Rendering ====================
+
+    def render_sheet(
+        self, specs: list[LabelSpec], output_format: str = "pdf", page: int = 1
+    ) -> LabelSheet:
+        """
+        Render labels onto sheets.
+
+        Args:
+            specs: Labels in print order
+            output_format: "pdf" (every page) or "png" (one page)
+            page: 1-based page number for PNG output
+
+        Returns:
+            LabelSheet with the encoded document and cache statistics
+
+        Raises:
+            RuntimeError: qrcode is not installed
+            ValueError: Unknown format, page out of range, no labels or too
+                many labels for one PDF
+        """
+        if not QRCODE_AVAILABLE:
+            raise RuntimeError(
+                "Label rendering not available. qrcode library not installed."
+            )
+        if output_format not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported label format: {output_format}")
+        if not specs:
+            raise ValueError("No locations to label")
+
+        page_count = -(-len(specs) // LABELS_PER_PAGE)
+        if output_format == "png":
+            if not 1 <= page <= page_count:
+                raise ValueError(f"Page {page} out of range (1-{page_count})")
+            start = (page - 1) * LABELS_PER_PAGE
+            printed = specs[start : start + LABELS_PER_PAGE]
+        else:
+            if len(specs) > MAX_LABELS_PER_SHEET:
+                raise ValueError(
+                    f"{len(specs)} labels exceed the limit of "
+                    f"{MAX_LABELS_PER_SHEET} per PDF; print a smaller subtree"
+                )
+            printed = specs
+
+        rendered = self._ensure_cached(printed)
+
+        pages = [
+            self._compose_page(printed[i : i + LABELS_PER_PAGE])
+            for i in range(0, len(printed), LABELS_PER_PAGE)
+        ]
+        buffer = io.BytesIO()
+        if output_format == "pdf":
+            pages[0].save(
+                buffer,
+                "PDF",
+                save_all=True,
+                append_images=pages[1:],
+                resolution=LABEL_DPI,
+            )
+        else:
+            pages[0].save(buffer, "PNG", optimize=True, dpi=(LABEL_DPI, LABEL_DPI))
+
+        logger.info(
+            f"Rendered {len(printed)} labels ({rendered} new) "
+            f"onto {len(pages)} {output_format} page(s)"
+        )
+        return LabelSheet(
+            content=buffer.getvalue(),
+            media_type=MEDIA_TYPES[output_format],
+            page_count=page_count,
+            label_count=len(specs),
+            rendered=rendered,
+            cached=len(printed) - rendered,
+        )
+
+    def _label_path(self, spec: LabelSpec) -> Path:
+        return self.cache_dir / spec.cache_path
+
+    def _ensure_cached(self, specs: list[LabelSpec]) -> int:
+        """Render every label missing from the cache; return how many."""
+        missing = list({spec for spec in specs if not self._label_path(spec).exists()})
+        if not missing:
+            return 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_dir = str(self.cache_dir)
+        if len(missing) < self.pool_min_labels:
+            return render_to_cache(cache_dir, missing)
+
+        chunks = [
+            missing[i : i + RENDER_CHUNK_SIZE]
+            for i in range(0, len(missing), RENDER_CHUNK_SIZE)
+        ]
+        pool = _get_pool()
+        return sum(pool.map(render_to_cache, [cache_dir] * len(chunks), chunks))
+
+    def _compose_page(self, specs: list[LabelSpec]) -> Image.Image:
+        """Paste cached labels onto one sheet, row by row."""
+        sheet = Image.new("1", PAGE_SIZE, 1)
+        left, top = SHEET_MARGINS
+        for position, spec in enumerate(specs):
+            row, column = divmod(position, SHEET_COLUMNS)
+            with Image.open(self._label_path(spec)) as label:
+                sheet.paste(
+                    label, (left + column * COLUMN_PITCH, top + row * LABEL_SIZE[1])
+                )
+        return sheet
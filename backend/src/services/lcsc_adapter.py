@@ -5,36 +5,30 @@ Implements the ProviderAdapter interface for LCSC (Shenzhen Licheng Technology C
 using web scraping to search their public website.
 """
 
-import asyncio
 import logging
 import re
+from urllib.parse import urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 
+from .browser_pool import PLAYWRIGHT_AVAILABLE, get_browser_pool
+from .http_client import get_http_client
 from .provider_adapter import ProviderAdapter
+from .rate_limiter import CircuitOpenError, get_host_limiters
 
 logger = logging.getLogger(__name__)
 
-# Try to import Playwright for JavaScript rendering
-try:
-    from playwright.async_api import async_playwright
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    logger.info(
-        "Playwright not available. LCSC search will use basic HTML scraping (may return limited results). "
-        "Install with: uv pip install -e '.[scraping]' && playwright install chromium"
-    )
-
 
 class LCSCAdapter(ProviderAdapter):
     """
     LCSC provider adapter for searching parts and retrieving resources.
 
-    Implements rate limiting (10 req/sec), error handling, and pagination
-    for the LCSC API.
+    Implements error handling and pagination for the LCSC API. Requests are
+    paced per host by the shared HostLimiter (HTTP requests by the client
+    transport, browser page loads by _goto), which also fails them fast with
+    CircuitOpenError while LCSC is down; that error is never swallowed, so
+    callers can serve cached data instead.
     """
 
     def __init__(
@@ -49,20 +43,23 @@ class LCSCAdapter(ProviderAdapter):
         """
         self.api_key = api_key
         self.base_url = base_url
-        self._last_request_time = 0.0
-        self._rate_limit_delay = 0.1  # 10 requests per second = 0.1s between requests
-
-    async def _rate_limit(self):
-        """Enforce rate limiting to prevent API abuse."""
-        import time
-
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-
-        if time_since_last_request < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - time_since_last_request)
 
-        self._last_request_time = time.time()
+    async def _goto(self, page, url: str):
+        """Load a page in the browser, paced by the host's shared limiter."""
+        limiter = get_host_limiters().get(urlparse(url).hostname)
+        await limiter.acquire()
+        try:
+            response = await page.goto(
+                url, wait_until="domcontentloaded", timeout=15000
+            )
+        except Exception:
+            limiter.record_failure()
+            raise
+        if response is not None:
+            limiter.record_response(
+                response.status, response.headers.get("retry-after")
+            )
+        return response
 
     async def _make_request(
         self, endpoint: str, params: dict | None = None, timeout: float = 10.0
@@ -82,32 +79,30 @@ class LCSCAdapter(ProviderAdapter):
             httpx.HTTPStatusError: If API returns error status
             httpx.TimeoutException: If request times out
         """
-        await self._rate_limit()
-
         url = f"{self.base_url}{endpoint}"
         headers = {}
 
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    url, params=params or {}, headers=headers, timeout=timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    f"LCSC API error: {e.response.status_code} - {e.response.text}"
-                )
-                raise
-            except httpx.TimeoutException:
-                logger.error(f"LCSC API timeout for {url}")
-                raise
-            except Exception as e:
-                logger.error(f"LCSC API request failed: {str(e)}")
-                raise
+        client = get_http_client()
+        try:
+            response = await client.get(
+                url, params=params or {}, headers=headers, timeout=timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"LCSC API error: {e.response.status_code} - {e.response.text}"
+            )
+            raise
+        except httpx.TimeoutException:
+            logger.error(f"LCSC API timeout for {url}")
+            raise
+        except Exception as e:
+            logger.error(f"LCSC API request failed: {str(e)}")
+            raise
 
     async def search(self, query: str, limit: int = 10) -> list[dict]:
         """
@@ -125,6 +120,8 @@ class LCSCAdapter(ProviderAdapter):
         if PLAYWRIGHT_AVAILABLE:
             try:
                 return await self._search_with_playwright(query, limit)
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 logger.warning(
                     f"Playwright search failed, falling back to basic scraping: {e}"
@@ -144,108 +141,97 @@ class LCSCAdapter(ProviderAdapter):
         Returns:
             List of search results
         """
-        await self._rate_limit()
+        async with get_browser_pool().page() as page:
+            # Navigate to search page
+            search_url = f"https://www.lcsc.com/search?q={query}"
+            await self._goto(page, search_url)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+            # LCSC loads results via Vue.js/API - wait for the data table to populate
+            # Wait for table rows to appear (they don't have data-track in practice)
             try:
-                page = await browser.new_page()
+                await page.wait_for_selector("tbody tr", timeout=10000)
+                logger.info("Product table loaded successfully")
+            except Exception as e:
+                logger.warning(f"Timeout waiting for product table: {e}")
+                # Try anyway - sometimes content loads but selector times out
+                pass
+
+            # Get page content after JS rendering
+            content = await page.content()
+            soup = BeautifulSoup(content, "html.parser")
 
-                # Navigate to search page
-                search_url = f"https://www.lcsc.com/search?q={query}"
-                await page.goto(search_url, wait_until="networkidle", timeout=15000)
+            results = []
+            # LCSC uses table tbody tr for product rows
+            # Get more rows than needed since many are headers/non-products
+            all_rows = soup.select("tbody tr")
+            logger.debug(f"Found {len(all_rows)} total table rows")
+
+            for row in all_rows:
+                # Stop if we have enough results
+                if len(results) >= limit:
+                    break
 
-                # LCSC loads results via Vue.js/API - wait for the data table to populate
-                # Wait for table rows to appear (they don't have data-track in practice)
                 try:
-                    await page.wait_for_selector("tbody tr", timeout=10000)
-                    logger.info("Product table loaded successfully")
-                except Exception as e:
-                    logger.warning(f"Timeout waiting for product table: {e}")
-                    # Try anyway - sometimes content loads but selector times out
-                    pass
+                    # Extract LCSC part number from link (e.g., C8734)
+                    part_link = row.select_one('a[href*="/product-detail/C"]')
+                    if not part_link:
+                        continue
 
-                # Get page content after JS rendering
-                content = await page.content()
-                soup = BeautifulSoup(content, "html.parser")
-
-                results = []
-                # LCSC uses table tbody tr for product rows
-                # Get more rows than needed since many are headers/non-products
-                all_rows = soup.select("tbody tr")
-                logger.debug(f"Found {len(all_rows)} total table rows")
-
-                for row in all_rows:
-                    # Stop if we have enough results
-                    if len(results) >= limit:
-                        break
-
-                    try:
-                        # Extract LCSC part number from link (e.g., C8734)
-                        part_link = row.select_one('a[href*="/product-detail/C"]')
-                        if not part_link:
-                            continue
-
-                        href = part_link.get("href", "")
-                        part_number_match = re.search(r"C\d+", href)
-                        if not part_number_match:
-                            continue
-
-                        lcsc_part_number = part_number_match.group(0)
-
-                        # Extract MPN (manufacturer part number)
-                        # MPN is in a link with highlighted text (has <span> with background-color)
-                        mpn_elem = row.select_one("a.font-Bold-600.v2-a")
-                        if mpn_elem:
-                            # Get text, removing HTML highlighting
-                            mpn_text = mpn_elem.get_text(strip=True)
-                            mpn = mpn_text if mpn_text != lcsc_part_number else ""
-                        else:
-                            mpn = ""
-
-                        # Extract manufacturer
-                        mfr_link = row.select_one('a[href*="/brand-detail/"]')
-                        manufacturer = mfr_link.get_text(strip=True) if mfr_link else ""
-
-                        # Note: Description and package data from search results is unreliable
-                        # due to dynamic table structure. Get from detail page instead.
-                        description = ""
-                        footprint = ""
-
-                        # Extract image
-                        img_elem = row.select_one("div.v-image__image")
-                        image_url = ""
-                        if img_elem:
-                            style = img_elem.get("style", "")
-                            img_match = re.search(
-                                r'url\(["\']?([^"\']+)["\']?\)', style
-                            )
-                            if img_match:
-                                image_url = img_match.group(1)
-
-                        results.append(
-                            {
-                                "part_number": lcsc_part_number,
-                                "name": mpn or lcsc_part_number,
-                                "description": description,
-                                "manufacturer": manufacturer,
-                                "datasheet_url": "",  # Datasheet URL only available from detail page
-                                "image_urls": [image_url] if image_url else [],
-                                "footprint": footprint,
-                                "provider_url": f"https://www.lcsc.com/product-detail/{lcsc_part_number}.html",
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to parse product row: {e}")
+                    href = part_link.get("href", "")
+                    part_number_match = re.search(r"C\d+", href)
+                    if not part_number_match:
                         continue
 
-                logger.info(
-                    f"Playwright search for '{query}' returned {len(results)} results"
-                )
-                return results[:limit]
+                    lcsc_part_number = part_number_match.group(0)
+
+                    # Extract MPN (manufacturer part number)
+                    # MPN is in a link with highlighted text (has <span> with background-color)
+                    mpn_elem = row.select_one("a.font-Bold-600.v2-a")
+                    if mpn_elem:
+                        # Get text, removing HTML highlighting
+                        mpn_text = mpn_elem.get_text(strip=True)
+                        mpn = mpn_text if mpn_text != lcsc_part_number else ""
+                    else:
+                        mpn = ""
+
+                    # Extract manufacturer
+                    mfr_link = row.select_one('a[href*="/brand-detail/"]')
+                    manufacturer = mfr_link.get_text(strip=True) if mfr_link else ""
+
+                    # Note: Description and package data from search results is unreliable
+                    # due to dynamic table structure. Get from detail page instead.
+                    description = ""
+                    footprint = ""
+
+                    # Extract image
+                    img_elem = row.select_one("div.v-image__image")
+                    image_url = ""
+                    if img_elem:
+                        style = img_elem.get("style", "")
+                        img_match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
+                        if img_match:
+                            image_url = img_match.group(1)
+
+                    results.append(
+                        {
+                            "part_number": lcsc_part_number,
+                            "name": mpn or lcsc_part_number,
+                            "description": description,
+                            "manufacturer": manufacturer,
+                            "datasheet_url": "",  # Datasheet URL only available from detail page
+                            "image_urls": [image_url] if image_url else [],
+                            "footprint": footprint,
+                            "provider_url": f"https://www.lcsc.com/product-detail/{lcsc_part_number}.html",
+                        }
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to parse product row: {e}")
+                    continue
 
-            finally:
-                await browser.close()
+            logger.info(
+                f"Playwright search for '{query}' returned {len(results)} results"
+            )
+            return results[:limit]
 
     async def _extract_specifications_with_playwright(
         self, part_number: str, product_url: str
@@ -260,89 +246,82 @@ class LCSCAdapter(ProviderAdapter):
         Returns:
             Dictionary of specifications
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
-                page = await browser.new_page()
-
-                # Navigate to product page
-                await page.goto(product_url, wait_until="networkidle", timeout=15000)
-
-                # Wait for specifications table to load
-                try:
-                    await page.wait_for_selector(
-                        "div.common-table-v7 tbody tr", timeout=10000
-                    )
-                except Exception:
-                    logger.warning(f"Timeout waiting for specs table on {part_number}")
-
-                # Get rendered HTML
-                content = await page.content()
-                soup = BeautifulSoup(content, "html.parser")
-
-                specifications = {}
+        async with get_browser_pool().page() as page:
+            # Navigate to product page
+            await self._goto(page, product_url)
 
-                # Find the "Products Specifications" heading
-                spec_heading = None
-                headings = soup.select(
-                    "h2, h3, .table-title, .section-title, div.font-Bold-600"
+            # Wait for specifications table to load
+            try:
+                await page.wait_for_selector(
+                    "div.common-table-v7 tbody tr", timeout=10000
+                )
+            except Exception:
+                logger.warning(f"Timeout waiting for specs table on {part_number}")
+
+            # Get rendered HTML
+            content = await page.content()
+            soup = BeautifulSoup(content, "html.parser")
+
+            specifications = {}
+
+            # Find the "Products Specifications" heading
+            spec_heading = None
+            headings = soup.select(
+                "h2, h3, .table-title, .section-title, div.font-Bold-600"
+            )
+            for heading in headings:
+                heading_text = heading.get_text(strip=True)
+                if "Product" in heading_text and "Specification" in heading_text:
+                    spec_heading = heading
+                    break
+
+            if spec_heading:
+                # Get all tables after the heading
+                spec_tables = spec_heading.find_all_next(
+                    "div", class_="common-table-v7", limit=10
                 )
-                for heading in headings:
-                    heading_text = heading.get_text(strip=True)
-                    if "Product" in heading_text and "Specification" in heading_text:
-                        spec_heading = heading
-                        break
-
-                if spec_heading:
-                    # Get all tables after the heading
-                    spec_tables = spec_heading.find_all_next(
-                        "div", class_="common-table-v7", limit=10
-                    )
 
-                    for table in spec_tables:
-                        spec_rows = table.select("tbody tr")
-
-                        for row in spec_rows:
-                            cells = row.select("td")
-                            if len(cells) >= 2:
-                                spec_name = cells[0].get_text(strip=True)
-                                spec_value = cells[1].get_text(strip=True)
-
-                                # Skip pricing rows (1+, 10+, etc.)
-                                if "+" in spec_name and "$" in spec_value:
-                                    continue
-
-                                # Skip general info and non-technical fields
-                                if spec_name in [
-                                    "Category",
-                                    "Manufacturer",
-                                    "Package",
-                                    "ECCN",
-                                    "CNHTS",
-                                    "USHTS",
-                                    "TARIC",
-                                    "CAHTS",
-                                    "BRHTS",
-                                    "INHTS",
-                                    "MXHTS",
-                                    "Datasheet",
-                                    "Minimum",
-                                    "Multiple",
-                                    "Standard Packaging",
-                                    "Sales Unit",
-                                    "EDA Models",
-                                    "RoHS",
-                                ]:
-                                    continue
-
-                                # Store valid specifications
-                                if spec_name and spec_value:
-                                    specifications[spec_name] = spec_value
-
-                return specifications
-
-            finally:
-                await browser.close()
+                for table in spec_tables:
+                    spec_rows = table.select("tbody tr")
+
+                    for row in spec_rows:
+                        cells = row.select("td")
+                        if len(cells) >= 2:
+                            spec_name = cells[0].get_text(strip=True)
+                            spec_value = cells[1].get_text(strip=True)
+
+                            # Skip pricing rows (1+, 10+, etc.)
+                            if "+" in spec_name and "$" in spec_value:
+                                continue
+
+                            # Skip general info and non-technical fields
+                            if spec_name in [
+                                "Category",
+                                "Manufacturer",
+                                "Package",
+                                "ECCN",
+                                "CNHTS",
+                                "USHTS",
+                                "TARIC",
+                                "CAHTS",
+                                "BRHTS",
+                                "INHTS",
+                                "MXHTS",
+                                "Datasheet",
+                                "Minimum",
+                                "Multiple",
+                                "Standard Packaging",
+                                "Sales Unit",
+                                "EDA Models",
+                                "RoHS",
+                            ]:
+                                continue
+
+                            # Store valid specifications
+                            if spec_name and spec_value:
+                                specifications[spec_name] = spec_value
+
+            return specifications
 
     async def _search_basic(self, query: str, limit: int = 10) -> list[dict]:
         """
@@ -357,8 +336,6 @@ class LCSCAdapter(ProviderAdapter):
             List of search results (likely empty due to JS requirement)
         """
         try:
-            await self._rate_limit()
-
             search_url = "https://www.lcsc.com/search"
             params = {"q": query}
 
@@ -368,74 +345,74 @@ class LCSCAdapter(ProviderAdapter):
                 "Accept-Language": "en-US,en;q=0.5",
             }
 
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(
-                    search_url, params=params, headers=headers, timeout=10.0
-                )
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, "html.parser")
-                results = []
-
-                product_items = soup.select(
-                    ".product-item, .search-product-item, [data-product-code]"
-                )[:limit]
-
-                for item in product_items:
-                    try:
-                        part_number = self._extract_part_number_from_item(item)
-                        if not part_number:
-                            continue
-
-                        name_elem = item.select_one(
-                            ".product-model, .product-name, h3, h4"
-                        )
-                        name = (
-                            name_elem.get_text(strip=True) if name_elem else part_number
-                        )
-
-                        desc_elem = item.select_one(
-                            ".product-intro, .product-description, p"
-                        )
-                        description = (
-                            desc_elem.get_text(strip=True) if desc_elem else ""
-                        )
-
-                        mfr_elem = item.select_one(".product-brand, .manufacturer")
-                        manufacturer = mfr_elem.get_text(strip=True) if mfr_elem else ""
-
-                        pkg_elem = item.select_one(".product-package, .package")
-                        footprint = pkg_elem.get_text(strip=True) if pkg_elem else ""
-
-                        img_elem = item.select_one("img")
-                        image_url = img_elem.get("src", "") if img_elem else ""
-                        if image_url and not image_url.startswith("http"):
-                            image_url = f"https://www.lcsc.com{image_url}"
-
-                        results.append(
-                            {
-                                "part_number": part_number,
-                                "name": name,
-                                "description": description,
-                                "manufacturer": manufacturer,
-                                "datasheet_url": "",  # Datasheet URL only available from detail page
-                                "image_urls": [image_url] if image_url else [],
-                                "footprint": footprint,
-                                "provider_url": f"https://www.lcsc.com/product-detail/{part_number}.html",
-                            }
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to parse product item: {e}")
+            client = get_http_client()
+            response = await client.get(
+                search_url,
+                params=params,
+                headers=headers,
+                timeout=10.0,
+                follow_redirects=True,
+            )
+            response.raise_for_status()
+
+            soup = BeautifulSoup(response.text, "html.parser")
+            results = []
+
+            product_items = soup.select(
+                ".product-item, .search-product-item, [data-product-code]"
+            )[:limit]
+
+            for item in product_items:
+                try:
+                    part_number = self._extract_part_number_from_item(item)
+                    if not part_number:
                         continue
 
-                if not results:
-                    logger.warning(
-                        f"Basic HTML scraping found no results for '{query}' - Install Playwright for better results: "
-                        "uv pip install -e '.[scraping]' && playwright install chromium"
+                    name_elem = item.select_one(".product-model, .product-name, h3, h4")
+                    name = name_elem.get_text(strip=True) if name_elem else part_number
+
+                    desc_elem = item.select_one(
+                        ".product-intro, .product-description, p"
+                    )
+                    description = desc_elem.get_text(strip=True) if desc_elem else ""
+
+                    mfr_elem = item.select_one(".product-brand, .manufacturer")
+                    manufacturer = mfr_elem.get_text(strip=True) if mfr_elem else ""
+
+                    pkg_elem = item.select_one(".product-package, .package")
+                    footprint = pkg_elem.get_text(strip=True) if pkg_elem else ""
+
+                    img_elem = item.select_one("img")
+                    image_url = img_elem.get("src", "") if img_elem else ""
+                    if image_url and not image_url.startswith("http"):
+                        image_url = f"https://www.lcsc.com{image_url}"
+
+                    results.append(
+                        {
+                            "part_number": part_number,
+                            "name": name,
+                            "description": description,
+                            "manufacturer": manufacturer,
+                            "datasheet_url": "",  # Datasheet URL only available from detail page
+                            "image_urls": [image_url] if image_url else [],
+                            "footprint": footprint,
+                            "provider_url": f"https://www.lcsc.com/product-detail/{part_number}.html",
+                        }
                     )
+                except Exception as e:
+                    logger.warning(f"Failed to parse product item: {e}")
+                    continue
+
+            if not results:
+                logger.warning(
+                    f"Basic HTML scraping found no results for '{query}' - Install Playwright for better results: "
+                    "uv pip install -e '.[scraping]' && playwright install chromium"
+                )
 
-                return results[:limit]
+            return results[:limit]
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.error(f"LCSC basic search failed for query '{query}': {str(e)}")
             return []
@@ -479,8 +456,6 @@ class LCSCAdapter(ProviderAdapter):
         """
         logger.warning(f"[LCSC] Getting part details for {part_number}")
         try:
-            await self._rate_limit()
-
             # LCSC product detail URL
             product_url = f"https://www.lcsc.com/product-detail/{part_number}.html"
             logger.warning(f"[LCSC] Fetching URL: {product_url}")
@@ -491,151 +466,153 @@ class LCSCAdapter(ProviderAdapter):
                 "Accept-Language": "en-US,en;q=0.5",
             }
 
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(product_url, headers=headers, timeout=10.0)
-                response.raise_for_status()
-
-                # Parse HTML
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Check if this is a 404 page
-                title = soup.select_one("title")
-                if title and "Page Not Found" in title.get_text():
-                    logger.warning(f"Part {part_number} not found on LCSC")
-                    raise Exception(f"Part {part_number} not found")
-
-                # Extract data using actual LCSC HTML structure
-                result = {
-                    "part_number": part_number,
-                    "name": "",
-                    "description": "",
-                    "manufacturer": "",
-                    "datasheet_url": "",
-                    "image_urls": [],
-                    "footprint": "",
-                    "provider_url": product_url,
-                    "specifications": {},
-                    "pricing": [],
-                    "stock": 0,
-                    "category": "",
-                }
+            client = get_http_client()
+            response = await client.get(
+                product_url, headers=headers, timeout=10.0, follow_redirects=True
+            )
+            response.raise_for_status()
+
+            # Parse HTML
+            soup = BeautifulSoup(response.text, "html.parser")
+
+            # Check if this is a 404 page
+            title = soup.select_one("title")
+            if title and "Page Not Found" in title.get_text():
+                logger.warning(f"Part {part_number} not found on LCSC")
+                raise Exception(f"Part {part_number} not found")
+
+            # Extract data using actual LCSC HTML structure
+            result = {
+                "part_number": part_number,
+                "name": "",
+                "description": "",
+                "manufacturer": "",
+                "datasheet_url": "",
+                "image_urls": [],
+                "footprint": "",
+                "provider_url": product_url,
+                "specifications": {},
+                "pricing": [],
+                "stock": 0,
+                "category": "",
+            }
+
+            # Extract product title (e.g., "ST STM32G431CBT6")
+            title_elem = soup.select_one("h1.font-Bold-600.fz-20")
+            if title_elem:
+                result["name"] = title_elem.get_text(strip=True)
+
+            # Extract table information
+            info_table = soup.select("table.tableInfoWrap tr")
+            for row in info_table:
+                cells = row.select("td")
+                if len(cells) >= 2:
+                    label = cells[0].get_text(strip=True)
+                    value = cells[1].get_text(strip=True)
+
+                    if label == "Manufacturer":
+                        result["manufacturer"] = value
+                    elif label == "Mfr. Part #":
+                        result["name"] = value
+                    elif label == "Package":
+                        result["footprint"] = value
+                    elif label == "Description":
+                        result["description"] = value
+
+            # Extract datasheet URL
+            datasheet_link = soup.select_one('a[href*="/datasheet/"]')
+            if datasheet_link:
+                href = datasheet_link.get("href", "")
+                if href:
+                    result["datasheet_url"] = (
+                        f"https://www.lcsc.com{href}" if href.startswith("/") else href
+                    )
+
+            # Extract images from background-image style
+            image_divs = soup.select("div.v-image__image")
+            for img_div in image_divs:
+                style = img_div.get("style", "")
+                if "background-image: url(" in style:
+                    # Extract URL from CSS url() function
+                    match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
+                    if match:
+                        img_url = match.group(1)
+                        if img_url and img_url not in result["image_urls"]:
+                            result["image_urls"].append(img_url)
+
+            # Extract stock quantity
+            stock_elem = soup.select_one("span.fz-20.font-Bold-600")
+            if stock_elem:
+                stock_text = stock_elem.get_text(strip=True)
+                # Remove "In-Stock:" prefix and commas
+                stock_text = (
+                    stock_text.replace("In-Stock:", "").replace(",", "").strip()
+                )
+                try:
+                    result["stock"] = int(stock_text)
+                except (ValueError, AttributeError):
+                    pass
 
-                # Extract product title (e.g., "ST STM32G431CBT6")
-                title_elem = soup.select_one("h1.font-Bold-600.fz-20")
-                if title_elem:
-                    result["name"] = title_elem.get_text(strip=True)
-
-                # Extract table information
-                info_table = soup.select("table.tableInfoWrap tr")
-                for row in info_table:
-                    cells = row.select("td")
-                    if len(cells) >= 2:
-                        label = cells[0].get_text(strip=True)
-                        value = cells[1].get_text(strip=True)
-
-                        if label == "Manufacturer":
-                            result["manufacturer"] = value
-                        elif label == "Mfr. Part #":
-                            result["name"] = value
-                        elif label == "Package":
-                            result["footprint"] = value
-                        elif label == "Description":
-                            result["description"] = value
-
-                # Extract datasheet URL
-                datasheet_link = soup.select_one('a[href*="/datasheet/"]')
-                if datasheet_link:
-                    href = datasheet_link.get("href", "")
-                    if href:
-                        result["datasheet_url"] = (
-                            f"https://www.lcsc.com{href}"
-                            if href.startswith("/")
-                            else href
-                        )
-
-                # Extract images from background-image style
-                image_divs = soup.select("div.v-image__image")
-                for img_div in image_divs:
-                    style = img_div.get("style", "")
-                    if "background-image: url(" in style:
-                        # Extract URL from CSS url() function
-                        match = re.search(r'url\(["\']?([^"\']+)["\']?\)', style)
-                        if match:
-                            img_url = match.group(1)
-                            if img_url and img_url not in result["image_urls"]:
-                                result["image_urls"].append(img_url)
-
-                # Extract stock quantity
-                stock_elem = soup.select_one("span.fz-20.font-Bold-600")
-                if stock_elem:
-                    stock_text = stock_elem.get_text(strip=True)
-                    # Remove "In-Stock:" prefix and commas
-                    stock_text = (
-                        stock_text.replace("In-Stock:", "").replace(",", "").strip()
+            # Extract pricing from price table
+            price_table = soup.select("table.priceTable tbody tr")
+            for row in price_table:
+                cells = row.select("td")
+                if len(cells) >= 2:
+                    qty_text = cells[0].get_text(strip=True)
+                    price_text = cells[1].get_text(strip=True)
+
+                    # Parse quantity (e.g., "1+", "10+", "1,000+")
+                    qty_match = re.match(r"([\d,]+)\+", qty_text)
+                    if qty_match:
+                        quantity = int(qty_match.group(1).replace(",", ""))
+
+                        # Parse price (e.g., "$ 3.0856")
+                        price_match = re.search(r"\$?\s*([\d.]+)", price_text)
+                        if price_match:
+                            price = float(price_match.group(1))
+                            result["pricing"].append(
+                                {
+                                    "quantity": quantity,
+                                    "price": price,
+                                    "currency": "USD",
+                                }
+                            )
+
+            # Extract specifications using Playwright (JavaScript-rendered content)
+            if PLAYWRIGHT_AVAILABLE:
+                try:
+                    specs = await self._extract_specifications_with_playwright(
+                        part_number, product_url
                     )
-                    try:
-                        result["stock"] = int(stock_text)
-                    except (ValueError, AttributeError):
-                        pass
-
-                # Extract pricing from price table
-                price_table = soup.select("table.priceTable tbody tr")
-                for row in price_table:
-                    cells = row.select("td")
-                    if len(cells) >= 2:
-                        qty_text = cells[0].get_text(strip=True)
-                        price_text = cells[1].get_text(strip=True)
-
-                        # Parse quantity (e.g., "1+", "10+", "1,000+")
-                        qty_match = re.match(r"([\d,]+)\+", qty_text)
-                        if qty_match:
-                            quantity = int(qty_match.group(1).replace(",", ""))
-
-                            # Parse price (e.g., "$ 3.0856")
-                            price_match = re.search(r"\$?\s*([\d.]+)", price_text)
-                            if price_match:
-                                price = float(price_match.group(1))
-                                result["pricing"].append(
-                                    {
-                                        "quantity": quantity,
-                                        "price": price,
-                                        "currency": "USD",
-                                    }
-                                )
-
-                # Extract specifications using Playwright (JavaScript-rendered content)
-                if PLAYWRIGHT_AVAILABLE:
-                    try:
-                        specs = await self._extract_specifications_with_playwright(
-                            part_number, product_url
-                        )
-                        result["specifications"] = specs
-                        logger.warning(
-                            f"Extracted {len(specs)} specifications via Playwright for {part_number}"
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract specifications with Playwright: {e}"
-                        )
-                else:
+                    result["specifications"] = specs
                     logger.warning(
-                        f"Playwright not available - skipping specifications for {part_number}"
+                        f"Extracted {len(specs)} specifications via Playwright for {part_number}"
                     )
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to extract specifications with Playwright: {e}"
+                    )
+            else:
+                logger.warning(
+                    f"Playwright not available - skipping specifications for {part_number}"
+                )
 
-                # Extract category from breadcrumbs
-                breadcrumbs = soup.select("ul.v2-breadcrumbs a")
-                if breadcrumbs:
-                    # Last breadcrumb before product is usually the category
-                    category_parts = [
-                        bc.get_text(strip=True)
-                        for bc in breadcrumbs
-                        if bc.get_text(strip=True) not in ["Home", "Products"]
-                    ]
-                    if category_parts:
-                        result["category"] = " / ".join(category_parts)
-
-                logger.info(f"Successfully scraped details for {part_number}")
-                return result
+            # Extract category from breadcrumbs
+            breadcrumbs = soup.select("ul.v2-breadcrumbs a")
+            if breadcrumbs:
+                # Last breadcrumb before product is usually the category
+                category_parts = [
+                    bc.get_text(strip=True)
+                    for bc in breadcrumbs
+                    if bc.get_text(strip=True) not in ["Home", "Products"]
+                ]
+                if category_parts:
+                    result["category"] = " / ".join(category_parts)
+
+            logger.info(f"Successfully scraped details for {part_number}")
+            return result
 
         except Exception as e:
             logger.error(f"LCSC get_part_details failed for '{part_number}': {str(e)}")
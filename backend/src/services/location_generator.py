@@ -7,7 +7,7 @@ based on configurable layouts (single, row, grid, 3D grid) using range specifica
 
 import itertools
 import string
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 
 from ..schemas.location_layout import LayoutConfiguration, RangeSpecification, RangeType
 
@@ -75,19 +75,175 @@ class LocationGeneratorService:
 
         total = 1
         for range_spec in config.ranges:
-            if range_spec.range_type == RangeType.LETTERS:
-                # Calculate letter range size
-                start = range_spec.start.lower()
-                end = range_spec.end.lower()
-                count = ord(end) - ord(start) + 1
-            else:
-                # Calculate number range size
-                count = range_spec.end - range_spec.start + 1
-
-            total *= count
+            total *= self.range_size(range_spec)
 
         return total
 
+    def range_size(self, range_spec: RangeSpecification) -> int:
+        """
+        Number of values in a single range.
+
+        Args:
+            range_spec: Range specification
+
+        Returns:
+            Count of values the range generates
+        """
+        if range_spec.range_type == RangeType.LETTERS:
+            return ord(range_spec.end.lower()) - ord(range_spec.start.lower()) + 1
+        return range_spec.end - range_spec.start + 1
+
+    # ==================== Index addressing ====================
+    #
+    # Names are the Cartesian product of the ranges with the last range
+    # varying fastest, so a layout is a mixed-radix number whose digits are
+    # the offsets into each range. That lets any name be computed (or mapped
+    # back to its position) directly, without generating the ones before it.
+
+    def name_at(self, config: LayoutConfiguration, index: int) -> str:
+        """
+        Compute the name at a position in generation order.
+
+        Args:
+            config: Layout configuration
+            index: Zero-based position (0 <= index < total count)
+
+        Returns:
+            The index-th generated name
+
+        Raises:
+            IndexError: If index is outside the layout
+        """
+        total = self.calculate_total_count(config)
+        if not 0 <= index < total:
+            raise IndexError(f"Location index {index} out of range (0-{total - 1})")
+
+        if not config.ranges:
+            return config.prefix
+
+        # Peel offsets off from the fastest-varying (last) range
+        offsets = []
+        for range_spec in reversed(config.ranges):
+            index, offset = divmod(index, self.range_size(range_spec))
+            offsets.append(offset)
+        offsets.reverse()
+
+        name_parts = [config.prefix]
+        for i, (range_spec, offset) in enumerate(zip(config.ranges, offsets)):
+            name_parts.append(self._range_value_at(range_spec, offset))
+            if i < len(config.separators):
+                name_parts.append(config.separators[i])
+
+        return "".join(name_parts)
+
+    def index_of(self, config: LayoutConfiguration, name: str) -> int | None:
+        """
+        Find the position of a name in the layout (inverse of name_at).
+
+        Args:
+            config: Layout configuration
+            name: Candidate location name
+
+        Returns:
+            Zero-based position, or None if the layout never generates name
+        """
+        offsets = self.coordinates_of(config, name)
+        if offsets is None:
+            return None
+
+        index = 0
+        for range_spec, offset in zip(config.ranges, offsets):
+            index = index * self.range_size(range_spec) + offset
+        return index
+
+    def coordinates_of(
+        self, config: LayoutConfiguration, name: str
+    ) -> tuple[int, ...] | None:
+        """
+        Split a generated name into its per-range offsets (its grid position).
+
+        Args:
+            config: Layout configuration
+            name: Candidate location name
+
+        Returns:
+            One zero-based offset per range (empty for single layouts), or
+            None if the layout never generates name
+        """
+        if not name.startswith(config.prefix):
+            return None
+
+        if not config.ranges:
+            return () if name == config.prefix else None
+
+        offsets = self._parse_offsets(config, name, len(config.prefix), 0)
+        return tuple(offsets) if offsets is not None else None
+
+    def _range_value_at(self, range_spec: RangeSpecification, offset: int) -> str:
+        """Format the offset-th value of a range exactly as generate_range does."""
+        if range_spec.range_type == RangeType.LETTERS:
+            char = chr(ord(range_spec.start.lower()) + offset)
+            return char.upper() if range_spec.capitalize else char
+
+        value = str(range_spec.start + offset)
+        if range_spec.zero_pad:
+            return value.zfill(len(str(range_spec.end)))
+        return value
+
+    def _range_offset(self, range_spec: RangeSpecification, token: str) -> int | None:
+        """Map a formatted range value back to its offset (None if not in range)."""
+        if range_spec.range_type == RangeType.LETTERS:
+            if len(token) != 1:
+                return None
+            if token != (token.upper() if range_spec.capitalize else token.lower()):
+                return None
+            offset = ord(token.lower()) - ord(range_spec.start.lower())
+        else:
+            if not (token.isascii() and token.isdigit()):
+                return None
+            if not range_spec.zero_pad and len(token) > 1 and token[0] == "0":
+                return None
+            offset = int(token) - range_spec.start
+
+        return offset if 0 <= offset < self.range_size(range_spec) else None
+
+    def _token_lengths(self, range_spec: RangeSpecification) -> range:
+        """Possible lengths of a formatted value of the range."""
+        if range_spec.range_type == RangeType.LETTERS:
+            return range(1, 2)
+        if range_spec.zero_pad:
+            width = len(str(range_spec.end))
+            return range(width, width + 1)
+        return range(len(str(range_spec.start)), len(str(range_spec.end)) + 1)
+
+    def _parse_offsets(
+        self, config: LayoutConfiguration, name: str, pos: int, depth: int
+    ) -> list[int] | None:
+        """
+        Split name[pos:] into per-range offsets, backtracking over value widths.
+
+        Unpadded numbers have variable width, and separators may be empty, so
+        a split that fails later can require a different width earlier on.
+        """
+        if depth == len(config.ranges):
+            return [] if pos == len(name) else None
+
+        range_spec = config.ranges[depth]
+        separator = config.separators[depth] if depth < len(config.separators) else ""
+
+        for length in self._token_lengths(range_spec):
+            end = pos + length
+            if end > len(name):
+                break
+            offset = self._range_offset(range_spec, name[pos:end])
+            if offset is None or not name.startswith(separator, end):
+                continue
+            rest = self._parse_offsets(config, name, end + len(separator), depth + 1)
+            if rest is not None:
+                return [offset, *rest]
+
+        return None
+
     def generate_names(self, config: LayoutConfiguration) -> list[str]:
         """
         Generate all location names based on configuration.
@@ -98,18 +254,30 @@ class LocationGeneratorService:
         Returns:
             List of all generated location names
         """
+        return list(self.iter_names(config))
+
+    def iter_names(self, config: LayoutConfiguration) -> Iterator[str]:
+        """
+        Lazily generate location names in layout order.
+
+        Only the (small) per-range value lists are held in memory, so callers
+        can stream tens of thousands of names without building the full list.
+
+        Args:
+            config: Layout configuration with prefix, ranges, and separators
+
+        Yields:
+            Generated location names
+        """
         if not config.ranges:
-            # Single layout: just return prefix
-            return [config.prefix]
+            # Single layout: just the prefix
+            yield config.prefix
+            return
 
         # Generate all range values
-        range_values = []
-        for range_spec in config.ranges:
-            values = list(self.generate_range(range_spec))
-            range_values.append(values)
+        range_values = [list(self.generate_range(r)) for r in config.ranges]
 
-        # Generate all combinations using Cartesian product
-        all_names = []
+        # Walk the Cartesian product
         for combination in itertools.product(*range_values):
             # Build name: prefix + range[0] + sep[0] + range[1] + sep[1] + ...
             name_parts = [config.prefix]
@@ -118,8 +286,4 @@ class LocationGeneratorService:
                 if i < len(config.separators):
                     name_parts.append(config.separators[i])
 
-            # Join all parts
-            name = "".join(name_parts)
-            all_names.append(name)
-
-        return all_names
+            yield "".join(name_parts)
@@ -4,19 +4,35 @@ Location validation service for validating layout configurations.
 This service validates layout configurations against business rules and database constraints.
 """
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..models.storage_location import StorageLocation
 from ..schemas.location_layout import LayoutConfiguration
 from .location_generator import LocationGeneratorService
 
+# Maximum locations per bulk operation (FR-008)
+MAX_LOCATIONS_PER_LAYOUT = 500
+
+# Maximum locations when a layout opts in to high-volume generation
+HIGH_VOLUME_MAX_LOCATIONS = 50_000
+
+# Layouts larger than this get a "cannot be undone" warning (FR-009)
+LARGE_BATCH_WARNING_THRESHOLD = 100
+
+# Existing names fetched per round trip during the duplicate check
+DUPLICATE_CHECK_BATCH_SIZE = 1000
+
+# Upper bound for "starts with prefix" range scans (highest code point)
+PREFIX_RANGE_END = "\U0010ffff"
+
 
 class LocationValidatorService:
     """
     Service for validating location layout configurations.
 
     Validates business rules such as:
-    - 500 location limit
+    - 500 location limit (50,000 for high-volume layouts)
     - 100+ location warning
     - Duplicate name detection
     - Parent location existence
@@ -55,25 +71,23 @@ class LocationValidatorService:
         # Calculate total count
         total_count = self.generator.calculate_total_count(config)
 
-        # Validate total count <= 500 (FR-008)
-        if total_count > 500:
+        # Validate total count against the layout's limit (FR-008)
+        limit = (
+            HIGH_VOLUME_MAX_LOCATIONS
+            if config.high_volume
+            else MAX_LOCATIONS_PER_LAYOUT
+        )
+        if total_count > limit:
             errors.append(
-                f"Total location count ({total_count}) exceeds maximum limit of 500"
+                f"Total location count ({total_count}) exceeds maximum limit of {limit}"
             )
             # Return early with total_count - no point in checking other validations if count is too high
             return errors, warnings, total_count
 
         # Check for duplicate names in database (FR-007)
-        all_names = self.generator.generate_names(config)
-
-        existing_names = (
-            self.db.query(StorageLocation.name)
-            .filter(StorageLocation.name.in_(all_names))
-            .all()
-        )
+        duplicate_names = self.find_existing_names(config)
 
-        if existing_names:
-            duplicate_names = [name[0] for name in existing_names]
+        if duplicate_names:
             errors.append(
                 f"Duplicate location names already exist: {', '.join(duplicate_names[:5])}"
                 + ("..." if len(duplicate_names) > 5 else "")
@@ -89,9 +103,42 @@ class LocationValidatorService:
                 errors.append(f"Parent location with ID {config.parent_id} not found")
 
         # Add warning for large batches (FR-009)
-        if 100 < total_count <= 500:
+        if total_count > LARGE_BATCH_WARNING_THRESHOLD:
             warnings.append(
                 f"Creating {total_count} locations cannot be undone. Locations cannot be deleted."
             )
 
         return errors, warnings, total_count
+
+    def find_existing_names(self, config: LayoutConfiguration) -> list[str]:
+        """
+        Return the layout's names that already exist as storage locations.
+
+        Rather than sending every generated name to the database, existing
+        names that share the layout prefix are streamed (in chunks) from an
+        index range scan on storage_locations.name and mapped back into the
+        layout with LocationGeneratorService.index_of. Cost follows the number
+        of similarly-named locations, not the size of the layout.
+
+        Args:
+            config: Layout configuration
+
+        Returns:
+            Existing names, in layout order
+        """
+        rows = self.db.execute(
+            select(StorageLocation.name)
+            .where(
+                StorageLocation.name >= config.prefix,
+                StorageLocation.name < config.prefix + PREFIX_RANGE_END,
+            )
+            .execution_options(yield_per=DUPLICATE_CHECK_BATCH_SIZE)
+        ).scalars()
+
+        matches = {}
+        for name in rows:
+            index = self.generator.index_of(config, name)
+            if index is not None:
+                matches[index] = name
+
+        return [matches[index] for index in sorted(matches)]
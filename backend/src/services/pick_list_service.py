@@ -0,0 +1,444 @@
+"""
+Pick-list generation for project kitting.
+
+Turns a project's component allocations into an ordered walk through the
+shop: which locations to take each part from, and in what order to visit
+them.
+
+Source selection prefers locations that are visited anyway and, after that,
+locations holding the most stock, so most lines are served by a single visit.
+
+Travel cost follows the storage hierarchy. Moving one level up or down the
+location tree (e.g. out of a drawer into its cabinet) costs HOP_COST; moving
+sideways between two siblings costs the Manhattan distance between their
+row/column coordinates when both were generated from the same layout
+(recovered from layout_config and the location name), and SIBLING_COST
+otherwise. The route starts and ends at the entrance (above the roots); it is
+built by nearest neighbour and improved with 2-opt, which keeps a few
+hundred stops well inside interactive latency.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import (
+    Component,
+    ComponentLocation,
+    Project,
+    ProjectComponent,
+    StorageLocation,
+    StorageLocationClosure,
+)
+from ..schemas.location_layout import LayoutConfiguration
+from .location_generator import LocationGeneratorService
+
+logger = logging.getLogger(__name__)
+
+# Cost of moving one level up or down the location tree
+HOP_COST = 10.0
+
+# Cost of moving between siblings without comparable layout coordinates
+SIBLING_COST = 5.0
+
+# Cost per row/column step between siblings of the same generated layout
+GRID_STEP_COST = 1.0
+
+# Upper bound on 2-opt improvement sweeps over the route
+MAX_TWO_OPT_PASSES = 25
+
+
+@dataclass
+class PickStop:
+    """A location on the route and the picks made there."""
+
+    location_id: str
+    path: tuple[str, ...]  # Location ids from the root down to this location
+    picks: list[dict] = field(default_factory=list)
+
+
+class TravelCostModel:
+    """
+    Hierarchy-based travel cost between locations.
+
+    Args:
+        coordinates: Location id -> (layout key, grid coordinates) for
+            locations generated from a layout
+    """
+
+    def __init__(self, coordinates: dict[str, tuple[str, tuple[int, ...]]]):
+        self.coordinates = coordinates
+
+    def distance(self, a: tuple[str, ...], b: tuple[str, ...]) -> float:
+        """
+        Travel cost between two locations given by their root-first paths.
+
+        The entrance is the empty path.
+        """
+        common = 0
+        for left, right in zip(a, b):
+            if left != right:
+                break
+            common += 1
+
+        up = len(a) - common
+        down = len(b) - common
+        if not up or not down:
+            # One location contains the other
+            return HOP_COST * (up + down)
+
+        return HOP_COST * (up + down - 2) + self._lateral(a[common], b[common])
+
+    def _lateral(self, a: str, b: str) -> float:
+        """Cost of stepping between two siblings."""
+        a_coords = self.coordinates.get(a)
+        b_coords = self.coordinates.get(b)
+        if a_coords and b_coords and a_coords[0] == b_coords[0]:
+            steps = sum(abs(x - y) for x, y in zip(a_coords[1], b_coords[1]))
+            return GRID_STEP_COST * steps
+        return SIBLING_COST
+
+
+def select_sources(
+    lines: list[tuple[str, int]], stock: dict[str, list[tuple[str, int]]]
+) -> tuple[dict[str, list[tuple[str, int]]], list[dict]]:
+    """
+    Choose the locations each line is picked from.
+
+    Lines with the fewest candidate locations are placed first. A line is
+    taken from a single location where possible, preferring one that is
+    already on the route and then the one holding the most stock; otherwise
+    it is split across locations in the same order of preference. Picked
+    quantities are taken out of the stock, so several lines for the same
+    component never share the same units.
+
+    Args:
+        lines: (component_id, quantity) pairs to pick
+        stock: component_id -> [(location_id, quantity_on_hand), ...]
+            (not modified)
+
+    Returns:
+        Tuple of (location_id -> [(component_id, quantity), ...], shortages)
+        where shortages lists {component_id, required, available} for lines
+        that cannot be filled completely
+    """
+    visits: dict[str, list[tuple[str, int]]] = defaultdict(list)
+    shortages = []
+    on_hand = {
+        component_id: dict(locations) for component_id, locations in stock.items()
+    }
+
+    ordered = sorted(lines, key=lambda line: len(stock.get(line[0], ())))
+    for component_id, required in ordered:
+        remaining_stock = on_hand.get(component_id, {})
+        candidates = sorted(
+            (
+                (location_id, quantity)
+                for location_id, quantity in remaining_stock.items()
+                if quantity > 0
+            ),
+            key=lambda c: c[1],
+            reverse=True,
+        )
+        available = sum(quantity for _, quantity in candidates)
+        if available < required:
+            shortages.append(
+                {
+                    "component_id": component_id,
+                    "required": required,
+                    "available": available,
+                }
+            )
+
+        single = [c for c in candidates if c[1] >= required]
+        if single:
+            visited = [c for c in single if c[0] in visits]
+            location_id, _ = (visited or single)[0]
+            visits[location_id].append((component_id, required))
+            remaining_stock[location_id] -= required
+            continue
+
+        # Split: visited locations first, each group by descending quantity
+        remaining = required
+        candidates.sort(key=lambda c: c[0] not in visits)
+        for location_id, quantity in candidates:
+            if remaining <= 0:
+                break
+            taken = min(quantity, remaining)
+            visits[location_id].append((component_id, taken))
+            remaining_stock[location_id] -= taken
+            remaining -= taken
+
+    return visits, shortages
+
+
+def plan_route(stops: list[PickStop], model: TravelCostModel) -> list[PickStop]:
+    """
+    Order stops into a short round trip from the entrance.
+
+    Builds a nearest-neighbour tour and improves it with 2-opt until no
+    reversal shortens it (or MAX_TWO_OPT_PASSES sweeps have run).
+
+    Args:
+        stops: Locations to visit
+        model: Travel cost model
+
+    Returns:
+        Stops in visiting order
+    """
+    if len(stops) < 2:
+        return list(stops)
+
+    # Node 0 is the entrance; distances are symmetric
+    paths = [(), *(stop.path for stop in stops)]
+    size = len(paths)
+    dist = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1, size):
+            dist[i][j] = dist[j][i] = model.distance(paths[i], paths[j])
+
+    # Nearest neighbour from the entrance
+    tour = [0]
+    unvisited = set(range(1, size))
+    while unvisited:
+        row = dist[tour[-1]]
+        nearest = min(unvisited, key=row.__getitem__)
+        tour.append(nearest)
+        unvisited.remove(nearest)
+
+    # 2-opt on the closed tour, keeping the entrance first
+    tour.append(0)
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, size - 1):
+            a, b = tour[i - 1], tour[i]
+            dist_a = dist[a]
+            dist_b = dist[b]
+            base = dist_a[b]
+            for j in range(i + 1, size):
+                c, d = tour[j], tour[j + 1]
+                if dist_a[c] + dist_b[d] < base + dist[c][d] - 1e-9:
+                    tour[i : j + 1] = reversed(tour[i : j + 1])
+                    b = tour[i]
+                    dist_b = dist[b]
+                    base = dist_a[b]
+                    improved = True
+        if not improved:
+            break
+
+    return [stops[node - 1] for node in tour[1:-1]]
+
+
+def route_cost(stops: Iterable[PickStop], model: TravelCostModel) -> float:
+    """Round-trip travel cost of visiting stops in order from the entrance."""
+    cost = 0.0
+    previous: tuple[str, ...] = ()
+    for stop in stops:
+        cost += model.distance(previous, stop.path)
+        previous = stop.path
+    return cost + model.distance(previous, ())
+
+
+class PickListService:
+    """
+    Service for building ordered pick lists.
+
+    Provides methods for:
+    - Pick lists for a project's outstanding allocations
+    - Pick lists for arbitrary (component, quantity) lines
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize service with database session.
+
+        Args:
+            db: SQLAlchemy session for database operations
+        """
+        self.db = db
+        self.generator = LocationGeneratorService()
+
+    def build_project_pick_list(self, project_id: str) -> dict:
+        """
+        Build the pick list for a project's allocated but unused components.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            Pick list dictionary (see build_pick_list)
+
+        Raises:
+            ValueError: Project not found
+        """
+        if not self.db.get(Project, project_id):
+            raise ValueError(f"Project {project_id} not found")
+
+        rows = self.db.execute(
+            select(
+                ProjectComponent.component_id,
+                ProjectComponent.quantity_allocated - ProjectComponent.quantity_used,
+            ).where(ProjectComponent.project_id == project_id)
+        ).all()
+
+        pick_list = self.build_pick_list(
+            [(component_id, quantity) for component_id, quantity in rows]
+        )
+        pick_list["project_id"] = project_id
+        return pick_list
+
+    def build_pick_list(self, lines: list[tuple[str, int]]) -> dict:
+        """
+        Choose source locations for each line and order the visits.
+
+        Args:
+            lines: (component_id, quantity) pairs; non-positive quantities
+                are ignored
+
+        Returns:
+            Dict with ordered stops (each with its picks), shortages,
+            total_lines, total_visits, route_cost and hierarchy_order_cost
+            (the cost of simply walking the stops in hierarchy order)
+
+        Raises:
+            ValueError: Component not found
+        """
+        lines = [(cid, qty) for cid, qty in lines if qty > 0]
+        component_ids = {cid for cid, _ in lines}
+
+        components = {
+            row.id: row
+            for row in self.db.execute(
+                select(Component.id, Component.name, Component.part_number).where(
+                    Component.id.in_(component_ids)
+                )
+            )
+        }
+        missing = sorted(component_ids - components.keys())
+        if missing:
+            raise ValueError(f"Component(s) not found: {', '.join(missing)}")
+
+        stock: dict[str, list[tuple[str, int]]] = defaultdict(list)
+        for component_id, location_id, quantity in self.db.execute(
+            select(
+                ComponentLocation.component_id,
+                ComponentLocation.storage_location_id,
+                ComponentLocation.quantity_on_hand,
+            ).where(
+                ComponentLocation.component_id.in_(component_ids),
+                ComponentLocation.quantity_on_hand > 0,
+            )
+        ):
+            stock[component_id].append((location_id, quantity))
+
+        visits, shortages = select_sources(lines, stock)
+        paths, coordinates, locations = self._load_hierarchy(visits)
+        model = TravelCostModel(coordinates)
+
+        stops = [
+            PickStop(
+                location_id=location_id,
+                path=paths[location_id],
+                picks=[
+                    {
+                        "component_id": component_id,
+                        "component_name": components[component_id].name,
+                        "part_number": components[component_id].part_number,
+                        "quantity": quantity,
+                    }
+                    for component_id, quantity in picks
+                ],
+            )
+            for location_id, picks in visits.items()
+        ]
+        stops.sort(key=lambda stop: locations[stop.location_id].location_hierarchy)
+        hierarchy_order_cost = route_cost(stops, model)
+
+        route = plan_route(stops, model)
+
+        for shortage in shortages:
+            component = components[shortage["component_id"]]
+            shortage["component_name"] = component.name
+            shortage["part_number"] = component.part_number
+
+        return {
+            "stops": [
+                {
+                    "sequence": sequence,
+                    "location_id": stop.location_id,
+                    "location_name": locations[stop.location_id].name,
+                    "location_hierarchy": locations[
+                        stop.location_id
+                    ].location_hierarchy,
+                    "picks": stop.picks,
+                }
+                for sequence, stop in enumerate(route, start=1)
+            ],
+            "shortages": shortages,
+            "total_lines": len(lines),
+            "total_visits": len(route),
+            "route_cost": route_cost(route, model),
+            "hierarchy_order_cost": hierarchy_order_cost,
+        }
+
+    def _load_hierarchy(self, location_ids: Iterable[str]):
+        """
+        Load root-first paths and layout coordinates for the given locations.
+
+        Ancestors of every location come from one closure-table query.
+
+        Returns:
+            Tuple of (location_id -> path, node_id -> (layout key,
+            coordinates), location_id -> row with name/location_hierarchy)
+        """
+        ancestors: dict[str, list[tuple[int, str]]] = defaultdict(list)
+        nodes = {}
+        for row in self.db.execute(
+            select(
+                StorageLocationClosure.descendant_id,
+                StorageLocationClosure.depth,
+                StorageLocation.id,
+                StorageLocation.name,
+                StorageLocation.type,
+                StorageLocation.location_hierarchy,
+                StorageLocation.layout_config,
+            )
+            .join(
+                StorageLocation,
+                StorageLocation.id == StorageLocationClosure.ancestor_id,
+            )
+            .where(StorageLocationClosure.descendant_id.in_(list(location_ids)))
+        ):
+            ancestors[row.descendant_id].append((row.depth, row.id))
+            nodes[row.id] = row
+
+        paths = {
+            location_id: tuple(node_id for _, node_id in sorted(chain, reverse=True))
+            for location_id, chain in ancestors.items()
+        }
+
+        layouts: dict[str, LayoutConfiguration | None] = {}
+        coordinates = {}
+        for node in nodes.values():
+            if not node.layout_config:
+                continue
+            key = json.dumps(node.layout_config, sort_keys=True)
+            if key not in layouts:
+                try:
+                    layouts[key] = LayoutConfiguration(
+                        **node.layout_config, location_type=node.type
+                    )
+                except (TypeError, ValueError):
+                    layouts[key] = None
+            if layouts[key] is None:
+                continue
+            position = self.generator.coordinates_of(layouts[key], node.name)
+            if position is not None:
+                coordinates[node.id] = (key, position)
+
+        return paths, coordinates, nodes
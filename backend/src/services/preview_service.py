@@ -7,10 +7,17 @@ of what would be created without actually creating any database records.
 
 from sqlalchemy.orm import Session
 
-from ..schemas.location_layout import LayoutConfiguration, PreviewResponse
+from ..schemas.location_layout import (
+    LayoutConfiguration,
+    PreviewPageResponse,
+    PreviewResponse,
+)
 from .location_generator import LocationGeneratorService
 from .location_validator import LocationValidatorService
 
+# Names shown at the start of a preview (FR-013)
+PREVIEW_SAMPLE_SIZE = 5
+
 
 class PreviewService:
     """
@@ -61,12 +68,15 @@ class PreviewService:
                 is_valid=False,
             )
 
-        # Generate names
-        all_names = self.generator.generate_names(config)
-
-        # Get first 5 and last name (FR-013)
-        sample_names = all_names[:5]
-        last_name = all_names[-1] if all_names else ""
+        # First 5 and last name (FR-013), addressed directly so the full
+        # name list is never built
+        sample_names = [
+            self.generator.name_at(config, index)
+            for index in range(min(PREVIEW_SAMPLE_SIZE, total_count))
+        ]
+        last_name = (
+            self.generator.name_at(config, total_count - 1) if total_count > 0 else ""
+        )
 
         return PreviewResponse(
             sample_names=sample_names,
@@ -76,3 +86,34 @@ class PreviewService:
             errors=[],
             is_valid=True,
         )
+
+    def generate_preview_page(
+        self, config: LayoutConfiguration, offset: int = 0, limit: int = 100
+    ) -> PreviewPageResponse:
+        """
+        Return one page of the names a layout would generate.
+
+        Pages are computed by index, so any page of an arbitrarily large
+        layout costs the same. No validation is performed; use
+        generate_preview for errors and warnings.
+
+        Args:
+            config: Layout configuration to preview
+            offset: Position of the first name to return
+            limit: Maximum number of names to return
+
+        Returns:
+            PreviewPageResponse with the page of names and total count
+        """
+        total_count = self.generator.calculate_total_count(config)
+        end = min(offset + limit, total_count)
+
+        return PreviewPageResponse(
+            names=[
+                self.generator.name_at(config, index) for index in range(offset, end)
+            ],
+            offset=offset,
+            limit=limit,
+            total_count=total_count,
+            has_more=end < total_count,
+        )
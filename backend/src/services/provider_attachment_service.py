@@ -8,86 +8,37 @@ import asyncio
 import logging
 import mimetypes
 import time
-from collections import defaultdict
+import uuid
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-import aiohttp
+import httpx
 
 from ..database import get_db
 from ..providers.base_provider import ComponentSearchResult
 from ..services.attachment_service import AttachmentService
 from ..services.file_storage import file_storage
+from .file_download import DownloadTooLargeError, download_to_file
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter:
-    """Token bucket rate limiter for API requests."""
-
-    def __init__(self, requests_per_second: float = 2.0, burst_size: int = 5):
-        self.requests_per_second = requests_per_second
-        self.burst_size = burst_size
-        self.tokens = burst_size
-        self.last_update = time.time()
-        self.lock = asyncio.Lock()
-
-    async def acquire(self):
-        """Acquire a token, blocking until available."""
-        async with self.lock:
-            now = time.time()
-            # Add tokens based on elapsed time
-            elapsed = now - self.last_update
-            self.tokens = min(
-                self.burst_size, self.tokens + elapsed * self.requests_per_second
-            )
-            self.last_update = now
-
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return
-
-            # Wait for next token
-            wait_time = (1 - self.tokens) / self.requests_per_second
-            await asyncio.sleep(wait_time)
-            self.tokens = 0
-
-
 class ProviderAttachmentService:
     """Service for auto-downloading component attachments from providers."""
 
     def __init__(self):
-        self.session: aiohttp.ClientSession | None = None
         self.max_file_size = 50 * 1024 * 1024  # 50MB limit
-        self.timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
-
-        # Rate limiting per domain to be good API citizens
-        self.rate_limiters: dict[str, RateLimiter] = defaultdict(
-            lambda: RateLimiter(requests_per_second=1.0, burst_size=3)
-        )
+        self.timeout = 30.0  # 30 second timeout
+        self.headers = {
+            "User-Agent": "PartsHub/1.0 (Component Management System)",
+            "Accept": "application/pdf,image/*,*/*",
+        }
 
         # Track recent downloads to avoid duplicates
         self.recent_downloads: dict[str, float] = {}
         self.download_cache_duration = 3600  # 1 hour cache
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=self.timeout,
-                headers={
-                    "User-Agent": "PartsHub/1.0 (Component Management System)",
-                    "Accept": "application/pdf,image/*,*/*",
-                },
-            )
-        return self.session
-
-    async def close(self):
-        """Close HTTP session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-
     async def _should_download_url(self, url: str) -> bool:
         """Check if URL should be downloaded based on recent cache."""
         now = time.time()
@@ -108,32 +59,24 @@ class ProviderAttachmentService:
 
         return True
 
-    async def _apply_rate_limit(self, url: str):
-        """Apply rate limiting based on URL domain."""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-
-            if domain:
-                rate_limiter = self.rate_limiters[domain]
-                await rate_limiter.acquire()
-                logger.debug(f"Rate limit applied for domain: {domain}")
-        except Exception as e:
-            logger.warning(f"Could not apply rate limiting for {url}: {e}")
-
-    async def download_file_from_url(
+    async def download_to_incoming(
         self, url: str, max_size: int | None = None
-    ) -> tuple[bytes, str, str] | None:
+    ) -> tuple[Path, str, str] | None:
         """
-        Download file from URL and return content, filename, and MIME type.
-        Includes rate limiting and duplicate detection for good API citizenship.
+        Stream a file from a URL into file storage's incoming directory.
+        Includes duplicate detection for good API citizenship; requests are
+        rate limited per host by the shared HTTP client.
+
+        The body is written to disk chunk by chunk and capped at max_size even
+        without a Content-Length header, so memory use does not grow with the
+        file size. Store the result with file_storage.store_file_from_path.
 
         Args:
             url: URL to download from
             max_size: Maximum file size in bytes (defaults to service limit)
 
         Returns:
-            Tuple of (file_content, filename, mime_type) or None if failed
+            Tuple of (file_path, filename, mime_type) or None if failed
         """
         if not url:
             return None
@@ -143,69 +86,80 @@ class ProviderAttachmentService:
             return None
 
         max_size = max_size or self.max_file_size
+        destination = file_storage.incoming_dir / uuid.uuid4().hex
 
         try:
-            # Apply rate limiting
-            await self._apply_rate_limit(url)
+            downloaded = await download_to_file(
+                url,
+                destination,
+                max_size=max_size,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to download {url}: HTTP {e.response.status_code}")
+            return None
+        except DownloadTooLargeError as e:
+            logger.warning(f"{e} from {url}")
+            return None
+        except httpx.TimeoutException:
+            logger.error(f"Timeout downloading from {url}")
+            return None
+        except Exception as e:
+            logger.error(f"Error downloading from {url}: {e}")
+            return None
 
-            session = await self._get_session()
+        if not downloaded.size:
+            logger.warning(f"Empty file downloaded from {url}")
+            destination.unlink(missing_ok=True)
+            return None
 
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logger.warning(f"Failed to download {url}: HTTP {response.status}")
-                    return None
+        # Determine MIME type
+        mime_type = (downloaded.content_type or "").split(";")[0].strip()
+        if not mime_type:
+            # Fallback to guessing from URL
+            mime_type, _ = mimetypes.guess_type(url)
+            mime_type = mime_type or "application/octet-stream"
 
-                # Check content length if provided
-                content_length = response.headers.get("Content-Length")
-                if content_length and int(content_length) > max_size:
-                    logger.warning(
-                        f"File too large: {content_length} bytes > {max_size}"
-                    )
-                    return None
-
-                # Read content in chunks to avoid memory issues
-                content = bytearray()
-                async for chunk in response.content.iter_chunked(8192):
-                    content.extend(chunk)
-                    if len(content) > max_size:
-                        logger.warning(
-                            f"File too large during download: {len(content)} bytes > {max_size}"
-                        )
-                        return None
+        # Generate filename
+        parsed_url = urlparse(url)
+        filename = Path(parsed_url.path).name
+        if not filename or "." not in filename:
+            # Generate filename based on MIME type
+            extension = mimetypes.guess_extension(mime_type) or ".bin"
+            filename = f"download_{hash(url) & 0x7fffffff}{extension}"
 
-                if not content:
-                    logger.warning(f"Empty file downloaded from {url}")
-                    return None
+        # Mark as recently downloaded
+        self.recent_downloads[url] = time.time()
 
-                # Determine MIME type
-                mime_type = (
-                    response.headers.get("Content-Type", "").split(";")[0].strip()
-                )
-                if not mime_type:
-                    # Fallback to guessing from URL
-                    mime_type, _ = mimetypes.guess_type(url)
-                    mime_type = mime_type or "application/octet-stream"
-
-                # Generate filename
-                parsed_url = urlparse(url)
-                filename = Path(parsed_url.path).name
-                if not filename or "." not in filename:
-                    # Generate filename based on MIME type
-                    extension = mimetypes.guess_extension(mime_type) or ".bin"
-                    filename = f"download_{hash(url) & 0x7fffffff}{extension}"
-
-                # Mark as recently downloaded
-                self.recent_downloads[url] = time.time()
-
-                logger.info(f"Successfully downloaded {len(content)} bytes from {url}")
-                return bytes(content), filename, mime_type
-
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout downloading from {url}")
-        except Exception as e:
-            logger.error(f"Error downloading from {url}: {e}")
+        logger.info(f"Successfully downloaded {downloaded.size} bytes from {url}")
+        return destination, filename, mime_type
+
+    async def download_file_from_url(
+        self, url: str, max_size: int | None = None
+    ) -> tuple[bytes, str, str] | None:
+        """
+        Download file from URL and return content, filename, and MIME type.
+
+        Reads the whole file into memory; prefer download_to_incoming for
+        anything that is stored.
 
-        return None
+        Args:
+            url: URL to download from
+            max_size: Maximum file size in bytes (defaults to service limit)
+
+        Returns:
+            Tuple of (file_content, filename, mime_type) or None if failed
+        """
+        result = await self.download_to_incoming(url, max_size)
+        if result is None:
+            return None
+
+        file_path, filename, mime_type = result
+        try:
+            return file_path.read_bytes(), filename, mime_type
+        finally:
+            file_path.unlink(missing_ok=True)
 
     async def download_component_attachments(
         self,
@@ -242,25 +196,28 @@ class ProviderAttachmentService:
             # Download datasheet if available and requested
             if download_options.get("datasheet", True) and search_result.datasheet_url:
                 try:
-                    download_result = await self.download_file_from_url(
+                    download_result = await self.download_to_incoming(
                         search_result.datasheet_url
                     )
                     if download_result:
-                        file_content, filename, mime_type = download_result
-
-                        # Store file using FileStorageService
-                        (
-                            file_path,
-                            thumbnail_path,
-                            file_size,
-                            detected_mime,
-                            safe_filename,
-                        ) = file_storage.store_file(
-                            component_id=component_id,
-                            file_content=file_content,
-                            filename=filename,
-                            attachment_type="datasheet",
-                        )
+                        incoming_path, filename, mime_type = download_result
+
+                        # Move the file into FileStorageService
+                        try:
+                            (
+                                file_path,
+                                thumbnail_path,
+                                file_size,
+                                detected_mime,
+                                safe_filename,
+                            ) = file_storage.store_file_from_path(
+                                component_id=component_id,
+                                source_path=incoming_path,
+                                filename=filename,
+                                attachment_type="datasheet",
+                            )
+                        finally:
+                            incoming_path.unlink(missing_ok=True)
 
                         # Create attachment record
                         attachment_data = {
@@ -310,25 +267,28 @@ class ProviderAttachmentService:
             # Download image if available and requested
             if download_options.get("image", True) and search_result.image_url:
                 try:
-                    download_result = await self.download_file_from_url(
+                    download_result = await self.download_to_incoming(
                         search_result.image_url
                     )
                     if download_result:
-                        file_content, filename, mime_type = download_result
-
-                        # Store file using FileStorageService
-                        (
-                            file_path,
-                            thumbnail_path,
-                            file_size,
-                            detected_mime,
-                            safe_filename,
-                        ) = file_storage.store_file(
-                            component_id=component_id,
-                            file_content=file_content,
-                            filename=filename,
-                            attachment_type="image",
-                        )
+                        incoming_path, filename, mime_type = download_result
+
+                        # Move the file into FileStorageService
+                        try:
+                            (
+                                file_path,
+                                thumbnail_path,
+                                file_size,
+                                detected_mime,
+                                safe_filename,
+                            ) = file_storage.store_file_from_path(
+                                component_id=component_id,
+                                source_path=incoming_path,
+                                filename=filename,
+                                attachment_type="image",
+                            )
+                        finally:
+                            incoming_path.unlink(missing_ok=True)
 
                         # Set as primary image if it's the first image
                         is_primary = not attachment_service.get_primary_image(
@@ -443,12 +403,6 @@ class ProviderAttachmentService:
 
         return processed_results
 
-    def __del__(self):
-        """Cleanup on deletion."""
-        if hasattr(self, "session") and self.session and not self.session.closed:
-            # Note: Can't await in __del__, session should be closed explicitly
-            logger.warning("ProviderAttachmentService session not properly closed")
-
 
 # Global provider attachment service instance
 provider_attachment_service = ProviderAttachmentService()
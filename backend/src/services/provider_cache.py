@@ -0,0 +1,472 @@
+"""
+Persistent cache for external provider lookups.
+
+Provider searches, SKU lookups and part details hit the network (and often a
+headless browser) on every call, even when the wizard looked the same LCSC
+SKU up minutes ago. ProviderCache stores each response in the
+provider_response_cache table, keyed by provider, lookup kind, normalised
+query and parameters:
+
+- entries are fresh for a per-kind TTL and returned without a network call
+- after that they are served stale for STALE_WINDOW while one background
+  refresh per key replaces them (stale-while-revalidate)
+- empty responses are cached for EMPTY_TTL only and never served stale, so a
+  provider outage that surfaces as "no results" heals quickly; an empty
+  refresh never replaces a non-empty entry that is still servable, as
+  providers report lookup failures as empty results
+- concurrent misses for the same key share a single fetch
+- the table is bounded: expired entries are purged and the least recently
+  used ones evicted once it holds more than max_entries rows
+
+Loader exceptions propagate and are never cached. Cache storage errors are
+logged and fall through to a live fetch, so the cache can only make lookups
+faster, never fail them.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..database import get_session
+from ..models import ProviderResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Fresh lifetime per lookup kind
+DEFAULT_TTLS = {
+    "search": timedelta(hours=6),
+    "sku": timedelta(hours=24),
+    "details": timedelta(hours=24),
+}
+
+# Fresh lifetime for kinds without an entry in DEFAULT_TTLS
+DEFAULT_TTL = timedelta(hours=6)
+
+# How long past expiry an entry may still be served while it is refreshed
+STALE_WINDOW = timedelta(days=7)
+
+# Fresh lifetime of empty responses (no stale period)
+EMPTY_TTL = timedelta(minutes=10)
+
+# Entries kept before least-recently-used eviction
+PROVIDER_CACHE_MAX_ENTRIES = 10_000
+
+# Eviction trims the table to this fraction of max_entries, so it does not
+# run again on the very next write
+EVICTION_LOW_WATER = 0.9
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+def provider_cache_enabled() -> bool:
+    """Whether the shared cache is enabled (PROVIDER_CACHE_ENABLED, default on)."""
+    return os.getenv("PROVIDER_CACHE_ENABLED", "1").lower() not in ("0", "false")
+
+
+def normalize_query(kind: str, query: str) -> str:
+    """
+    Normalise a lookup so equivalent requests share a cache entry.
+
+    Whitespace is collapsed; SKUs and part numbers are upper-cased and free
+    text searches case-folded.
+    """
+    collapsed = " ".join(query.split())
+    return collapsed.casefold() if kind == "search" else collapsed.upper()
+
+
+def cache_key(provider: str, kind: str, query: str, params: dict | None = None) -> str:
+    """SHA-256 key of a provider lookup."""
+    identity = json.dumps(
+        [provider.lower(), kind, normalize_query(kind, query), params or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; they are stored in UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+class ProviderCache:
+    """
+    Persistent, size-bounded cache of provider responses.
+
+    Args:
+        session_factory: Callable returning a new Session (one per operation)
+        ttls: Fresh lifetime overrides per lookup kind
+        stale_window: How long expired entries may be served while refreshed
+        empty_ttl: Fresh lifetime of empty responses
+        max_entries: Table size that triggers LRU eviction (default from
+            PROVIDER_CACHE_MAX_ENTRIES)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = get_session,
+        ttls: dict[str, timedelta] | None = None,
+        stale_window: timedelta = STALE_WINDOW,
+        empty_ttl: timedelta = EMPTY_TTL,
+        max_entries: int | None = None,
+    ):
+        self.session_factory = session_factory
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_window = stale_window
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries or int(
+            os.getenv("PROVIDER_CACHE_MAX_ENTRIES", PROVIDER_CACHE_MAX_ENTRIES)
+        )
+        self.counters: Counter[str] = Counter()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        kind: str,
+        query: str,
+        loader: Loader,
+        params: dict | None = None,
+    ) -> Any:
+        """
+        Return the cached response for a lookup, fetching it on a miss.
+
+        Args:
+            provider: Provider name
+            kind: Lookup kind (search, sku, details, ...)
+            query: Query, SKU or part number
+            loader: Coroutine function returning the JSON-serialisable response
+            params: Extra parameters that change the response (e.g. limit)
+
+        Returns:
+            The cached or freshly fetched response
+
+        Raises:
+            Exception: Whatever loader raises on a miss
+        """
+        key = cache_key(provider, kind, query, params)
+        now = _now()
+
+        entry = self._read(key, now)
+        if entry is not None:
+            payload, expires_at = entry
+            if now < expires_at:
+                self.counters["hits"] += 1
+                return payload
+
+            self.counters["stale_hits"] += 1
+            if self._inflight_task(key) is None:
+                self._start_fetch(key, provider, kind, query, params, loader)
+            return payload
+
+        self.counters["misses"] += 1
+        task = self._inflight_task(key)
+        if task is None:
+            task = self._start_fetch(key, provider, kind, query, params, loader)
+        # Shielded so a cancelled caller does not cancel a fetch others share
+        return await asyncio.shield(task)
+
+    def get_fresh(
+        self,
+        provider: str,
+        kind: str,
+        queries: list[str],
+        params: dict | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fresh cached responses for many lookups, read in one query.
+
+        Stale and missing entries are left out, so callers fetch them through
+        get_or_fetch (which serves stale entries while refreshing them).
+
+        Returns:
+            Mapping of query to cached response
+        """
+        keys = {cache_key(provider, kind, query, params): query for query in queries}
+        if not keys:
+            return {}
+
+        now = _now()
+        try:
+            with self.session_factory() as session:
+                entries = session.scalars(
+                    select(ProviderResponseCache).where(
+                        ProviderResponseCache.cache_key.in_(keys)
+                    )
+                ).all()
+                fresh = {}
+                for entry in entries:
+                    if _as_utc(entry.expires_at) <= now:
+                        continue
+                    fresh[keys[entry.cache_key]] = entry.payload
+                    entry.last_accessed_at = now
+                    entry.hit_count += 1
+                session.commit()
+        except SQLAlchemyError as e:
+            self.counters["errors"] += 1
+            logger.warning(f"Provider cache read failed: {e}")
+            return {}
+
+        self.counters["hits"] += len(fresh)
+        return fresh
+
+    async def wait_for_refreshes(self) -> None:
+        """Wait for in-flight fetches, including background refreshes."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._inflight.values() if task.get_loop() is loop]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def invalidate(
+        self,
+        provider: str | None = None,
+        kind: str | None = None,
+        query: str | None = None,
+        params: dict | None = None,
+    ) -> int:
+        """
+        Delete cached entries.
+
+        With provider, kind and query, only that lookup is removed; otherwise
+        every entry matching the given provider and/or kind (all entries when
+        nothing is given).
+
+        Returns:
+            Number of entries deleted
+        """
+        statement = delete(ProviderResponseCache)
+        if provider and kind and query is not None:
+            statement = statement.where(
+                ProviderResponseCache.cache_key
+                == cache_key(provider, kind, query, params)
+            )
+        else:
+            if provider:
+                statement = statement.where(
+                    ProviderResponseCache.provider == provider.lower()
+                )
+            if kind:
+                statement = statement.where(ProviderResponseCache.kind == kind)
+
+        with self.session_factory() as session:
+            deleted = session.execute(statement).rowcount
+            session.commit()
+        return deleted
+
+    def get_statistics(self) -> dict:
+        """Entry count, stored bytes and hit/miss counters since startup."""
+        with self.session_factory() as session:
+            entries, size = session.execute(
+                select(
+                    func.count(ProviderResponseCache.cache_key),
+                    func.coalesce(func.sum(ProviderResponseCache.size_bytes), 0),
+                )
+            ).one()
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_entries": self.max_entries,
+            **{
+                name: self.counters[name]
+                for name in ("hits", "stale_hits", "misses", "refreshes", "errors")
+            },
+        }
+
+    # ==================== Fetching ====================
+
+    def _inflight_task(self, key: str) -> asyncio.Task | None:
+        """The fetch running for key on the current event loop, if any."""
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return task
+        return None
+
+    def _start_fetch(
+        self,
+        key: str,
+        provider: str,
+        kind: str,
+        query: str,
+        params: dict | None,
+        loader: Loader,
+    ) -> asyncio.Task:
+        """Run loader once for key and store its result."""
+        task = asyncio.ensure_future(
+            self._load_and_store(key, provider, kind, query, params, loader)
+        )
+        self._inflight[key] = task
+
+        def finished(done: asyncio.Task) -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            if not done.cancelled() and done.exception() is not None:
+                # Foreground callers re-raise it; stale entries are kept
+                logger.warning(
+                    f"Provider lookup {provider}/{kind} '{query}' failed: "
+                    f"{done.exception()}"
+                )
+
+        task.add_done_callback(finished)
+        return task
+
+    async def _load_and_store(
+        self,
+        key: str,
+        provider: str,
+        kind: str,
+        query: str,
+        params: dict | None,
+        loader: Loader,
+    ) -> Any:
+        self.counters["refreshes"] += 1
+        payload = await loader()
+        self._write(key, provider, kind, query, params, payload)
+        return payload
+
+    # ==================== Storage ====================
+
+    def _read(self, key: str, now: datetime) -> tuple[Any, datetime] | None:
+        """Return (payload, expires_at) of a servable entry and record the hit."""
+        try:
+            with self.session_factory() as session:
+                entry = session.get(ProviderResponseCache, key)
+                if entry is None or _as_utc(entry.stale_until) <= now:
+                    return None
+                payload = entry.payload
+                expires_at = _as_utc(entry.expires_at)
+                entry.last_accessed_at = now
+                entry.hit_count += 1
+                session.commit()
+                return payload, expires_at
+        except SQLAlchemyError as e:
+            self.counters["errors"] += 1
+            logger.warning(f"Provider cache read failed: {e}")
+            return None
+
+    def _write(
+        self,
+        key: str,
+        provider: str,
+        kind: str,
+        query: str,
+        params: dict | None,
+        payload: Any,
+    ) -> None:
+        """Store a response and keep the table within max_entries."""
+        now = _now()
+        try:
+            encoded = json.dumps(payload, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Provider response for {provider}/{kind} not cached: {e}")
+            return
+
+        is_empty = not payload
+        if is_empty:
+            expires_at = stale_until = now + self.empty_ttl
+        else:
+            expires_at = now + self.ttls.get(kind, DEFAULT_TTL)
+            stale_until = expires_at + self.stale_window
+
+        try:
+            with self.session_factory() as session:
+                if is_empty:
+                    current = session.get(ProviderResponseCache, key)
+                    if (
+                        current is not None
+                        and not current.is_empty
+                        and _as_utc(current.stale_until) > now
+                    ):
+                        # Likely a failed refresh: keep serving the stale entry
+                        logger.info(
+                            f"Kept cached {provider}/{kind} '{query}' over an "
+                            "empty refresh"
+                        )
+                        return
+                session.merge(
+                    ProviderResponseCache(
+                        cache_key=key,
+                        provider=provider.lower(),
+                        kind=kind,
+                        query=normalize_query(kind, query),
+                        params=params,
+                        payload=json.loads(encoded),
+                        is_empty=is_empty,
+                        size_bytes=len(encoded),
+                        fetched_at=now,
+                        expires_at=expires_at,
+                        stale_until=stale_until,
+                        last_accessed_at=now,
+                        hit_count=0,
+                    )
+                )
+                self._evict(session, now)
+                session.commit()
+        except SQLAlchemyError as e:
+            self.counters["errors"] += 1
+            logger.warning(f"Provider cache write failed: {e}")
+
+    def _evict(self, session: Session, now: datetime) -> None:
+        """Purge dead entries, then least recently used ones beyond the limit."""
+        session.execute(
+            delete(ProviderResponseCache).where(
+                ProviderResponseCache.stale_until <= now
+            )
+        )
+        count = session.scalar(select(func.count(ProviderResponseCache.cache_key)))
+        if count <= self.max_entries:
+            return
+
+        excess = count - int(self.max_entries * EVICTION_LOW_WATER)
+        oldest = (
+            select(ProviderResponseCache.cache_key)
+            .order_by(ProviderResponseCache.last_accessed_at)
+            .limit(excess)
+        )
+        session.execute(
+            delete(ProviderResponseCache).where(
+                ProviderResponseCache.cache_key.in_(oldest)
+            )
+        )
+        logger.info(f"Provider cache evicted {excess} least recently used entries")
+
+
+async def cached_lookup(
+    cache: ProviderCache | None,
+    provider: str,
+    kind: str,
+    query: str,
+    loader: Loader,
+    params: dict | None = None,
+) -> Any:
+    """Run loader through cache, or directly when caching is disabled."""
+    if cache is None:
+        return await loader()
+    return await cache.get_or_fetch(provider, kind, query, loader, params)
+
+
+# Global instance - lazy initialized
+_provider_cache: ProviderCache | None = None
+
+
+def get_provider_cache() -> ProviderCache | None:
+    """Get the shared provider cache, or None when PROVIDER_CACHE_ENABLED is off."""
+    global _provider_cache
+    if not provider_cache_enabled():
+        return None
+    if _provider_cache is None:
+        _provider_cache = ProviderCache()
+    return _provider_cache
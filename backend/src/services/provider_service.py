@@ -6,20 +6,56 @@ Handles provider registration, searches across providers, and result aggregation
 import asyncio
 import logging
 import re
+from collections.abc import AsyncIterator
 from typing import Any
 
 from ..providers.base_provider import ComponentDataProvider, ComponentSearchResult
 from ..providers.lcsc_provider import LCSCProvider
+from .provider_cache import (
+    ProviderCache,
+    cached_lookup,
+    get_provider_cache,
+    normalize_query,
+)
+from .rate_limiter import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    CircuitOpenError,
+    HostLimiters,
+    get_host_limiters,
+)
 
 logger = logging.getLogger(__name__)
 
+# Requests a provider host may receive back to back before its
+# rate_limit_delay applies
+PROVIDER_RATE_LIMIT_BURST = 5
+
+# SKU lookups in flight at once while resolving a batch
+PROVIDER_SKU_BATCH_CONCURRENCY = 8
+
 
 class ProviderService:
     """Service for managing component data providers"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: ProviderCache | None = None,
+        limiters: HostLimiters | None = None,
+    ):
+        """
+        Initialize the service with the default providers.
+
+        Args:
+            cache: Response cache for provider lookups (default: the shared
+                cache, unless PROVIDER_CACHE_ENABLED is off)
+            limiters: Per-host rate limiters and circuit breakers (default:
+                the shared ones used by the HTTP client)
+        """
         self.providers: dict[str, ComponentDataProvider] = {}
         self.enabled_providers: set[str] = set()
+        self.cache = cache if cache is not None else get_provider_cache()
+        self.limiters = limiters if limiters is not None else get_host_limiters()
         self._initialize_default_providers()
 
     def _initialize_default_providers(self):
@@ -36,8 +72,21 @@ class ProviderService:
             logger.error(f"Error initializing default providers: {e}")
 
     def register_provider(self, name: str, provider: ComponentDataProvider):
-        """Register a new component data provider"""
+        """
+        Register a new component data provider.
+
+        The provider's hosts are paced at its rate_limit_delay, with bursts
+        of up to PROVIDER_RATE_LIMIT_BURST requests, so interactive searches
+        are unaffected while bulk work such as BOM refreshes is paced.
+        """
         self.providers[name] = provider
+        if provider.rate_limit_delay > 0:
+            for host in provider.hosts:
+                self.limiters.configure(
+                    host,
+                    requests_per_second=1 / provider.rate_limit_delay,
+                    burst_size=PROVIDER_RATE_LIMIT_BURST,
+                )
         logger.info(f"Registered provider: {name}")
 
     def enable_provider(self, name: str):
@@ -57,6 +106,27 @@ class ProviderService:
         """Get list of enabled provider names"""
         return list(self.enabled_providers)
 
+    def _check_circuits(self, provider: ComponentDataProvider):
+        """
+        Fail fast before a live request if a provider host's circuit is open.
+
+        Pacing itself happens per request to each host. Cache hits never
+        reach this point, and stale cached responses keep being served while
+        their refresh fails here.
+
+        Raises:
+            CircuitOpenError: If any of the provider's hosts is failing
+        """
+        for host in provider.hosts:
+            self.limiters.get(host).check()
+
+    def get_circuit_state(self, provider: ComponentDataProvider) -> str:
+        """Worst circuit state of the provider's hosts ("closed" if none)."""
+        states = {self.limiters.get(host).state for host in provider.hosts}
+        if CIRCUIT_OPEN in states:
+            return CIRCUIT_OPEN
+        return next(iter(states - {CIRCUIT_CLOSED}), CIRCUIT_CLOSED)
+
     async def search_all_providers(
         self,
         query: str,
@@ -118,8 +188,17 @@ class ProviderService:
         limit: int,
     ) -> list[ComponentSearchResult]:
         """Safely search a provider with error handling"""
-        try:
+
+        async def load():
+            self._check_circuits(provider)
             results = await provider.search_components(query, limit)
+            return [result.model_dump(mode="json") for result in results]
+
+        try:
+            payload = await cached_lookup(
+                self.cache, provider_name, "search", query, load, {"limit": limit}
+            )
+            results = [ComponentSearchResult.model_validate(item) for item in payload]
             logger.debug(
                 f"Provider {provider_name} returned {len(results)} results for '{query}'"
             )
@@ -214,9 +293,11 @@ class ProviderService:
                 continue
 
             try:
-                provider_obj = self.providers[provider_name]
-                result = await provider_obj.get_component_details(
-                    part_number, manufacturer
+                result = await self._get_provider_details(
+                    provider_name,
+                    self.providers[provider_name],
+                    part_number,
+                    manufacturer,
                 )
                 if result:
                     result.provider_id = f"{provider_name}_{result.provider_id}"
@@ -226,26 +307,59 @@ class ProviderService:
 
         return None
 
+    async def _get_provider_details(
+        self,
+        provider_name: str,
+        provider: ComponentDataProvider,
+        part_number: str,
+        manufacturer: str | None,
+    ) -> ComponentSearchResult | None:
+        """Get details from one provider through the response cache"""
+
+        async def load():
+            self._check_circuits(provider)
+            result = await provider.get_component_details(part_number, manufacturer)
+            return result.model_dump(mode="json") if result else None
+
+        payload = await cached_lookup(
+            self.cache,
+            provider_name,
+            "details",
+            part_number,
+            load,
+            {"manufacturer": manufacturer},
+        )
+        return ComponentSearchResult.model_validate(payload) if payload else None
+
     async def verify_providers(self) -> dict[str, bool]:
         """
         Verify connectivity for all registered providers.
 
+        Providers with an open circuit are reported down without contacting
+        them; get_provider_info has their host states.
+
         Returns:
             Dictionary mapping provider names to their connection status
         """
         verification_tasks = []
         provider_names = []
+        status = {}
 
         for name, provider in self.providers.items():
+            try:
+                self._check_circuits(provider)
+            except CircuitOpenError as e:
+                status[name] = False
+                logger.warning(f"Provider {name} not verified: {e}")
+                continue
             provider_names.append(name)
             verification_tasks.append(provider.verify_connection())
 
         if not verification_tasks:
-            return {}
+            return status
 
         results = await asyncio.gather(*verification_tasks, return_exceptions=True)
 
-        status = {}
         for i, result in enumerate(results):
             provider_name = provider_names[i]
             if isinstance(result, Exception):
@@ -312,19 +426,129 @@ class ProviderService:
         self, provider_name: str, provider: ComponentDataProvider, provider_sku: str
     ) -> ComponentSearchResult | None:
         """Safely search a provider by SKU with error handling"""
-        try:
+
+        async def load():
+            self._check_circuits(provider)
             result = await provider.search_by_provider_sku(provider_sku)
+            return result.model_dump(mode="json") if result else None
+
+        try:
+            payload = await cached_lookup(
+                self.cache, provider_name, "sku", provider_sku, load
+            )
+            result = self._sku_result(provider_name, payload)
             if result:
                 logger.debug(
                     f"Provider {provider_name} found component for SKU '{provider_sku}'"
                 )
-                # Ensure provider info is tagged
-                result.provider_id = f"{provider_name}_{result.provider_id}"
             return result
         except Exception as e:
             logger.error(f"Error searching provider {provider_name} by SKU: {e}")
             return None
 
+    @staticmethod
+    def _sku_result(
+        provider_name: str, payload: dict | None
+    ) -> ComponentSearchResult | None:
+        """Result for a cached SKU payload, tagged with the provider name"""
+        if not payload:
+            return None
+        result = ComponentSearchResult.model_validate(payload)
+        result.provider_id = f"{provider_name}_{result.provider_id}"
+        return result
+
+    async def search_by_provider_skus(
+        self,
+        provider_skus: list[str],
+        providers: list[str] | None = None,
+        concurrency: int = PROVIDER_SKU_BATCH_CONCURRENCY,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Resolve many provider SKUs, yielding each one as soon as it resolves.
+
+        SKUs are deduplicated (case and surrounding whitespace ignored). SKUs
+        with fresh cached responses from every provider are yielded first,
+        read in one query per provider; the rest fan out with at most
+        concurrency lookups in flight and are yielded in completion order.
+        Each lookup goes through search_by_provider_sku, so it is cached,
+        coalesced with concurrent lookups and rate limited per host.
+
+        Args:
+            provider_skus: Provider-specific SKUs or part identifiers
+            providers: Specific providers to search (default: all enabled)
+            concurrency: Lookups in flight at once
+
+        Yields:
+            Per SKU: {"provider_sku", "results" (provider name to result, for
+            providers that found it), "total_found", "providers_searched",
+            "cached"}
+        """
+        target_providers = [
+            name
+            for name in providers or self.get_enabled_providers()
+            if name in self.providers
+        ]
+        unique_skus = {}
+        for sku in provider_skus:
+            if sku and sku.strip():
+                unique_skus.setdefault(normalize_query("sku", sku), sku.strip())
+        skus = list(unique_skus.values())
+
+        def entry(sku: str, results: dict, cached: bool) -> dict[str, Any]:
+            found = {
+                name: result.model_dump(mode="json")
+                for name, result in results.items()
+                if result is not None
+            }
+            return {
+                "provider_sku": sku,
+                "results": found,
+                "total_found": len(found),
+                "providers_searched": len(results),
+                "cached": cached,
+            }
+
+        # Serve SKUs every provider has a fresh answer for without fetching
+        pending = skus
+        if self.cache is not None and target_providers:
+            cached = {
+                name: self.cache.get_fresh(name, "sku", skus)
+                for name in target_providers
+            }
+            pending = []
+            for sku in skus:
+                if all(sku in cached[name] for name in target_providers):
+                    results = {
+                        name: self._sku_result(name, cached[name][sku])
+                        for name in target_providers
+                    }
+                    yield entry(sku, results, cached=True)
+                else:
+                    pending.append(sku)
+
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(sku: str) -> tuple[str, dict]:
+            async with semaphore:
+                return sku, await self.search_by_provider_sku(sku, target_providers)
+
+        logger.info(
+            f"Resolving {len(pending)} SKUs ({len(skus) - len(pending)} cached) "
+            f"across {len(target_providers)} providers"
+        )
+        tasks = [asyncio.ensure_future(resolve(sku)) for sku in pending]
+        try:
+            for next_resolved in asyncio.as_completed(tasks):
+                sku, results = await next_resolved
+                yield entry(sku, results, cached=False)
+        finally:
+            # Stop outstanding lookups if the consumer goes away
+            for task in tasks:
+                task.cancel()
+
     async def unified_search(
         self,
         query: str,
@@ -407,11 +631,20 @@ class ProviderService:
         return "part_number"
 
     def get_provider_info(self) -> dict[str, Any]:
-        """Get information about all registered providers"""
+        """
+        Get information about all registered providers.
+
+        Besides the provider's own info, each entry has its circuit state
+        (worst of its hosts) and the rate limiter state of every host.
+        """
         info = {}
         for name, provider in self.providers.items():
             provider_info = provider.get_provider_info()
             provider_info["enabled"] = name in self.enabled_providers
+            provider_info["circuit_state"] = self.get_circuit_state(provider)
+            provider_info["hosts"] = {
+                host: self.limiters.get(host).get_state() for host in provider.hosts
+            }
             info[name] = provider_info
 
         return info
@@ -0,0 +1,337 @@
+"""
+Rate limiting for outbound requests to external services.
+
+RateLimiter is a plain token bucket. HostLimiter adds what talking to a
+provider's host needs, and one is shared per host by every request to it
+(the pooled HTTP client's transport and browser page loads):
+
+- AIMD pacing: the request rate grows by RATE_INCREASE per successful
+  response up to the host's ceiling and halves on every 429
+- Retry-After on 429 and 503 responses holds all requests to the host
+  until the given time (capped at MAX_RETRY_AFTER)
+- a circuit breaker: after CIRCUIT_FAILURE_THRESHOLD consecutive 5xx
+  responses or connection errors the host is failed fast with
+  CircuitOpenError for CIRCUIT_RESET_TIMEOUT, then a single probe request
+  decides whether it closes again
+
+Failing fast lets provider lookups fall back to cached responses instead of
+waiting on timeouts from a provider that is down.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Default request rate ceiling (per second) and burst for hosts without a
+# configured limit; providers configure their hosts from rate_limit_delay
+HOST_RATE_LIMIT = 10.0
+HOST_RATE_BURST = 10
+
+# Rate added per successful response, and the floor halving stops at
+RATE_INCREASE = 0.1
+MIN_RATE = 0.05
+
+# Longest Retry-After honoured, in seconds
+MAX_RETRY_AFTER = 300.0
+
+# Consecutive failures that open the circuit, and seconds before a probe
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class RateLimiter:
+    """Token bucket rate limiter for API requests."""
+
+    def __init__(self, requests_per_second: float = 2.0, burst_size: int = 5):
+        self.requests_per_second = requests_per_second
+        self.burst_size = burst_size
+        self.tokens = burst_size
+        self.last_update = time.time()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Acquire a token, blocking until available."""
+        async with self.lock:
+            now = time.time()
+            # Add tokens based on elapsed time
+            elapsed = now - self.last_update
+            self.tokens = min(
+                self.burst_size, self.tokens + elapsed * self.requests_per_second
+            )
+            self.last_update = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            # Wait for next token
+            wait_time = (1 - self.tokens) / self.requests_per_second
+            await asyncio.sleep(wait_time)
+            self.tokens = 0
+            self.last_update = time.time()
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(
+            f"Circuit open for {host}: failing fast for another {retry_in:.0f}s"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delay or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        seconds = (when - datetime.now(UTC)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class HostLimiter:
+    """
+    Adaptive rate limiter and circuit breaker for one host.
+
+    Pacing uses a virtual schedule (the earliest time the next request may
+    start) rather than a lock held while sleeping, so one limiter can be
+    shared across event loops and threads.
+
+    Args:
+        host: Host name
+        requests_per_second: Rate ceiling; pacing starts there
+        burst_size: Requests allowed back to back at the current rate
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before a probe
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        requests_per_second: float = HOST_RATE_LIMIT,
+        burst_size: int = HOST_RATE_BURST,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.host = host
+        self.max_rate = requests_per_second
+        self.rate = requests_per_second
+        self.burst_size = burst_size
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._next_start = 0.0
+        self._blocked_until = 0.0
+        self._opened_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def configure(self, requests_per_second: float, burst_size: int | None = None):
+        """Change the rate ceiling (and burst), keeping the breaker state."""
+        with self._lock:
+            self.max_rate = requests_per_second
+            self.rate = min(self.rate, requests_per_second)
+            if burst_size is not None:
+                self.burst_size = burst_size
+
+    # ==================== Before a request ====================
+
+    def check(self) -> None:
+        """
+        Fail fast if the circuit is open, without reserving a request.
+
+        Raises:
+            CircuitOpenError: While the circuit is open and no probe is due
+        """
+        with self._lock:
+            retry_in = self._circuit_retry_in(self.clock())
+        if retry_in is not None:
+            raise CircuitOpenError(self.host, retry_in)
+
+    def reserve(self) -> float:
+        """
+        Reserve the next request slot.
+
+        Returns:
+            Seconds to wait before sending the request
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            now = self.clock()
+            retry_in = self._circuit_retry_in(now)
+            if retry_in is not None:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, retry_in)
+            if self.state == CIRCUIT_OPEN:
+                # Reset timeout elapsed: this request is the probe
+                self.state = CIRCUIT_HALF_OPEN
+                self._probe_in_flight = True
+
+            interval = 1 / self.rate
+            next_start = max(self._next_start, now)
+            wait = max(
+                0.0,
+                next_start - (self.burst_size - 1) * interval - now,
+                self._blocked_until - now,
+            )
+            self._next_start = max(next_start, now + wait) + interval
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+            return wait
+
+    async def acquire(self) -> None:
+        """Wait for the next request slot (see reserve)."""
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                self.release()
+                raise
+
+    def _circuit_retry_in(self, now: float) -> float | None:
+        """Seconds until requests may pass again, or None if they may now."""
+        if self.state == CIRCUIT_OPEN and now < self._opened_until:
+            return self._opened_until - now
+        if self.state == CIRCUIT_HALF_OPEN and self._probe_in_flight:
+            return self.reset_timeout
+        return None
+
+    # ==================== After a request ====================
+
+    def record_response(self, status_code: int, retry_after: str | None = None):
+        """Adapt the rate and breaker to a response from the host."""
+        with self._lock:
+            now = self.clock()
+            delay = (
+                parse_retry_after(retry_after) if status_code in (429, 503) else None
+            )
+            if delay:
+                self._blocked_until = max(self._blocked_until, now + delay)
+
+            if status_code == 429:
+                # Multiplicative decrease, and no burst until the rate recovers
+                self.rate = max(MIN_RATE, self.rate / 2)
+                self._next_start = max(
+                    self._next_start, now + self.burst_size / self.rate
+                )
+                self._succeeded()
+            elif status_code >= 500:
+                self._failed(now, delay)
+            else:
+                self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+                self._succeeded()
+
+    def record_failure(self) -> None:
+        """Count a connection error or timeout against the host."""
+        with self._lock:
+            self._failed(self.clock(), None)
+
+    def release(self) -> None:
+        """Give up a reservation without an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _succeeded(self) -> None:
+        self.consecutive_failures = 0
+        self.state = CIRCUIT_CLOSED
+        self._probe_in_flight = False
+
+    def _failed(self, now: float, retry_after: float | None) -> None:
+        self.consecutive_failures += 1
+        if (
+            self.state == CIRCUIT_HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = CIRCUIT_OPEN
+            self._opened_until = now + max(self.reset_timeout, retry_after or 0.0)
+            self._probe_in_flight = False
+
+    def get_state(self) -> dict:
+        """Current rate, breaker state and request counters."""
+        with self._lock:
+            now = self.clock()
+            return {
+                "state": self.state,
+                "requests_per_second": round(self.rate, 3),
+                "max_requests_per_second": self.max_rate,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in": round(self._circuit_retry_in(now) or 0.0, 1),
+                "blocked_for": round(max(0.0, self._blocked_until - now), 1),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+            }
+
+
+class HostLimiters:
+    """Registry of HostLimiter instances, one per host."""
+
+    def __init__(self, **defaults):
+        self.defaults = defaults
+        self._limiters: dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> HostLimiter:
+        """The limiter for host, created with the registry defaults."""
+        host = host.lower()
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = HostLimiter(host, **self.defaults)
+            return limiter
+
+    def configure(
+        self, host: str, requests_per_second: float, burst_size: int | None = None
+    ) -> HostLimiter:
+        """Set a host's rate ceiling (e.g. from a provider's rate_limit_delay)."""
+        limiter = self.get(host)
+        limiter.configure(requests_per_second, burst_size)
+        return limiter
+
+    def get_states(self) -> dict[str, dict]:
+        """State of every host seen so far."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.host: limiter.get_state() for limiter in limiters}
+
+
+# Global instance - shared by every outbound request
+_host_limiters = HostLimiters()
+
+
+def get_host_limiters() -> HostLimiters:
+    """Get the shared per-host limiters."""
+    return _host_limiters
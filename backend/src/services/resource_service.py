@@ -6,14 +6,18 @@ and file storage for datasheets, images, footprints, and other resources.
 """
 
 import logging
+import uuid
 from datetime import datetime
 from pathlib import Path
 
 import httpx
-from fastapi import BackgroundTasks
 from sqlalchemy.orm import Session
 
+from ..models.background_job import BackgroundJob
 from ..models.resource import Resource
+from .file_download import download_to_file, is_client_error
+from .file_storage import file_storage
+from .job_queue import PermanentJobError, enqueue_job, job_host
 
 logger = logging.getLogger(__name__)
 
@@ -26,28 +30,12 @@ class ResourceService:
     asynchronously, tracking progress, and managing file storage.
     """
 
-    # Storage configuration
-    UPLOAD_DIR = Path("backend/uploads/resources")
+    # Download configuration
     DOWNLOAD_TIMEOUT = 30.0  # seconds
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 
-    @staticmethod
-    def _get_storage_path(provider_link_id: int, file_name: str) -> Path:
-        """
-        Get storage path for a resource file.
-
-        Args:
-            provider_link_id: Provider link ID
-            file_name: Resource filename
-
-        Returns:
-            Path to storage location
-        """
-        # Create directory structure: uploads/resources/{provider_link_id}/
-        storage_dir = ResourceService.UPLOAD_DIR / str(provider_link_id)
-        storage_dir.mkdir(parents=True, exist_ok=True)
-
-        return storage_dir / file_name
+    # Download job priority per resource type (higher runs first)
+    DOWNLOAD_PRIORITIES = {"datasheet": 10}
 
     @staticmethod
     async def download_resource_sync(db: Session, resource_id: int) -> Resource:
@@ -65,7 +53,7 @@ class ResourceService:
             Updated Resource object
 
         Raises:
-            ValueError: If resource not found
+            ValueError: If resource not found or the file exceeds MAX_FILE_SIZE
             Exception: If download fails
         """
         # Get resource
@@ -79,48 +67,37 @@ class ResourceService:
             resource.download_status = "downloading"
             db.commit()
 
-            # Download file
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    resource.source_url,
-                    timeout=ResourceService.DOWNLOAD_TIMEOUT,
-                    follow_redirects=True,
-                )
-                response.raise_for_status()
-
-                # Check file size
-                content_length = int(response.headers.get("content-length", 0))
-                if (
-                    content_length > ResourceService.MAX_FILE_SIZE
-                    and content_length > 0
-                ):
-                    raise ValueError(
-                        f"File too large: {content_length} bytes (max {ResourceService.MAX_FILE_SIZE})"
-                    )
-
-                # Get storage path
-                storage_path = ResourceService._get_storage_path(
-                    resource.provider_link_id, resource.file_name
-                )
-
-                # Write file
-                with open(storage_path, "wb") as f:
-                    f.write(response.content)
+            # Stream the file to disk, capped at MAX_FILE_SIZE, then store it
+            # once per distinct content (one datasheet serves many parts)
+            blobs = file_storage.blobs
+            downloaded = await download_to_file(
+                resource.source_url,
+                blobs.incoming_dir / uuid.uuid4().hex,
+                max_size=ResourceService.MAX_FILE_SIZE,
+                timeout=ResourceService.DOWNLOAD_TIMEOUT,
+            )
+            stored = blobs.put_file(
+                downloaded.path,
+                Path(resource.file_name).suffix,
+                sha256=downloaded.sha256,
+            )
 
-                # Update resource
-                resource.file_path = str(storage_path)
-                resource.file_size_bytes = len(response.content)
-                resource.download_status = "complete"
-                resource.downloaded_at = datetime.utcnow()
+            # Update resource
+            resource.file_path = str(stored.path)
+            resource.file_size_bytes = downloaded.size
+            resource.download_status = "complete"
+            resource.downloaded_at = datetime.utcnow()
 
-                db.commit()
-                db.refresh(resource)
+            db.commit()
+            db.refresh(resource)
 
-                logger.info(
-                    f"Successfully downloaded resource {resource_id}: {resource.file_name}"
-                )
+            logger.info(
+                f"Successfully downloaded resource {resource_id}: "
+                f"{resource.file_name} (sha256 {downloaded.sha256}"
+                f"{', already stored' if stored.deduplicated else ''})"
+            )
 
-                return resource
+            return resource
 
         except Exception as e:
             logger.error(f"Failed to download resource {resource_id}: {str(e)}")
@@ -132,32 +109,64 @@ class ResourceService:
             raise
 
     @staticmethod
-    async def download_resource_async(resource_id: int) -> None:
+    def queue_download(db: Session, resource: Resource) -> BackgroundJob:
         """
-        Download a resource asynchronously (background task).
+        Queue a resource for download by the background job queue.
 
-        Used for non-critical resources like images and footprints that can
-        be downloaded in the background after component creation.
+        The job is added to the caller's transaction and runs once it commits.
+        Datasheets are queued ahead of images and CAD files.
 
         Args:
-            resource_id: Resource ID to download
+            db: Database session
+            resource: Resource to download (must have an ID)
 
-        Note: This function creates its own database session since it runs
-        in a background task.
+        Returns:
+            The download job
+        """
+        return enqueue_job(
+            db,
+            "resource_download",
+            {"resource_id": resource.id},
+            priority=ResourceService.DOWNLOAD_PRIORITIES.get(resource.resource_type, 0),
+            idempotency_key=f"resource_download:{resource.id}",
+            host=job_host(resource.source_url),
+        )
+
+    @staticmethod
+    async def run_download_job(payload: dict) -> dict:
+        """
+        Job handler for "resource_download" jobs.
+
+        Missing resources, oversized files and client errors are not retried.
+
+        Args:
+            payload: Job payload with resource_id
+
+        Returns:
+            Stored file path and size
         """
         from ..database import SessionLocal
 
         db = SessionLocal()
 
         try:
-            await ResourceService.download_resource_sync(db, resource_id)
-        except Exception as e:
-            logger.error(
-                f"Background download failed for resource {resource_id}: {str(e)}"
+            resource = await ResourceService.download_resource_sync(
+                db, payload["resource_id"]
             )
+        except ValueError as e:
+            raise PermanentJobError(str(e)) from e
+        except httpx.HTTPStatusError as e:
+            if is_client_error(e):
+                raise PermanentJobError(str(e)) from e
+            raise
         finally:
             db.close()
 
+        return {
+            "file_path": resource.file_path,
+            "file_size_bytes": resource.file_size_bytes,
+        }
+
     @staticmethod
     async def get_resource_status(db: Session, resource_id: int) -> dict:
         """
@@ -211,7 +220,6 @@ class ResourceService:
         db: Session,
         link_id: int,
         resource_data: dict,
-        background_tasks: BackgroundTasks | None = None,
     ) -> Resource:
         """
         Add a new resource to a provider link and queue for download.
@@ -223,7 +231,6 @@ class ResourceService:
                 - type: Resource type
                 - url: Source URL
                 - file_name: Filename
-            background_tasks: FastAPI background tasks
 
         Returns:
             Created Resource object
@@ -256,21 +263,20 @@ class ResourceService:
         )
 
         db.add(resource)
-        db.commit()
-        db.refresh(resource)
+        db.flush()
 
         # Queue for background download
-        if background_tasks:
-            background_tasks.add_task(
-                ResourceService.download_resource_async, resource.id
-            )
+        ResourceService.queue_download(db, resource)
+
+        db.commit()
+        db.refresh(resource)
 
         return resource
 
     @staticmethod
     async def retry_failed_downloads(db: Session) -> dict:
         """
-        Retry all failed resource downloads.
+        Queue all failed resource downloads again.
 
         Args:
             db: Database session
@@ -278,7 +284,7 @@ class ResourceService:
         Returns:
             Dictionary with retry statistics:
             - total_failed: Number of failed resources found
-            - retry_queued: Number of retries queued
+            - retry_queued: Number of downloads queued
             - retry_failed: Number that failed to queue
         """
         # Find all failed resources
@@ -294,16 +300,16 @@ class ResourceService:
 
         for resource in failed_resources:
             try:
-                # Reset status to pending
                 resource.download_status = "pending"
+                ResourceService.queue_download(db, resource)
                 db.commit()
-
-                # Attempt download
-                await ResourceService.download_resource_sync(db, resource.id)
                 stats["retry_queued"] += 1
 
             except Exception as e:
-                logger.error(f"Retry failed for resource {resource.id}: {str(e)}")
+                db.rollback()
+                logger.error(
+                    f"Failed to queue retry for resource {resource.id}: {str(e)}"
+                )
                 stats["retry_failed"] += 1
 
         return stats
@@ -3,26 +3,65 @@ Stock history service for pagination and export functionality.
 
 This service provides:
 - Paginated stock history retrieval with sorting
-- Multi-format export (CSV, Excel/XLSX, JSON)
+- Inventory-wide ledger queries with filters and keyset pagination
+- Multi-format streaming export (CSV, Excel/XLSX, JSON, NDJSON)
 
 Implements FR-043 through FR-048 and FR-059 from spec.md.
 """
 
-import csv
-import io
+import base64
 import json
 import logging
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any, Literal
 
 from fastapi import HTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
-
-from ..models import Component, StockTransaction
+from sqlalchemy import Row, Select, String, and_, func, or_, select, type_coerce
+from sqlalchemy.orm import Session, aliased, joinedload
+
+from ..models import Component, StockTransaction, StorageLocation, TransactionType
+from .export_streaming import (
+    EXPORT_YIELD_PER,
+    iter_csv,
+    iter_json_with_items,
+    iter_ndjson,
+    iter_xlsx,
+)
 
 logger = logging.getLogger(__name__)
 
+# Column headers per FR-043, shared by CSV and XLSX exports
+EXPORT_HEADERS = [
+    "Date",
+    "Type",
+    "Quantity Change",
+    "Previous Qty",
+    "New Qty",
+    "From Location",
+    "To Location",
+    "Lot ID",
+    "Price/Unit",
+    "Total Price",
+    "User",
+    "Reason",
+    "Notes",
+]
+
+# Ledger exports prepend the component to each history row
+LEDGER_EXPORT_HEADERS = ["Component ID", "Component", "Part Number", *EXPORT_HEADERS]
+
+# created_at compared as its stored text so keyset cursors round-trip exactly
+# (server-side CURRENT_TIMESTAMP values have no fractional seconds)
+LEDGER_CREATED_KEY = type_coerce(StockTransaction.created_at, String)
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
 
 class StockHistoryService:
     """
@@ -116,11 +155,10 @@ class StockHistoryService:
         else:
             query = query.order_by(sort_column.asc())
 
-        # Get total count for pagination metadata
-        count_query = select(StockTransaction).where(
+        # Get total count for pagination metadata (COUNT(*), no row hydration)
+        total_count = self._count_transactions(
             StockTransaction.component_id == component_id
         )
-        total_count = len(self.session.execute(count_query).scalars().all())
 
         # Calculate pagination
         total_pages = (
@@ -152,31 +190,34 @@ class StockHistoryService:
     def export_history(
         self,
         component_id: str,
-        export_format: Literal["csv", "xlsx", "json"],
+        export_format: Literal["csv", "xlsx", "json", "ndjson"],
         sort_by: str = "created_at",
         sort_order: Literal["asc", "desc"] = "desc",
-    ) -> tuple[bytes | str, str, str]:
+    ) -> tuple[Iterator[bytes], str, str]:
         """
         Export complete stock transaction history in specified format.
 
         Implements FR-043 (column headers), FR-059 (export formats).
-        Exports ALL history entries without pagination.
+        Exports ALL history entries without pagination. Validation happens
+        eagerly; the returned iterator then pages through the database with
+        yield_per so memory use stays constant regardless of history size.
 
         Args:
             component_id: UUID of component
-            export_format: Export format (csv, xlsx, json)
+            export_format: Export format (csv, xlsx, json, ndjson)
             sort_by: Field to sort by
             sort_order: Sort order (asc or desc)
 
         Returns:
-            Tuple of (content, content_type, filename):
-                - content: Bytes (xlsx) or string (csv/json)
+            Tuple of (chunks, content_type, filename):
+                - chunks: Iterator of encoded byte chunks
                 - content_type: MIME type
                 - filename: Suggested filename with extension
 
         Raises:
             HTTPException(404): Component not found
             HTTPException(400): Invalid format or sort parameters
+            HTTPException(500): XLSX requested but openpyxl is not installed
         """
         # Validate component exists
         component = self.session.get(Component, component_id)
@@ -184,46 +225,26 @@ class StockHistoryService:
             raise HTTPException(status_code=404, detail="Component not found")
 
         # Validate format
-        if export_format not in ["csv", "xlsx", "json"]:
+        if export_format not in EXPORT_CONTENT_TYPES:
             raise HTTPException(
                 status_code=400,
-                detail="Invalid format. Must be one of: csv, xlsx, json",
+                detail="Invalid format. Must be one of: csv, xlsx, json, ndjson",
             )
 
-        # Validate and map sort_by field
-        sort_field_map = {
-            "created_at": StockTransaction.created_at,
-            "quantity_change": StockTransaction.quantity_change,
-            "transaction_type": StockTransaction.transaction_type,
-            "user_name": StockTransaction.user_name,
-        }
-
-        if sort_by not in sort_field_map:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid sort_by field. Must be one of: {', '.join(sort_field_map.keys())}",
-            )
-
-        # Build query with eager loading
-        query = (
-            select(StockTransaction)
-            .where(StockTransaction.component_id == component_id)
-            .options(
-                joinedload(StockTransaction.from_location),
-                joinedload(StockTransaction.to_location),
-            )
+        if export_format == "xlsx":
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Excel export not available. openpyxl library not installed.",
+                )
+
+        query = self._build_export_query(
+            [StockTransaction.component_id == component_id],
+            self._history_order_by(sort_by, sort_order),
         )
 
-        # Apply sorting
-        sort_column = sort_field_map[sort_by]
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # Get all transactions (no pagination)
-        transactions = self.session.execute(query).scalars().all()
-
         # Generate timestamp for filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         # Sanitize component name for filename (ASCII-safe for HTTP headers)
@@ -233,226 +254,456 @@ class StockHistoryService:
             .encode("ascii", errors="ignore")
             .decode("ascii")
         )
+        filename = f"stock_history_{component_name}_{timestamp}.{export_format}"
+
+        rows = self._iter_export_rows(query)
 
-        # Export based on format
         if export_format == "csv":
-            content = self._export_to_csv(transactions)
-            content_type = "text/csv"
-            filename = f"stock_history_{component_name}_{timestamp}.csv"
+            chunks = iter_csv(EXPORT_HEADERS, map(self._format_csv_row, rows))
         elif export_format == "xlsx":
-            content = self._export_to_xlsx(transactions)
-            content_type = (
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            chunks = iter_xlsx(
+                "Stock History", EXPORT_HEADERS, map(self._format_xlsx_row, rows)
             )
-            filename = f"stock_history_{component_name}_{timestamp}.xlsx"
+        elif export_format == "ndjson":
+            chunks = iter_ndjson(map(self._format_json_entry, rows))
         else:  # json
-            content = self._export_to_json(component, transactions)
-            content_type = "application/json"
-            filename = f"stock_history_{component_name}_{timestamp}.json"
+            total_entries = self._count_transactions(
+                StockTransaction.component_id == component_id
+            )
+            chunks = iter_json_with_items(
+                {
+                    "component_id": component.id,
+                    "component_name": component.name,
+                    "exported_at": datetime.now().isoformat(),
+                    "total_entries": total_entries,
+                },
+                "entries",
+                map(self._format_json_entry, rows),
+            )
 
-        return content, content_type, filename
+        return chunks, EXPORT_CONTENT_TYPES[export_format], filename
 
-    def _export_to_csv(self, transactions: list[StockTransaction]) -> str:
+    def get_ledger(
+        self,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        component_id: str | None = None,
+        user_id: str | None = None,
+        location_id: str | None = None,
+        lot_id: str | None = None,
+        transaction_type: TransactionType | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = False,
+    ) -> dict[str, Any]:
         """
-        Export transactions to CSV format.
+        Get inventory-wide stock transaction ledger with keyset pagination.
 
-        Column headers per FR-043: Date, Type, Quantity Change, Previous Qty,
-        New Qty, From Location, To Location, Lot ID, Price/Unit, Total Price,
-        User, Reason, Notes
+        Results are ordered by (created_at, id) and paged with an opaque
+        cursor instead of OFFSET, so deep pages cost the same as the first.
+        Filters map onto the ledger indexes: (created_at, component_id),
+        (user_id, created_at) and (lot_id).
 
         Args:
-            transactions: List of StockTransaction objects
+            start_date: Only include transactions at or after this time
+            end_date: Only include transactions before this time
+            component_id: Restrict to a single component
+            user_id: Restrict to transactions performed by a user
+            location_id: Restrict to transactions moving stock into or out of a location
+            lot_id: Restrict to a lot/batch identifier
+            transaction_type: Restrict to a transaction type
+            sort_order: Chronological order (asc or desc)
+            limit: Maximum number of entries to return (1-500)
+            cursor: next_cursor value from a previous page
+            include_total: Also return COUNT(*) of all matching entries
 
         Returns:
-            CSV string
-        """
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write headers (FR-043)
-        writer.writerow(
-            [
-                "Date",
-                "Type",
-                "Quantity Change",
-                "Previous Qty",
-                "New Qty",
-                "From Location",
-                "To Location",
-                "Lot ID",
-                "Price/Unit",
-                "Total Price",
-                "User",
-                "Reason",
-                "Notes",
-            ]
-        )
+            Dict containing:
+                - entries: List of ledger entry dicts
+                - next_cursor: Cursor for the following page (None on last page)
+                - has_more: Whether another page exists
+                - total_entries: Matching entry count (only when include_total)
 
-        # Write data rows
-        for txn in transactions:
-            # Format quantity change with +/- indicator
-            qty_change = txn.quantity_change
-            qty_str = f"{'+' if qty_change > 0 else ''}{qty_change}"
+        Raises:
+            HTTPException(400): Invalid limit, date range or cursor
+        """
+        if limit < 1 or limit > 500:
+            raise HTTPException(
+                status_code=400, detail="Limit must be between 1 and 500"
+            )
 
-            # Get location names
-            from_loc = txn.from_location.name if txn.from_location else ""
-            to_loc = txn.to_location.name if txn.to_location else ""
+        criteria = self._ledger_criteria(
+            start_date=start_date,
+            end_date=end_date,
+            component_id=component_id,
+            user_id=user_id,
+            location_id=location_id,
+            lot_id=lot_id,
+            transaction_type=transaction_type,
+        )
 
-            # Format pricing
-            price_per_unit = (
-                f"${float(txn.price_per_unit):.2f}" if txn.price_per_unit else ""
-            )
-            total_price = f"${float(txn.total_price):.2f}" if txn.total_price else ""
-
-            writer.writerow(
-                [
-                    txn.created_at.isoformat() if txn.created_at else "",
-                    txn.transaction_type.value.upper(),
-                    qty_str,
-                    txn.previous_quantity,
-                    txn.new_quantity,
-                    from_loc,
-                    to_loc,
-                    txn.lot_id or "",
-                    price_per_unit,
-                    total_price,
-                    txn.user_name or "",
-                    txn.reason or "",
-                    txn.notes or "",
-                ]
-            )
+        page_criteria = list(criteria)
+        if cursor:
+            created_key, txn_id = self._decode_cursor(cursor)
+            if sort_order == "desc":
+                page_criteria.append(
+                    or_(
+                        LEDGER_CREATED_KEY < created_key,
+                        and_(
+                            LEDGER_CREATED_KEY == created_key,
+                            StockTransaction.id < txn_id,
+                        ),
+                    )
+                )
+            else:
+                page_criteria.append(
+                    or_(
+                        LEDGER_CREATED_KEY > created_key,
+                        and_(
+                            LEDGER_CREATED_KEY == created_key,
+                            StockTransaction.id > txn_id,
+                        ),
+                    )
+                )
+
+        # Fetch one extra row to detect whether another page exists
+        query = self._build_export_query(
+            page_criteria, self._ledger_order_by(sort_order)
+        ).limit(limit + 1)
+        rows = self.session.execute(query).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = self._encode_cursor(rows[-1]) if has_more else None
+
+        result = {
+            "entries": [self._format_ledger_entry(row) for row in rows],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+        if include_total:
+            result["total_entries"] = self._count_transactions(*criteria)
 
-        return output.getvalue()
+        return result
 
-    def _export_to_xlsx(self, transactions: list[StockTransaction]) -> bytes:
+    def export_ledger(
+        self,
+        export_format: Literal["csv", "xlsx", "json", "ndjson"],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        component_id: str | None = None,
+        user_id: str | None = None,
+        location_id: str | None = None,
+        lot_id: str | None = None,
+        transaction_type: TransactionType | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+    ) -> tuple[Iterator[bytes], str, str]:
         """
-        Export transactions to Excel/XLSX format using openpyxl.
+        Stream the filtered inventory-wide ledger in the specified format.
 
-        Args:
-            transactions: List of StockTransaction objects
+        Accepts the same filters as get_ledger and streams every matching
+        entry with yield_per, so whole-ledger exports run in constant memory.
 
         Returns:
-            XLSX file as bytes
+            Tuple of (chunks, content_type, filename)
+
+        Raises:
+            HTTPException(400): Invalid format or date range
+            HTTPException(500): XLSX requested but openpyxl is not installed
         """
-        try:
-            from openpyxl import Workbook
-        except ImportError:
+        if export_format not in EXPORT_CONTENT_TYPES:
             raise HTTPException(
-                status_code=500,
-                detail="Excel export not available. openpyxl library not installed.",
+                status_code=400,
+                detail="Invalid format. Must be one of: csv, xlsx, json, ndjson",
             )
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Stock History"
-
-        # Write headers (same as CSV, per FR-043)
-        ws.append(
-            [
-                "Date",
-                "Type",
-                "Quantity Change",
-                "Previous Qty",
-                "New Qty",
-                "From Location",
-                "To Location",
-                "Lot ID",
-                "Price/Unit",
-                "Total Price",
-                "User",
-                "Reason",
-                "Notes",
-            ]
+        if export_format == "xlsx":
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Excel export not available. openpyxl library not installed.",
+                )
+
+        criteria = self._ledger_criteria(
+            start_date=start_date,
+            end_date=end_date,
+            component_id=component_id,
+            user_id=user_id,
+            location_id=location_id,
+            lot_id=lot_id,
+            transaction_type=transaction_type,
         )
+        query = self._build_export_query(criteria, self._ledger_order_by(sort_order))
 
-        # Write data rows
-        for txn in transactions:
-            # Format quantity change with +/- indicator
-            qty_change = txn.quantity_change
-            qty_str = f"{'+' if qty_change > 0 else ''}{qty_change}"
-
-            # Get location names
-            from_loc = txn.from_location.name if txn.from_location else ""
-            to_loc = txn.to_location.name if txn.to_location else ""
-
-            # Format pricing (Excel can handle numbers directly)
-            price_per_unit = float(txn.price_per_unit) if txn.price_per_unit else ""
-            total_price = float(txn.total_price) if txn.total_price else ""
-
-            ws.append(
-                [
-                    txn.created_at.isoformat() if txn.created_at else "",
-                    txn.transaction_type.value.upper(),
-                    qty_str,
-                    txn.previous_quantity,
-                    txn.new_quantity,
-                    from_loc,
-                    to_loc,
-                    txn.lot_id or "",
-                    price_per_unit,
-                    total_price,
-                    txn.user_name or "",
-                    txn.reason or "",
-                    txn.notes or "",
-                ]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"stock_ledger_{timestamp}.{export_format}"
+
+        rows = self._iter_export_rows(query)
+
+        if export_format == "csv":
+            chunks = iter_csv(
+                LEDGER_EXPORT_HEADERS,
+                (
+                    self._ledger_row_prefix(row) + self._format_csv_row(row)
+                    for row in rows
+                ),
+            )
+        elif export_format == "xlsx":
+            chunks = iter_xlsx(
+                "Stock Ledger",
+                LEDGER_EXPORT_HEADERS,
+                (
+                    self._ledger_row_prefix(row) + self._format_xlsx_row(row)
+                    for row in rows
+                ),
+            )
+        elif export_format == "ndjson":
+            chunks = iter_ndjson(map(self._format_ledger_entry, rows))
+        else:  # json
+            chunks = iter_json_with_items(
+                {
+                    "exported_at": datetime.now().isoformat(),
+                    "total_entries": self._count_transactions(*criteria),
+                },
+                "entries",
+                map(self._format_ledger_entry, rows),
             )
 
-        # Save to bytes
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output.getvalue()
+        return chunks, EXPORT_CONTENT_TYPES[export_format], filename
+
+    def _count_transactions(self, *criteria) -> int:
+        """Count matching transactions with COUNT(*) instead of loading rows."""
+        return self.session.scalar(
+            select(func.count()).select_from(StockTransaction).where(*criteria)
+        )
 
-    def _export_to_json(
-        self, component: Component, transactions: list[StockTransaction]
-    ) -> str:
+    @staticmethod
+    def _ledger_criteria(
+        start_date: datetime | None,
+        end_date: datetime | None,
+        component_id: str | None,
+        user_id: str | None,
+        location_id: str | None,
+        lot_id: str | None,
+        transaction_type: TransactionType | None,
+    ) -> list:
         """
-        Export transactions to JSON format.
+        Translate ledger filters into WHERE criteria.
 
-        Includes component metadata and full transaction details.
+        Raises:
+            HTTPException(400): start_date is after end_date
+        """
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=400, detail="start_date must be before end_date"
+            )
 
-        Args:
-            component: Component object
-            transactions: List of StockTransaction objects
+        criteria = []
+        if start_date:
+            criteria.append(StockTransaction.created_at >= start_date)
+        if end_date:
+            criteria.append(StockTransaction.created_at < end_date)
+        if component_id:
+            criteria.append(StockTransaction.component_id == component_id)
+        if user_id:
+            criteria.append(StockTransaction.user_id == user_id)
+        if location_id:
+            criteria.append(
+                or_(
+                    StockTransaction.from_location_id == location_id,
+                    StockTransaction.to_location_id == location_id,
+                )
+            )
+        if lot_id:
+            criteria.append(StockTransaction.lot_id == lot_id)
+        if transaction_type:
+            criteria.append(StockTransaction.transaction_type == transaction_type)
+        return criteria
+
+    @staticmethod
+    def _history_order_by(sort_by: str, sort_order: Literal["asc", "desc"]) -> list:
+        """
+        Map a per-component history sort field to ORDER BY clauses.
 
-        Returns:
-            JSON string
+        Raises:
+            HTTPException(400): Invalid sort_by field
         """
-        # Build entries list
-        entries = []
-        for txn in transactions:
-            entry = {
-                "id": txn.id,
-                "created_at": txn.created_at.isoformat() if txn.created_at else None,
-                "transaction_type": txn.transaction_type.value.upper(),
-                "quantity_change": txn.quantity_change,
-                "previous_quantity": txn.previous_quantity,
-                "new_quantity": txn.new_quantity,
-                "from_location_id": txn.from_location_id,
-                "from_location_name": (
-                    txn.from_location.name if txn.from_location else None
-                ),
-                "to_location_id": txn.to_location_id,
-                "to_location_name": txn.to_location.name if txn.to_location else None,
-                "lot_id": txn.lot_id,
-                "price_per_unit": (
-                    float(txn.price_per_unit) if txn.price_per_unit else None
-                ),
-                "total_price": float(txn.total_price) if txn.total_price else None,
-                "user_id": txn.user_id,
-                "user_name": txn.user_name,
-                "reason": txn.reason,
-                "notes": txn.notes,
-            }
-            entries.append(entry)
-
-        # Build response object matching ExportResponse schema
-        response = {
-            "component_id": component.id,
-            "component_name": component.name,
-            "exported_at": datetime.now().isoformat(),
-            "total_entries": len(entries),
-            "entries": entries,
+        sort_field_map = {
+            "created_at": StockTransaction.created_at,
+            "quantity_change": StockTransaction.quantity_change,
+            "transaction_type": StockTransaction.transaction_type,
+            "user_name": StockTransaction.user_name,
+        }
+
+        if sort_by not in sort_field_map:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid sort_by field. Must be one of: {', '.join(sort_field_map.keys())}",
+            )
+
+        sort_column = sort_field_map[sort_by]
+        if sort_order == "desc":
+            return [sort_column.desc(), StockTransaction.id.desc()]
+        return [sort_column.asc(), StockTransaction.id.asc()]
+
+    @staticmethod
+    def _ledger_order_by(sort_order: Literal["asc", "desc"]) -> list:
+        """Keyset ORDER BY for the ledger: (created_at, id)."""
+        if sort_order == "desc":
+            return [StockTransaction.created_at.desc(), StockTransaction.id.desc()]
+        return [StockTransaction.created_at.asc(), StockTransaction.id.asc()]
+
+    @staticmethod
+    def _encode_cursor(row: Row) -> str:
+        """Encode the keyset position of a ledger row as an opaque cursor."""
+        payload = json.dumps([row.created_key, row.id]).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[str, str]:
+        """
+        Decode a ledger cursor back to its (created_at, id) keyset position.
+
+        Raises:
+            HTTPException(400): Malformed cursor
+        """
+        try:
+            created_key, txn_id = json.loads(base64.urlsafe_b64decode(cursor))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not isinstance(created_key, str) or not isinstance(txn_id, str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return created_key, txn_id
+
+    def _build_export_query(self, criteria: list, order_by: list) -> Select:
+        """
+        Build a column-level export query with location names joined in.
+
+        Selecting plain columns instead of ORM entities keeps rows out of the
+        session identity map, so streaming with yield_per stays constant-memory.
+        """
+        from_location = aliased(StorageLocation)
+        to_location = aliased(StorageLocation)
+
+        return (
+            select(
+                StockTransaction.id,
+                StockTransaction.component_id,
+                Component.name.label("component_name"),
+                Component.part_number.label("component_part_number"),
+                StockTransaction.created_at,
+                LEDGER_CREATED_KEY.label("created_key"),
+                StockTransaction.transaction_type,
+                StockTransaction.quantity_change,
+                StockTransaction.previous_quantity,
+                StockTransaction.new_quantity,
+                StockTransaction.from_location_id,
+                from_location.name.label("from_location_name"),
+                StockTransaction.to_location_id,
+                to_location.name.label("to_location_name"),
+                StockTransaction.lot_id,
+                StockTransaction.price_per_unit,
+                StockTransaction.total_price,
+                StockTransaction.user_id,
+                StockTransaction.user_name,
+                StockTransaction.reason,
+                StockTransaction.notes,
+            )
+            .join(Component, StockTransaction.component_id == Component.id)
+            .outerjoin(
+                from_location, StockTransaction.from_location_id == from_location.id
+            )
+            .outerjoin(to_location, StockTransaction.to_location_id == to_location.id)
+            .where(*criteria)
+            .order_by(*order_by)
+        )
+
+    def _iter_export_rows(self, query: Select) -> Iterator[Row]:
+        """Stream export rows from the database in EXPORT_YIELD_PER batches."""
+        result = self.session.execute(
+            query.execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    @staticmethod
+    def _format_csv_row(row: Row) -> list[Any]:
+        """Format an export row for CSV (FR-043 column order)."""
+        qty_change = row.quantity_change
+        return [
+            row.created_at.isoformat() if row.created_at else "",
+            row.transaction_type.value.upper(),
+            f"{'+' if qty_change > 0 else ''}{qty_change}",
+            row.previous_quantity,
+            row.new_quantity,
+            row.from_location_name or "",
+            row.to_location_name or "",
+            row.lot_id or "",
+            f"${float(row.price_per_unit):.2f}" if row.price_per_unit else "",
+            f"${float(row.total_price):.2f}" if row.total_price else "",
+            row.user_name or "",
+            row.reason or "",
+            row.notes or "",
+        ]
+
+    @staticmethod
+    def _format_xlsx_row(row: Row) -> list[Any]:
+        """Format an export row for Excel (numeric prices, FR-043 column order)."""
+        qty_change = row.quantity_change
+        return [
+            row.created_at.isoformat() if row.created_at else "",
+            row.transaction_type.value.upper(),
+            f"{'+' if qty_change > 0 else ''}{qty_change}",
+            row.previous_quantity,
+            row.new_quantity,
+            row.from_location_name or "",
+            row.to_location_name or "",
+            row.lot_id or "",
+            float(row.price_per_unit) if row.price_per_unit else "",
+            float(row.total_price) if row.total_price else "",
+            row.user_name or "",
+            row.reason or "",
+            row.notes or "",
+        ]
+
+    @staticmethod
+    def _format_json_entry(row: Row) -> dict[str, Any]:
+        """Format an export row as a JSON/NDJSON history entry."""
+        return {
+            "id": row.id,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "transaction_type": row.transaction_type.value.upper(),
+            "quantity_change": row.quantity_change,
+            "previous_quantity": row.previous_quantity,
+            "new_quantity": row.new_quantity,
+            "from_location_id": row.from_location_id,
+            "from_location_name": row.from_location_name,
+            "to_location_id": row.to_location_id,
+            "to_location_name": row.to_location_name,
+            "lot_id": row.lot_id,
+            "price_per_unit": float(row.price_per_unit) if row.price_per_unit else None,
+            "total_price": float(row.total_price) if row.total_price else None,
+            "user_id": row.user_id,
+            "user_name": row.user_name,
+            "reason": row.reason,
+            "notes": row.notes,
         }
 
-        return json.dumps(response, indent=2)
+    @classmethod
+    def _format_ledger_entry(cls, row: Row) -> dict[str, Any]:
+        """Format an export row as a ledger entry (history entry plus component)."""
+        entry = cls._format_json_entry(row)
+        entry["component_id"] = row.component_id
+        entry["component_name"] = row.component_name
+        entry["component_part_number"] = row.component_part_number
+        return entry
+
+    @staticmethod
+    def _ledger_row_prefix(row: Row) -> list[Any]:
+        """Leading component columns for tabular ledger exports."""
+        return [row.component_id, row.component_name, row.component_part_number or ""]
@@ -0,0 +1,320 @@
+"""
+Stock-take (cycle count) reconciliation.
+
+A stock-take submits counted quantities for many (location, component)
+pairs at once. Instead of one add/remove operation per bin, the counts are
+diffed against ComponentLocation in a single pass and every variance is
+applied in one database transaction:
+
+- existing entries are updated with one executemany UPDATE, so the reorder
+  alert triggers fire exactly once per changed row
+- entries counted for the first time are bulk inserted
+- entries counted as zero are deleted (FR-021, as remove_stock does)
+- one ADJUST StockTransaction per variance is bulk inserted, all sharing the
+  stock-take's batch_id
+
+Matched entries are left untouched.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..database import write_transaction
+from ..models import (
+    Component,
+    ComponentLocation,
+    ReorderAlert,
+    StockTransaction,
+    StorageLocation,
+    TransactionType,
+)
+
+logger = logging.getLogger(__name__)
+
+# IDs per IN (...) lookup and rows per executemany round trip
+STOCK_TAKE_BATCH_SIZE = 1000
+
+# Unknown IDs listed in a validation error
+MAX_REPORTED_UNKNOWN_IDS = 10
+
+
+def _chunks(items: list, size: int = STOCK_TAKE_BATCH_SIZE):
+    """Yield consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class StockTakeService:
+    """
+    Service for reconciling stock-takes against recorded inventory.
+
+    Provides methods for:
+    - Diffing counted quantities against ComponentLocation
+    - Applying all variances as one batch of adjustments
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize service with database session.
+
+        Args:
+            session: SQLAlchemy session for database operations
+        """
+        self.session = session
+
+    def reconcile(
+        self,
+        lines: list[tuple[str, str, int]],
+        user: dict,
+        complete_locations: bool = False,
+        dry_run: bool = False,
+        comments: str | None = None,
+    ) -> dict:
+        """
+        Reconcile counted quantities and apply the variances.
+
+        Args:
+            lines: (location_id, component_id, counted_quantity) tuples;
+                duplicate pairs are summed
+            user: Dict with user_id, user_name, is_admin
+            complete_locations: Adjust stock recorded at a counted location
+                but missing from the lines to zero
+            dry_run: Build the report without writing anything
+            comments: Comments recorded on every adjustment
+
+        Returns:
+            Dict containing StockTakeResponse data
+
+        Raises:
+            HTTPException(404): Unknown location or component IDs
+        """
+        if dry_run:
+            return self._reconcile(lines, user, complete_locations, True, comments)
+
+        # Read, diff and write in one transaction on a connection of its own,
+        # so stock changed by another writer meanwhile is not overwritten
+        # with the counted values
+        with write_transaction(self.session) as session:
+            return StockTakeService(session)._reconcile(
+                lines, user, complete_locations, False, comments
+            )
+
+    def _reconcile(
+        self,
+        lines: list[tuple[str, str, int]],
+        user: dict,
+        complete_locations: bool,
+        dry_run: bool,
+        comments: str | None,
+    ) -> dict:
+        """Diff the counts and, unless dry_run, write the variances."""
+        counts: dict[tuple[str, str], int] = defaultdict(int)
+        for location_id, component_id, counted in lines:
+            counts[(location_id, component_id)] += counted
+
+        location_ids = sorted({location_id for location_id, _ in counts})
+        component_ids = sorted({component_id for _, component_id in counts})
+        self._check_exist(StorageLocation, location_ids, "storage location")
+        self._check_exist(Component, component_ids, "component")
+
+        recorded = self._recorded_stock(location_ids)
+        if complete_locations:
+            for key in recorded:
+                counts.setdefault(key, 0)
+        else:
+            recorded = {key: row for key, row in recorded.items() if key in counts}
+
+        unit_costs = self._unit_costs(counts.keys(), recorded)
+
+        batch_id = str(uuid.uuid4())
+        now = datetime.now(UTC)
+        reason = comments or "Stock-take adjustment"
+
+        adjustments = []
+        updates, inserts, deletes, transactions = [], [], [], []
+        units_added = units_removed = 0
+        variance_value = Decimal("0")
+
+        for (location_id, component_id), counted in counts.items():
+            row = recorded.get((location_id, component_id))
+            previous = row.quantity_on_hand if row else 0
+            change = counted - previous
+            if change == 0:
+                continue
+
+            if row is None:
+                action = "created"
+                inserts.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "component_id": component_id,
+                        "storage_location_id": location_id,
+                        "quantity_on_hand": counted,
+                    }
+                )
+            elif counted == 0:
+                action = "removed"
+                deletes.append(row.id)
+            else:
+                action = "adjusted"
+                updates.append(
+                    {"id": row.id, "quantity_on_hand": counted, "updated_at": now}
+                )
+
+            transactions.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "component_id": component_id,
+                    "transaction_type": TransactionType.ADJUST,
+                    "quantity_change": change,
+                    "previous_quantity": previous,
+                    "new_quantity": counted,
+                    "reason": reason,
+                    "reference_id": batch_id,
+                    "reference_type": "stock_take",
+                    "from_location_id": location_id if change < 0 else None,
+                    "to_location_id": location_id if change > 0 else None,
+                    "user_id": user.get("user_id"),
+                    "user_name": user.get("user_name"),
+                    "batch_id": batch_id,
+                    "notes": comments,
+                }
+            )
+            adjustments.append(
+                {
+                    "component_id": component_id,
+                    "location_id": location_id,
+                    "previous_quantity": previous,
+                    "counted_quantity": counted,
+                    "quantity_change": change,
+                    "action": action,
+                }
+            )
+
+            if change > 0:
+                units_added += change
+            else:
+                units_removed -= change
+            variance_value += change * unit_costs[(location_id, component_id)]
+
+        if not dry_run and adjustments:
+            self._apply(updates, inserts, deletes, transactions, now)
+
+        logger.info(
+            f"Stock-take {batch_id}{' (dry run)' if dry_run else ''}: "
+            f"{len(counts)} entries counted, {len(adjustments)} adjusted"
+        )
+
+        return {
+            "batch_id": batch_id,
+            "dry_run": dry_run,
+            "total_lines": len(lines),
+            "counted_locations": len(location_ids),
+            "counted_entries": len(counts),
+            "matched": len(counts) - len(adjustments),
+            "adjusted": len(adjustments),
+            "units_added": units_added,
+            "units_removed": units_removed,
+            "net_change": units_added - units_removed,
+            "variance_value": variance_value,
+            "adjustments": adjustments,
+        }
+
+    def _check_exist(self, model, ids: list[str], label: str) -> None:
+        """Raise 404 listing IDs that have no row in model's table."""
+        found = set()
+        for chunk in _chunks(ids):
+            found.update(
+                self.session.execute(select(model.id).where(model.id.in_(chunk)))
+                .scalars()
+                .all()
+            )
+        unknown = [i for i in ids if i not in found]
+        if unknown:
+            shown = ", ".join(unknown[:MAX_REPORTED_UNKNOWN_IDS])
+            more = len(unknown) - MAX_REPORTED_UNKNOWN_IDS
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown {label} ID(s): {shown}"
+                + (f" and {more} more" if more > 0 else ""),
+            )
+
+    def _recorded_stock(self, location_ids: list[str]) -> dict:
+        """ComponentLocation rows at the counted locations, keyed by pair."""
+        recorded = {}
+        for chunk in _chunks(location_ids):
+            for row in self.session.execute(
+                select(
+                    ComponentLocation.id,
+                    ComponentLocation.component_id,
+                    ComponentLocation.storage_location_id,
+                    ComponentLocation.quantity_on_hand,
+                    ComponentLocation.unit_cost_at_location,
+                ).where(ComponentLocation.storage_location_id.in_(chunk))
+            ):
+                recorded[(row.storage_location_id, row.component_id)] = row
+        return recorded
+
+    def _unit_costs(self, keys, recorded: dict) -> dict:
+        """Unit cost per pair: location cost, else component average price."""
+        component_ids = sorted({component_id for _, component_id in keys})
+        average = {}
+        for chunk in _chunks(component_ids):
+            average.update(
+                self.session.execute(
+                    select(
+                        Component.id,
+                        func.coalesce(Component.average_purchase_price, 0),
+                    ).where(Component.id.in_(chunk))
+                ).all()
+            )
+
+        costs = {}
+        for key in keys:
+            row = recorded.get(key)
+            cost = row.unit_cost_at_location if row else None
+            costs[key] = Decimal(cost if cost is not None else average[key[1]])
+        return costs
+
+    def _apply(
+        self,
+        updates: list[dict],
+        inserts: list[dict],
+        deletes: list[str],
+        transactions: list[dict],
+        now: datetime,
+    ) -> None:
+        """Write every variance and its audit row (committed by reconcile)."""
+        for chunk in _chunks(updates):
+            self.session.execute(update(ComponentLocation), chunk)
+        for chunk in _chunks(inserts):
+            self.session.execute(insert(ComponentLocation), chunk)
+        for chunk in _chunks(deletes):
+            # Bulk deletes bypass the ORM cascade to reorder alerts
+            self.session.execute(
+                delete(ReorderAlert).where(
+                    ReorderAlert.component_location_id.in_(chunk)
+                )
+            )
+            self.session.execute(
+                delete(ComponentLocation).where(ComponentLocation.id.in_(chunk))
+            )
+        for chunk in _chunks(transactions):
+            self.session.execute(insert(StockTransaction), chunk)
+
+        touched = sorted(
+            {t["from_location_id"] or t["to_location_id"] for t in transactions}
+        )
+        for chunk in _chunks(touched):
+            self.session.execute(
+                update(StorageLocation)
+                .where(StorageLocation.id.in_(chunk))
+                .values(last_used_at=now)
+            )
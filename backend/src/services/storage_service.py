@@ -5,11 +5,20 @@ StorageLocationService with hierarchy and bulk creation operations.
 import uuid
 from typing import Any
 
-from sqlalchemy import or_
+from sqlalchemy import case, func, literal, or_, select, update
 from sqlalchemy.orm import Session, selectinload
 
 from ..constants import StorageLocationType
-from ..models import Component, ComponentLocation, StorageLocation
+from ..database.search import fts_matching_ids_query
+from ..models import (
+    Category,
+    Component,
+    ComponentLocation,
+    ComponentStockTotal,
+    StorageLocation,
+    StorageLocationClosure,
+)
+from ..models.storage_location import hierarchy_listeners_suspended
 
 
 class StorageLocationService:
@@ -146,10 +155,13 @@ class StorageLocationService:
                 if location.is_ancestor_of(parent):
                     raise ValueError("Circular reference detected")
 
-        # Update fields
-        for field, value in update_data.items():
-            if hasattr(location, field):
-                setattr(location, field, value)
+        old_hierarchy = location.location_hierarchy
+
+        # Update fields (paths are rebuilt below, so skip the per-set listeners)
+        with hierarchy_listeners_suspended(self.db):
+            for field, value in update_data.items():
+                if hasattr(location, field):
+                    setattr(location, field, value)
 
         # Rebuild hierarchy if parent or name changed
         if "parent_id" in update_data or "name" in update_data:
@@ -165,8 +177,11 @@ class StorageLocationService:
             else:
                 location.location_hierarchy = location.name
 
-            # Update all children hierarchies recursively
-            self._update_children_hierarchy(location)
+            # Rewrite all descendant paths in one statement
+            if location.location_hierarchy != old_hierarchy:
+                self._rewrite_subtree_hierarchy(
+                    location.id, old_hierarchy, location.location_hierarchy
+                )
 
         self.db.commit()
         self.db.refresh(location)
@@ -230,19 +245,139 @@ class StorageLocationService:
         )
         locations = query.all()
 
-        # Add component count if requested
+        # Add component count if requested (one grouped query for the page)
         if include_component_count:
+            counts = dict(
+                self.db.execute(
+                    select(
+                        ComponentLocation.storage_location_id,
+                        func.count(ComponentLocation.id),
+                    )
+                    .where(
+                        ComponentLocation.storage_location_id.in_(
+                            [location.id for location in locations]
+                        )
+                    )
+                    .group_by(ComponentLocation.storage_location_id)
+                ).all()
+            )
             for location in locations:
-                location.component_count = location.get_component_count()
+                location.component_count = counts.get(location.id, 0)
 
         return locations
 
+    def get_occupancy(
+        self, root_id: str | None = None, location_type: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Per-location occupancy with subtree rollups, for heatmaps.
+
+        Stock is aggregated per location once, then rolled up to every
+        ancestor through the closure table, so the whole tree is answered by
+        a single grouped query regardless of its size.
+
+        Value uses the location-specific unit cost when set, falling back to
+        the component's average purchase price. fill_ratio is the share of
+        locations in the subtree (including the location itself) that hold
+        stock.
+
+        Args:
+            root_id: Only report locations in this location's subtree
+            location_type: Only report locations of this type (rollups still
+                cover all descendants)
+
+        Returns:
+            Occupancy dicts ordered by location hierarchy
+        """
+        unit_cost = func.coalesce(
+            ComponentLocation.unit_cost_at_location,
+            Component.average_purchase_price,
+            0,
+        )
+        direct = (
+            select(
+                ComponentLocation.storage_location_id.label("location_id"),
+                func.count(ComponentLocation.id).label("part_count"),
+                func.sum(ComponentLocation.quantity_on_hand).label("quantity"),
+                func.sum(ComponentLocation.quantity_on_hand * unit_cost).label("value"),
+            )
+            .join(Component, Component.id == ComponentLocation.component_id)
+            .group_by(ComponentLocation.storage_location_id)
+            .subquery()
+        )
+
+        part_count = func.coalesce(direct.c.part_count, 0)
+        quantity = func.coalesce(direct.c.quantity, 0)
+        value = func.coalesce(direct.c.value, 0)
+        is_self = StorageLocationClosure.depth == 0
+
+        query = (
+            select(
+                StorageLocation.id,
+                StorageLocation.name,
+                StorageLocation.type,
+                StorageLocation.parent_id,
+                StorageLocation.location_hierarchy,
+                func.sum(case((is_self, part_count), else_=0)).label("part_count"),
+                func.sum(case((is_self, quantity), else_=0)).label("quantity"),
+                func.sum(case((is_self, value), else_=0)).label("value"),
+                func.sum(part_count).label("subtree_part_count"),
+                func.sum(quantity).label("subtree_quantity"),
+                func.sum(value).label("subtree_value"),
+                func.count(StorageLocationClosure.descendant_id).label(
+                    "subtree_locations"
+                ),
+                func.sum(case((quantity > 0, 1), else_=0)).label("occupied_locations"),
+            )
+            .join(
+                StorageLocationClosure,
+                StorageLocationClosure.ancestor_id == StorageLocation.id,
+            )
+            .outerjoin(
+                direct, direct.c.location_id == StorageLocationClosure.descendant_id
+            )
+            .group_by(StorageLocation.id)
+            .order_by(StorageLocation.location_hierarchy)
+        )
+
+        if root_id:
+            query = query.where(
+                StorageLocation.id.in_(
+                    select(StorageLocationClosure.descendant_id).where(
+                        StorageLocationClosure.ancestor_id == root_id
+                    )
+                )
+            )
+        if location_type:
+            query = query.where(StorageLocation.type == location_type)
+
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "type": row.type,
+                "parent_id": row.parent_id,
+                "location_hierarchy": row.location_hierarchy,
+                "part_count": row.part_count,
+                "total_quantity": row.quantity,
+                "total_value": round(float(row.value), 2),
+                "subtree_part_count": row.subtree_part_count,
+                "subtree_quantity": row.subtree_quantity,
+                "subtree_value": round(float(row.subtree_value), 2),
+                "subtree_locations": row.subtree_locations,
+                "occupied_locations": row.occupied_locations,
+                "fill_ratio": round(row.occupied_locations / row.subtree_locations, 4),
+            }
+            for row in self.db.execute(query)
+        ]
+
     def get_location_components(
         self,
         location_id: str,
         include_children: bool = False,
         search: str | None = None,
         category: str | None = None,
+        category_id: str | None = None,
         component_type: str | None = None,
         stock_status: str | None = None,
         sort_by: str = "name",
@@ -250,153 +385,82 @@ class StorageLocationService:
         limit: int = 50,
         offset: int = 0,
     ) -> list[Component]:
-        """Get components in a storage location."""
-        from .component_service import ComponentService
-
-        ComponentService(self.db)
-
-        from ..models import ComponentLocation
-
+        """
+        Get components stored in a location (or its whole subtree).
+
+        Runs as a single statement: membership is a semi-join on
+        component_locations (the subtree comes from the closure table, so a
+        component stored in several child bins is listed once), search uses
+        the FTS index, and stock status filtering and quantity sorting read
+        the trigger-maintained component_stock_totals instead of summing
+        component_locations per row.
+        """
         if include_children:
-            # Get location and all its descendants
-            location = (
-                self.db.query(StorageLocation)
-                .filter(StorageLocation.id == location_id)
-                .first()
-            )
-            if not location:
-                return []
-
-            descendant_locations = location.get_all_descendants()
-            location_ids = [location.id] + [loc.id for loc in descendant_locations]
-
-            # Filter components by multiple locations via ComponentLocation
-            query = (
-                self.db.query(Component)
-                .options(
-                    selectinload(Component.category),
-                    selectinload(Component.locations),
-                    selectinload(Component.tags),
+            in_location = ComponentLocation.storage_location_id.in_(
+                select(StorageLocationClosure.descendant_id).where(
+                    StorageLocationClosure.ancestor_id == location_id
                 )
-                .join(ComponentLocation)
-                .filter(ComponentLocation.storage_location_id.in_(location_ids))
             )
         else:
-            # Just this location
-            query = (
-                self.db.query(Component)
-                .options(
-                    selectinload(Component.category),
-                    selectinload(Component.locations),
-                    selectinload(Component.tags),
+            in_location = ComponentLocation.storage_location_id == location_id
+
+        query = (
+            self.db.query(Component)
+            .options(
+                selectinload(Component.category),
+                selectinload(Component.locations).selectinload(
+                    ComponentLocation.storage_location
+                ),
+                selectinload(Component.tags),
+            )
+            # Every component stored somewhere has a totals row
+            .join(
+                ComponentStockTotal,
+                ComponentStockTotal.component_id == Component.id,
+            )
+            .filter(
+                Component.id.in_(
+                    select(ComponentLocation.component_id).where(in_location)
                 )
-                .join(ComponentLocation)
-                .filter(ComponentLocation.storage_location_id == location_id)
             )
+        )
 
-        # Apply additional filters (reuse logic from ComponentService)
-        if search:
-            search_term = f"%{search}%"
+        if search and search.strip():
             query = query.filter(
-                or_(
-                    Component.name.ilike(search_term),
-                    Component.part_number.ilike(search_term),
-                    Component.manufacturer.ilike(search_term),
-                )
+                Component.id.in_(fts_matching_ids_query(search, self.db))
             )
 
         if category:
-            from ..models import Category
+            # Name match is resolved against the (small) categories table
+            query = query.filter(
+                Component.category_id.in_(
+                    select(Category.id).where(Category.name.ilike(f"%{category}%"))
+                )
+            )
 
-            query = query.join(Category).filter(Category.name.ilike(f"%{category}%"))
+        if category_id:
+            query = query.filter(Component.category_id == category_id)
 
         if component_type:
             query = query.filter(Component.component_type.ilike(f"%{component_type}%"))
 
-        if stock_status:
-            from sqlalchemy import and_, func
-
-            # Apply the same multi-location stock filtering logic as ComponentService
-            if stock_status == "out":
-                # Components with zero total quantity across all locations
-                quantity_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.quantity_on_hand), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                query = query.filter(quantity_subquery == 0)
-            elif stock_status == "low":
-                # Components with quantity > 0 but <= total minimum stock across all locations
-                quantity_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.quantity_on_hand), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                min_stock_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.minimum_stock), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                query = query.filter(
-                    and_(
-                        quantity_subquery > 0,
-                        quantity_subquery <= min_stock_subquery,
-                        min_stock_subquery > 0,
-                    )
-                )
-            elif stock_status == "available":
-                # Components with quantity > total minimum stock across all locations
-                quantity_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.quantity_on_hand), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                min_stock_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.minimum_stock), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                query = query.filter(quantity_subquery > min_stock_subquery)
+        quantity = ComponentStockTotal.quantity_on_hand
+        minimum_stock = ComponentStockTotal.minimum_stock
+        if stock_status == "out":
+            query = query.filter(quantity == 0)
+        elif stock_status == "low":
+            query = query.filter(
+                quantity > 0, quantity <= minimum_stock, minimum_stock > 0
+            )
+        elif stock_status == "available":
+            query = query.filter(quantity > minimum_stock)
 
-        # Apply sorting
+        sort_key = quantity if sort_by == "quantity" else Component.name
         if sort_order.lower() == "desc":
-            if sort_by == "name":
-                query = query.order_by(Component.name.desc())
-            elif sort_by == "quantity":
-                # For multi-location model, we need to sort by calculated total quantity
-                quantity_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.quantity_on_hand), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                query = query.order_by(quantity_subquery.desc())
-        else:
-            if sort_by == "name":
-                query = query.order_by(Component.name)
-            elif sort_by == "quantity":
-                # For multi-location model, we need to sort by calculated total quantity
-                quantity_subquery = (
-                    self.db.query(
-                        func.coalesce(func.sum(ComponentLocation.quantity_on_hand), 0)
-                    )
-                    .filter(ComponentLocation.component_id == Component.id)
-                    .scalar_subquery()
-                )
-                query = query.order_by(quantity_subquery)
+            sort_key = sort_key.desc()
+        # Component.id keeps pages stable when sort keys tie
+        query = query.order_by(sort_key, Component.id)
 
-        # Apply pagination
         return query.offset(offset).limit(limit).all()
 
     def bulk_create_locations(
@@ -439,22 +503,26 @@ class StorageLocationService:
             self.db.flush()  # Get IDs but don't commit yet
 
             # Second pass: resolve parent relationships and update hierarchies
-            for i, loc_data in enumerate(locations_data):
-                location = created_locations[i]
-
-                # Handle parent_name reference
-                if "parent_name" in loc_data:
-                    parent_name = loc_data["parent_name"]
-                    if parent_name is None:
-                        continue  # Skip if parent_name is explicitly None
-                    if parent_name in location_map:
-                        parent = location_map[parent_name]
-                        location.parent_id = parent.id
-                        location.location_hierarchy = (
-                            f"{parent.location_hierarchy}/{location.name}"
-                        )
-                    else:
-                        raise ValueError(f"Parent location not found: {parent_name}")
+            # Paths are set explicitly, so skip the per-set listeners
+            with hierarchy_listeners_suspended(self.db):
+                for i, loc_data in enumerate(locations_data):
+                    location = created_locations[i]
+
+                    # Handle parent_name reference
+                    if "parent_name" in loc_data:
+                        parent_name = loc_data["parent_name"]
+                        if parent_name is None:
+                            continue  # Skip if parent_name is explicitly None
+                        if parent_name in location_map:
+                            parent = location_map[parent_name]
+                            location.parent_id = parent.id
+                            location.location_hierarchy = (
+                                f"{parent.location_hierarchy}/{location.name}"
+                            )
+                        else:
+                            raise ValueError(
+                                f"Parent location not found: {parent_name}"
+                            )
 
             # Check for circular references
             for location in created_locations:
@@ -473,13 +541,39 @@ class StorageLocationService:
             self.db.rollback()
             raise e
 
-    def _update_children_hierarchy(self, parent_location: StorageLocation):
-        """Recursively update hierarchy paths for all children."""
-        for child in parent_location.children:
-            child.location_hierarchy = (
-                f"{parent_location.location_hierarchy}/{child.name}"
+    def _rewrite_subtree_hierarchy(
+        self, location_id: str, old_prefix: str, new_prefix: str
+    ) -> int:
+        """
+        Replace the path prefix of every descendant with a single UPDATE.
+
+        Descendants are selected through the closure table, and each path is
+        rewritten as new_prefix || substr(path, len(old_prefix) + 1), so the
+        cost is one statement regardless of subtree size or depth.
+
+        Args:
+            location_id: Root of the subtree (its own path is set by the caller)
+            old_prefix: Previous location_hierarchy of the root
+            new_prefix: New location_hierarchy of the root
+
+        Returns:
+            Number of descendant rows updated
+        """
+        descendant_ids = select(StorageLocationClosure.descendant_id).where(
+            StorageLocationClosure.ancestor_id == location_id,
+            StorageLocationClosure.depth > 0,
+        )
+        result = self.db.execute(
+            update(StorageLocation)
+            .where(StorageLocation.id.in_(descendant_ids))
+            .values(
+                location_hierarchy=literal(new_prefix)
+                + func.substr(StorageLocation.location_hierarchy, len(old_prefix) + 1),
+                updated_at=func.now(),
             )
-            self._update_children_hierarchy(child)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     def _check_circular_reference(
         self, location: StorageLocation, location_map: dict[str, StorageLocation]
@@ -11,6 +11,7 @@ import logging
 from sqlalchemy.orm import Session
 
 from ..models.wizard_provider import Provider
+from .provider_cache import cached_lookup, get_provider_cache
 
 logger = logging.getLogger(__name__)
 
@@ -126,9 +127,16 @@ class WizardProviderService:
         # Instantiate adapter
         adapter = WizardProviderService._instantiate_adapter(provider)
 
-        # Execute search
+        # Execute search (repeat lookups are served from the response cache)
         try:
-            results = await adapter.search(query, limit)
+            results = await cached_lookup(
+                get_provider_cache(),
+                provider.adapter_class,
+                "search",
+                query,
+                lambda: adapter.search(query, limit),
+                {"limit": limit},
+            )
 
             return {
                 "provider_id": provider.id,
@@ -163,7 +171,13 @@ class WizardProviderService:
         provider = await WizardProviderService.get_provider(db, provider_id)
         adapter = WizardProviderService._instantiate_adapter(provider)
 
-        return await adapter.get_part_details(part_number)
+        return await cached_lookup(
+            get_provider_cache(),
+            provider.adapter_class,
+            "details",
+            part_number,
+            lambda: adapter.get_part_details(part_number),
+        )
 
     @staticmethod
     async def get_part_resources(
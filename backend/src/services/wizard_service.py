@@ -8,7 +8,6 @@ manufacturer/footprint creation, provider linking, and resource downloads.
 import logging
 import re
 
-from fastapi import BackgroundTasks
 from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -93,7 +92,6 @@ class WizardService:
     async def create_component(
         db: Session,
         data: dict,
-        background_tasks: BackgroundTasks | None = None,
     ) -> Component:
         """
         Create a component with optional provider link and resources.
@@ -118,7 +116,6 @@ class WizardService:
                     - url: Resource URL
                     - file_name: Filename
                 - specifications (optional): Component specifications
-            background_tasks: FastAPI background tasks for async downloads
 
         Returns:
             Created Component with relationships loaded
@@ -213,28 +210,9 @@ class WizardService:
                         db.add(resource)
                         db.flush()  # Get resource ID
 
-                        # Download critical resources synchronously (datasheets)
-                        if resource_data["type"] == "datasheet":
-                            try:
-                                await ResourceService.download_resource_sync(
-                                    db, resource.id
-                                )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to download datasheet synchronously: {str(e)}"
-                                )
-                                # Continue - background task will retry
-
-                        # Queue non-critical resources for background download
-                        if background_tasks and resource_data["type"] in [
-                            "image",
-                            "footprint",
-                            "symbol",
-                            "model_3d",
-                        ]:
-                            background_tasks.add_task(
-                                ResourceService.download_resource_async, resource.id
-                            )
+                        # Queue the download; it runs once the component
+                        # is committed (datasheets first)
+                        ResourceService.queue_download(db, resource)
 
             # Commit transaction
             db.commit()
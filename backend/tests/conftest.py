@@ -23,6 +23,10 @@ os.environ[
     "DATABASE_URL"
 ] = "sqlite:///:memory:"  # Use in-memory database for complete isolation
 os.environ["PORT"] = "8005"  # Use different port for tests (production uses 8000)
+# Provider lookups must not be served from (or written to) a shared cache
+os.environ["PROVIDER_CACHE_ENABLED"] = "0"
+# Queued downloads and conversions are run explicitly by the tests that need them
+os.environ["JOB_QUEUE_WORKERS"] = "0"
 
 # Test database URL - in-memory database for complete isolation
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -0,0 +1,95 @@
+"""
+Contract test for location label sheets
+GET /api/v1/storage-locations/{id}/labels and POST /api/v1/storage-locations/labels
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest.importorskip("qrcode")
+
+
+@pytest.fixture(autouse=True)
+def label_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("LABEL_CACHE_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def layout_request(client: TestClient, auth_headers):
+    """Create a shelf with a row of six generated bins."""
+    response = client.post(
+        "/api/v1/storage-locations",
+        json={"name": "label-shelf", "type": "shelf"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    shelf_id = response.json()["id"]
+
+    config = {
+        "layout_type": "row",
+        "prefix": "label-bin-",
+        "ranges": [{"range_type": "numbers", "start": 1, "end": 6}],
+        "separators": [],
+        "location_type": "bin",
+        "parent_id": shelf_id,
+    }
+    response = client.post(
+        "/api/v1/storage-locations/bulk-create-layout",
+        json=config,
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    return {"shelf_id": shelf_id, "config": config}
+
+
+@pytest.mark.contract
+class TestLocationLabelsContract:
+    """Contract tests for label sheet endpoints"""
+
+    def test_labels_require_authentication(self, client: TestClient, layout_request):
+        response = client.get(
+            f"/api/v1/storage-locations/{layout_request['shelf_id']}/labels"
+        )
+        assert response.status_code == 401
+
+    def test_subtree_label_pdf(self, client: TestClient, auth_headers, layout_request):
+        response = client.get(
+            f"/api/v1/storage-locations/{layout_request['shelf_id']}/labels",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/pdf"
+        assert response.headers["x-total-pages"] == "1"
+        assert response.headers["x-label-count"] == "7"
+        assert response.content.startswith(b"%PDF")
+
+    def test_layout_label_png(self, client: TestClient, auth_headers, layout_request):
+        response = client.post(
+            "/api/v1/storage-locations/labels?format=png",
+            json=layout_request["config"],
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["x-label-count"] == "6"
+
+    def test_label_errors(self, client: TestClient, auth_headers, layout_request):
+        response = client.get(
+            "/api/v1/storage-locations/00000000-0000-0000-0000-000000000000/labels",
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
+        response = client.post(
+            "/api/v1/storage-locations/labels",
+            json={**layout_request["config"], "prefix": "missing-bin-"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+        response = client.get(
+            f"/api/v1/storage-locations/{layout_request['shelf_id']}/labels"
+            "?format=png&page=2",
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
@@ -427,3 +427,46 @@ class TestGeneratePreviewContract:
 
         # Should return 400 (Bad Request) for malformed JSON
         assert response.status_code == 400
+
+    def test_preview_names_page(self, client: TestClient):
+        """
+        Paginated preview: any page is computed by position, even for
+        layouts far beyond the creation limit
+        """
+        payload = {
+            "layout_type": "grid_3d",
+            "prefix": "wh-",
+            "ranges": [
+                {"range_type": "letters", "start": "a", "end": "z"},
+                {"range_type": "numbers", "start": 0, "end": 199},
+                {"range_type": "numbers", "start": 0, "end": 199, "zero_pad": True},
+            ],
+            "separators": ["-", "-"],
+            "location_type": "bin",
+            "single_part_only": False,
+        }
+
+        response = client.post(
+            "/api/v1/storage-locations/generate-preview/names?offset=200&limit=3",
+            json=payload,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["names"] == ["wh-a-1-000", "wh-a-1-001", "wh-a-1-002"]
+        assert data["total_count"] == 1_040_000
+        assert data["has_more"] is True
+
+        response = client.post(
+            "/api/v1/storage-locations/generate-preview/names"
+            "?offset=1039999&limit=10",
+            json=payload,
+        )
+        data = response.json()
+        assert data["names"] == ["wh-z-199-199"]
+        assert data["has_more"] is False
+
+        response = client.post(
+            "/api/v1/storage-locations/generate-preview/names?limit=5000",
+            json=payload,
+        )
+        assert response.status_code == 422
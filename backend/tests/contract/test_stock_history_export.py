@@ -5,6 +5,7 @@ Tests stock history export endpoint according to OpenAPI specification (stock-hi
 This test MUST FAIL initially - endpoint has not been implemented yet (TDD red phase)
 """
 
+import json
 
 import pytest
 from fastapi.testclient import TestClient
@@ -237,6 +238,59 @@ class TestStockHistoryExportContract:
         assert "quantity_change" in entry
         assert "new_quantity" in entry
 
+    def test_export_ndjson_format_success(
+        self,
+        client: TestClient,
+        db_session: Session,
+        auth_headers,
+        sample_component_data,
+        sample_storage_location_data,
+    ):
+        """Test NDJSON export streams one history entry per line"""
+        # Setup
+        component_resp = client.post(
+            "/api/v1/components", json=sample_component_data, headers=auth_headers
+        )
+        component_id = component_resp.json()["id"]
+
+        location_resp = client.post(
+            "/api/v1/storage-locations",
+            json=sample_storage_location_data,
+            headers=auth_headers,
+        )
+        location_id = location_resp.json()["id"]
+
+        # Create transactions
+        for i in range(3):
+            client.post(
+                f"/api/v1/components/{component_id}/stock/add",
+                json={
+                    "location_id": location_id,
+                    "quantity": 10,
+                    "lot_id": f"LOT-NDJSON-{i+1}",
+                },
+                headers=auth_headers,
+            )
+
+        # Test: Export as NDJSON
+        response = client.get(
+            f"/api/v1/components/{component_id}/stock/history/export?format=ndjson",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert ".ndjson" in response.headers["content-disposition"]
+
+        entries = [json.loads(line) for line in response.text.splitlines()]
+        assert len(entries) == 3
+        assert {entry["lot_id"] for entry in entries} == {
+            "LOT-NDJSON-1",
+            "LOT-NDJSON-2",
+            "LOT-NDJSON-3",
+        }
+        assert all(entry["to_location_name"] for entry in entries)
+
     def test_export_all_entries_no_pagination(
         self,
         client: TestClient,
@@ -0,0 +1,217 @@
+"""
+Contract test for GET /api/v1/stock/ledger and /api/v1/stock/ledger/export
+Tests the inventory-wide stock ledger: filters, keyset pagination and streaming export
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def ledger_setup(client: TestClient, auth_headers, sample_component_data):
+    """Create two components with stock transactions in one location."""
+    location_resp = client.post(
+        "/api/v1/storage-locations",
+        json={"name": "ledger-drawer", "type": "drawer"},
+        headers=auth_headers,
+    )
+    assert location_resp.status_code == 201
+    location_id = location_resp.json()["id"]
+
+    component_ids = []
+    for suffix in ("A", "B"):
+        component_resp = client.post(
+            "/api/v1/components",
+            json={
+                **sample_component_data,
+                "name": f"Ledger part {suffix}",
+                "part_number": f"LEDGER-{suffix}",
+            },
+            headers=auth_headers,
+        )
+        assert component_resp.status_code == 201
+        component_ids.append(component_resp.json()["id"])
+
+    # Component A: 4 adds (lots LOT-A-1..4); component B: 3 adds + 1 remove
+    for i in range(4):
+        resp = client.post(
+            f"/api/v1/components/{component_ids[0]}/stock/add",
+            json={"location_id": location_id, "quantity": 10, "lot_id": f"LOT-A-{i+1}"},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+    for _ in range(3):
+        resp = client.post(
+            f"/api/v1/components/{component_ids[1]}/stock/add",
+            json={"location_id": location_id, "quantity": 5},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+    resp = client.post(
+        f"/api/v1/components/{component_ids[1]}/stock/remove",
+        json={"location_id": location_id, "quantity": 2},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+
+    return {"location_id": location_id, "component_ids": component_ids}
+
+
+@pytest.mark.contract
+class TestStockLedgerContract:
+    """Contract tests for the inventory-wide stock ledger endpoints"""
+
+    def test_ledger_requires_authentication(self, client: TestClient):
+        """Ledger listing requires authentication"""
+        response = client.get("/api/v1/stock/ledger")
+        assert response.status_code == 401
+
+    def test_ledger_returns_all_components(
+        self, client: TestClient, db_session: Session, auth_headers, ledger_setup
+    ):
+        """Unfiltered ledger spans every component, newest first"""
+        response = client.get(
+            "/api/v1/stock/ledger?include_total=true", headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_entries"] == 8
+        assert len(data["entries"]) == 8
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+        assert {e["component_id"] for e in data["entries"]} == set(
+            ledger_setup["component_ids"]
+        )
+        timestamps = [e["created_at"] for e in data["entries"]]
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert {e["component_name"] for e in data["entries"]} == {
+            "Ledger part A",
+            "Ledger part B",
+        }
+
+    def test_ledger_keyset_pagination_visits_every_entry_once(
+        self, client: TestClient, db_session: Session, auth_headers, ledger_setup
+    ):
+        """Walking next_cursor returns each entry exactly once"""
+        for sort_order in ("desc", "asc"):
+            seen = []
+            cursor = None
+            pages = 0
+            while True:
+                url = f"/api/v1/stock/ledger?limit=3&sort_order={sort_order}"
+                if cursor:
+                    url += f"&cursor={cursor}"
+                response = client.get(url, headers=auth_headers)
+                assert response.status_code == 200
+                data = response.json()
+                assert "total_entries" not in data
+                seen.extend(e["id"] for e in data["entries"])
+                pages += 1
+                if not data["has_more"]:
+                    break
+                cursor = data["next_cursor"]
+
+            assert pages == 3
+            assert len(seen) == 8
+            assert len(set(seen)) == 8
+
+    def test_ledger_filters(
+        self, client: TestClient, db_session: Session, auth_headers, ledger_setup
+    ):
+        """Component, lot, type and location filters narrow the ledger"""
+        component_a, component_b = ledger_setup["component_ids"]
+
+        response = client.get(
+            f"/api/v1/stock/ledger?component_id={component_a}&include_total=true",
+            headers=auth_headers,
+        )
+        assert response.json()["total_entries"] == 4
+
+        response = client.get(
+            "/api/v1/stock/ledger?lot_id=LOT-A-2", headers=auth_headers
+        )
+        entries = response.json()["entries"]
+        assert len(entries) == 1
+        assert entries[0]["lot_id"] == "LOT-A-2"
+
+        response = client.get(
+            "/api/v1/stock/ledger?transaction_type=remove", headers=auth_headers
+        )
+        entries = response.json()["entries"]
+        assert len(entries) == 1
+        assert entries[0]["component_id"] == component_b
+
+        response = client.get(
+            f"/api/v1/stock/ledger?location_id={ledger_setup['location_id']}"
+            "&include_total=true",
+            headers=auth_headers,
+        )
+        assert response.json()["total_entries"] == 8
+
+        response = client.get(
+            "/api/v1/stock/ledger?start_date=2000-01-01T00:00:00"
+            "&end_date=2000-12-31T00:00:00",
+            headers=auth_headers,
+        )
+        assert response.json()["entries"] == []
+
+    def test_ledger_rejects_invalid_cursor_and_range(
+        self, client: TestClient, db_session: Session, auth_headers
+    ):
+        """Malformed cursors and inverted date ranges are 400s"""
+        response = client.get(
+            "/api/v1/stock/ledger?cursor=not-a-cursor", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+        response = client.get(
+            "/api/v1/stock/ledger?start_date=2025-02-01T00:00:00"
+            "&end_date=2025-01-01T00:00:00",
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+    def test_ledger_export_requires_admin(
+        self, client: TestClient, db_session: Session, user_auth_headers
+    ):
+        """Ledger export is admin-only"""
+        response = client.get(
+            "/api/v1/stock/ledger/export?format=csv", headers=user_auth_headers
+        )
+        assert response.status_code == 403
+
+    def test_ledger_export_streams_filtered_entries(
+        self, client: TestClient, db_session: Session, auth_headers, ledger_setup
+    ):
+        """CSV, NDJSON and JSON exports honour ledger filters"""
+        component_b = ledger_setup["component_ids"][1]
+
+        response = client.get(
+            f"/api/v1/stock/ledger/export?format=ndjson&component_id={component_b}",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        entries = [json.loads(line) for line in response.text.splitlines()]
+        assert len(entries) == 4
+        assert all(e["component_part_number"] == "LEDGER-B" for e in entries)
+
+        response = client.get(
+            "/api/v1/stock/ledger/export?format=csv", headers=auth_headers
+        )
+        assert response.status_code == 200
+        lines = response.text.strip().split("\n")
+        assert lines[0].startswith("Component ID,Component,Part Number,Date,Type")
+        assert len(lines) == 9
+
+        response = client.get(
+            "/api/v1/stock/ledger/export?format=json&lot_id=LOT-A-1",
+            headers=auth_headers,
+        )
+        data = response.json()
+        assert data["total_entries"] == 1
+        assert data["entries"][0]["lot_id"] == "LOT-A-1"
@@ -0,0 +1,228 @@
+"""
+Contract test for POST /api/v1/stock/stock-take
+Tests batch reconciliation of counted quantities against recorded stock
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.src.models import ComponentLocation, ReorderAlert, StockTransaction
+
+
+@pytest.fixture
+def count_setup(client: TestClient, auth_headers, sample_component_data):
+    """Two bins; part A in both (50 + 20), part B in bin 1 (10)."""
+    location_ids = []
+    for name in ("count-bin-1", "count-bin-2"):
+        response = client.post(
+            "/api/v1/storage-locations",
+            json={"name": name, "type": "bin"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        location_ids.append(response.json()["id"])
+
+    component_ids = []
+    for suffix in ("A", "B", "C"):
+        response = client.post(
+            "/api/v1/components",
+            json={
+                **sample_component_data,
+                "name": f"Count part {suffix}",
+                "part_number": f"COUNT-{suffix}",
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        component_ids.append(response.json()["id"])
+
+    for component_id, location_id, quantity in [
+        (component_ids[0], location_ids[0], 50),
+        (component_ids[0], location_ids[1], 20),
+        (component_ids[1], location_ids[0], 10),
+    ]:
+        response = client.post(
+            f"/api/v1/components/{component_id}/stock/add",
+            json={
+                "location_id": location_id,
+                "quantity": quantity,
+                "price_per_unit": 2.0,
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    return {"locations": location_ids, "components": component_ids}
+
+
+def _line(location_id, component_id, quantity):
+    return {
+        "location_id": location_id,
+        "component_id": component_id,
+        "counted_quantity": quantity,
+    }
+
+
+@pytest.mark.contract
+class TestStockTakeContract:
+    """Contract tests for stock-take reconciliation"""
+
+    def test_stock_take_requires_admin(
+        self, client: TestClient, user_auth_headers, count_setup
+    ):
+        response = client.post(
+            "/api/v1/stock/stock-take",
+            json={"lines": [_line(count_setup["locations"][0], "x", 1)]},
+            headers=user_auth_headers,
+        )
+        assert response.status_code == 403
+
+    def test_stock_take_reconciles_in_one_batch(
+        self, client: TestClient, db_session: Session, auth_headers, count_setup
+    ):
+        """Variances become ADJUST transactions sharing one batch_id"""
+        bin_1, bin_2 = count_setup["locations"]
+        part_a, part_b, part_c = count_setup["components"]
+
+        response = client.post(
+            "/api/v1/stock/stock-take",
+            json={
+                "lines": [
+                    _line(bin_1, part_a, 30),
+                    _line(bin_1, part_a, 15),  # second count sheet, summed
+                    _line(bin_2, part_a, 20),  # matches
+                    _line(bin_1, part_b, 0),  # counted empty
+                    _line(bin_2, part_c, 7),  # found stock
+                ],
+                "comments": "Aisle 1 cycle count",
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        report = response.json()
+        assert report["dry_run"] is False
+        assert report["total_lines"] == 5
+        assert report["counted_entries"] == 4
+        assert report["matched"] == 1
+        assert report["adjusted"] == 3
+        assert report["units_added"] == 7
+        assert report["units_removed"] == 15
+        assert report["net_change"] == -8
+        # bin 1 has a unit cost of 2.00 for A and B; C has no cost
+        assert float(report["variance_value"]) == -30.0
+
+        actions = {
+            (a["location_id"], a["component_id"]): (a["action"], a["quantity_change"])
+            for a in report["adjustments"]
+        }
+        assert actions == {
+            (bin_1, part_a): ("adjusted", -5),
+            (bin_1, part_b): ("removed", -10),
+            (bin_2, part_c): ("created", 7),
+        }
+
+        db_session.expire_all()
+        stock = {
+            (row.storage_location_id, row.component_id): row.quantity_on_hand
+            for row in db_session.query(ComponentLocation)
+        }
+        assert stock == {(bin_1, part_a): 45, (bin_2, part_a): 20, (bin_2, part_c): 7}
+
+        transactions = (
+            db_session.query(StockTransaction)
+            .filter(StockTransaction.batch_id == report["batch_id"])
+            .all()
+        )
+        assert len(transactions) == 3
+        assert {t.transaction_type.value for t in transactions} == {"adjust"}
+        assert {t.notes for t in transactions} == {"Aisle 1 cycle count"}
+
+    def test_dry_run_and_complete_locations(
+        self, client: TestClient, db_session: Session, auth_headers, count_setup
+    ):
+        """complete_locations zeroes uncounted stock; dry_run writes nothing"""
+        bin_1, _ = count_setup["locations"]
+        part_a, part_b, _ = count_setup["components"]
+
+        response = client.post(
+            "/api/v1/stock/stock-take",
+            json={
+                "lines": [_line(bin_1, part_a, 50)],
+                "complete_locations": True,
+                "dry_run": True,
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["dry_run"] is True
+        assert report["counted_entries"] == 2
+        assert [(a["component_id"], a["action"]) for a in report["adjustments"]] == [
+            (part_b, "removed")
+        ]
+
+        db_session.expire_all()
+        assert db_session.query(ComponentLocation).count() == 3
+        assert (
+            db_session.query(StockTransaction)
+            .filter(StockTransaction.batch_id == report["batch_id"])
+            .count()
+            == 0
+        )
+
+    def test_reorder_trigger_fires_once(
+        self, client: TestClient, db_session: Session, auth_headers, count_setup
+    ):
+        """A count below the reorder threshold raises a single alert"""
+        bin_1, _ = count_setup["locations"]
+        part_a = count_setup["components"][0]
+
+        response = client.put(
+            f"/api/v1/reorder-alerts/thresholds/{part_a}/{bin_1}",
+            json={"threshold": 40, "enabled": True},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        response = client.post(
+            "/api/v1/stock/stock-take",
+            json={"lines": [_line(bin_1, part_a, 12), _line(bin_1, part_a, 13)]},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        db_session.expire_all()
+        alerts = db_session.query(ReorderAlert).filter_by(component_id=part_a).all()
+        assert len(alerts) == 1
+        assert alerts[0].status == "active"
+        assert alerts[0].current_quantity == 25
+
+    def test_unknown_ids_rejected(
+        self, client: TestClient, db_session: Session, auth_headers, count_setup
+    ):
+        """Unknown components fail the whole count"""
+        bin_1 = count_setup["locations"][0]
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        response = client.post(
+            "/api/v1/stock/stock-take",
+            json={
+                "lines": [
+                    _line(bin_1, count_setup["components"][0], 1),
+                    _line(bin_1, missing, 1),
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+        assert missing in response.json()["detail"]
+
+        db_session.expire_all()
+        assert (
+            db_session.query(StockTransaction)
+            .filter(StockTransaction.batch_id.is_not(None))
+            .count()
+            == 0
+        )
@@ -0,0 +1,148 @@
+"""
+Contract test for GET /api/v1/storage-locations/occupancy
+Tests the occupancy heatmap: per-location aggregates, subtree rollups and ETags
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def occupancy_setup(client: TestClient, auth_headers, sample_component_data):
+    """cabinet > drawer-1 > (bin-a, bin-b), cabinet > drawer-2; stock in bin-a/b."""
+    ids = {}
+    for name, type_, parent in [
+        ("occ-cabinet", "cabinet", None),
+        ("occ-drawer-1", "drawer", "occ-cabinet"),
+        ("occ-drawer-2", "drawer", "occ-cabinet"),
+        ("occ-bin-a", "bin", "occ-drawer-1"),
+        ("occ-bin-b", "bin", "occ-drawer-1"),
+    ]:
+        payload = {"name": name, "type": type_}
+        if parent:
+            payload["parent_id"] = ids[parent]
+        resp = client.post(
+            "/api/v1/storage-locations", json=payload, headers=auth_headers
+        )
+        assert resp.status_code == 201
+        ids[name] = resp.json()["id"]
+
+    component_ids = []
+    for suffix in ("A", "B"):
+        resp = client.post(
+            "/api/v1/components",
+            json={
+                **sample_component_data,
+                "name": f"Occupancy part {suffix}",
+                "part_number": f"OCC-{suffix}",
+            },
+            headers=auth_headers,
+        )
+        assert resp.status_code == 201
+        component_ids.append(resp.json()["id"])
+
+    for component_id, location, quantity in [
+        (component_ids[0], "occ-bin-a", 10),
+        (component_ids[1], "occ-bin-a", 5),
+        (component_ids[1], "occ-bin-b", 20),
+    ]:
+        resp = client.post(
+            f"/api/v1/components/{component_id}/stock/add",
+            json={
+                "location_id": ids[location],
+                "quantity": quantity,
+                "price_per_unit": 0.5,
+            },
+            headers=auth_headers,
+        )
+        assert resp.status_code == 200
+
+    return ids
+
+
+@pytest.mark.contract
+class TestStorageOccupancyContract:
+    """Contract tests for the storage occupancy heatmap endpoint"""
+
+    def test_occupancy_rolls_up_subtrees(self, client: TestClient, occupancy_setup):
+        """Direct figures per location, subtree figures rolled up to ancestors"""
+        response = client.get("/api/v1/storage-locations/occupancy")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_locations"] == 5
+        by_name = {loc["name"]: loc for loc in data["locations"]}
+
+        bin_a = by_name["occ-bin-a"]
+        assert bin_a["part_count"] == 2
+        assert bin_a["total_quantity"] == 15
+        assert bin_a["total_value"] == pytest.approx(7.5)
+        assert bin_a["fill_ratio"] == 1.0
+
+        drawer = by_name["occ-drawer-1"]
+        assert drawer["part_count"] == 0
+        assert drawer["total_quantity"] == 0
+        assert drawer["subtree_part_count"] == 3
+        assert drawer["subtree_quantity"] == 35
+        assert drawer["subtree_value"] == pytest.approx(17.5)
+        assert drawer["subtree_locations"] == 3
+        assert drawer["occupied_locations"] == 2
+
+        cabinet = by_name["occ-cabinet"]
+        assert cabinet["subtree_quantity"] == 35
+        assert cabinet["subtree_locations"] == 5
+        assert cabinet["fill_ratio"] == pytest.approx(0.4)
+
+        assert by_name["occ-drawer-2"]["fill_ratio"] == 0.0
+
+    def test_occupancy_filters(self, client: TestClient, occupancy_setup):
+        """root_id limits to a subtree; type filters rows but not rollups"""
+        response = client.get(
+            "/api/v1/storage-locations/occupancy"
+            f"?root_id={occupancy_setup['occ-drawer-1']}"
+        )
+        names = [loc["name"] for loc in response.json()["locations"]]
+        assert names == ["occ-drawer-1", "occ-bin-a", "occ-bin-b"]
+
+        response = client.get("/api/v1/storage-locations/occupancy?type=drawer")
+        locations = response.json()["locations"]
+        assert {loc["name"] for loc in locations} == {"occ-drawer-1", "occ-drawer-2"}
+        assert max(loc["subtree_quantity"] for loc in locations) == 35
+
+        response = client.get(
+            "/api/v1/storage-locations/occupancy"
+            "?root_id=00000000-0000-0000-0000-000000000000"
+        )
+        assert response.status_code == 404
+
+    def test_occupancy_etag_revalidation(
+        self, client: TestClient, auth_headers, occupancy_setup
+    ):
+        """Unchanged data revalidates with 304; stock changes change the ETag"""
+        response = client.get("/api/v1/storage-locations/occupancy")
+        etag = response.headers["etag"]
+        assert "no-cache" in response.headers["cache-control"]
+
+        response = client.get(
+            "/api/v1/storage-locations/occupancy",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+
+        resp = client.post(
+            "/api/v1/storage-locations",
+            json={
+                "name": "occ-bin-c",
+                "type": "bin",
+                "parent_id": occupancy_setup["occ-drawer-2"],
+            },
+            headers=auth_headers,
+        )
+        assert resp.status_code == 201
+
+        response = client.get(
+            "/api/v1/storage-locations/occupancy",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
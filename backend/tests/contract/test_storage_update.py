@@ -177,6 +177,57 @@ class TestStorageUpdateContract:
             assert "/" not in data["location_hierarchy"]
             assert data["location_hierarchy"] == data["name"]
 
+    def test_update_storage_location_rewrites_subtree_paths(
+        self, client: TestClient, auth_headers
+    ):
+        """Renaming or moving a location rewrites every descendant's path"""
+
+        def create(name, parent_id=None):
+            response = client.post(
+                "/api/v1/storage-locations",
+                json={"name": name, "type": "cabinet", "parent_id": parent_id},
+                headers=auth_headers,
+            )
+            assert response.status_code == 201
+            return response.json()["id"]
+
+        def hierarchy(location_id):
+            response = client.get(
+                f"/api/v1/storage-locations/{location_id}", headers=auth_headers
+            )
+            return response.json()["location_hierarchy"]
+
+        cabinet = create("Path Cabinet")
+        drawer = create("Path Drawer", cabinet)
+        bin_id = create("Path Bin", drawer)
+        other = create("Other Cabinet")
+
+        response = client.put(
+            f"/api/v1/storage-locations/{cabinet}",
+            json={"name": "Renamed Cabinet"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert hierarchy(drawer) == "Renamed Cabinet/Path Drawer"
+        assert hierarchy(bin_id) == "Renamed Cabinet/Path Drawer/Path Bin"
+
+        response = client.put(
+            f"/api/v1/storage-locations/{drawer}",
+            json={"parent_id": other},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["location_hierarchy"] == "Other Cabinet/Path Drawer"
+        assert hierarchy(bin_id) == "Other Cabinet/Path Drawer/Path Bin"
+
+        # Moving a location under its own descendant is rejected
+        response = client.put(
+            f"/api/v1/storage-locations/{other}",
+            json={"parent_id": bin_id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
     def test_update_storage_location_invalid_parent(
         self, client: TestClient, auth_headers
     ):
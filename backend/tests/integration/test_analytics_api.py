@@ -1487,3 +1487,67 @@ class TestAnalyticsTopVelocity:
         )
 
         assert response.status_code == 403
+
+
+@pytest.mark.integration
+class TestAnalyticsAnomalies:
+    """Integration tests for anomaly scan, listing and acknowledgement"""
+
+    def test_anomaly_endpoints_require_admin(self, client, user_auth_headers):
+        """Anomaly endpoints are admin-only"""
+        response = client.get("/api/v1/analytics/anomalies", headers=user_auth_headers)
+        assert response.status_code == 403
+
+        response = client.post(
+            "/api/v1/analytics/anomalies/scan", headers=user_auth_headers
+        )
+        assert response.status_code == 403
+
+    def test_scan_list_and_acknowledge(self, client, db_session, auth_headers):
+        """A flagged mis-scan can be listed and acknowledged through the API"""
+        from backend.src.models import Component, StockTransaction, TransactionType
+
+        component = Component(name="API Anomaly Part", part_number="API-ANOM-1")
+        db_session.add(component)
+        db_session.commit()
+
+        base = datetime.now(UTC) - timedelta(days=15)
+        for day, quantity in enumerate([10, 9, 11, 10, 12, 10, 8, 10, 5000]):
+            db_session.add(
+                StockTransaction(
+                    component_id=component.id,
+                    transaction_type=TransactionType.REMOVE,
+                    quantity_change=-quantity,
+                    previous_quantity=10000,
+                    new_quantity=10000 - quantity,
+                    reason="Used",
+                    created_at=base + timedelta(days=day),
+                )
+            )
+        db_session.commit()
+
+        response = client.post("/api/v1/analytics/anomalies/scan", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["anomalies_found"] == 1
+
+        response = client.get("/api/v1/analytics/anomalies", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 1
+        anomaly = data["anomalies"][0]
+        assert anomaly["component_id"] == component.id
+        assert anomaly["quantity"] == 5000
+
+        response = client.post(
+            f"/api/v1/analytics/anomalies/{anomaly['id']}/acknowledge",
+            json={"notes": "Typo on scanner"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "acknowledged"
+        assert response.json()["notes"] == "Typo on scanner"
+
+        response = client.get(
+            "/api/v1/analytics/anomalies?status=open", headers=auth_headers
+        )
+        assert response.json()["total_count"] == 0
@@ -4,6 +4,8 @@ Performance validation tests for Storage Location Layout Generator.
 These tests validate that the system meets performance requirements from research.md:
 - T058: Preview API must respond in < 200ms for 500 locations
 - T059: Bulk create API must complete in < 2000ms for 500 locations
+- High-volume layouts: 50,000 locations (high_volume=true) in < 30s
+  (performance marker: excluded from the default run, use -m performance)
 
 Performance Targets:
 - Preview API: <200ms for 500 locations (research.md requirement)
@@ -11,6 +13,7 @@ Performance Targets:
 
 Test Configuration:
 - 500-location layout: 25 letters × 20 numbers = 500 locations
+- 50,000-location layout: 25 letters × 40 numbers × 50 numbers (3D grid)
 - Uses isolated in-memory SQLite database (Constitution Principle VI)
 """
 
@@ -212,6 +215,147 @@ class TestLocationGenerationPerformance:
             f"({2000 / elapsed_ms:.1f}x faster than required)"
         )
 
+    @pytest.fixture
+    def perf_config_50k_locations(self):
+        """
+        High-volume warehouse layout that generates exactly 50,000 locations.
+
+        Layout: 25 letters (a-y) × 40 shelves × 50 bins = 50,000 locations
+        Format: wh-a-01-01, ..., wh-y-40-50
+        """
+        return {
+            "layout_type": "grid_3d",
+            "prefix": "wh-",
+            "ranges": [
+                {
+                    "range_type": "letters",
+                    "start": "a",
+                    "end": "y",
+                    "capitalize": False,
+                },
+                {"range_type": "numbers", "start": 1, "end": 40, "zero_pad": True},
+                {"range_type": "numbers", "start": 1, "end": 50, "zero_pad": True},
+            ],
+            "separators": ["-", "-"],
+            "location_type": "bin",
+            "single_part_only": False,
+            "high_volume": True,
+        }
+
+    @pytest.mark.performance
+    def test_bulk_create_performance_50k_locations(
+        self, test_client, db_session, perf_config_50k_locations, auth_headers
+    ):
+        """
+        High-volume bulk create: 50,000 locations under a parent in < 30s.
+
+        Verifies the batched insert path precomputes hierarchy paths and
+        unique QR code ids, and that duplicates are still rejected at this
+        size.
+        """
+        from backend.src.models.storage_location import (
+            StorageLocation,
+            StorageLocationClosure,
+        )
+
+        parent = StorageLocation(name="warehouse", type="building")
+        db_session.add(parent)
+        db_session.commit()
+        config = {**perf_config_50k_locations, "parent_id": parent.id}
+
+        start = time.perf_counter()
+        response = test_client.post(
+            "/api/v1/storage-locations/bulk-create-layout",
+            json=config,
+            headers=auth_headers,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert (
+            response.status_code == 201
+        ), f"Expected 201, got {response.status_code}: {response.text}"
+        data = response.json()
+        assert data["created_count"] == 50_000
+        assert len(set(data["created_ids"])) == 50_000
+
+        rows = (
+            db_session.query(StorageLocation)
+            .filter(StorageLocation.parent_id == parent.id)
+            .all()
+        )
+        assert len(rows) == 50_000
+        assert len({row.qr_code_id for row in rows}) == 50_000
+        assert all(row.location_hierarchy == f"warehouse/{row.name}" for row in rows)
+        assert all(row.qr_code_id == f"LOC-{row.id[:8].upper()}" for row in rows)
+
+        # Closure triggers ran for every inserted row
+        descendants = (
+            db_session.query(StorageLocationClosure)
+            .filter(
+                StorageLocationClosure.ancestor_id == parent.id,
+                StorageLocationClosure.depth == 1,
+            )
+            .count()
+        )
+        assert descendants == 50_000
+
+        assert (
+            elapsed_ms < 30_000
+        ), f"Bulk create took {elapsed_ms:.2f}ms (requirement: <30000ms)"
+
+        # Re-running the same layout is rejected as a duplicate
+        response = test_client.post(
+            "/api/v1/storage-locations/bulk-create-layout",
+            json=config,
+            headers=auth_headers,
+        )
+        assert response.status_code == 409
+
+        print(
+            f"\n✓ Bulk Create Performance: {elapsed_ms:.2f}ms for 50,000 locations "
+            f"({50_000 / (elapsed_ms / 1000):.0f} loc/sec)"
+        )
+
+    def test_high_volume_limit(
+        self, test_client, db_session, perf_config_50k_locations
+    ):
+        """Layouts need high_volume beyond 500 and are capped at 50,000."""
+        config = perf_config_50k_locations
+
+        response = test_client.post(
+            "/api/v1/storage-locations/generate-preview",
+            json={**config, "high_volume": False},
+        )
+        assert response.status_code == 200
+        assert response.json()["is_valid"] is False
+
+        response = test_client.post(
+            "/api/v1/storage-locations/generate-preview", json=config
+        )
+        data = response.json()
+        assert data["total_count"] == 50_000
+        assert data["is_valid"] is True
+        assert data["last_name"] == "wh-y-40-50"
+
+        oversized = {
+            **config,
+            "ranges": [
+                *config["ranges"][:2],
+                {
+                    "range_type": "numbers",
+                    "start": 1,
+                    "end": 51,
+                    "zero_pad": True,
+                },
+            ],
+        }
+        response = test_client.post(
+            "/api/v1/storage-locations/generate-preview", json=oversized
+        )
+        data = response.json()
+        assert data["is_valid"] is False
+        assert any("50000" in error for error in data["errors"])
+
     def test_preview_performance_edge_cases(self, test_client, db_session):
         """
         Additional performance validation for edge cases.
@@ -0,0 +1,90 @@
+"""
+Performance test for stock-take reconciliation.
+
+Reconciles a 5,000-line count (500 bins x 10 components, a fifth of them
+with a variance) and checks it completes in under a second.
+"""
+
+import random
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from backend.src.models import (
+    Component,
+    ComponentLocation,
+    StockTransaction,
+    StorageLocation,
+)
+from backend.src.services.stock_take_service import StockTakeService
+
+
+@pytest.fixture
+def warehouse(db_session):
+    """500 bins each holding 10 components."""
+    rng = random.Random(3)
+    locations = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"take-bin-{i}",
+            "type": "bin",
+            "location_hierarchy": f"take-bin-{i}",
+            "qr_code_id": f"TAKE-{i:04d}",
+        }
+        for i in range(500)
+    ]
+    components = [
+        {"id": str(uuid.uuid4()), "name": f"take-part-{i}"} for i in range(1000)
+    ]
+    db_session.execute(insert(StorageLocation), locations)
+    db_session.execute(insert(Component), components)
+
+    stock = []
+    for index, location in enumerate(locations):
+        for offset in range(10):
+            stock.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "component_id": components[(index * 10 + offset) % 1000]["id"],
+                    "storage_location_id": location["id"],
+                    "quantity_on_hand": rng.randint(1, 200),
+                }
+            )
+    db_session.execute(insert(ComponentLocation), stock)
+    db_session.commit()
+    return stock
+
+
+@pytest.mark.integration
+@pytest.mark.performance
+def test_stock_take_5000_lines(db_session, warehouse):
+    """5,000 counted lines reconcile in one transaction in under a second"""
+    rng = random.Random(5)
+    lines = []
+    for row in warehouse:
+        counted = row["quantity_on_hand"]
+        if rng.random() < 0.2:
+            counted = max(0, counted + rng.randint(-20, 20))
+        lines.append((row["storage_location_id"], row["component_id"], counted))
+    expected = sum(
+        1 for line, row in zip(lines, warehouse) if line[2] != row["quantity_on_hand"]
+    )
+
+    start = time.perf_counter()
+    report = StockTakeService(db_session).reconcile(lines, {"user_name": "perf"})
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n✓ Stock-take: {len(lines)} lines, {report['adjusted']} adjustments "
+        f"in {elapsed * 1000:.0f}ms"
+    )
+    assert report["adjusted"] == expected
+    assert (
+        db_session.query(StockTransaction)
+        .filter(StockTransaction.batch_id == report["batch_id"])
+        .count()
+        == expected
+    )
+    assert elapsed < 1.0, f"Stock-take took {elapsed:.2f}s"
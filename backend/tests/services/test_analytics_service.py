@@ -294,6 +294,73 @@ def test_get_usage_trends_velocity_calculation(
     assert abs(response.velocity.daily_average - expected_daily) < 0.01
 
 
+def test_usage_trends_calendar_buckets(
+    analytics_service, db_session, sample_component, sample_location
+):
+    """Weekly/monthly buckets follow ISO weeks and calendar months, with gaps filled."""
+    for created_at, change in (
+        (datetime(2025, 1, 31, 12, 0, tzinfo=UTC), -3),  # Friday, ISO week of Jan 27
+        (datetime(2025, 2, 1, 12, 0, tzinfo=UTC), -4),  # Saturday, same ISO week
+        (datetime(2025, 2, 3, 12, 0, tzinfo=UTC), 20),  # Monday, next ISO week
+        (datetime(2025, 3, 31, 12, 0, tzinfo=UTC), -5),
+    ):
+        db_session.add(
+            StockTransaction(
+                component_id=sample_component.id,
+                transaction_type=(
+                    TransactionType.REMOVE if change < 0 else TransactionType.ADD
+                ),
+                quantity_change=change,
+                previous_quantity=0,
+                new_quantity=0,
+                reason="Bucket test",
+                from_location_id=sample_location.id,
+                created_at=created_at,
+            )
+        )
+    db_session.commit()
+
+    start_date = datetime(2025, 1, 15, tzinfo=UTC)
+    end_date = datetime(2025, 3, 31, 23, 59, tzinfo=UTC)
+
+    monthly = analytics_service.get_usage_trends(
+        component_id=sample_component.id,
+        location_id=None,
+        start_date=start_date,
+        end_date=end_date,
+        period=AggregationPeriod.MONTHLY,
+    )
+    assert [dp.timestamp for dp in monthly.data] == [
+        start_date,
+        datetime(2025, 2, 1, tzinfo=UTC),
+        datetime(2025, 3, 1, tzinfo=UTC),
+    ]
+    assert [(dp.added, dp.removed) for dp in monthly.data] == [(0, 3), (20, 4), (0, 5)]
+
+    weekly = analytics_service.get_usage_trends(
+        component_id=sample_component.id,
+        location_id=None,
+        start_date=start_date,
+        end_date=end_date,
+        period=AggregationPeriod.WEEKLY,
+    )
+    by_week = {dp.timestamp: dp for dp in weekly.data}
+    assert all(dp.timestamp.weekday() == 0 for dp in weekly.data[1:])
+    assert by_week[datetime(2025, 1, 27, tzinfo=UTC)].removed == 7
+    assert by_week[datetime(2025, 2, 3, tzinfo=UTC)].added == 20
+    assert by_week[datetime(2025, 2, 10, tzinfo=UTC)].removed == 0
+
+    levels = analytics_service.get_stock_levels(
+        component_id=sample_component.id,
+        location_id=None,
+        start_date=start_date,
+        end_date=end_date,
+        period=AggregationPeriod.DAILY,
+    )
+    assert len(levels.data) == 76  # Jan 15 .. Mar 31 inclusive
+    assert sum(dp.transaction_count for dp in levels.data) == 4
+
+
 def test_get_usage_trends_no_consumption(
     analytics_service, sample_component, sample_location, component_location
 ):
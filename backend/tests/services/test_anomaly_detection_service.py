@@ -0,0 +1,179 @@
+"""
+Unit tests for AnomalyDetectionService.
+
+Builds a steady daily removal history with an injected mis-scan and checks
+flagging, incremental scans and acknowledgement.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.src.models import (
+    Component,
+    StockAnomaly,
+    StockAnomalyDeferral,
+    StockTransaction,
+    StorageLocation,
+    TransactionType,
+)
+from backend.src.services.anomaly_detection_service import AnomalyDetectionService
+
+
+@pytest.fixture
+def anomaly_service(db_session):
+    """Create AnomalyDetectionService instance with test database session."""
+    return AnomalyDetectionService(db_session)
+
+
+@pytest.fixture
+def component(db_session):
+    """Create a component and location for removal history."""
+    component = Component(name="Anomaly Capacitor", part_number="ANOM-CAP-100N")
+    location = StorageLocation(name="Anomaly Bin", type="bin")
+    db_session.add_all([component, location])
+    db_session.commit()
+    return component
+
+
+def _removal(component, quantity, created_at, transaction_type=TransactionType.REMOVE):
+    return StockTransaction(
+        component_id=component.id,
+        transaction_type=transaction_type,
+        quantity_change=-quantity,
+        previous_quantity=100000,
+        new_quantity=100000 - quantity,
+        reason="Used in project",
+        created_at=created_at,
+    )
+
+
+@pytest.fixture
+def removal_history(db_session, component):
+    """Twenty days of 8-12 unit removals plus one 10,000 unit mis-scan."""
+    base = datetime.now(UTC) - timedelta(days=25)
+    for day in range(20):
+        db_session.add(
+            _removal(component, 8 + day % 5, base + timedelta(days=day, hours=9))
+        )
+    mis_scan = _removal(component, 10000, base + timedelta(days=20, hours=9))
+    db_session.add(mis_scan)
+    db_session.commit()
+    return mis_scan
+
+
+def test_scan_flags_outlier_removal(anomaly_service, removal_history):
+    """Only the mis-scan is flagged; normal usage is left alone."""
+    result = anomaly_service.run_scan()
+
+    assert result["transactions_scanned"] == 21
+    assert result["anomalies_found"] == 1
+
+    anomalies = anomaly_service.list_anomalies()
+    assert len(anomalies) == 1
+    assert anomalies[0]["transaction_id"] == removal_history.id
+    assert anomalies[0]["quantity"] == 10000
+    assert anomalies[0]["median_daily_removal"] == 10
+    assert anomalies[0]["robust_score"] > 3.5
+
+
+def test_scan_is_incremental(anomaly_service, db_session, component, removal_history):
+    """A second scan evaluates only removals newer than the last high-water mark."""
+    first = anomaly_service.run_scan()
+    assert first["anomalies_found"] == 1
+
+    second = anomaly_service.run_scan()
+    assert second["anomalies_found"] == 0
+    # Only rows sharing the boundary timestamp are re-read
+    assert second["transactions_scanned"] == 0
+
+    db_session.add(
+        _removal(
+            component,
+            5000,
+            datetime.now(UTC) - timedelta(days=1),
+            transaction_type=TransactionType.ADJUST,
+        )
+    )
+    db_session.add(_removal(component, 11, datetime.now(UTC) - timedelta(days=1)))
+    db_session.commit()
+
+    third = anomaly_service.run_scan()
+    assert third["transactions_scanned"] == 2
+    assert third["anomalies_found"] == 1
+    assert db_session.query(StockAnomaly).count() == 2
+
+
+def test_scan_defers_components_without_baseline(
+    anomaly_service, db_session, component
+):
+    """Removals without a baseline yet are evaluated once one exists."""
+    base = datetime.now(UTC) - timedelta(days=8)
+    db_session.add(_removal(component, 10, base))
+    mis_scan = _removal(component, 9000, base + timedelta(days=1))
+    db_session.add(mis_scan)
+    db_session.add(_removal(component, 11, base + timedelta(days=2)))
+    db_session.commit()
+
+    result = anomaly_service.run_scan()
+    assert result["transactions_scanned"] == 3
+    assert result["anomalies_found"] == 0
+    assert db_session.query(StockAnomalyDeferral).count() == 3
+
+    # The mark still moves on, so the deferred rows are not re-read
+    result = anomaly_service.run_scan()
+    assert result["transactions_scanned"] == 0
+
+    # The newly stocked part builds up enough active days
+    for day in range(3, 7):
+        db_session.add(_removal(component, 9 + day % 3, base + timedelta(days=day)))
+    db_session.commit()
+
+    # Four new removals plus the three deferred ones
+    result = anomaly_service.run_scan()
+    assert result["transactions_scanned"] == 7
+    assert result["anomalies_found"] == 1
+    assert anomaly_service.list_anomalies()[0]["transaction_id"] == mis_scan.id
+    assert db_session.query(StockAnomalyDeferral).count() == 0
+
+    # Nothing is deferred any more: only the row at the mark is re-read
+    assert anomaly_service.run_scan()["transactions_scanned"] == 1
+
+
+def test_scan_drops_deferrals_outside_lookback(anomaly_service, db_session, component):
+    """Deferred removals are given up on once they leave the lookback window."""
+    base = datetime.now(UTC) - timedelta(days=8)
+    db_session.add(_removal(component, 10, base))
+    db_session.add(_removal(component, 9000, base + timedelta(days=6)))
+    db_session.commit()
+
+    anomaly_service.run_scan()
+    assert db_session.query(StockAnomalyDeferral).count() == 2
+
+    anomaly_service.run_scan(lookback_days=7)
+    assert db_session.query(StockAnomalyDeferral).count() == 1
+
+
+def test_acknowledge_anomaly(anomaly_service, removal_history):
+    """Acknowledged anomalies leave the open list and cannot be re-acknowledged."""
+    anomaly_service.run_scan()
+    anomaly_id = anomaly_service.list_anomalies()[0]["id"]
+
+    acknowledged = anomaly_service.acknowledge_anomaly(
+        anomaly_id, username="admin", notes="Mis-scan, corrected"
+    )
+    assert acknowledged["status"] == "acknowledged"
+    assert acknowledged["acknowledged_by"] == "admin"
+    assert acknowledged["acknowledged_at"] is not None
+
+    assert anomaly_service.list_anomalies() == []
+    assert len(anomaly_service.list_anomalies(status="acknowledged")) == 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        anomaly_service.acknowledge_anomaly(anomaly_id)
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        anomaly_service.acknowledge_anomaly(99999)
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,271 @@
+"""
+Unit tests for the content-addressed blob store.
+
+Files are stored in a temporary directory against the test database, so
+deduplication, trigger-maintained reference counts, garbage collection and
+adoption of files from the old per-component layout are checked together.
+"""
+
+import asyncio
+import hashlib
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.models import (
+    Attachment,
+    Blob,
+    Component,
+    KiCadLibraryData,
+    Provider,
+    ProviderLink,
+    Resource,
+)
+from backend.src.services import http_client
+from backend.src.services.blob_store import blob_sha256
+from backend.src.services.file_storage import FileStorageService
+from backend.src.services.http_client import close_http_client, create_http_client
+
+PDF = b"%PDF-1.4\n" + b"datasheet " * 5_000 + b"\n%%EOF\n"
+OTHER_PDF = b"%PDF-1.4\n" + b"errata " * 2_000 + b"\n%%EOF\n"
+
+
+@pytest.fixture
+def storage(db_session, tmp_path):
+    storage = FileStorageService(base_path=str(tmp_path / "attachments"))
+    storage.blobs.session_factory = sessionmaker(bind=db_session.get_bind())
+    return storage
+
+
+def _components(db_session, count: int) -> list[Component]:
+    components = [Component(name=f"RES-{i}") for i in range(count)]
+    db_session.add_all(components)
+    db_session.commit()
+    return components
+
+
+def _attach(db_session, storage, component, content=PDF) -> Attachment:
+    file_path, thumbnail, size, mime_type, name = storage.store_file(
+        component.id, content, "datasheet.pdf", "datasheet"
+    )
+    attachment = Attachment(
+        component_id=component.id,
+        filename=name,
+        original_filename=name,
+        file_size=size,
+        mime_type=mime_type,
+        file_path=file_path,
+        thumbnail_path=thumbnail,
+    )
+    db_session.add(attachment)
+    db_session.commit()
+    return attachment
+
+
+def _ref_count(db_session, content: bytes) -> int | None:
+    db_session.expire_all()
+    blob = db_session.get(Blob, hashlib.sha256(content).hexdigest())
+    return blob.ref_count if blob else None
+
+
+def test_identical_files_share_one_counted_blob(db_session, storage):
+    components = _components(db_session, 3)
+    attachments = [_attach(db_session, storage, c) for c in components]
+
+    assert len({a.file_path for a in attachments}) == 1
+    assert blob_sha256(attachments[0].file_path) == hashlib.sha256(PDF).hexdigest()
+    assert _ref_count(db_session, PDF) == 3
+
+    db_session.delete(attachments[0])
+    db_session.commit()
+    assert _ref_count(db_session, PDF) == 2
+
+    attachments[1].file_path = _attach(
+        db_session, storage, components[0], OTHER_PDF
+    ).file_path
+    db_session.commit()
+    assert _ref_count(db_session, PDF) == 1
+    assert _ref_count(db_session, OTHER_PDF) == 2
+
+
+def test_kicad_custom_files_are_counted(db_session, storage):
+    (component,) = _components(db_session, 1)
+    model = storage.blobs.put_bytes(b"solid model\nendsolid\n", ".STEP")
+    assert model.path.name.endswith(".step")
+
+    kicad_data = KiCadLibraryData(component_id=component.id)
+    kicad_data.set_custom_3d_model(str(model.path))
+    kicad_data.set_custom_symbol(str(model.path))
+    db_session.add(kicad_data)
+    db_session.commit()
+    assert db_session.get(Blob, model.sha256).ref_count == 2
+
+    kicad_data.reset_symbol_to_auto()
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.get(Blob, model.sha256).ref_count == 1
+
+
+def test_garbage_collection_removes_unreferenced_blobs(db_session, storage):
+    (component,) = _components(db_session, 1)
+    kept = _attach(db_session, storage, component)
+    dropped = _attach(db_session, storage, component, OTHER_PDF)
+    unclaimed = storage.blobs.put_bytes(b"never referenced")
+    db_session.delete(dropped)
+    db_session.commit()
+
+    # Still inside the grace period
+    assert storage.blobs.collect_garbage()["blobs_removed"] == 0
+
+    result = storage.blobs.collect_garbage(timedelta(0))
+
+    assert result["blobs_removed"] == 2
+    assert result["bytes_freed"] == len(OTHER_PDF) + len(b"never referenced")
+    assert storage.file_exists(kept.file_path)
+    assert not storage.file_exists(dropped.file_path)
+    assert not unclaimed.path.exists()
+    assert _ref_count(db_session, OTHER_PDF) is None
+
+
+def test_blob_paths_under_a_root_containing_blobs(db_session, tmp_path):
+    storage = FileStorageService(
+        base_path=str(tmp_path / "srv" / "blobs" / "partshub" / "attachments")
+    )
+    storage.blobs.session_factory = sessionmaker(bind=db_session.get_bind())
+    (component,) = _components(db_session, 1)
+    model = storage.blobs.put_bytes(b"solid model\nendsolid\n", ".step")
+
+    # Absolute paths, as resources and KiCad files store them
+    kicad_data = KiCadLibraryData(component_id=component.id)
+    kicad_data.set_custom_3d_model(str(model.path))
+    db_session.add(kicad_data)
+    db_session.commit()
+
+    assert blob_sha256(model.path) == model.sha256
+    db_session.expire_all()
+    assert db_session.get(Blob, model.sha256).ref_count == 1
+    assert storage.blobs.collect_garbage(timedelta(0))["blobs_removed"] == 0
+    assert model.path.exists()
+
+    assert blob_sha256(f"/srv/blobs/{model.sha256}/data/x.pdf") is None
+    assert blob_sha256(f"/data/blobs/ab/cd/{model.sha256.upper()}.pdf") is None
+
+
+def test_statistics_report_deduplication(db_session, storage):
+    for component in _components(db_session, 4):
+        _attach(db_session, storage, component)
+
+    stats = storage.blobs.get_statistics()
+
+    assert stats["blobs"] == 1
+    assert stats["references"] == 4
+    assert stats["stored_bytes"] == len(PDF)
+    assert stats["saved_bytes"] == 3 * len(PDF)
+
+
+def test_adopt_and_recount_existing_files(db_session, storage):
+    components = _components(db_session, 2)
+    for i, component in enumerate(components):
+        legacy = f"aa/{component.id}/datasheets/datasheet_{i}.pdf"
+        legacy_path = storage.base_path / legacy
+        legacy_path.parent.mkdir(parents=True)
+        legacy_path.write_bytes(PDF)
+        db_session.add(
+            Attachment(
+                component_id=component.id,
+                filename="datasheet.pdf",
+                original_filename="datasheet.pdf",
+                file_size=len(PDF),
+                mime_type="application/pdf",
+                file_path=legacy,
+            )
+        )
+    db_session.commit()
+
+    result = storage.blobs.adopt_existing_files(storage.base_path)
+
+    assert result == {"files_adopted": 2, "files_missing": 0, "bytes_saved": len(PDF)}
+    db_session.expire_all()
+    paths = {a.file_path for a in db_session.query(Attachment)}
+    assert len(paths) == 1
+    assert storage.get_file_path(paths.pop()).read_bytes() == PDF
+    assert not list(storage.base_path.glob("aa/*/datasheets/*"))
+    assert _ref_count(db_session, PDF) == 2
+
+    db_session.query(Blob).delete()
+    db_session.commit()
+    assert storage.blobs.recount() == 1
+    assert _ref_count(db_session, PDF) == 2
+
+
+def test_downloaded_resources_share_blobs(monkeypatch, db_session, storage):
+    from backend.src.services import resource_service
+    from backend.src.services.resource_service import ResourceService
+
+    monkeypatch.setattr(resource_service, "file_storage", storage)
+    provider = Provider(
+        name="LCSC", adapter_class="LCSCAdapter", base_url="https://www.lcsc.com"
+    )
+    components = _components(db_session, 2)
+    db_session.add(provider)
+    db_session.commit()
+    resource_ids = []
+    for i, component in enumerate(components):
+        link = ProviderLink(
+            component_id=component.id,
+            provider_id=provider.id,
+            provider_part_number=f"C{2500 + i}",
+            provider_url=f"https://www.lcsc.com/product-detail/C{2500 + i}.html",
+        )
+        db_session.add(link)
+        db_session.commit()
+        resource = Resource(
+            provider_link_id=link.id,
+            resource_type="datasheet",
+            file_name="RC0603.pdf",
+            source_url="https://datasheet.test/RC0603.pdf",
+        )
+        db_session.add(resource)
+        db_session.commit()
+        resource_ids.append(resource.id)
+
+    async def main():
+        client = create_http_client(
+            httpx.MockTransport(lambda request: httpx.Response(200, content=PDF))
+        )
+        monkeypatch.setattr(http_client, "_http_client", client)
+        monkeypatch.setattr(
+            http_client, "_http_client_loop", asyncio.get_running_loop()
+        )
+        try:
+            return [
+                await ResourceService.download_resource_sync(db_session, resource_id)
+                for resource_id in resource_ids
+            ]
+        finally:
+            await close_http_client()
+
+    first, second = asyncio.run(main())
+
+    assert first.file_path == second.file_path
+    assert first.file_path.endswith(".pdf")
+    assert _ref_count(db_session, PDF) == 2
+    assert list(storage.blobs.incoming_dir.iterdir()) == []
+
+
+def test_blob_api(monkeypatch, client, auth_headers, user_auth_headers, storage):
+    from backend.src.api import blobs as blobs_api
+
+    monkeypatch.setattr(blobs_api, "file_storage", storage)
+    storage.blobs.put_bytes(b"never referenced")
+
+    stats = client.get("/api/v1/blobs/stats", headers=user_auth_headers)
+    assert stats.json()["blobs"] == 1
+    assert client.post("/api/v1/blobs/gc", headers=user_auth_headers).status_code == 403
+
+    collected = client.post(
+        "/api/v1/blobs/gc", params={"grace_minutes": 0}, headers=auth_headers
+    )
+    assert collected.json()["blobs_removed"] == 1
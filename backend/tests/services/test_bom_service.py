@@ -0,0 +1,208 @@
+"""
+Unit tests for BOMService generation and provider-data refresh.
+
+BOMs are generated against the offline LocalProvider, so coalesced searches,
+bounded concurrency, the provider-data upsert and the batched loads are
+observable through the provider's call counter and the SQL issued.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.models import (
+    Category,
+    Component,
+    ComponentProviderData,
+    Project,
+    ProjectComponent,
+)
+from backend.src.providers.base_provider import ComponentSearchResult
+from backend.src.providers.local_provider import LocalProvider
+from backend.src.services import bom_service as bom_module
+from backend.src.services.bom_service import BOMService
+from backend.src.services.provider_service import ProviderService
+
+
+def _part(sku: str, part_number: str, stock: int = 1000) -> ComponentSearchResult:
+    return ComponentSearchResult(
+        part_number=part_number,
+        manufacturer="Yageo",
+        description=f"{part_number} part",
+        availability=stock,
+        price_breaks=[{"quantity": 1, "price": 0.02}, {"quantity": 100, "price": 0.01}],
+        provider_id=sku,
+        provider_part_id=sku,
+        provider_url=f"https://www.lcsc.com/product-detail/{sku}.html",
+    )
+
+
+@pytest.fixture
+def local():
+    return LocalProvider(
+        [_part("C25804", "RC0603FR-0710KL"), _part("C7950", "LM358DR", stock=40)]
+    )
+
+
+@pytest.fixture
+def bom_service(db_session, local):
+    provider_service = ProviderService()
+    provider_service.disable_provider("lcsc")
+    provider_service.register_provider("local", local)
+    provider_service.enable_provider("local")
+    return BOMService(provider_service, sessionmaker(bind=db_session.get_bind()))
+
+
+@pytest.fixture
+def project(db_session):
+    """Four BOM lines; two share a part number, one has none."""
+    category = Category(name="BOM parts")
+    db_session.add(category)
+    db_session.commit()
+    components = [
+        Component(
+            name="R1 10k", part_number="RC0603FR-0710KL", category_id=category.id
+        ),
+        Component(
+            name="R2 10k", part_number=" rc0603fr-0710kl", category_id=category.id
+        ),
+        Component(name="U1 op-amp", part_number="LM358DR", category_id=category.id),
+        Component(name="J1 header", part_number=None, category_id=category.id),
+    ]
+    project = Project(name="Preamp")
+    db_session.add_all([project, *components])
+    db_session.commit()
+    for component, quantity in zip(components, (120, 4, 2, 1)):
+        db_session.add(
+            ProjectComponent(
+                project_id=project.id,
+                component_id=component.id,
+                quantity_allocated=quantity,
+            )
+        )
+    db_session.commit()
+    return project
+
+
+def test_refresh_coalesces_part_numbers_and_upserts(
+    bom_service, project, local, db_session
+):
+    items = asyncio.run(
+        bom_service.generate_project_bom(project.id, refresh_provider_data=True)
+    )
+
+    assert local.calls["search"] == 2
+    lines = {item.component.name: item.to_dict() for item in items}
+    assert lines["R1 10k"]["provider_sku"] == "C25804"
+    assert lines["R1 10k"]["unit_cost"] == 0.01
+    assert lines["R2 10k"]["unit_cost"] == 0.02
+    assert lines["U1 op-amp"]["availability"] == 40
+    assert lines["U1 op-amp"]["provider_name"] == "Local"
+    assert lines["J1 header"]["provider_sku"] is None
+
+    local.parts[1] = _part("C7950", "LM358DR", stock=5)
+    items = asyncio.run(
+        bom_service.generate_project_bom(project.id, refresh_provider_data=True)
+    )
+
+    assert local.calls["search"] == 4
+    assert db_session.query(ComponentProviderData).count() == 3
+    lines = {item.component.name: item.to_dict() for item in items}
+    assert lines["U1 op-amp"]["availability"] == 5
+
+
+def test_only_components_without_provider_data_are_refreshed(
+    bom_service, project, local
+):
+    asyncio.run(bom_service.generate_project_bom(project.id))
+    asyncio.run(bom_service.generate_project_bom(project.id))
+
+    # The part-number-less line never has provider data but is never searched
+    assert local.calls["search"] == 2
+
+
+def test_refresh_records_provider_names_containing_underscores(
+    bom_service, db_session, local
+):
+    provider_service = bom_service.provider_service
+    provider_service.disable_provider("local")
+    provider_service.providers.pop("local")
+    local.name = "Local_Parts"
+    provider_service.register_provider("local_parts", local)
+    provider_service.enable_provider("local_parts")
+    components = [Component(name="U1 op-amp", part_number="LM358DR")]
+    db_session.add_all(components)
+    db_session.commit()
+
+    refreshed = asyncio.run(bom_service._refresh_provider_data(components))
+
+    assert refreshed == 1
+    data = db_session.query(ComponentProviderData).one()
+    assert data.provider.name == "Local_Parts"
+    assert data.provider_part_id == "C7950"
+
+
+def test_refresh_searches_are_bounded(bom_service, db_session, monkeypatch):
+    class SlowProvider(LocalProvider):
+        active = peak = 0
+
+        async def search_components(self, query, limit=10):
+            SlowProvider.active += 1
+            SlowProvider.peak = max(SlowProvider.peak, SlowProvider.active)
+            await asyncio.sleep(0.01)
+            SlowProvider.active -= 1
+            return await super().search_components(query, limit)
+
+    monkeypatch.setattr(bom_module, "BOM_REFRESH_CONCURRENCY", 2)
+    bom_service.provider_service.register_provider(
+        "local", SlowProvider([_part(f"C{i}", f"PN-{i}") for i in range(6)])
+    )
+    components = [Component(name=f"part {i}", part_number=f"PN-{i}") for i in range(6)]
+    db_session.add_all(components)
+    db_session.commit()
+
+    refreshed = asyncio.run(bom_service._refresh_provider_data(components))
+
+    assert refreshed == 6
+    assert SlowProvider.peak == 2
+
+
+def test_component_list_bom_loads_in_batches(bom_service, project, db_session):
+    asyncio.run(bom_service.generate_project_bom(project.id))
+    # J1 header (no part number, so no provider data) first
+    component_ids = [
+        component_id
+        for (component_id,) in db_session.query(Component.id)
+        .join(ProjectComponent)
+        .filter(ProjectComponent.project_id == project.id)
+        .order_by(Component.name)
+    ]
+    statements = []
+    engine = db_session.get_bind()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        items = asyncio.run(
+            bom_service.generate_component_list_bom(
+                [(component_id, 3) for component_id in component_ids]
+                + [("missing", 1), (component_ids[0], 7)]
+            )
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    # Components, their categories, and provider data with provider records
+    assert len(statements) == 3
+    assert [item.quantity for item in items] == [3, 3, 3, 3, 7]
+    assert [item.provider_data is not None for item in items] == [
+        False,
+        True,
+        True,
+        True,
+        False,
+    ]
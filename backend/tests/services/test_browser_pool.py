@@ -0,0 +1,203 @@
+"""
+Unit tests for BrowserPool.
+
+The pool is driven with an in-process fake browser, so page reuse, the page
+bound, recycling and request interception are checked without Chromium.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.src.services.browser_pool import BrowserPool, _intercept
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "about:blank"
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        await asyncio.sleep(0)
+        self.url = url
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages: list[FakePage] = []
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.context = FakeContext()
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def new_context(self):
+        return self.context
+
+    async def close(self):
+        self.closed = True
+
+
+class Launcher:
+    def __init__(self):
+        self.browsers: list[FakeBrowser] = []
+
+    async def __call__(self):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+@pytest.fixture
+def launcher():
+    return Launcher()
+
+
+def test_pages_are_reused_on_one_browser(launcher):
+    pool = BrowserPool(launcher=launcher)
+
+    async def searches():
+        for query in ("10k", "100nF", "LM358"):
+            async with pool.page() as page:
+                await page.goto(f"https://www.lcsc.com/search?q={query}")
+        return pool.get_statistics()
+
+    stats = asyncio.run(searches())
+
+    assert len(launcher.browsers) == 1
+    context = launcher.browsers[0].context
+    assert [pattern for pattern, _ in context.routes] == ["**/*"]
+    assert len(context.pages) == 1
+    assert context.pages[0].url == "about:blank"
+    assert stats["pages_created"] == 1
+    assert stats["pages_reused"] == 2
+
+
+def test_open_pages_are_bounded(launcher):
+    pool = BrowserPool(max_pages=2, launcher=launcher)
+    active = []
+    peak = []
+
+    async def search():
+        async with pool.page():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+
+    async def burst():
+        await asyncio.gather(*(search() for _ in range(6)))
+
+    asyncio.run(burst())
+
+    assert max(peak) == 2
+    assert len(launcher.browsers[0].context.pages) == 2
+
+
+def test_browser_is_recycled_after_page_budget(launcher):
+    pool = BrowserPool(pages_per_browser=3, launcher=launcher)
+
+    async def searches():
+        for _ in range(7):
+            async with pool.page():
+                pass
+        await pool.close()
+
+    asyncio.run(searches())
+
+    assert len(launcher.browsers) == 3
+    assert all(browser.closed for browser in launcher.browsers)
+    assert pool.counters["recycles"] == 2
+
+
+def test_retired_browser_closes_after_last_page_returns(launcher):
+    pool = BrowserPool(pages_per_browser=1, launcher=launcher)
+
+    async def overlapping():
+        async with pool.page():
+            async with pool.page():
+                assert len(launcher.browsers) == 2
+                # The first browser still has a page out
+                assert not launcher.browsers[0].closed
+            assert not launcher.browsers[0].closed
+        assert launcher.browsers[0].closed
+        assert not launcher.browsers[1].closed
+
+    asyncio.run(overlapping())
+
+
+def test_failed_page_is_discarded_and_dead_browser_replaced(launcher):
+    pool = BrowserPool(launcher=launcher)
+
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            async with pool.page():
+                raise TimeoutError("wait_for_selector")
+        first = launcher.browsers[0].context.pages[0]
+
+        launcher.browsers[0].connected = False
+        async with pool.page() as page:
+            assert page is not first
+        return first
+
+    first = asyncio.run(scenario())
+
+    assert first.closed
+    assert len(launcher.browsers) == 2
+    assert launcher.browsers[0].closed
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url="https://www.lcsc.com/search"):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def fulfill(self, **kwargs):
+        self.outcome = ("fulfill", kwargs["content_type"])
+
+    async def abort(self):
+        self.outcome = ("abort",)
+
+    async def continue_(self):
+        self.outcome = ("continue",)
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, outcome",
+    [
+        ("document", "https://www.lcsc.com/search?q=10k", ("continue",)),
+        ("xhr", "https://wmsc.lcsc.com/ftps/wm/search", ("continue",)),
+        (
+            "image",
+            "https://assets.lcsc.com/images/C25804.jpg",
+            ("fulfill", "image/gif"),
+        ),
+        ("font", "https://www.lcsc.com/fonts/roboto.woff2", ("abort",)),
+        ("script", "https://www.googletagmanager.com/gtag/js", ("abort",)),
+        ("xhr", "https://region1.google-analytics.com/g/collect", ("abort",)),
+    ],
+)
+def test_heavy_requests_are_intercepted(resource_type, url, outcome):
+    route = FakeRoute(resource_type, url)
+
+    asyncio.run(_intercept(route))
+
+    assert route.outcome == outcome
@@ -0,0 +1,207 @@
+"""
+Unit tests for ColumnarExportService.
+
+Exports a small ledger to a temporary dataset directory and checks
+partitioning, schema conversion and incremental high-water-mark handling.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import update
+
+from backend.src.models import (
+    Component,
+    ComponentLocation,
+    StockTransaction,
+    StorageLocation,
+    TransactionType,
+)
+from backend.src.services.columnar_export_service import ColumnarExportService
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+@pytest.fixture
+def ledger(db_session):
+    """Create a component with stock and transactions across two months."""
+    component = Component(
+        name="Export Resistor",
+        part_number="EXP-RES-1K",
+        specifications={"resistance": "1k"},
+        average_purchase_price=0.0125,
+    )
+    location = StorageLocation(name="Export Drawer", type="drawer")
+    db_session.add_all([component, location])
+    db_session.commit()
+
+    db_session.add(
+        ComponentLocation(
+            component_id=component.id,
+            storage_location_id=location.id,
+            quantity_on_hand=80,
+        )
+    )
+    for created_at, change in (
+        (datetime(2025, 9, 30, 23, 0, tzinfo=UTC), 100),
+        (datetime(2025, 10, 1, 9, 0, tzinfo=UTC), -10),
+        (datetime(2025, 10, 2, 9, 0, tzinfo=UTC), -10),
+    ):
+        db_session.add(_transaction(component, location, change, created_at))
+    db_session.commit()
+    return component, location
+
+
+def _transaction(component, location, change, created_at):
+    return StockTransaction(
+        component_id=component.id,
+        transaction_type=TransactionType.ADD if change > 0 else TransactionType.REMOVE,
+        quantity_change=change,
+        previous_quantity=0,
+        new_quantity=max(change, 0),
+        to_location_id=location.id,
+        reason="export test",
+        created_at=created_at,
+    )
+
+
+@pytest.mark.unit
+class TestColumnarExportService:
+    """Tests for month-partitioned Parquet/Arrow exports."""
+
+    def test_parquet_export_is_month_partitioned(self, db_session, ledger, tmp_path):
+        """Transactions land in one partition per month with typed columns."""
+        summary = ColumnarExportService(db_session, tmp_path).export()
+
+        transactions = summary["tables"]["stock_transactions"]
+        assert transactions["rows_exported"] == 3
+        assert sorted((tmp_path / "stock_transactions").glob("month=*")) == [
+            tmp_path / "stock_transactions" / "month=2025-09",
+            tmp_path / "stock_transactions" / "month=2025-10",
+        ]
+
+        table = ds.dataset(
+            tmp_path / "stock_transactions", format="parquet", partitioning="hive"
+        ).to_table()
+        assert table.num_rows == 3
+        assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+        assert set(table.column("transaction_type").to_pylist()) == {"add", "remove"}
+
+        components = ds.dataset(
+            tmp_path / "components", format="parquet", partitioning="hive"
+        ).to_table()
+        assert components.column("specifications").to_pylist() == [
+            '{"resistance": "1k"}'
+        ]
+        assert summary["tables"]["component_locations"]["rows_exported"] == 1
+
+    def test_incremental_export_only_writes_new_rows(
+        self, db_session, ledger, tmp_path
+    ):
+        """A second run continues from the stored high-water mark."""
+        service = ColumnarExportService(db_session, tmp_path)
+        first = service.export(tables=["stock_transactions"])
+        assert first["tables"]["stock_transactions"]["rows_exported"] == 3
+
+        second = service.export(tables=["stock_transactions"])
+        assert second["tables"]["stock_transactions"]["rows_exported"] == 0
+        assert second["tables"]["stock_transactions"]["files"] == []
+
+        component, location = ledger
+        # Same timestamp as the current watermark: must not be lost
+        db_session.add(
+            _transaction(
+                component, location, -5, datetime(2025, 10, 2, 9, 0, tzinfo=UTC)
+            )
+        )
+        db_session.add(
+            _transaction(
+                component, location, -5, datetime(2025, 11, 3, 9, 0, tzinfo=UTC)
+            )
+        )
+        db_session.commit()
+
+        third = service.export(tables=["stock_transactions"])
+        assert third["tables"]["stock_transactions"]["rows_exported"] == 2
+
+        table = ds.dataset(
+            tmp_path / "stock_transactions", format="parquet", partitioning="hive"
+        ).to_table()
+        assert table.num_rows == 5
+        assert len(set(table.column("id").to_pylist())) == 5
+
+    def test_full_refresh_replaces_exported_files(self, db_session, ledger, tmp_path):
+        """A full refresh rewrites the tables instead of appending duplicates."""
+        service = ColumnarExportService(db_session, tmp_path)
+        service.export()
+        component, location = ledger
+        db_session.add(
+            _transaction(
+                component, location, -5, datetime(2025, 11, 3, 9, 0, tzinfo=UTC)
+            )
+        )
+        db_session.commit()
+
+        refreshed = service.export(tables=["stock_transactions"], full_refresh=True)
+
+        transactions = refreshed["tables"]["stock_transactions"]
+        assert transactions["rows_exported"] == 4
+        assert all(
+            path.startswith(str(tmp_path / "stock_transactions" / "month="))
+            for path in transactions["files"]
+        )
+        table = ds.dataset(
+            tmp_path / "stock_transactions", format="parquet", partitioning="hive"
+        ).to_table()
+        assert table.num_rows == 4
+        assert len(set(table.column("id").to_pylist())) == 4
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "_export_state.json",
+            "component_locations",
+            "components",
+            "stock_transactions",
+        ]
+
+        # Tables outside the refresh keep their high-water marks
+        after = service.export()
+        assert after["tables"]["stock_transactions"]["rows_exported"] == 0
+        assert after["tables"]["components"]["rows_exported"] == 0
+
+    def test_rows_without_watermark(self, db_session, ledger, tmp_path):
+        """updated_at falls back to created_at; rows with neither are reported."""
+        db_session.execute(update(ComponentLocation).values(updated_at=None))
+        db_session.execute(
+            update(StockTransaction)
+            .where(StockTransaction.quantity_change == 100)
+            .values(created_at=None)
+        )
+        db_session.commit()
+        service = ColumnarExportService(db_session, tmp_path)
+
+        summary = service.export(tables=["stock_transactions", "component_locations"])
+        assert summary["tables"]["component_locations"]["rows_exported"] == 1
+        transactions = summary["tables"]["stock_transactions"]
+        assert (transactions["rows_exported"], transactions["rows_skipped"]) == (2, 1)
+
+        # Still reported on incremental runs
+        again = service.export(tables=["stock_transactions"])
+        transactions = again["tables"]["stock_transactions"]
+        assert (transactions["rows_exported"], transactions["rows_skipped"]) == (0, 1)
+
+    def test_arrow_ipc_export(self, db_session, ledger, tmp_path):
+        """Arrow IPC files are readable with the same schema."""
+        summary = ColumnarExportService(db_session, tmp_path).export(
+            export_format="arrow", tables=["stock_transactions"]
+        )
+
+        files = summary["tables"]["stock_transactions"]["files"]
+        assert len(files) == 2
+        assert all(f.endswith(".arrow") for f in files)
+        rows = sum(pa.ipc.open_file(path).read_all().num_rows for path in files)
+        assert rows == 3
+
+    def test_rejects_unknown_table(self, db_session, tmp_path):
+        """Unknown table names are rejected before anything is written."""
+        with pytest.raises(ValueError, match="Unknown export tables"):
+            ColumnarExportService(db_session, tmp_path).export(tables=["users"])
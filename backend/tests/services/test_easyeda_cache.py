@@ -0,0 +1,179 @@
+"""
+Unit tests for the EasyEDA conversion cache.
+
+A fake converter writes symbol, footprint and 3D model files like
+EasyEDAService does and runs in a thread pool instead of worker processes,
+so hits, coalescing, version keys and blob storage of the artefacts are
+checked without easyeda2kicad or network access.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.models import Blob, Component, EasyEDAConversion
+from backend.src.services import component_service as component_service_module
+from backend.src.services.blob_store import BlobStore, blob_sha256
+from backend.src.services.component_service import ComponentService
+from backend.src.services.easyeda_cache import EasyEDAConversionCache
+from backend.src.services.easyeda_service import EasyEDAConversionError
+
+
+class FakeConverter:
+    """Writes EasyEDA-style artefacts and counts conversions per part."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, lcsc_id: str, output_dir: str) -> dict:
+        with self._lock:
+            self.calls.append(lcsc_id)
+        time.sleep(self.delay)
+        if lcsc_id == "C404404":
+            raise EasyEDAConversionError(f"Component {lcsc_id} not found in EasyEDA")
+
+        output = Path(output_dir)
+        symbol = output / "RC0603FR-0710KL.kicad_sym"
+        symbol.write_text(f"(kicad_symbol_lib (symbol {lcsc_id}))")
+        footprint = output / "RC0603FR-0710KL.kicad_mod"
+        footprint.write_text("(footprint R_0603_1608Metric)")
+        model = output / "RC0603FR-0710KL.step"
+        model.write_bytes(b"ISO-10303-21;\nEND-ISO-10303-21;\n")
+        return {
+            "lcsc_id": lcsc_id,
+            "component_info": {"name": "RC0603FR-0710KL"},
+            "conversions": {
+                "symbol": {
+                    "file_path": str(symbol),
+                    "library_name": "EasyEDA_Symbols",
+                    "symbol_name": "RC0603FR-0710KL",
+                },
+                "footprint": {
+                    "file_path": str(footprint),
+                    "library_name": "EasyEDA_Footprints",
+                    "footprint_name": "R_0603_1608Metric",
+                },
+                "model_3d": {
+                    "file_path": str(model),
+                    "model_name": "RC0603FR-0710KL",
+                },
+            },
+            "output_dir": output_dir,
+        }
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+@pytest.fixture
+def blob_store(tmp_path, session_factory):
+    return BlobStore(tmp_path / "blobs", session_factory)
+
+
+def _cache(session_factory, blob_store, executor, converter, version="test+1"):
+    return EasyEDAConversionCache(
+        session_factory=session_factory,
+        blob_store=blob_store,
+        converter=converter,
+        executor=executor,
+        version=version,
+    )
+
+
+def test_second_conversion_is_served_from_cache(
+    db_session, session_factory, blob_store, executor
+):
+    converter = FakeConverter()
+    cache = _cache(session_factory, blob_store, executor, converter)
+
+    first = asyncio.run(cache.convert("c25804"))
+    second = asyncio.run(cache.convert("C25804"))
+
+    assert converter.calls == ["C25804"]
+    assert second == first
+    model_path = second["conversions"]["model_3d"]["file_path"]
+    assert blob_sha256(model_path) is not None
+    assert Path(model_path).read_bytes().startswith(b"ISO-10303-21")
+    assert second["conversions"]["symbol"]["symbol_name"] == "RC0603FR-0710KL"
+    assert db_session.get(Blob, blob_sha256(model_path)).ref_count == 1
+    stats = cache.get_statistics()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_concurrent_misses_share_one_conversion(session_factory, blob_store, executor):
+    converter = FakeConverter(delay=0.1)
+    cache = _cache(session_factory, blob_store, executor, converter)
+
+    async def convert_many():
+        return await asyncio.gather(*(cache.convert("C25804") for _ in range(5)))
+
+    results = asyncio.run(convert_many())
+
+    assert converter.calls == ["C25804"]
+    assert all(result == results[0] for result in results)
+    assert cache.counters["coalesced"] == 4
+
+
+def test_failures_and_new_versions_convert_again(
+    db_session, session_factory, blob_store, executor
+):
+    converter = FakeConverter()
+    cache = _cache(session_factory, blob_store, executor, converter)
+
+    for _ in range(2):
+        with pytest.raises(EasyEDAConversionError):
+            asyncio.run(cache.convert("C404404"))
+    asyncio.run(cache.convert("C25804"))
+
+    upgraded = _cache(session_factory, blob_store, executor, converter, "test+2")
+    asyncio.run(upgraded.convert("C25804"))
+
+    assert converter.calls == ["C404404", "C404404", "C25804", "C25804"]
+    assert db_session.query(EasyEDAConversion).count() == 2
+    assert cache.invalidate("C25804") == 2
+
+
+def test_components_sharing_a_part_reuse_the_conversion(
+    monkeypatch, db_session, session_factory, blob_store, executor
+):
+    converter = FakeConverter()
+    cache = _cache(session_factory, blob_store, executor, converter)
+    monkeypatch.setattr(component_service_module, "EASYEDA_INTEGRATION_AVAILABLE", True)
+    monkeypatch.setattr(component_service_module, "get_conversion_cache", lambda: cache)
+    components = [
+        Component(name=f"10k 0603 #{i}", provider_sku="C25804") for i in range(2)
+    ]
+    db_session.add_all(components)
+    db_session.commit()
+    service = ComponentService(db_session)
+
+    async def convert_all():
+        return [await service._try_easyeda_conversion(c) for c in components]
+
+    kicad_data = asyncio.run(convert_all())
+    db_session.add_all(kicad_data)
+    db_session.commit()
+
+    assert converter.calls == ["C25804"]
+    assert kicad_data[0].get_footprint_reference() == (
+        "EasyEDA_Footprints:R_0603_1608Metric"
+    )
+    model_path = kicad_data[0].model_3d_path
+    assert kicad_data[1].model_3d_path == model_path
+    # Referenced by the cache entry and both components
+    assert db_session.get(Blob, blob_sha256(model_path)).ref_count == 3
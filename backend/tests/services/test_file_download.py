@@ -0,0 +1,142 @@
+"""
+Unit tests for streaming, size-capped downloads.
+
+Responses come from httpx.MockTransport (chunked bodies without
+Content-Length where it matters), so the byte cap, digest, atomic rename and
+the resource/attachment download paths are checked without network access.
+"""
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+from backend.src.services import http_client
+from backend.src.services.file_download import (
+    DownloadTooLargeError,
+    download_to_file,
+)
+from backend.src.services.file_storage import FileStorageService
+from backend.src.services.http_client import close_http_client, create_http_client
+
+PDF = b"%PDF-1.4\n" + b"0" * 200_000 + b"\n%%EOF\n"
+
+
+async def _chunks(body: bytes, size: int = 10_000):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/missing.pdf":
+        return httpx.Response(404)
+    if request.url.path == "/declared.pdf":
+        return httpx.Response(200, content=PDF)
+    # Chunked body, no Content-Length
+    return httpx.Response(
+        200, content=_chunks(PDF), headers={"Content-Type": "application/pdf"}
+    )
+
+
+def _run(monkeypatch, coroutine_factory):
+    async def main():
+        client = create_http_client(httpx.MockTransport(_handler))
+        monkeypatch.setattr(http_client, "_http_client", client)
+        monkeypatch.setattr(
+            http_client, "_http_client_loop", asyncio.get_running_loop()
+        )
+        try:
+            return await coroutine_factory()
+        finally:
+            await close_http_client()
+
+    return asyncio.run(main())
+
+
+def test_download_streams_to_destination_with_digest(monkeypatch, tmp_path):
+    destination = tmp_path / "C8734" / "datasheet.pdf"
+
+    downloaded = _run(
+        monkeypatch,
+        lambda: download_to_file(
+            "https://datasheet.test/chunked.pdf", destination, max_size=len(PDF)
+        ),
+    )
+
+    assert destination.read_bytes() == PDF
+    assert downloaded.size == len(PDF)
+    assert downloaded.sha256 == hashlib.sha256(PDF).hexdigest()
+    assert downloaded.content_type == "application/pdf"
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+@pytest.mark.parametrize("path", ["/chunked.pdf", "/declared.pdf"])
+def test_oversized_download_leaves_existing_file_alone(monkeypatch, tmp_path, path):
+    destination = tmp_path / "datasheet.pdf"
+    destination.write_bytes(b"previous version")
+
+    with pytest.raises(DownloadTooLargeError):
+        _run(
+            monkeypatch,
+            lambda: download_to_file(
+                f"https://datasheet.test{path}", destination, max_size=50_000
+            ),
+        )
+
+    assert destination.read_bytes() == b"previous version"
+    assert list(tmp_path.iterdir()) == [destination]
+
+
+def test_error_status_writes_nothing(monkeypatch, tmp_path):
+    destination = tmp_path / "datasheet.pdf"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(
+            monkeypatch,
+            lambda: download_to_file(
+                "https://datasheet.test/missing.pdf", destination, max_size=len(PDF)
+            ),
+        )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_attachment_download_is_moved_into_storage(monkeypatch, tmp_path):
+    from backend.src.services import provider_attachment_service
+
+    storage = FileStorageService(base_path=str(tmp_path))
+    monkeypatch.setattr(provider_attachment_service, "file_storage", storage)
+    service = provider_attachment_service.ProviderAttachmentService()
+
+    async def download_and_store():
+        result = await service.download_to_incoming(
+            "https://datasheet.test/chunked.pdf"
+        )
+        too_large = await service.download_to_incoming(
+            "https://datasheet.test/declared.pdf", max_size=1024
+        )
+        return result, too_large
+
+    (incoming, filename, mime_type), too_large = _run(monkeypatch, download_and_store)
+
+    assert too_large is None
+    assert (filename, mime_type) == ("chunked.pdf", "application/pdf")
+    file_path, thumbnail, size, detected, safe_name = storage.store_file_from_path(
+        "component-1", incoming, filename, "datasheet"
+    )
+    assert not incoming.exists()
+    assert list(storage.incoming_dir.iterdir()) == []
+    assert storage.get_file_path(file_path).read_bytes() == PDF
+    assert (thumbnail, size, detected) == (None, len(PDF), "application/pdf")
+
+
+def test_store_from_path_rejects_disallowed_types(tmp_path):
+    storage = FileStorageService(base_path=str(tmp_path / "attachments"))
+    source = storage.incoming_dir / "payload"
+    source.write_bytes(b"MZ\x90\x00" + b"\x00" * 512)
+
+    with pytest.raises(ValueError, match="not allowed"):
+        storage.store_file_from_path("component-1", source, "setup.exe")
+
+    assert source.exists()
@@ -0,0 +1,141 @@
+"""
+Unit tests for the shared HTTP client pool.
+
+Requests are answered by httpx.MockTransport, so per-host limits, slot
+release and client reuse are checked without network access.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.src.services import http_client
+from backend.src.services.http_client import (
+    close_http_client,
+    create_http_client,
+    get_http_client,
+)
+from backend.src.services.provider_attachment_service import ProviderAttachmentService
+
+
+class _Recorder:
+    """Mock transport handler tracking concurrent requests per host."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        await asyncio.sleep(self.delay)
+        self.active[host] -= 1
+        return httpx.Response(200, content=b"x" * 100)
+
+
+def test_concurrent_requests_are_limited_per_host():
+    recorder = _Recorder()
+
+    async def burst():
+        async with create_http_client(httpx.MockTransport(recorder), 2) as client:
+            await asyncio.gather(
+                *(client.get(f"https://{host}/part") for host in ["a.test"] * 8),
+                *(client.get(f"https://{host}/part") for host in ["b.test"] * 3),
+            )
+
+    asyncio.run(burst())
+
+    assert recorder.peak == {"a.test": 2, "b.test": 2}
+
+
+def test_streamed_response_holds_host_slot_until_closed():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"datasheet")
+
+    async def scenario():
+        async with create_http_client(httpx.MockTransport(handler), 1) as client:
+            async with client.stream("GET", "https://lcsc.test/a.pdf") as response:
+                second = asyncio.ensure_future(client.get("https://lcsc.test/b.pdf"))
+                await asyncio.sleep(0.01)
+                blocked = not second.done()
+                await response.aread()
+            return blocked, (await second).content
+
+    assert asyncio.run(scenario()) == (True, b"datasheet")
+
+
+def test_failed_request_releases_host_slot():
+    attempts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(204)
+
+    async def scenario():
+        async with create_http_client(httpx.MockTransport(handler), 1) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("https://lcsc.test/first")
+            response = await asyncio.wait_for(
+                client.get("https://lcsc.test/second"), timeout=1
+            )
+            return response.status_code
+
+    assert asyncio.run(scenario()) == 204
+
+
+def test_shared_client_is_reused_per_event_loop():
+    async def clients():
+        first = get_http_client()
+        second = get_http_client()
+        await close_http_client()
+        reopened = get_http_client()
+        await close_http_client()
+        return first, second, reopened
+
+    first, second, reopened = asyncio.run(clients())
+
+    assert first is second
+    assert first.is_closed
+    assert reopened is not first
+
+    async def other_loop():
+        client = get_http_client()
+        await close_http_client()
+        return client
+
+    assert asyncio.run(other_loop()) is not reopened
+
+
+def test_attachment_download_uses_shared_client(monkeypatch):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        size = 64 if request.url.path == "/small.pdf" else 4096
+        return httpx.Response(
+            200,
+            content=b"%" * size,
+            headers={"Content-Type": "application/pdf"},
+        )
+
+    service = ProviderAttachmentService()
+
+    async def downloads():
+        client = create_http_client(httpx.MockTransport(handler))
+        monkeypatch.setattr(http_client, "_http_client", client)
+        monkeypatch.setattr(
+            http_client, "_http_client_loop", asyncio.get_running_loop()
+        )
+        small = await service.download_file_from_url("https://lcsc.test/small.pdf")
+        large = await service.download_file_from_url(
+            "https://lcsc.test/large.pdf", max_size=1024
+        )
+        await close_http_client()
+        return small, large
+
+    small, large = asyncio.run(downloads())
+
+    assert small == (b"%" * 64, "small.pdf", "application/pdf")
+    assert large is None
@@ -0,0 +1,385 @@
+"""
+Unit tests for the durable background job queue.
+
+Queues run against the test database with in-process handlers, so claiming,
+retries with backoff, idempotency keys, leases, per-host limits and the jobs
+API can be checked without network access.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.database import Base
+from backend.src.models import (
+    BackgroundJob,
+    Component,
+    Provider,
+    ProviderLink,
+    StorageLocation,
+)
+from backend.src.schemas.location_layout import (
+    LayoutConfiguration,
+    LayoutType,
+    RangeSpecification,
+    RangeType,
+)
+from backend.src.services import bulk_create_service
+from backend.src.services import job_queue as job_queue_module
+from backend.src.services.job_queue import (
+    JobQueue,
+    PermanentJobError,
+    backoff_delay,
+    enqueue_job,
+)
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+def _queue(session_factory, handlers, **kwargs) -> JobQueue:
+    return JobQueue(handlers, session_factory, poll_interval=0.01, **kwargs)
+
+
+def _enqueue(db_session, kind="echo", payload=None, **kwargs) -> BackgroundJob:
+    job = enqueue_job(db_session, kind, payload, **kwargs)
+    db_session.commit()
+    return job
+
+
+def _reload(db_session, job: BackgroundJob) -> BackgroundJob:
+    db_session.expire_all()
+    return db_session.get(BackgroundJob, job.id)
+
+
+async def echo(payload):
+    return payload
+
+
+def test_jobs_run_by_priority(db_session, session_factory):
+    order = []
+
+    async def record(payload):
+        order.append(payload["name"])
+
+    _enqueue(db_session, "record", {"name": "image"})
+    _enqueue(db_session, "record", {"name": "datasheet"}, priority=10)
+    _enqueue(db_session, "record", {"name": "later"}, delay=60)
+    queue = _queue(session_factory, {"record": record})
+
+    assert asyncio.run(queue.run_pending()) == 2
+    assert order == ["datasheet", "image"]
+
+
+def test_claimed_job_is_not_claimed_twice(db_session, session_factory):
+    job = _enqueue(db_session)
+    first = _queue(session_factory, {"echo": echo})
+    second = _queue(session_factory, {"echo": echo})
+
+    claimed = first.claim()
+
+    assert claimed.id == job.id
+    assert claimed.attempts == 1
+    assert second.claim() is None
+
+
+def test_failures_back_off_then_fail(db_session, session_factory):
+    async def flaky(payload):
+        raise ConnectionError("connection reset")
+
+    job = _enqueue(db_session, "flaky", max_attempts=2)
+    queue = _queue(session_factory, {"flaky": flaky})
+
+    asyncio.run(queue.run_pending())
+    job = _reload(db_session, job)
+    assert job.status == "queued"
+    assert job.attempts == 1
+    assert job.error == "connection reset"
+    retry_in = job.run_after.replace(tzinfo=UTC) - datetime.now(UTC)
+    assert timedelta(seconds=3) < retry_in <= timedelta(seconds=6)
+
+    # Not due yet
+    assert asyncio.run(queue.run_pending()) == 0
+
+    job.run_after = datetime.now(UTC)
+    db_session.commit()
+    asyncio.run(queue.run_pending())
+    job = _reload(db_session, job)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.finished_at is not None
+
+
+def test_permanent_errors_and_unknown_kinds_are_not_retried(
+    db_session, session_factory
+):
+    async def missing(payload):
+        raise PermanentJobError("Resource with ID 42 not found")
+
+    missing_job = _enqueue(db_session, "missing")
+    unknown_job = _enqueue(db_session, "unknown")
+    queue = _queue(session_factory, {"missing": missing})
+
+    asyncio.run(queue.run_pending())
+
+    assert _reload(db_session, missing_job).status == "failed"
+    assert _reload(db_session, unknown_job).error == "No handler for job kind 'unknown'"
+    assert queue.counters["failed"] == 2
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    assert 5.0 <= backoff_delay(1) <= 5.5
+    assert 20.0 <= backoff_delay(3) <= 22.0
+    assert backoff_delay(30) <= job_queue_module.JOB_BACKOFF_MAX * 1.1
+
+
+def test_idempotency_key_returns_existing_job(db_session, session_factory):
+    first = _enqueue(db_session, payload={"n": 1}, idempotency_key="resource:1")
+    again = _enqueue(db_session, payload={"n": 2}, idempotency_key="resource:1")
+
+    assert again.id == first.id
+    assert again.payload == {"n": 1}
+
+    queue = _queue(session_factory, {"echo": echo})
+    asyncio.run(queue.run_pending())
+    done = _enqueue(db_session, idempotency_key="resource:1")
+    assert _reload(db_session, done).status == "succeeded"
+
+    _reload(db_session, first).status = "failed"
+    db_session.commit()
+    requeued = _enqueue(db_session, payload={"n": 3}, idempotency_key="resource:1")
+    assert requeued.id == first.id
+    assert (requeued.status, requeued.attempts) == ("queued", 0)
+    assert db_session.query(BackgroundJob).count() == 1
+
+
+def test_expired_lease_is_reclaimed(db_session, session_factory):
+    job = _enqueue(db_session)
+    crashed = _queue(session_factory, {"echo": echo}, lease=timedelta(seconds=-1))
+    crashed.claim()
+
+    queue = _queue(session_factory, {"echo": echo})
+    assert asyncio.run(queue.run_pending()) == 1
+
+    job = _reload(db_session, job)
+    assert job.status == "succeeded"
+    assert job.attempts == 2
+    assert job.result == {}
+
+
+def test_expired_lease_without_attempts_left_fails(db_session, session_factory):
+    job = _enqueue(db_session, max_attempts=2)
+    for _ in range(2):
+        crashed = _queue(session_factory, {"echo": echo}, lease=timedelta(seconds=-1))
+        assert crashed.claim() is not None
+
+    queue = _queue(session_factory, {"echo": echo})
+    assert asyncio.run(queue.run_pending()) == 0
+
+    job = _reload(db_session, job)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.worker_id is None
+    assert queue.counters["failed"] == 1
+
+
+def test_running_job_renews_its_lease(db_session, session_factory):
+    job = _enqueue(db_session, "slow")
+    other = _queue(session_factory, {})
+
+    async def slow(payload):
+        # Outlives the lease several times over
+        for _ in range(4):
+            await asyncio.sleep(0.15)
+            assert other.claim() is None
+
+    queue = _queue(session_factory, {"slow": slow}, lease=timedelta(seconds=0.3))
+    assert asyncio.run(queue.run_pending()) == 1
+
+    job = _reload(db_session, job)
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+
+
+def test_polling_does_not_commit_a_failed_bulk_create(tmp_path, monkeypatch):
+    # File database on one shared connection, as the app's engine is set up
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'shared.db'}",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    queue = _queue(session_factory, {})
+    polls = 0
+    claim = queue.claim
+
+    def counting_claim():
+        nonlocal polls
+        polls += 1
+        return claim()
+
+    monkeypatch.setattr(queue, "claim", counting_claim)
+
+    # Run the queue's workers while the bulk create is in progress
+    loop = asyncio.new_event_loop()
+    worker = threading.Thread(target=loop.run_forever)
+    worker.start()
+    asyncio.run_coroutine_threadsafe(queue.start(), loop).result(5)
+
+    batches = 0
+    assign = bulk_create_service.BulkCreateService._assign_unique_qr_codes
+
+    def assign_then_fail(self, batch, seen):
+        nonlocal batches
+        batches += 1
+        if batches == 2:
+            # The first batch is written; give the queue time to poll
+            started = polls
+            deadline = time.monotonic() + 5
+            while polls < started + 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        if batches == 3:
+            raise RuntimeError("disk full")
+        assign(self, batch, seen)
+
+    monkeypatch.setattr(bulk_create_service, "INSERT_BATCH_SIZE", 2)
+    monkeypatch.setattr(
+        bulk_create_service.BulkCreateService,
+        "_assign_unique_qr_codes",
+        assign_then_fail,
+    )
+    config = LayoutConfiguration(
+        layout_type=LayoutType.ROW,
+        prefix="bin-",
+        ranges=[RangeSpecification(range_type=RangeType.LETTERS, start="a", end="f")],
+        separators=[],
+        location_type="bin",
+        single_part_only=False,
+    )
+    try:
+        with session_factory() as session:
+            response = bulk_create_service.BulkCreateService(
+                session
+            ).bulk_create_locations(config)
+    finally:
+        asyncio.run_coroutine_threadsafe(queue.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        worker.join()
+        loop.close()
+
+    assert not response.success
+    assert polls >= 3
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(StorageLocation)) == 0
+    engine.dispose()
+
+
+def test_workers_limit_concurrency_per_host(db_session, session_factory):
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def download(payload):
+        host = payload["host"]
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+
+    for i in range(4):
+        for host in ("www.lcsc.com", "datasheet.lcsc.com"):
+            _enqueue(db_session, "download", {"host": host, "i": i}, host=host)
+    queue = _queue(session_factory, {"download": download}, workers=4, max_per_host=2)
+
+    async def drain():
+        await queue.start()
+        try:
+            while queue.get_statistics()["jobs"]["succeeded"] < 8:
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+
+    asyncio.run(asyncio.wait_for(drain(), 5))
+
+    assert peak == {"www.lcsc.com": 2, "datasheet.lcsc.com": 2}
+
+
+def test_stop_puts_running_jobs_back(db_session, session_factory):
+    started = []
+
+    async def hang(payload):
+        started.append(payload)
+        await asyncio.sleep(10)
+
+    job = _enqueue(db_session, "hang")
+    queue = _queue(session_factory, {"hang": hang})
+
+    async def interrupted():
+        await queue.start()
+        while not started:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(asyncio.wait_for(interrupted(), 5))
+
+    job = _reload(db_session, job)
+    assert job.status == "queued"
+    assert job.attempts == 0
+    assert job.worker_id is None
+
+
+def test_added_resource_is_queued_for_download(client, auth_headers, db_session):
+    provider = Provider(
+        name="LCSC", adapter_class="LCSCAdapter", base_url="https://www.lcsc.com"
+    )
+    component = Component(name="STM32F103C8T6")
+    db_session.add_all([provider, component])
+    db_session.commit()
+    link = ProviderLink(
+        component_id=component.id,
+        provider_id=provider.id,
+        provider_part_number="C8734",
+        provider_url="https://www.lcsc.com/product-detail/C8734.html",
+    )
+    db_session.add(link)
+    db_session.commit()
+
+    response = client.post(
+        f"/api/provider-links/{link.id}/resources",
+        json={
+            "type": "datasheet",
+            "url": "https://datasheet.lcsc.com/C8734.pdf",
+            "file_name": "C8734.pdf",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    resource_id = response.json()["id"]
+
+    jobs = client.get(
+        "/api/v1/jobs", params={"kind": "resource_download"}, headers=auth_headers
+    ).json()
+    assert len(jobs) == 1
+    assert jobs[0]["payload"] == {"resource_id": resource_id}
+    assert jobs[0]["idempotency_key"] == f"resource_download:{resource_id}"
+    assert jobs[0]["host"] == "datasheet.lcsc.com"
+    assert jobs[0]["priority"] == 10
+
+    job_id = jobs[0]["id"]
+    assert (
+        client.post(f"/api/v1/jobs/{job_id}/retry", headers=auth_headers).status_code
+        == 409
+    )
+    cancelled = client.post(f"/api/v1/jobs/{job_id}/cancel", headers=auth_headers)
+    assert cancelled.json()["status"] == "cancelled"
+    retried = client.post(f"/api/v1/jobs/{job_id}/retry", headers=auth_headers)
+    assert retried.json()["status"] == "queued"
+    assert client.get("/api/v1/jobs/999999", headers=auth_headers).status_code == 404
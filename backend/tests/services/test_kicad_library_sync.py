@@ -0,0 +1,107 @@
+"""
+Unit tests for incremental KiCad library sync.
+
+Components live in the test database and libraries in a temporary
+directory, so the manifest, unchanged-file reuse, regeneration of edited
+parts and pruning of deleted ones are checked on the files themselves.
+"""
+
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.models import Category, Component
+from backend.src.services.kicad_library import (
+    LIBRARY_MANIFEST_FILE,
+    KiCadLibraryManager,
+)
+
+
+@pytest.fixture
+def manager(db_session):
+    return KiCadLibraryManager(sessionmaker(bind=db_session.get_bind()))
+
+
+@pytest.fixture
+def components(db_session):
+    resistors = Category(name="Resistors")
+    components = [
+        Component(
+            name=f"{value} 0603 resistor",
+            part_number=f"RC0603FR-07{value}L",
+            manufacturer="Yageo",
+            notes=f"{value} 1% thick film",
+            specifications={"package": "0603"},
+            category=resistors,
+        )
+        for value in ("10K", "1K", "100R")
+    ]
+    db_session.add_all(components)
+    db_session.commit()
+    return components
+
+
+def _sync(manager, library, mode="incremental"):
+    result = manager.sync_libraries(str(library), sync_mode=mode)
+    assert result["success"], result
+    return result
+
+
+def test_unchanged_library_is_not_rewritten(manager, components, tmp_path):
+    first = _sync(manager, tmp_path, mode="full")
+    symbol_lib = tmp_path / "PartsHub.kicad_sym"
+    written = symbol_lib.stat().st_mtime_ns
+
+    second = _sync(manager, tmp_path)
+
+    assert (first["symbols_created"], first["footprints_created"]) == (3, 3)
+    assert second["components_unchanged"] == 3
+    assert (second["symbols_created"], second["footprints_created"]) == (0, 0)
+    assert symbol_lib.stat().st_mtime_ns == written
+    manifest = json.loads((tmp_path / LIBRARY_MANIFEST_FILE).read_text())
+    assert set(manifest["symbols"]) == {c.id for c in components}
+
+
+def test_edited_parts_are_regenerated_and_deleted_parts_pruned(
+    manager, components, db_session, tmp_path
+):
+    _sync(manager, tmp_path)
+    edited, deleted, kept = components
+    part_numbers = [c.part_number for c in components]
+    edited.notes = "10K 0.5% thin film"
+    db_session.delete(deleted)
+    db_session.commit()
+
+    result = _sync(manager, tmp_path)
+
+    assert result["components_regenerated"] == 1
+    assert result["components_removed"] == 1
+    assert (result["symbols_created"], result["footprints_created"]) == (1, 1)
+    assert result["footprints_removed"] == 1
+    library = (tmp_path / "PartsHub.kicad_sym").read_text()
+    assert "10K 0.5% thin film" in library
+    assert part_numbers[1] not in library
+    assert part_numbers[2] in library
+    footprints = sorted(p.name for p in (tmp_path / "PartsHub.pretty").iterdir())
+    assert footprints == [
+        f"{part_numbers[2]}_0603.kicad_mod",
+        f"{part_numbers[0]}_0603.kicad_mod",
+    ]
+
+
+def test_missing_files_are_restored(manager, components, tmp_path):
+    _sync(manager, tmp_path)
+    footprint = (
+        tmp_path / "PartsHub.pretty" / f"{components[0].part_number}_0603.kicad_mod"
+    )
+    footprint.unlink()
+    symbol_lib = tmp_path / "PartsHub.kicad_sym"
+    symbol_lib.write_text(symbol_lib.read_text().replace("1% thick film", "edited"))
+
+    result = _sync(manager, tmp_path)
+
+    assert footprint.exists()
+    assert result["footprints_created"] == 1
+    assert result["symbols_created"] == 3
+    assert "edited" not in symbol_lib.read_text()
@@ -0,0 +1,141 @@
+"""
+Unit tests for LabelSheetService.
+
+Covers label selection for subtrees and layouts, PDF/PNG sheet output and
+the on-disk label cache.
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from backend.src.models import StorageLocation
+from backend.src.schemas.location_layout import LayoutConfiguration
+from backend.src.services.bulk_create_service import BulkCreateService
+from backend.src.services.label_sheet_service import (
+    LABELS_PER_PAGE,
+    PAGE_SIZE,
+    LabelSheetService,
+    LabelSpec,
+    shutdown_label_pool,
+)
+
+pytest.importorskip("qrcode")
+
+
+@pytest.fixture
+def drawer_layout(db_session):
+    """Cabinet with a generated 5 x 8 grid of bins (41 locations in all)."""
+    cabinet = StorageLocation(name="label-cabinet", type="cabinet")
+    db_session.add(cabinet)
+    db_session.commit()
+
+    config = LayoutConfiguration(
+        layout_type="grid",
+        prefix="lbl-",
+        ranges=[
+            {"range_type": "letters", "start": "a", "end": "e"},
+            {"range_type": "numbers", "start": 1, "end": 8},
+        ],
+        separators=["-"],
+        location_type="bin",
+        parent_id=cabinet.id,
+    )
+    assert BulkCreateService(db_session).bulk_create_locations(config).success
+    return {"cabinet": cabinet, "config": config}
+
+
+@pytest.fixture
+def service(db_session, tmp_path):
+    return LabelSheetService(db_session, cache_dir=tmp_path)
+
+
+class TestLabelSelection:
+    """Tests for choosing which labels to print"""
+
+    def test_subtree_labels(self, service, drawer_layout):
+        """Subtree includes the root and is in hierarchy order"""
+        specs = service.subtree_labels(drawer_layout["cabinet"].id)
+
+        assert len(specs) == 41
+        assert specs[0].name == "label-cabinet"
+        assert specs[1].hierarchy == "label-cabinet/lbl-a-1"
+        assert all(spec.qr_code_id.startswith("LOC-") for spec in specs)
+
+    def test_subtree_labels_unknown_location(self, service):
+        with pytest.raises(ValueError):
+            service.subtree_labels("00000000-0000-0000-0000-000000000000")
+
+    def test_layout_labels(self, service, drawer_layout):
+        """Layout labels follow generation order"""
+        specs = service.layout_labels(drawer_layout["config"])
+
+        assert len(specs) == 40
+        assert [spec.name for spec in specs[:3]] == ["lbl-a-1", "lbl-a-2", "lbl-a-3"]
+        assert specs[-1].name == "lbl-e-8"
+
+    def test_layout_labels_not_created(self, service, drawer_layout):
+        """A layout whose locations do not exist is rejected"""
+        config = drawer_layout["config"].model_copy(update={"prefix": "nope-"})
+        with pytest.raises(ValueError, match="40 location"):
+            service.layout_labels(config)
+
+
+class TestLabelRendering:
+    """Tests for sheet output and the label cache"""
+
+    def test_pdf_sheet_and_cache(self, service, drawer_layout, tmp_path):
+        """First print renders every label; a reprint is served from cache"""
+        specs = service.subtree_labels(drawer_layout["cabinet"].id)
+
+        sheet = service.render_sheet(specs, "pdf")
+        assert sheet.content.startswith(b"%PDF")
+        assert sheet.page_count == 2
+        assert (sheet.rendered, sheet.cached) == (41, 0)
+        assert len(list(tmp_path.glob("*/*.png"))) == 41
+
+        reprint = service.render_sheet(specs, "pdf")
+        assert (reprint.rendered, reprint.cached) == (0, 41)
+
+    def test_png_page(self, service, drawer_layout):
+        """PNG output is a single full-size page"""
+        specs = service.subtree_labels(drawer_layout["cabinet"].id)
+
+        sheet = service.render_sheet(specs, "png", page=2)
+        assert sheet.media_type == "image/png"
+        assert sheet.rendered == 41 - LABELS_PER_PAGE  # only page 2 is drawn
+        with Image.open(io.BytesIO(sheet.content)) as image:
+            assert image.size == PAGE_SIZE
+
+        with pytest.raises(ValueError, match="out of range"):
+            service.render_sheet(specs, "png", page=3)
+
+    def test_changed_text_replaces_cached_label(self, service, tmp_path):
+        """Renaming a location re-renders its label and drops the old one"""
+        service.render_sheet([LabelSpec("LOC-0001", "old", "shelf/old")], "png")
+        sheet = service.render_sheet([LabelSpec("LOC-0001", "new", "shelf/new")], "png")
+
+        assert sheet.rendered == 1
+        assert len(list(tmp_path.glob("*/LOC-0001-*.png"))) == 1
+
+    def test_process_pool_rendering(self, db_session, tmp_path):
+        """Large batches are rendered in the process pool"""
+        service = LabelSheetService(db_session, cache_dir=tmp_path, pool_min_labels=1)
+        specs = [
+            LabelSpec(f"LOC-P{i:04d}", f"bin-{i}", f"rack/bin-{i}") for i in range(120)
+        ]
+
+        sheet = service.render_sheet(specs, "pdf")
+
+        assert sheet.rendered == 120
+        assert sheet.page_count == 4
+        assert len(list(tmp_path.glob("*/*.png"))) == 120
+
+        shutdown_label_pool()
+        # A later render starts a new pool
+        rerendered = LabelSheetService(
+            db_session, cache_dir=tmp_path / "again", pool_min_labels=1
+        ).render_sheet(specs[:2], "png")
+        assert rerendered.rendered == 2
+        shutdown_label_pool()
@@ -0,0 +1,173 @@
+"""
+Unit tests for StorageLocationService.get_location_components.
+
+A cabinet holds two drawers; components are stocked in one or both so the
+subtree listing, FTS search, category ID filter, stock status and quantity
+sort can be checked against known totals.
+"""
+
+import pytest
+
+from backend.src.database.search import ComponentSearchService
+from backend.src.models import (
+    Category,
+    Component,
+    ComponentLocation,
+    StorageLocation,
+)
+from backend.src.services.storage_service import StorageLocationService
+
+
+@pytest.fixture
+def cabinet(db_session):
+    """cabinet > (drawer-a, drawer-b) with four stocked components."""
+    passive = Category(name="Passive")
+    active = Category(name="Active")
+    cabinet = StorageLocation(name="list-cabinet", type="cabinet")
+    db_session.add_all([passive, active, cabinet])
+    db_session.commit()
+    drawer_a = StorageLocation(
+        name="list-drawer-a", type="drawer", parent_id=cabinet.id
+    )
+    drawer_b = StorageLocation(
+        name="list-drawer-b", type="drawer", parent_id=cabinet.id
+    )
+    db_session.add_all([drawer_a, drawer_b])
+    db_session.commit()
+
+    parts = {
+        "resistor": Component(
+            name="10k resistor", component_type="resistor", category_id=passive.id
+        ),
+        "capacitor": Component(
+            name="100nF capacitor", component_type="capacitor", category_id=passive.id
+        ),
+        "opamp": Component(
+            name="LM358 op-amp", component_type="ic", category_id=active.id
+        ),
+        "mcu": Component(name="ATmega328P", component_type="ic", category_id=active.id),
+    }
+    db_session.add_all(parts.values())
+    db_session.commit()
+
+    for key, location, quantity, minimum in [
+        ("resistor", drawer_a, 300, 50),
+        ("resistor", drawer_b, 200, 50),  # Same part in both drawers
+        ("capacitor", drawer_a, 20, 50),  # Low
+        ("opamp", drawer_b, 0, 5),  # Out
+        ("mcu", drawer_b, 8, 2),
+    ]:
+        db_session.add(
+            ComponentLocation(
+                component_id=parts[key].id,
+                storage_location_id=location.id,
+                quantity_on_hand=quantity,
+                minimum_stock=minimum,
+            )
+        )
+    db_session.commit()
+    # As at startup: the per-test database may predate the FTS triggers
+    ComponentSearchService().rebuild_fts_index(db_session)
+
+    return {
+        "cabinet": cabinet,
+        "drawer_a": drawer_a,
+        "drawer_b": drawer_b,
+        "parts": parts,
+        "categories": {"passive": passive, "active": active},
+    }
+
+
+def _names(components):
+    return [component.name for component in components]
+
+
+def test_subtree_lists_each_component_once(db_session, cabinet):
+    service = StorageLocationService(db_session)
+
+    direct = service.get_location_components(cabinet["cabinet"].id)
+    subtree = service.get_location_components(
+        cabinet["cabinet"].id, include_children=True
+    )
+
+    assert direct == []
+    assert _names(subtree) == [
+        "100nF capacitor",
+        "10k resistor",
+        "ATmega328P",
+        "LM358 op-amp",
+    ]
+
+
+def test_search_uses_full_text_index(db_session, cabinet):
+    service = StorageLocationService(db_session)
+
+    found = service.get_location_components(
+        cabinet["cabinet"].id, include_children=True, search="resist"
+    )
+    only_b = service.get_location_components(cabinet["drawer_b"].id, search="capacitor")
+
+    assert _names(found) == ["10k resistor"]
+    assert only_b == []
+
+
+def test_category_filters(db_session, cabinet):
+    service = StorageLocationService(db_session)
+    cabinet_id = cabinet["cabinet"].id
+
+    by_id = service.get_location_components(
+        cabinet_id,
+        include_children=True,
+        category_id=cabinet["categories"]["active"].id,
+    )
+    by_name = service.get_location_components(
+        cabinet_id, include_children=True, category="pass"
+    )
+
+    assert _names(by_id) == ["ATmega328P", "LM358 op-amp"]
+    assert _names(by_name) == ["100nF capacitor", "10k resistor"]
+
+
+def test_stock_status_and_quantity_sort_use_totals(db_session, cabinet):
+    service = StorageLocationService(db_session)
+    cabinet_id = cabinet["cabinet"].id
+
+    def listing(**filters):
+        return _names(
+            service.get_location_components(
+                cabinet_id, include_children=True, **filters
+            )
+        )
+
+    assert listing(stock_status="out") == ["LM358 op-amp"]
+    assert listing(stock_status="low") == ["100nF capacitor"]
+    assert listing(stock_status="available") == ["10k resistor", "ATmega328P"]
+    assert listing(sort_by="quantity", sort_order="desc") == [
+        "10k resistor",  # 500 across both drawers
+        "100nF capacitor",
+        "ATmega328P",
+        "LM358 op-amp",
+    ]
+    assert listing(sort_by="quantity", limit=2, offset=1) == [
+        "ATmega328P",
+        "100nF capacitor",
+    ]
+
+
+def test_totals_track_stock_changes(db_session, cabinet):
+    service = StorageLocationService(db_session)
+    opamp = cabinet["parts"]["opamp"]
+
+    entry = (
+        db_session.query(ComponentLocation)
+        .filter(ComponentLocation.component_id == opamp.id)
+        .one()
+    )
+    entry.quantity_on_hand = 40
+    db_session.commit()
+
+    assert _names(
+        service.get_location_components(
+            cabinet["drawer_b"].id, stock_status="available"
+        )
+    ) == ["10k resistor", "ATmega328P", "LM358 op-amp"]
@@ -0,0 +1,207 @@
+"""
+Unit tests for PickListService.
+
+Builds a cabinet with a generated 4x4 drawer of bins plus a loose shelf,
+stocks a handful of components and checks source selection, route order
+and shortages for a project pick list.
+"""
+
+import pytest
+
+from backend.src.models import (
+    Component,
+    ComponentLocation,
+    Project,
+    ProjectComponent,
+    StorageLocation,
+)
+from backend.src.schemas.location_layout import LayoutConfiguration
+from backend.src.services.bulk_create_service import BulkCreateService
+from backend.src.services.pick_list_service import (
+    PickListService,
+    PickStop,
+    TravelCostModel,
+    plan_route,
+    route_cost,
+    select_sources,
+)
+
+
+@pytest.fixture
+def shop(db_session):
+    """cabinet > drawer > bins a-1..d-4 (generated), shelf at the root."""
+    cabinet = StorageLocation(name="pick-cabinet", type="cabinet")
+    shelf = StorageLocation(name="pick-shelf", type="shelf")
+    db_session.add_all([cabinet, shelf])
+    db_session.commit()
+    drawer = StorageLocation(name="pick-drawer", type="drawer", parent_id=cabinet.id)
+    db_session.add(drawer)
+    db_session.commit()
+
+    response = BulkCreateService(db_session).bulk_create_locations(
+        LayoutConfiguration(
+            layout_type="grid",
+            prefix="pick-",
+            ranges=[
+                {"range_type": "letters", "start": "a", "end": "d"},
+                {"range_type": "numbers", "start": 1, "end": 4},
+            ],
+            separators=["-"],
+            location_type="bin",
+            parent_id=drawer.id,
+        )
+    )
+    assert response.success
+
+    bins = {
+        location.name: location
+        for location in db_session.query(StorageLocation).filter(
+            StorageLocation.parent_id == drawer.id
+        )
+    }
+    return {"bins": bins, "shelf": shelf}
+
+
+def _stock(db_session, component, location, quantity):
+    db_session.add(
+        ComponentLocation(
+            component_id=component.id,
+            storage_location_id=location.id,
+            quantity_on_hand=quantity,
+        )
+    )
+
+
+@pytest.fixture
+def project(db_session, shop):
+    """Five components spread across the drawer and the shelf."""
+    bins = shop["bins"]
+    parts = [
+        Component(name=f"Pick part {i}", part_number=f"PICK-{i}") for i in range(5)
+    ]
+    project = Project(name="Pick project")
+    db_session.add_all([*parts, project])
+    db_session.commit()
+
+    _stock(db_session, parts[0], bins["pick-d-4"], 50)
+    _stock(db_session, parts[1], bins["pick-a-1"], 50)
+    _stock(db_session, parts[2], bins["pick-a-2"], 50)
+    _stock(db_session, parts[2], shop["shelf"], 500)  # larger, but off-route
+    _stock(db_session, parts[2], bins["pick-d-4"], 10)  # already visited
+    _stock(db_session, parts[3], bins["pick-d-3"], 5)
+    _stock(db_session, parts[3], bins["pick-b-1"], 5)
+    # parts[4] has no stock at all
+
+    for part, allocated, used in [
+        (parts[0], 10, 0),
+        (parts[1], 12, 2),
+        (parts[2], 8, 0),
+        (parts[3], 8, 0),
+        (parts[4], 3, 0),
+    ]:
+        db_session.add(
+            ProjectComponent(
+                project_id=project.id,
+                component_id=part.id,
+                quantity_allocated=allocated,
+                quantity_used=used,
+            )
+        )
+    db_session.commit()
+    return {"project": project, "parts": parts}
+
+
+class TestPickListService:
+    """Tests for project pick lists"""
+
+    def test_project_pick_list(self, db_session, project):
+        """Sources prefer visited locations; the route walks the drawer grid"""
+        parts = project["parts"]
+        pick_list = PickListService(db_session).build_project_pick_list(
+            project["project"].id
+        )
+
+        assert pick_list["project_id"] == project["project"].id
+        assert pick_list["total_lines"] == 5
+
+        picks = {
+            (pick["component_id"], stop["location_name"]): pick["quantity"]
+            for stop in pick_list["stops"]
+            for pick in stop["picks"]
+        }
+        assert picks[(parts[0].id, "pick-d-4")] == 10
+        assert picks[(parts[1].id, "pick-a-1")] == 10  # allocated - used
+        # Served from the bin already on the route rather than the shelf
+        assert picks[(parts[2].id, "pick-d-4")] == 8
+        # Split across two bins
+        assert picks[(parts[3].id, "pick-d-3")] + picks[(parts[3].id, "pick-b-1")] == 8
+
+        names = [stop["location_name"] for stop in pick_list["stops"]]
+        assert sorted(names) == ["pick-a-1", "pick-b-1", "pick-d-3", "pick-d-4"]
+        assert [stop["sequence"] for stop in pick_list["stops"]] == [1, 2, 3, 4]
+        # Grid order: a-1 and d-4 are opposite corners, so they bracket the walk
+        assert {names[0], names[-1]} <= {"pick-a-1", "pick-d-4", "pick-d-3"}
+        assert pick_list["route_cost"] <= pick_list["hierarchy_order_cost"]
+
+        assert pick_list["shortages"] == [
+            {
+                "component_id": parts[4].id,
+                "required": 3,
+                "available": 0,
+                "component_name": "Pick part 4",
+                "part_number": "PICK-4",
+            }
+        ]
+
+    def test_unknown_project(self, db_session):
+        """Missing projects raise ValueError"""
+        with pytest.raises(ValueError):
+            PickListService(db_session).build_project_pick_list("missing")
+
+    def test_unknown_component(self, db_session, project):
+        """Lines for missing components raise ValueError"""
+        with pytest.raises(ValueError, match="missing-part"):
+            PickListService(db_session).build_pick_list(
+                [(project["parts"][0].id, 1), ("missing-part", 2)]
+            )
+
+
+class TestSelectSources:
+    """Tests for source selection"""
+
+    def test_lines_do_not_share_stock(self):
+        """Repeated lines draw down the same stock instead of reusing it"""
+        stock = {"res": [("bin-1", 10), ("bin-2", 4)]}
+
+        visits, shortages = select_sources([("res", 8), ("res", 8)], stock)
+
+        taken: dict[str, int] = {}
+        for location_id, picks in visits.items():
+            for _, quantity in picks:
+                taken[location_id] = taken.get(location_id, 0) + quantity
+        assert taken == {"bin-1": 10, "bin-2": 4}
+        assert shortages == [{"component_id": "res", "required": 8, "available": 6}]
+        assert stock == {"res": [("bin-1", 10), ("bin-2", 4)]}
+
+
+class TestPlanRoute:
+    """Tests for the route heuristic"""
+
+    def test_grid_route_is_optimal(self):
+        """A single row of bins is walked end to end, not zig-zagged"""
+        coordinates = {f"bin-{i}": ("row", (0, i)) for i in range(8)}
+        model = TravelCostModel(coordinates)
+        stops = [
+            PickStop(location_id=f"bin-{i}", path=("drawer", f"bin-{i}"))
+            for i in (5, 0, 7, 2, 6, 1, 4, 3)
+        ]
+
+        route = plan_route(stops, model)
+
+        order = [stop.location_id for stop in route]
+        assert order in (
+            [f"bin-{i}" for i in range(8)],
+            [f"bin-{i}" for i in reversed(range(8))],
+        )
+        # Enter and leave the drawer once (2 * 2 hops) plus 7 grid steps
+        assert route_cost(route, model) == pytest.approx(4 * 10 + 7)
@@ -0,0 +1,238 @@
+"""
+Unit tests for ProviderCache.
+
+Runs ProviderService against the offline LocalProvider with a cache bound
+to the test database, so hits, stale-while-revalidate refreshes, empty
+responses, failures and eviction are observable through the provider's
+call counter.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.models import ProviderResponseCache
+from backend.src.providers.base_provider import ComponentSearchResult
+from backend.src.providers.local_provider import LocalProvider
+from backend.src.services.provider_cache import ProviderCache, cache_key
+from backend.src.services.provider_service import ProviderService
+
+
+def _part(sku: str, part_number: str, stock: int = 100) -> ComponentSearchResult:
+    return ComponentSearchResult(
+        part_number=part_number,
+        manufacturer="Yageo",
+        description=f"{part_number} thick film resistor",
+        availability=stock,
+        provider_id=sku,
+        provider_part_id=sku,
+    )
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+@pytest.fixture
+def local():
+    return LocalProvider(
+        [
+            _part("C25804", "RC0603FR-0710KL"),
+            _part("C21190", "RC0603FR-071KL"),
+        ]
+    )
+
+
+def _service(local: LocalProvider, cache: ProviderCache) -> ProviderService:
+    service = ProviderService(cache=cache)
+    service.disable_provider("lcsc")
+    service.register_provider("local", local)
+    service.enable_provider("local")
+    return service
+
+
+def test_repeat_lookups_are_served_from_cache(session_factory, local):
+    cache = ProviderCache(session_factory)
+    service = _service(local, cache)
+
+    async def lookups():
+        first = await service.search_by_provider_sku("C25804")
+        second = await service.search_by_provider_sku("  c25804 ")
+        details = await service.get_component_details("RC0603FR-0710KL")
+        details_again = await service.get_component_details("rc0603fr-0710kl")
+        return first, second, details, details_again
+
+    first, second, details, details_again = asyncio.run(lookups())
+
+    assert first["local"].part_number == "RC0603FR-0710KL"
+    assert second["local"] == first["local"]
+    assert details_again == details
+    assert local.calls == {"sku": 1, "details": 1}
+    assert cache.counters["hits"] == 2
+
+
+def test_search_params_are_part_of_the_key(session_factory, local):
+    cache = ProviderCache(session_factory)
+    service = _service(local, cache)
+
+    async def searches():
+        await service.search_components("rc0603", limit=5)
+        await service.search_components("RC0603 ", limit=5)
+        await service.search_components("rc0603", limit=1)
+
+    asyncio.run(searches())
+
+    assert local.calls["search"] == 2
+
+
+def test_stale_entries_are_served_and_refreshed(session_factory, local):
+    cache = ProviderCache(session_factory, ttls={"sku": timedelta(0)})
+    service = _service(local, cache)
+
+    async def lookups():
+        await service.search_by_provider_sku("C25804")
+        local.parts[0] = _part("C25804", "RC0603FR-0710KL", stock=5)
+
+        stale = await service.search_by_provider_sku("C25804")
+        await cache.wait_for_refreshes()
+        refreshed = await service.search_by_provider_sku("C25804")
+        await cache.wait_for_refreshes()
+        return stale, refreshed
+
+    stale, refreshed = asyncio.run(lookups())
+
+    assert stale["local"].availability == 100
+    assert refreshed["local"].availability == 5
+    assert local.calls["sku"] == 3
+    assert cache.counters["stale_hits"] == 2
+
+
+def test_failed_refresh_keeps_stale_entry(session_factory):
+    cache = ProviderCache(session_factory, ttls={"details": timedelta(0)})
+    responses = [{"stock": 10}]
+
+    async def loader():
+        if not responses:
+            raise RuntimeError("provider down")
+        return responses.pop()
+
+    async def lookups():
+        await cache.get_or_fetch("lcsc", "details", "C1", loader)
+        stale = await cache.get_or_fetch("lcsc", "details", "C1", loader)
+        await cache.wait_for_refreshes()
+        return stale, await cache.get_or_fetch("lcsc", "details", "C1", loader)
+
+    assert asyncio.run(lookups()) == ({"stock": 10}, {"stock": 10})
+
+
+def test_empty_refresh_keeps_stale_entry(session_factory, local):
+    # LCSCProvider reports lookup failures as None / [] rather than raising
+    cache = ProviderCache(session_factory, ttls={"sku": timedelta(0)})
+    service = _service(local, cache)
+
+    async def lookups():
+        await service.search_by_provider_sku("C25804")
+        local.parts.clear()
+
+        stale = await service.search_by_provider_sku("C25804")
+        await cache.wait_for_refreshes()
+        still_stale = await service.search_by_provider_sku("C25804")
+        await cache.wait_for_refreshes()
+        return stale, still_stale
+
+    stale, still_stale = asyncio.run(lookups())
+
+    assert stale["local"].part_number == "RC0603FR-0710KL"
+    assert still_stale["local"].part_number == "RC0603FR-0710KL"
+    assert local.calls["sku"] == 3
+
+
+def test_errors_and_empty_responses_are_not_kept(session_factory):
+    cache = ProviderCache(session_factory, empty_ttl=timedelta(0))
+    calls = []
+
+    async def failing():
+        calls.append("failing")
+        raise RuntimeError("timeout")
+
+    async def empty():
+        calls.append("empty")
+        return []
+
+    async def lookups():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.get_or_fetch("lcsc", "search", "x", failing)
+            assert await cache.get_or_fetch("lcsc", "search", "y", empty) == []
+
+    asyncio.run(lookups())
+
+    assert calls == ["failing", "empty", "failing", "empty"]
+
+
+def test_concurrent_misses_share_one_fetch(session_factory, local):
+    cache = ProviderCache(session_factory)
+    service = _service(local, cache)
+
+    async def burst():
+        return await asyncio.gather(
+            *(service.search_by_provider_sku("C21190") for _ in range(5))
+        )
+
+    results = asyncio.run(burst())
+
+    assert {result["local"].part_number for result in results} == {"RC0603FR-071KL"}
+    assert local.calls["sku"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(session_factory, db_session):
+    cache = ProviderCache(session_factory, max_entries=4)
+
+    async def payload():
+        return {"stock": 1}
+
+    async def fill():
+        for sku in ("C1", "C2", "C3", "C4"):
+            await cache.get_or_fetch("lcsc", "sku", sku, payload)
+        # Touch C1 so it is the most recently used
+        await cache.get_or_fetch("lcsc", "sku", "C1", payload)
+        await cache.get_or_fetch("lcsc", "sku", "C5", payload)
+
+    asyncio.run(fill())
+
+    kept = {entry.query for entry in db_session.query(ProviderResponseCache)}
+    assert kept == {"C1", "C4", "C5"}
+    assert cache.get_statistics()["entries"] == 3
+
+
+def test_invalidate_and_unavailable_storage(session_factory, local):
+    cache = ProviderCache(session_factory)
+    service = _service(local, cache)
+
+    asyncio.run(service.search_by_provider_sku("C25804"))
+    assert cache.invalidate("local", "sku", "c25804") == 1
+    asyncio.run(service.search_by_provider_sku("C25804"))
+    assert local.calls["sku"] == 2
+
+    def broken_session():
+        raise OperationalError("SELECT 1", {}, Exception("unable to open"))
+
+    broken = _service(local, ProviderCache(broken_session))
+    result = asyncio.run(broken.search_by_provider_sku("C25804"))
+
+    assert result["local"].provider_part_id == "C25804"
+    assert broken.cache.counters["errors"] == 2
+
+
+def test_cache_key_normalises_queries():
+    assert cache_key("LCSC", "sku", " c25804") == cache_key("lcsc", "sku", "C25804")
+    assert cache_key("lcsc", "search", "10K  Resistor") == cache_key(
+        "lcsc", "search", "10k resistor"
+    )
+    assert cache_key("lcsc", "search", "x", {"limit": 5}) != cache_key(
+        "lcsc", "search", "x", {"limit": 10}
+    )
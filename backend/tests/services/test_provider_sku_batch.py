@@ -0,0 +1,162 @@
+"""
+Unit tests for batch provider SKU resolution.
+
+ProviderService.search_by_provider_skus runs against the offline
+LocalProvider with a cache bound to the test database, so deduplication,
+cache-first ordering, bounded fan-out and the streamed endpoint can be
+checked without network access.
+"""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.api import integrations
+from backend.src.providers.base_provider import ComponentSearchResult
+from backend.src.providers.local_provider import LocalProvider
+from backend.src.services.provider_cache import ProviderCache
+from backend.src.services.provider_service import ProviderService
+
+
+def _part(sku: str) -> ComponentSearchResult:
+    return ComponentSearchResult(
+        part_number=f"PN-{sku}",
+        manufacturer="Yageo",
+        description=f"Part {sku}",
+        provider_id=sku,
+        provider_part_id=sku,
+    )
+
+
+class SlowProvider(LocalProvider):
+    """LocalProvider holding SKU lookups until their gate event is set."""
+
+    def __init__(self, parts, gates=None):
+        super().__init__(parts)
+        self.gates = gates or {}
+        self.started: list[str] = []
+        self.active = self.peak = 0
+
+    async def search_by_provider_sku(self, provider_sku):
+        self.started.append(provider_sku)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        gate = self.gates.get(provider_sku)
+        if gate is not None:
+            await gate.wait()
+        else:
+            await asyncio.sleep(0)
+        self.active -= 1
+        return await super().search_by_provider_sku(provider_sku)
+
+
+@pytest.fixture
+def cache(db_session):
+    return ProviderCache(sessionmaker(bind=db_session.get_bind()))
+
+
+def _service(provider: LocalProvider, cache: ProviderCache | None) -> ProviderService:
+    service = ProviderService(cache=cache)
+    service.disable_provider("lcsc")
+    service.register_provider("local", provider)
+    service.enable_provider("local")
+    return service
+
+
+async def _collect(service: ProviderService, skus, **kwargs) -> list[dict]:
+    return [entry async for entry in service.search_by_provider_skus(skus, **kwargs)]
+
+
+async def _until(condition) -> None:
+    """Yield to the event loop until condition() holds."""
+    for _ in range(1000):
+        if condition():
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("condition not reached")
+
+
+def test_duplicates_are_resolved_once(cache):
+    provider = SlowProvider([_part("C1"), _part("C2")])
+    service = _service(provider, cache)
+
+    entries = asyncio.run(_collect(service, ["C1", " c1", "C2", "C404", "", "C2"]))
+
+    assert sorted(entry["provider_sku"] for entry in entries) == ["C1", "C2", "C404"]
+    assert provider.calls["sku"] == 3
+    found = {entry["provider_sku"]: entry["total_found"] for entry in entries}
+    assert found == {"C1": 1, "C2": 1, "C404": 0}
+    c1 = next(entry for entry in entries if entry["provider_sku"] == "C1")
+    assert c1["results"]["local"]["provider_id"] == "local_C1"
+
+
+def test_cached_skus_are_served_first(cache):
+    provider = SlowProvider([_part("C1"), _part("C2"), _part("C3")])
+    service = _service(provider, cache)
+
+    async def batches():
+        await _collect(service, ["C2", "C404"])
+        return await _collect(service, ["C1", "C2", "C3", "C404"])
+
+    entries = asyncio.run(batches())
+
+    assert [entry["cached"] for entry in entries] == [True, True, False, False]
+    assert [entry["provider_sku"] for entry in entries[:2]] == ["C2", "C404"]
+    assert provider.calls["sku"] == 4
+
+
+def test_results_stream_in_completion_order_with_bounded_fan_out():
+    skus = [f"C{i}" for i in range(6)]
+    # C0 and C1 hold their slots while the others pass through the third
+    release_order = ["C2", "C3", "C4", "C5", "C1", "C0"]
+
+    async def run():
+        gates = {sku: asyncio.Event() for sku in skus}
+        provider = SlowProvider([_part(sku) for sku in skus], gates)
+        service = _service(provider, None)
+        streamed: list[str] = []
+
+        async def consume():
+            async for entry in service.search_by_provider_skus(skus, concurrency=3):
+                streamed.append(entry["provider_sku"])
+
+        consumer = asyncio.create_task(consume())
+        await _until(lambda: provider.active == 3)
+        assert provider.started == ["C0", "C1", "C2"]
+
+        for count, sku in enumerate(release_order, start=1):
+            gates[sku].set()
+            await _until(lambda: len(streamed) == count)
+            assert streamed == release_order[:count]
+
+        await consumer
+        return provider
+
+    provider = asyncio.run(run())
+
+    assert provider.peak == 3
+    assert sorted(provider.started) == skus
+
+
+def test_batch_endpoint_streams_ndjson(client, cache, monkeypatch):
+    provider = SlowProvider([_part("C1"), _part("C2")])
+    monkeypatch.setattr(integrations, "provider_service", _service(provider, cache))
+
+    response = client.post(
+        "/api/v1/providers/search-skus",
+        json={"provider_skus": ["C1", "C2", "C404"]},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert {line["provider_sku"]: line["total_found"] for line in lines} == {
+        "C1": 1,
+        "C2": 1,
+        "C404": 0,
+    }
+
+    empty = client.post("/api/v1/providers/search-skus", json={"provider_skus": []})
+    assert empty.status_code == 422
@@ -0,0 +1,173 @@
+"""
+Unit tests for the per-host adaptive rate limiter and circuit breaker.
+
+HostLimiter runs on a fake clock, so AIMD pacing, Retry-After and circuit
+transitions are checked without sleeping. Requests go through
+httpx.MockTransport, and ProviderService runs against the offline
+LocalProvider with a private limiter registry.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.src.providers.base_provider import ComponentSearchResult
+from backend.src.providers.local_provider import LocalProvider
+from backend.src.services.http_client import create_http_client
+from backend.src.services.provider_cache import ProviderCache
+from backend.src.services.provider_service import ProviderService
+from backend.src.services.rate_limiter import (
+    CircuitOpenError,
+    HostLimiter,
+    HostLimiters,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock: FakeClock, **kwargs) -> HostLimiter:
+    options = {"requests_per_second": 4.0, "burst_size": 2, "reset_timeout": 30.0}
+    return HostLimiter("lcsc.test", clock=clock, **{**options, **kwargs})
+
+
+def test_rate_halves_on_429_and_recovers_additively():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.25]
+
+    limiter.record_response(429)
+    limiter.record_response(429)
+    assert limiter.rate == 1.0
+    # No burst after a 429: the next request waits a full interval
+    assert limiter.reserve() >= 1.0
+
+    for _ in range(50):
+        limiter.record_response(200)
+    assert limiter.rate == 4.0
+
+
+def test_retry_after_holds_requests_to_the_host():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.record_response(429, "12")
+
+    assert limiter.reserve() == pytest.approx(12.0)
+    assert limiter.get_state()["blocked_for"] == pytest.approx(12.0)
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("86400") == 300.0
+    assert parse_retry_after("soon") is None
+
+
+def test_circuit_opens_fails_fast_and_closes_after_a_probe():
+    clock = FakeClock()
+    limiter = _limiter(clock, failure_threshold=3)
+
+    for _ in range(2):
+        limiter.record_response(502)
+    limiter.record_response(404)  # Not a host failure; resets the streak
+    for _ in range(3):
+        limiter.record_failure()
+    assert limiter.state == "open"
+    with pytest.raises(CircuitOpenError):
+        limiter.reserve()
+
+    # Once the reset timeout passes, one probe is let through
+    clock.now += 30
+    limiter.check()
+    limiter.reserve()
+    assert limiter.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        limiter.reserve()
+
+    # A failed probe reopens the circuit, a successful one closes it
+    limiter.record_response(503)
+    assert limiter.state == "open"
+    clock.now += 30
+    limiter.reserve()
+    limiter.record_response(200)
+    assert limiter.get_state()["state"] == "closed"
+    assert limiter.get_state()["rejected"] == 2
+
+
+def test_transport_opens_circuit_on_server_errors():
+    limiters = HostLimiters(failure_threshold=2)
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        if request.url.host == "down.test":
+            return httpx.Response(503)
+        return httpx.Response(200)
+
+    async def scenario():
+        transport = httpx.MockTransport(handler)
+        async with create_http_client(transport, limiters=limiters) as client:
+            for _ in range(2):
+                await client.get("https://down.test/part")
+            with pytest.raises(CircuitOpenError) as failed_fast:
+                await client.get("https://down.test/part")
+            up = await client.get("https://up.test/part")
+            return failed_fast.value, up.status_code
+
+    error, up_status = asyncio.run(scenario())
+
+    assert calls == ["down.test", "down.test", "up.test"]
+    assert isinstance(error, httpx.TransportError)
+    assert error.request.url.host == "down.test"
+    assert up_status == 200
+    assert limiters.get_states()["down.test"]["state"] == "open"
+
+
+def test_open_circuit_serves_cached_responses(db_session):
+    cache = ProviderCache(
+        sessionmaker(bind=db_session.get_bind()), ttls={"sku": timedelta(0)}
+    )
+    limiters = HostLimiters()
+    local = LocalProvider(
+        [
+            ComponentSearchResult(
+                part_number="RC0603FR-0710KL",
+                manufacturer="Yageo",
+                description="10k resistor",
+                provider_id="C25804",
+                provider_part_id="C25804",
+            )
+        ]
+    )
+    local.hosts = ["local.test"]
+    service = ProviderService(cache=cache, limiters=limiters)
+    service.providers.pop("lcsc")
+    service.enabled_providers.discard("lcsc")
+    service.register_provider("local", local)
+    service.enable_provider("local")
+
+    async def lookups():
+        await service.search_by_provider_sku("C25804")
+        for _ in range(5):
+            limiters.get("local.test").record_failure()
+        stale = await service.search_by_provider_sku("C25804")
+        await cache.wait_for_refreshes()
+        missing = await service.search_by_provider_sku("C99999")
+        return stale, missing, await service.verify_providers()
+
+    stale, missing, verified = asyncio.run(lookups())
+
+    assert stale["local"].part_number == "RC0603FR-0710KL"
+    assert missing == {"local": None}
+    assert local.calls["sku"] == 1
+    assert verified["local"] is False
+    info = service.get_provider_info()["local"]
+    assert info["circuit_state"] == "open"
+    assert info["hosts"]["local.test"]["consecutive_failures"] == 5
@@ -0,0 +1,181 @@
+"""
+Unit tests for stock-take reconciliation atomicity.
+
+The session is bound to an engine configured like production (SQLite in
+autocommit mode), where a statement is committed as soon as it runs unless
+a transaction was opened explicitly.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.src.database import Base, write_transaction
+from backend.src.models import (
+    Component,
+    ComponentLocation,
+    StockTransaction,
+    StorageLocation,
+)
+from backend.src.services.stock_take_service import StockTakeService
+
+
+@pytest.fixture
+def autocommit_session():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_failed_stock_take_writes_nothing(autocommit_session, monkeypatch):
+    session = autocommit_session
+    location = StorageLocation(name="bin-1", type="bin", location_hierarchy="bin-1")
+    components = [Component(name=f"part-{i}") for i in range(3)]
+    session.add_all([location, *components])
+    session.commit()
+    session.execute(
+        insert(ComponentLocation),
+        [
+            {
+                "component_id": components[0].id,
+                "storage_location_id": location.id,
+                "quantity_on_hand": 10,
+            },
+            {
+                "component_id": components[1].id,
+                "storage_location_id": location.id,
+                "quantity_on_hand": 5,
+            },
+        ],
+    )
+    session.commit()
+    before = sorted(
+        session.execute(
+            select(ComponentLocation.component_id, ComponentLocation.quantity_on_hand)
+        ).all()
+    )
+
+    # Fail the audit rows, the last write of the stock-take
+    execute = session.execute
+
+    def failing_execute(statement, *args, **kwargs):
+        if getattr(statement, "table", None) == StockTransaction.__table__:
+            raise RuntimeError("audit insert failed")
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(session, "execute", failing_execute)
+    lines = [
+        (location.id, components[0].id, 7),  # update
+        (location.id, components[1].id, 0),  # delete
+        (location.id, components[2].id, 4),  # insert
+    ]
+    with pytest.raises(RuntimeError):
+        StockTakeService(session).reconcile(lines, {"user_name": "counter"})
+    monkeypatch.undo()
+
+    after = sorted(
+        session.execute(
+            select(ComponentLocation.component_id, ComponentLocation.quantity_on_hand)
+        ).all()
+    )
+    assert after == before
+    assert session.scalar(select(func.count()).select_from(StockTransaction)) == 0
+
+
+def test_other_sessions_cannot_commit_a_write_transaction(tmp_path):
+    # File database on one shared connection, as the app's engine is set up
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'shared.db'}",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False, "isolation_level": None},
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    session, other = session_factory(), session_factory()
+
+    with pytest.raises(RuntimeError):
+        with write_transaction(session) as writer:
+            writer.add(StorageLocation(name="bin-1", type="bin"))
+            writer.flush()
+            # Another request (or the job queue poller) commits on the
+            # shared connection meanwhile
+            other.scalar(select(func.count()).select_from(Component))
+            other.commit()
+            writer.add(StorageLocation(name="bin-2", type="bin"))
+            writer.flush()
+            raise RuntimeError("stock-take failed")
+
+    assert session.scalar(select(func.count()).select_from(StorageLocation)) == 0
+    session.close()
+    other.close()
+    engine.dispose()
+
+
+def test_stock_changed_during_stock_take_is_not_overwritten(tmp_path, monkeypatch):
+    # A file database, so the concurrent writer gets its own connection
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stock.db'}",
+        connect_args={
+            "check_same_thread": False,
+            "isolation_level": None,
+            "timeout": 5,
+        },
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    session = session_factory()
+    location = StorageLocation(name="bin-1", type="bin", location_hierarchy="bin-1")
+    component = Component(name="part-1")
+    session.add_all([location, component])
+    session.commit()
+    session.execute(
+        insert(ComponentLocation),
+        [
+            {
+                "component_id": component.id,
+                "storage_location_id": location.id,
+                "quantity_on_hand": 10,
+            }
+        ],
+    )
+    session.commit()
+
+    def add_five():
+        with session_factory() as other:
+            other.execute(
+                update(ComponentLocation).values(
+                    quantity_on_hand=ComponentLocation.quantity_on_hand + 5
+                )
+            )
+            other.commit()
+
+    # Another writer adds stock after the recorded stock was read
+    writer = threading.Thread(target=add_five)
+    unit_costs = StockTakeService._unit_costs
+
+    def read_then_race(self, keys, recorded):
+        writer.start()
+        writer.join(0.3)
+        return unit_costs(self, keys, recorded)
+
+    monkeypatch.setattr(StockTakeService, "_unit_costs", read_then_race)
+    result = StockTakeService(session).reconcile(
+        [(location.id, component.id, 7)], {"user_name": "counter"}
+    )
+    writer.join()
+
+    assert result["adjustments"][0]["previous_quantity"] == 10
+    # The addition waited for the stock-take and was applied on top of it
+    assert session.scalar(select(ComponentLocation.quantity_on_hand)) == 12
+    session.close()
+    engine.dispose()
@@ -3,6 +3,7 @@ Test-Driven Development tests for FileStorageService.
 Tests written BEFORE implementation to define expected behavior.
 """
 
+import hashlib
 import io
 import shutil
 import tempfile
@@ -91,26 +92,16 @@ startxref
         assert service_dir.exists()
         assert service_dir.is_dir()
 
-    def test_get_component_hash_consistent(self, file_storage_service):
-        """Test that component hash generation is consistent."""
-        component_id = "test-component-123"
-
-        hash1 = file_storage_service._get_component_hash(component_id)
-        hash2 = file_storage_service._get_component_hash(component_id)
-
-        assert hash1 == hash2
-        assert len(hash1) == 2  # First 2 chars of MD5
-        assert isinstance(hash1, str)
-
-    def test_get_component_dir_structure(self, file_storage_service, temp_storage_dir):
-        """Test that component directory follows hashed structure."""
-        component_id = "test-component-123"
+    def test_blob_path_is_content_addressed(
+        self, file_storage_service, temp_storage_dir
+    ):
+        """Test that blob paths fan out by the leading digest characters."""
+        sha256 = "ab" + "cd" + "0" * 60
 
-        expected_hash = file_storage_service._get_component_hash(component_id)
-        component_dir = file_storage_service._get_component_dir(component_id)
+        path = file_storage_service.blobs.path_for(sha256, ".pdf")
 
-        expected_path = Path(temp_storage_dir) / expected_hash / component_id
-        assert component_dir == expected_path
+        expected_path = Path(temp_storage_dir) / "blobs" / "ab" / "cd"
+        assert path == expected_path / f"{sha256}.pdf"
 
     def test_validate_file_jpeg_valid(self, file_storage_service, sample_image_bytes):
         """Test validation of valid JPEG file."""
@@ -187,7 +178,8 @@ startxref
         assert mime_type == "image/jpeg"
         assert safe_filename == "component_image.jpg"
         assert file_size == len(sample_image_bytes)
-        assert "images" in file_path
+        sha256 = hashlib.sha256(sample_image_bytes).hexdigest()
+        assert file_path == f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}.jpg"
         assert thumbnail_path is not None
         assert "thumb.jpg" in thumbnail_path
 
@@ -217,34 +209,39 @@ startxref
         assert mime_type == "application/pdf"
         assert safe_filename == "datasheet.pdf"
         assert file_size == len(sample_pdf_bytes)
-        assert "datasheets" in file_path
+        sha256 = hashlib.sha256(sample_pdf_bytes).hexdigest()
+        assert file_path == f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}.pdf"
         assert thumbnail_path is None  # No thumbnail for PDF
 
         # Verify file exists
         full_path = file_storage_service.get_file_path(file_path)
         assert full_path.exists()
 
-    def test_store_file_prevents_name_conflicts(
-        self, file_storage_service, sample_image_bytes
+    def test_store_file_deduplicates_identical_content(
+        self, file_storage_service, sample_image_bytes, sample_pdf_bytes
     ):
-        """Test that storing same filename twice creates unique files."""
-        component_id = "test-component-789"
-        filename = "duplicate.jpg"
-
-        # Store first file
+        """Test that identical content is stored once across components."""
+        # Store the same datasheet for two components
         file_path1, _, _, _, _ = file_storage_service.store_file(
-            component_id, sample_image_bytes, filename, "image"
+            "test-component-789", sample_pdf_bytes, "datasheet.pdf", "datasheet"
         )
-
-        # Store second file with same name
-        file_path2, _, _, _, _ = file_storage_service.store_file(
-            component_id, sample_image_bytes, filename, "image"
+        file_path2, _, _, _, name2 = file_storage_service.store_file(
+            "test-component-790", sample_pdf_bytes, "other_name.pdf", "datasheet"
+        )
+        image_path, _, _, _, _ = file_storage_service.store_file(
+            "test-component-790", sample_image_bytes, "datasheet.jpg", "image"
         )
 
-        # Verify different paths
-        assert file_path1 != file_path2
-        assert file_storage_service.get_file_path(file_path1).exists()
-        assert file_storage_service.get_file_path(file_path2).exists()
+        # Same blob, original name kept per attachment
+        assert file_path1 == file_path2
+        assert name2 == "other_name.pdf"
+        assert image_path != file_path1
+        blob_files = [
+            path
+            for path in file_storage_service.blobs.root.rglob("*")
+            if path.is_file() and "thumb" not in path.name
+        ]
+        assert len(blob_files) == 2
 
     @patch("backend.src.services.file_storage.Image.open")
     def test_generate_thumbnail_failure_handling(
@@ -262,7 +259,7 @@ startxref
         assert result is False
 
     def test_delete_file_success(self, file_storage_service, sample_image_bytes):
-        """Test successful file deletion."""
+        """Test that deleting a blob-backed attachment leaves the shared blob."""
         component_id = "test-component-delete"
         filename = "to_delete.jpg"
 
@@ -278,9 +275,20 @@ startxref
         # Delete files
         result = file_storage_service.delete_file(file_path, thumbnail_path)
 
+        # Other attachments may share the blob; garbage collection removes it
         assert result is True
-        assert not file_storage_service.file_exists(file_path)
-        assert not file_storage_service.file_exists(thumbnail_path)
+        assert file_storage_service.file_exists(file_path)
+        assert file_storage_service.file_exists(thumbnail_path)
+
+    def test_delete_file_legacy_layout(self, file_storage_service, temp_storage_dir):
+        """Test that files from the per-component layout are still deleted."""
+        legacy_path = "ab/test-component/datasheets/datasheet_1234abcd.pdf"
+        full_path = Path(temp_storage_dir) / legacy_path
+        full_path.parent.mkdir(parents=True)
+        full_path.write_bytes(b"%PDF-1.4")
+
+        assert file_storage_service.delete_file(legacy_path) is True
+        assert not full_path.exists()
 
     def test_delete_file_nonexistent(self, file_storage_service):
         """Test deletion of non-existent file."""
@@ -304,41 +312,6 @@ startxref
         # File exists after storage
         assert file_storage_service.file_exists(file_path)
 
-    def test_get_component_files(
-        self, file_storage_service, sample_image_bytes, sample_pdf_bytes
-    ):
-        """Test getting all files for a component."""
-        component_id = "test-component-files"
-
-        # Initially no files
-        files = file_storage_service.get_component_files(component_id)
-        assert files == []
-
-        # Store multiple files
-        file_storage_service.store_file(
-            component_id, sample_image_bytes, "image1.jpg", "image"
-        )
-        file_storage_service.store_file(
-            component_id, sample_pdf_bytes, "datasheet.pdf", "datasheet"
-        )
-        file_storage_service.store_file(
-            component_id, sample_image_bytes, "image2.jpg", "image"
-        )
-
-        # Get files
-        files = file_storage_service.get_component_files(component_id)
-
-        # Should have at least 4 files (2 images + 2 thumbnails + 1 PDF)
-        assert len(files) >= 4
-
-        # Check file types
-        file_names = [f.name for f in files]
-        jpg_files = [name for name in file_names if name.endswith(".jpg")]
-        pdf_files = [name for name in file_names if name.endswith(".pdf")]
-
-        assert len(pdf_files) >= 1
-        assert len(jpg_files) >= 3  # 2 original + 2 thumbnails (at least)
-
     def test_get_extension_from_mime(self, file_storage_service):
         """Test MIME type to extension mapping."""
         assert file_storage_service._get_extension_from_mime("image/jpeg") == ".jpg"
@@ -360,9 +333,9 @@ startxref
             )
             results.append(result)
 
-        # All files should be stored with unique paths
+        # Identical content shares one blob
         file_paths = [result[0] for result in results]
-        assert len(set(file_paths)) == 5  # All unique paths
+        assert len(set(file_paths)) == 1
 
         # All files should exist
         for file_path, _, _, _, _ in results:
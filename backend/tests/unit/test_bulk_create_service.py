@@ -18,7 +18,11 @@ NOTE: Test isolation - uses in-memory SQLite from conftest.py fixtures
 
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from backend.src.database import Base
 from backend.src.models.storage_location import StorageLocation
 from backend.src.schemas.location_layout import (
     LayoutConfiguration,
@@ -533,6 +537,51 @@ class TestTransactionSemantics:
         assert existing[0].name == "initial-1"
         assert existing[1].name == "initial-2"
 
+    def test_failed_later_batch_leaves_no_rows(self, monkeypatch):
+        """A failing batch rolls back earlier batches on an autocommit engine."""
+        # Configured like production: statements commit unless a
+        # transaction was opened explicitly
+        engine = create_engine(
+            "sqlite:///:memory:",
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False, "isolation_level": None},
+        )
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine, autoflush=False)()
+
+        execute = session.execute
+        batches = []
+
+        def failing_execute(statement, *args, **kwargs):
+            if getattr(statement, "table", None) == StorageLocation.__table__:
+                batches.append(statement)
+                if len(batches) == 2:
+                    raise RuntimeError("disk full")
+            return execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(session, "execute", failing_execute)
+        config = LayoutConfiguration(
+            layout_type=LayoutType.GRID,
+            prefix="hv-",
+            ranges=[
+                RangeSpecification(range_type=RangeType.LETTERS, start="a", end="c"),
+                RangeSpecification(range_type=RangeType.NUMBERS, start=1, end=999),
+            ],
+            separators=["-"],
+            location_type="bin",
+            single_part_only=False,
+            high_volume=True,
+        )
+
+        response = BulkCreateService(session).bulk_create_locations(config)
+        monkeypatch.undo()
+
+        assert response.success is False
+        assert len(batches) == 2
+        assert session.query(StorageLocation).count() == 0
+        session.close()
+        engine.dispose()
+
 
 @pytest.mark.unit
 class TestBulkCreateEdgeCases:
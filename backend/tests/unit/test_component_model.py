@@ -7,13 +7,16 @@ import uuid
 from decimal import Decimal
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 
 from backend.src.database import Base
 from backend.src.models.category import Category
 from backend.src.models.component import Component
-from backend.src.models.component_location import ComponentLocation
+from backend.src.models.component_location import (
+    ComponentLocation,
+    ComponentStockTotal,
+)
 from backend.src.models.kicad_data import KiCadDataSource, KiCadLibraryData
 from backend.src.models.storage_location import StorageLocation
 from backend.src.models.tag import Tag
@@ -367,6 +370,58 @@ class TestComponentModel:
         assert component.primary_location is not None
         assert component.primary_location.id == sample_storage_location.id
 
+    def test_component_stock_totals_follow_location_changes(
+        self, db_session, sample_category, sample_storage_location
+    ):
+        """Triggers keep component_stock_totals in step with component_locations"""
+        component = Component(
+            id=str(uuid.uuid4()),
+            name="Totals Component",
+            category_id=sample_category.id,
+        )
+        other_location = StorageLocation(
+            id=str(uuid.uuid4()), name="Totals Bin", type="bin"
+        )
+        db_session.add_all([component, other_location])
+        db_session.commit()
+
+        def totals():
+            db_session.expire_all()
+            total = db_session.get(ComponentStockTotal, component.id)
+            return (total.quantity_on_hand, total.minimum_stock, total.location_count)
+
+        first = ComponentLocation(
+            component_id=component.id,
+            storage_location_id=sample_storage_location.id,
+            quantity_on_hand=40,
+            minimum_stock=10,
+        )
+        second = ComponentLocation(
+            component_id=component.id,
+            storage_location_id=other_location.id,
+            quantity_on_hand=15,
+            minimum_stock=5,
+        )
+        db_session.add_all([first, second])
+        db_session.commit()
+        assert totals() == (55, 15, 2)
+
+        first.quantity_on_hand = 25
+        db_session.commit()
+        assert totals() == (40, 15, 2)
+
+        db_session.execute(
+            update(ComponentLocation)
+            .where(ComponentLocation.id == second.id)
+            .values(quantity_on_hand=0, minimum_stock=0)
+        )
+        db_session.commit()
+        assert totals() == (25, 10, 2)
+
+        db_session.delete(first)
+        db_session.commit()
+        assert totals() == (0, 0, 1)
+
     def test_component_update_timestamps(self, db_session, sample_category):
         """Test that updated_at timestamp changes on modification"""
         component = Component(
@@ -0,0 +1,86 @@
+"""
+Unit tests for the streaming export helpers.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from backend.src.services.export_streaming import (
+    iter_csv,
+    iter_json,
+    iter_json_with_items,
+    iter_ndjson,
+    iter_xlsx,
+)
+
+
+@pytest.mark.unit
+class TestExportStreaming:
+    """Tests for chunked CSV/JSON/NDJSON/XLSX encoders."""
+
+    def test_csv_is_flushed_in_chunks(self):
+        """Large CSV exports are yielded in several chunks that join losslessly."""
+        rows = ([i, f"name-{i}"] for i in range(2000))
+        chunks = list(iter_csv(["ID", "Name"], rows, chunk_size=1024))
+
+        assert len(chunks) > 1
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        assert parsed[0] == ["ID", "Name"]
+        assert len(parsed) == 2001
+        assert parsed[-1] == ["1999", "name-1999"]
+
+    def test_csv_with_no_rows_still_has_header(self):
+        """An empty export contains just the header row."""
+        content = b"".join(iter_csv(["A", "B"], []))
+        assert content.decode("utf-8").strip() == "A,B"
+
+    def test_ndjson_one_record_per_line(self):
+        """NDJSON output parses line by line."""
+        records = [{"id": i, "value": str(i)} for i in range(50)]
+        content = b"".join(iter_ndjson(records, chunk_size=64)).decode("utf-8")
+
+        lines = content.splitlines()
+        assert len(lines) == 50
+        assert [json.loads(line) for line in lines] == records
+
+    def test_json_with_items_is_a_single_document(self):
+        """Header fields and streamed items combine into one JSON object."""
+        items = ({"n": i} for i in range(10))
+        content = b"".join(
+            iter_json_with_items({"total": 10}, "entries", items, chunk_size=16)
+        )
+
+        data = json.loads(content)
+        assert data["total"] == 10
+        assert data["entries"] == [{"n": i} for i in range(10)]
+
+    def test_json_with_items_handles_empty_iterables(self):
+        """No items still produces valid JSON, with or without header fields."""
+        assert json.loads(b"".join(iter_json_with_items({}, "items", []))) == {
+            "items": []
+        }
+        assert json.loads(b"".join(iter_json_with_items({"a": 1}, "items", []))) == {
+            "a": 1,
+            "items": [],
+        }
+
+    def test_json_document_round_trips(self):
+        """iter_json produces the same document json.dumps would."""
+        document = {"by_category": [{"category": "R", "total": 1.5}], "n": None}
+        assert json.loads(b"".join(iter_json(document, chunk_size=8))) == document
+
+    def test_xlsx_write_only_workbook(self):
+        """XLSX exports are readable workbooks with the header and all rows."""
+        rows = ([i, i * 2] for i in range(100))
+        content = b"".join(iter_xlsx("Sheet", ["A", "B"], rows, chunk_size=512))
+
+        wb = load_workbook(io.BytesIO(content), read_only=True)
+        ws = wb["Sheet"]
+        values = list(ws.iter_rows(values_only=True))
+        assert values[0] == ("A", "B")
+        assert len(values) == 101
+        assert values[-1] == (99, 198)
@@ -14,7 +14,6 @@ Test Coverage (T044):
 NOTE: Test isolation - pure business logic, no database dependencies
 """
 
-
 import pytest
 
 from backend.src.schemas.location_layout import (
@@ -575,3 +574,154 @@ class TestGenerateNames:
         assert result[11] == "WS-A-12"
         assert result[12] == "WS-B-01"
         assert result[-1] == "WS-E-12"
+
+
+@pytest.mark.unit
+class TestIndexAddressing:
+    """Tests for name_at / index_of (mixed-radix addressing)."""
+
+    def _config(self, ranges, separators, layout_type=LayoutType.GRID):
+        return LayoutConfiguration(
+            layout_type=layout_type,
+            prefix="x-",
+            ranges=ranges,
+            separators=separators,
+            location_type="bin",
+            single_part_only=False,
+        )
+
+    @pytest.mark.parametrize(
+        "layout_type,ranges,separators",
+        [
+            (LayoutType.SINGLE, [], []),
+            (
+                LayoutType.ROW,
+                [RangeSpecification(range_type=RangeType.NUMBERS, start=8, end=12)],
+                [],
+            ),
+            (
+                LayoutType.GRID,
+                [
+                    RangeSpecification(
+                        range_type=RangeType.LETTERS,
+                        start="c",
+                        end="f",
+                        capitalize=True,
+                    ),
+                    RangeSpecification(
+                        range_type=RangeType.NUMBERS, start=1, end=12, zero_pad=True
+                    ),
+                ],
+                ["-"],
+            ),
+            (
+                # Unpadded numbers with no separators: "x-125a" must be
+                # split as 12 / 5 / a after 1 / 2 fails
+                LayoutType.GRID_3D,
+                [
+                    RangeSpecification(range_type=RangeType.NUMBERS, start=1, end=12),
+                    RangeSpecification(range_type=RangeType.NUMBERS, start=5, end=9),
+                    RangeSpecification(
+                        range_type=RangeType.LETTERS, start="a", end="b"
+                    ),
+                ],
+                ["", ""],
+            ),
+        ],
+    )
+    def test_name_at_and_index_of_match_generation_order(
+        self, layout_type, ranges, separators
+    ):
+        """Every position round-trips and matches generate_names."""
+        service = LocationGeneratorService()
+        config = self._config(ranges, separators, layout_type)
+
+        names = service.generate_names(config)
+
+        assert [service.name_at(config, i) for i in range(len(names))] == names
+        assert [service.index_of(config, name) for name in names] == list(
+            range(len(names))
+        )
+
+    @pytest.mark.parametrize(
+        "start,end,capitalize",
+        [("y", "z", False), ("A", "z", True), ("a", "Z", False), ("m", "m", True)],
+    )
+    def test_name_at_matches_iter_names_for_letters(self, start, end, capitalize):
+        """Letter ranges count and index the same letters they generate."""
+        service = LocationGeneratorService()
+        config = self._config(
+            [
+                RangeSpecification(
+                    range_type=RangeType.LETTERS,
+                    start=start,
+                    end=end,
+                    capitalize=capitalize,
+                )
+            ],
+            [],
+            LayoutType.ROW,
+        )
+
+        names = list(service.iter_names(config))
+
+        assert service.calculate_total_count(config) == len(names)
+        assert [service.name_at(config, i) for i in range(len(names))] == names
+
+    @pytest.mark.parametrize("end", ["ß", "é", "{", "Ω"])
+    def test_letters_outside_a_to_z_are_rejected(self, end):
+        """Letters generation never produces are rejected up front."""
+        with pytest.raises(ValueError, match="letters a-z"):
+            RangeSpecification(range_type=RangeType.LETTERS, start="y", end=end)
+
+    def test_name_at_out_of_range(self):
+        """Positions outside the layout raise IndexError."""
+        service = LocationGeneratorService()
+        config = self._config(
+            [RangeSpecification(range_type=RangeType.NUMBERS, start=1, end=3)],
+            [],
+            LayoutType.ROW,
+        )
+
+        with pytest.raises(IndexError):
+            service.name_at(config, 3)
+        with pytest.raises(IndexError):
+            service.name_at(config, -1)
+
+    def test_index_of_rejects_foreign_names(self):
+        """Names the layout never generates map to None."""
+        service = LocationGeneratorService()
+        config = self._config(
+            [
+                RangeSpecification(range_type=RangeType.LETTERS, start="a", end="c"),
+                RangeSpecification(
+                    range_type=RangeType.NUMBERS, start=1, end=20, zero_pad=True
+                ),
+            ],
+            ["-"],
+        )
+
+        for name in ["x-a-1", "x-A-01", "x-d-01", "x-a-21", "x-a-01-", "y-a-01"]:
+            assert service.index_of(config, name) is None
+        assert service.index_of(config, "x-c-20") == 59
+
+    def test_name_at_large_layout(self):
+        """The last name of a ~1M-slot layout is computed directly."""
+        service = LocationGeneratorService()
+        config = self._config(
+            [
+                RangeSpecification(range_type=RangeType.LETTERS, start="a", end="z"),
+                RangeSpecification(range_type=RangeType.NUMBERS, start=0, end=199),
+                RangeSpecification(
+                    range_type=RangeType.NUMBERS, start=0, end=199, zero_pad=True
+                ),
+            ],
+            ["-", "."],
+            LayoutType.GRID_3D,
+        )
+
+        total = service.calculate_total_count(config)
+        assert total == 26 * 200 * 200
+        assert service.name_at(config, total - 1) == "x-z-199.199"
+        assert service.name_at(config, 200 * 200 + 201) == "x-b-1.001"
+        assert service.index_of(config, "x-b-1.001") == 200 * 200 + 201
@@ -14,7 +14,6 @@ Test Coverage (T045):
 NOTE: Test isolation - uses in-memory SQLite from conftest.py fixtures
 """
 
-
 import pytest
 
 from backend.src.models.storage_location import StorageLocation
@@ -463,6 +462,28 @@ class TestValidateConfiguration:
         )
         assert duplicate_names_shown <= 5
 
+    def test_duplicate_check_ignores_similar_names(self, db_session):
+        """Only names the layout actually generates count as duplicates."""
+        db_session.add_all(
+            StorageLocation(name=name, type="bin")
+            for name in ["shelf-b", "shelf-aa", "shelf-z", "shelf-", "Shelf-c"]
+        )
+        db_session.commit()
+
+        validator = LocationValidatorService(db_session)
+        config = LayoutConfiguration(
+            layout_type=LayoutType.ROW,
+            prefix="shelf-",
+            ranges=[
+                RangeSpecification(range_type=RangeType.LETTERS, start="a", end="c")
+            ],
+            separators=[],
+            location_type="bin",
+            single_part_only=False,
+        )
+
+        assert validator.find_existing_names(config) == ["shelf-b"]
+
 
 @pytest.mark.unit
 class TestValidatorIntegration:
@@ -610,3 +610,88 @@ class TestStorageLocationModel:
         # last_used_at should still be None
         assert location.last_used_at is None
         assert location.qr_code_id == "LOC-CUSTOM1"
+
+    def test_storage_location_closure_subtree_queries(self, db_session):
+        """Subtree lookups, counts and ancestry come from the closure table"""
+        room = StorageLocation(id=str(uuid.uuid4()), name="Closure Room", type="room")
+        shelf = StorageLocation(
+            id=str(uuid.uuid4()), name="Shelf", type="shelf", parent_id=room.id
+        )
+        drawer = StorageLocation(
+            id=str(uuid.uuid4()), name="Drawer", type="drawer", parent_id=shelf.id
+        )
+        bin_location = StorageLocation(
+            id=str(uuid.uuid4()), name="Bin", type="bin", parent_id=drawer.id
+        )
+        db_session.add_all([room, shelf, drawer, bin_location])
+        db_session.commit()
+
+        component = Component(id=str(uuid.uuid4()), name="Closure Part")
+        db_session.add(component)
+        db_session.add(
+            ComponentLocation(
+                component_id=component.id,
+                storage_location_id=bin_location.id,
+                quantity_on_hand=5,
+            )
+        )
+        db_session.commit()
+
+        assert [loc.name for loc in room.get_all_descendants()] == [
+            "Shelf",
+            "Drawer",
+            "Bin",
+        ]
+        assert [loc.name for loc in bin_location.full_path] == [
+            "Closure Room",
+            "Shelf",
+            "Drawer",
+            "Bin",
+        ]
+        assert room.get_component_count(include_children=True) == 1
+        assert room.get_component_count() == 0
+        assert room.is_ancestor_of(bin_location)
+        assert not bin_location.is_ancestor_of(room)
+        assert not room.is_ancestor_of(room)
+
+        can_delete, reason = room.can_be_deleted()
+        assert can_delete is False
+        assert "child 'Bin'" in reason
+        assert room.get_deletion_blockers() == [
+            "Child 'Bin': Contains 1 component(s): Closure Part"
+        ]
+
+    def test_storage_location_closure_follows_moves(self, db_session):
+        """Moving a subtree re-links every descendant; cycles are rejected"""
+        from sqlalchemy.exc import IntegrityError
+
+        cabinet_a = StorageLocation(id=str(uuid.uuid4()), name="Cab A", type="cabinet")
+        cabinet_b = StorageLocation(id=str(uuid.uuid4()), name="Cab B", type="cabinet")
+        drawer = StorageLocation(
+            id=str(uuid.uuid4()), name="Drawer", type="drawer", parent_id=cabinet_a.id
+        )
+        bin_location = StorageLocation(
+            id=str(uuid.uuid4()), name="Bin", type="bin", parent_id=drawer.id
+        )
+        db_session.add_all([cabinet_a, cabinet_b, drawer, bin_location])
+        db_session.commit()
+
+        drawer.parent_id = cabinet_b.id
+        db_session.commit()
+
+        assert cabinet_a.get_all_descendants() == []
+        assert {loc.name for loc in cabinet_b.get_all_descendants()} == {
+            "Drawer",
+            "Bin",
+        }
+        assert cabinet_b.is_ancestor_of(bin_location)
+        assert not cabinet_a.is_ancestor_of(bin_location)
+
+        cabinet_b.parent_id = bin_location.id
+        with pytest.raises(IntegrityError, match="Circular reference"):
+            db_session.commit()
+        db_session.rollback()
+
+        db_session.delete(bin_location)
+        db_session.commit()
+        assert [loc.name for loc in cabinet_b.get_all_descendants()] == ["Drawer"]
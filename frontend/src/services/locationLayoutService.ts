@@ -21,6 +21,7 @@ export interface LayoutConfiguration {
   parent_id?: string | null
   location_type: string
   single_part_only: boolean
+  high_volume?: boolean
 }
 
 export interface PreviewResponse {
@@ -32,6 +33,14 @@ export interface PreviewResponse {
   is_valid: boolean
 }
 
+export interface PreviewPageResponse {
+  names: string[]
+  offset: number
+  limit: number
+  total_count: number
+  has_more: boolean
+}
+
 export interface BulkCreateResponse {
   created_ids: string[]
   created_count: number
@@ -50,6 +59,24 @@ export const locationLayoutService = {
     return response.data
   },
 
+  /**
+   * Fetch one page of the names a layout would generate
+   * @param config Layout configuration
+   * @param offset Position of the first name
+   * @param limit Names per page (max 1000)
+   * @returns Page of names with total count
+   */
+  async previewNames(
+    config: LayoutConfiguration,
+    offset = 0,
+    limit = 100
+  ): Promise<PreviewPageResponse> {
+    const response = await api.post('/api/v1/storage-locations/generate-preview/names', config, {
+      params: { offset, limit }
+    })
+    return response.data
+  },
+
   /**
    * Bulk create storage locations from layout configuration
    * @param config Layout configuration
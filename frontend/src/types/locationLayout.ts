@@ -25,6 +25,7 @@ export interface LayoutConfiguration {
   parent_id?: string | null
   location_type: LocationType
   single_part_only: boolean
+  high_volume?: boolean
 }
 
 export interface PreviewResponse {